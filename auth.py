@@ -13,7 +13,10 @@ import threading
 import json
 from typing import Optional, Callable, Dict, Any, Tuple
 
-import garth
+from lazy_import import lazy_import
+
+# garth viene importato al primo accesso a Garmin Connect
+garth = lazy_import('garth')
 
 class GarminAuth:
     """
@@ -443,15 +446,83 @@ class GarminAuth:
                 logging.error(f"Error in auth callback: {str(e)}")
 
 
+class RateLimiter:
+    """
+    Limita la frequenza delle richieste (token bucket), utilizzabile da più thread.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Inizializza il limitatore.
+        
+        Args:
+            rate: Richieste al secondo consentite in media
+            burst: Richieste consecutive consentite senza attesa
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Attende finché una richiesta è consentita.
+        
+        Returns:
+            Secondi di attesa
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                
+                delay = (1 - self._tokens) / self.rate
+            
+            time.sleep(delay)
+            waited += delay
+
+
 class GarminClient:
     """
     Client per interagire con Garmin Connect.
     Wrapper per le funzioni di garth per fornire un'interfaccia più comoda.
     """
     
-    def __init__(self):
-        """Inizializza il client."""
-        pass
+    def __init__(self, garth_client: Any = None, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Inizializza il client.
+        
+        Args:
+            garth_client: Sessione garth.Client da usare (predefinita: la sessione
+                          globale di garth, quella di GarminAuth)
+            rate_limiter: Limitatore delle richieste (opzionale)
+        """
+        self.garth_client = garth_client
+        self.rate_limiter = rate_limiter
+    
+    def _connectapi(self, path: str, **kwargs) -> Any:
+        """
+        Esegue una richiesta all'API di Garmin Connect con la sessione del client.
+        
+        Args:
+            path: Percorso dell'API
+            **kwargs: Argomenti per connectapi (method, params, json, ...)
+        
+        Returns:
+            Risposta dell'API
+        """
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        
+        session = self.garth_client if self.garth_client is not None else garth
+        return session.connectapi(path, **kwargs)
     
     def list_workouts(self) -> list:
         """
@@ -461,7 +532,7 @@ class GarminClient:
             Lista degli allenamenti
         """
         try:
-            response = garth.connectapi(
+            response = self._connectapi(
                 '/workout-service/workouts',
                 params={'start': 0, 'limit': 999, 'myWorkoutsOnly': True}
             )
@@ -481,7 +552,7 @@ class GarminClient:
             Dettagli dell'allenamento
         """
         try:
-            response = garth.connectapi(
+            response = self._connectapi(
                 f'/workout-service/workout/{workout_id}',
                 method="GET"
             )
@@ -501,7 +572,7 @@ class GarminClient:
             Risposta dell'API
         """
         try:
-            response = garth.connectapi(
+            response = self._connectapi(
                 '/workout-service/workout',
                 method="POST",
                 json=workout.garminconnect_json()
@@ -525,7 +596,7 @@ class GarminClient:
         try:
             wo_json = workout.garminconnect_json()
             wo_json['workoutId'] = workout_id
-            response = garth.connectapi(
+            response = self._connectapi(
                 f'/workout-service/workout/{workout_id}',
                 method="PUT",
                 json=wo_json
@@ -546,7 +617,7 @@ class GarminClient:
             Risposta dell'API
         """
         try:
-            response = garth.connectapi(
+            response = self._connectapi(
                 f'/workout-service/workout/{workout_id}',
                 method="DELETE"
             )
@@ -569,7 +640,7 @@ class GarminClient:
         try:
             # Garmin API richiede il mese come 0-11
             api_month = month - 1
-            response = garth.connectapi(
+            response = self._connectapi(
                 f'/calendar-service/year/{year}/month/{api_month}'
             )
             return response
@@ -589,7 +660,7 @@ class GarminClient:
             Risposta dell'API
         """
         try:
-            response = garth.connectapi(
+            response = self._connectapi(
                 f'/workout-service/schedule/{workout_id}',
                 method="POST",
                 json={'date': date}
@@ -610,7 +681,7 @@ class GarminClient:
             Risposta dell'API
         """
         try:
-            response = garth.connectapi(
+            response = self._connectapi(
                 f'/workout-service/schedule/{schedule_id}',
                 method="DELETE"
             )
@@ -640,7 +711,7 @@ class GarminClient:
             if end_date:
                 params['endDate'] = end_date
             
-            response = garth.connectapi(
+            response = self._connectapi(
                 '/activitylist-service/activities/search/activities',
                 params=params
             )
@@ -657,7 +728,7 @@ class GarminClient:
             Profilo utente
         """
         try:
-            response = garth.connectapi('/userprofile-service/socialProfile')
+            response = self._connectapi('/userprofile-service/socialProfile')
             return response
         except Exception as e:
             logging.error(f"Error getting user profile: {str(e)}")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Confronto dei tempi di lettura/scrittura YAML tra PyYAML puro e libyaml.
+
+Uso (dalla cartella principale del progetto):
+    python benchmarks/bench_yaml.py [--workouts 500] [--repeat 5]
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+import yaml
+from yaml.representer import SafeRepresenter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml_io
+
+
+class PureSafeDumper(yaml.SafeDumper):
+    """Dumper in puro Python con le stesse regole di yaml_io.SafeDumper."""
+
+
+PureSafeDumper.add_representer(tuple, SafeRepresenter.represent_list)
+
+
+def synthetic_plan(workouts: int) -> dict:
+    """
+    Genera un piano nel formato di esportazione YAML.
+    
+    Args:
+        workouts: Numero di allenamenti
+    
+    Returns:
+        Dizionario del piano
+    """
+    plan = {
+        'config': {
+            'name_prefix': '',
+            'margins': {'faster': '0:02', 'slower': '0:02', 'hr_up': 5, 'hr_down': 5},
+            'athlete_name': 'Atleta',
+            'race_day': '',
+            'preferred_days': '[1, 3, 5]',
+            'heart_rates': {'max_hr': 180, 'Z1_HR': '62-76% max_hr', 'Z2_HR': '76-85% max_hr'},
+        },
+        'paces': {'Z1': '6:35', 'Z2': '6:20', 'Z3': '6:00', 'Z4': '5:20', 'Z5': '4:50'},
+    }
+    
+    for index in range(workouts):
+        week, day = divmod(index, 3)
+        plan[f'W{week + 1:02d}D{day + 1} - Ripetute {index}'] = [
+            {'sport_type': 'running'},
+            {'date': f'2025-{(index // 28) % 12 + 1:02d}-{index % 28 + 1:02d}'},
+            {'warmup': '10min @ Z1 -- Riscaldamento'},
+            {'repeat': 6, 'steps': [
+                {'interval': '400m @ Z4 -- Veloce'},
+                {'recovery': '90s @ Z1'},
+            ]},
+            {'interval': '2km @ Z3'},
+            {'cooldown': 'lap-button @ Z1 -- Defaticamento'},
+        ]
+    
+    return plan
+
+
+def measure(function, repeat: int) -> float:
+    """
+    Misura il tempo migliore di una funzione.
+    
+    Args:
+        function: Funzione senza argomenti
+        repeat: Numero di ripetizioni
+    
+    Returns:
+        Tempo migliore in secondi
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench(label: str, text: str, repeat: int) -> None:
+    """
+    Confronta lettura e scrittura di un documento con le due implementazioni.
+    
+    Args:
+        label: Nome del documento
+        text: Contenuto YAML
+        repeat: Numero di ripetizioni
+    """
+    data = yaml.load(text, Loader=yaml.SafeLoader)
+    options = {'default_flow_style': False, 'sort_keys': False}
+    
+    load_py = measure(lambda: yaml.load(text, Loader=yaml.SafeLoader), repeat)
+    load_c = measure(lambda: yaml_io.load(text), repeat)
+    dump_py = measure(lambda: yaml.dump(data, Dumper=PureSafeDumper, **options), repeat)
+    dump_c = measure(lambda: yaml_io.dump(data), repeat)
+    
+    # Le due implementazioni devono produrre gli stessi dati e lo stesso testo
+    same = (yaml_io.load(text) == data and
+            yaml_io.dump(data) == yaml.dump(data, Dumper=PureSafeDumper, **options))
+    
+    print(f"{label:<40} {len(text) / 1024:8.1f} KB  "
+          f"load {load_py * 1000:8.2f} -> {load_c * 1000:7.2f} ms ({load_py / load_c:5.1f}x)  "
+          f"dump {dump_py * 1000:8.2f} -> {dump_c * 1000:7.2f} ms ({dump_py / dump_c:5.1f}x)  "
+          f"{'uguale' if same else 'DIVERSO'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark YAML: PyYAML puro contro libyaml')
+    parser.add_argument('--workouts', type=int, default=500, help='Allenamenti del piano sintetico')
+    parser.add_argument('--repeat', type=int, default=5, help='Ripetizioni di ogni misura')
+    args = parser.parse_args()
+    
+    print(f"Implementazione in uso: {yaml_io.backend()}")
+    if not yaml_io.LIBYAML_AVAILABLE:
+        print("libyaml non disponibile: i tempi delle due colonne coincidono")
+    
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for path in sorted(glob.glob(os.path.join(root, 'training_plans', '*.yaml'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            bench(os.path.basename(path), f.read(), args.repeat)
+    
+    text = yaml.dump(synthetic_plan(args.workouts), default_flow_style=False, sort_keys=False)
+    bench(f"piano sintetico ({args.workouts} allenamenti)", text, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,723 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Comandi senza interfaccia grafica per le operazioni in blocco sui piani.
+
+Ogni comando scrive su stdout un evento JSON per riga ('start', 'progress',
+'error', 'done' e 'job' per il comando 'sync'), con il nome del comando e
+i secondi trascorsi, così i job notturni possono seguirne l'avanzamento e
+misurarne la durata; i messaggi di log vanno su stderr. Questo modulo non importa tkinter; i servizi
+vengono importati dai comandi che li usano, così la costruzione del parser
+degli argomenti resta leggera anche per l'avvio dell'interfaccia grafica.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import datetime
+import threading
+from typing import Dict, Any, List, Tuple, Optional
+
+from config import get_config
+
+
+# Attesa massima (secondi) per il ripristino della sessione di Garmin Connect
+RESUME_TIMEOUT = 60
+
+# Codici di uscita
+EXIT_OK = 0
+EXIT_ERRORS = 1
+
+# Nomi dei giorni accettati da --days (0 = lunedì)
+DAY_NAMES = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+
+class ProgressReporter:
+    """Scrive gli eventi di un comando come righe JSON."""
+    
+    def __init__(self, command: str, stream=None):
+        """
+        Inizializza il reporter.
+        
+        Args:
+            command: Nome del comando
+            stream: Stream di uscita (predefinito: stdout)
+        """
+        self.command = command
+        self.stream = stream or sys.stdout
+        self.started = time.perf_counter()
+        self.errors = 0
+        
+        # Gli eventi possono arrivare da più thread (es. comando 'sync')
+        self._lock = threading.Lock()
+    
+    def emit(self, event: str, **fields) -> None:
+        """
+        Scrive un evento.
+        
+        Args:
+            event: Tipo di evento
+            **fields: Campi aggiuntivi dell'evento
+        """
+        record = {'event': event, 'command': self.command,
+                  'elapsed': round(time.perf_counter() - self.started, 3)}
+        record.update(fields)
+        with self._lock:
+            self.stream.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self.stream.flush()
+    
+    def progress(self, done: int, total: int, item: Optional[str] = None, **fields) -> None:
+        """
+        Scrive l'avanzamento di un comando.
+        
+        Args:
+            done: Elementi completati
+            total: Elementi totali
+            item: Elemento appena completato
+            **fields: Campi aggiuntivi dell'evento
+        """
+        self.emit('progress', done=done, total=total, item=item, **fields)
+    
+    def error(self, message: str, item: Optional[str] = None) -> None:
+        """
+        Scrive un errore non fatale.
+        
+        Args:
+            message: Messaggio di errore
+            item: Elemento che ha causato l'errore
+        """
+        with self._lock:
+            self.errors += 1
+        self.emit('error', item=item, message=message)
+    
+    def done(self, **fields) -> int:
+        """
+        Scrive il riepilogo finale.
+        
+        Args:
+            **fields: Campi del riepilogo
+        
+        Returns:
+            Codice di uscita del comando
+        """
+        self.emit('done', errors=self.errors, **fields)
+        return EXIT_OK if self.errors == 0 else EXIT_ERRORS
+
+
+# ----------------------------------------------------------------------
+# Funzioni di supporto
+# ----------------------------------------------------------------------
+
+def find_sources(sources: List[str]) -> List[str]:
+    """
+    Espande file, cartelle e pattern glob nei file di piani supportati.
+    
+    Args:
+        sources: File, cartelle o pattern
+    
+    Returns:
+        Percorsi dei file, senza duplicati, nell'ordine delle sorgenti
+    """
+    from services.batch_import import BatchImportService
+    
+    paths = []
+    for source in sources:
+        if os.path.isfile(source):
+            found = [source]
+        else:
+            found = BatchImportService.find_plan_files(source)
+            if not found:
+                raise FileNotFoundError(f"Nessun file di piani trovato: {source}")
+        
+        for path in found:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def load_workouts(sources: List[str], reporter: ProgressReporter,
+                  jobs: Optional[int] = None) -> List[Tuple[str, 'Workout']]:
+    """
+    Importa gli allenamenti da file, cartelle o pattern glob.
+    
+    Un singolo file viene importato nel processo corrente, più file in
+    parallelo su processi separati. Le sezioni di configurazione dei file
+    vengono applicate come nell'interfaccia grafica.
+    
+    Args:
+        sources: File, cartelle o pattern
+        reporter: Reporter degli eventi
+        jobs: Numero massimo di processi
+    
+    Returns:
+        Lista di tuple (nome, allenamento)
+    """
+    from services.batch_import import BatchImportService, importer_for
+    from services.plan_cache import get_plan_cache
+    
+    paths = find_sources(sources)
+    
+    if len(paths) == 1:
+        path = paths[0]
+        try:
+            workouts = get_plan_cache().import_workouts(path, importer_for(path))
+        except Exception as e:
+            reporter.error(str(e), item=path)
+            return []
+        reporter.progress(1, 1, item=path, workouts=len(workouts))
+        return workouts
+    
+    def on_progress(done, total, result):
+        if result.ok:
+            reporter.progress(done, total, item=result.file_path, workouts=len(result.workouts))
+        else:
+            reporter.error(result.error, item=result.file_path)
+    
+    return BatchImportService.import_files(paths, max_workers=jobs, progress_callback=on_progress).workouts
+
+
+def load_store_workouts() -> List[Tuple[str, 'Workout']]:
+    """
+    Carica gli allenamenti importati dall'archivio locale.
+    
+    Returns:
+        Lista di tuple (nome, allenamento)
+    """
+    from services.local_store import get_local_store
+    
+    return get_local_store().load_workouts()
+
+
+def can_write(workouts: List[Tuple[str, 'Workout']], reporter: ProgressReporter) -> bool:
+    """
+    Verifica che gli allenamenti caricati possano sovrascrivere la destinazione.
+    
+    Se una sorgente è fallita o non è stato caricato nulla, la destinazione
+    non va toccata: un file o un archivio sostituito con un piano incompleto
+    o vuoto farebbe perdere dati.
+    
+    Args:
+        workouts: Allenamenti caricati
+        reporter: Reporter degli eventi (con gli errori già segnalati)
+    
+    Returns:
+        True se la destinazione può essere scritta
+    """
+    if reporter.errors:
+        return False
+    
+    if not workouts:
+        reporter.error("Nessun allenamento caricato: destinazione non modificata")
+        return False
+    
+    return True
+
+
+def save_workouts(workouts: List[Tuple[str, 'Workout']], file_path: str, name_prefix: str = '',
+                  data_only: bool = False) -> None:
+    """
+    Salva gli allenamenti nel formato indicato dall'estensione del file.
+    
+    Args:
+        workouts: Lista di tuple (nome, allenamento)
+        file_path: Percorso del file (.yaml, .xlsx, .jsonl, .csv o .parquet)
+        name_prefix: Prefisso dei nomi per i formati che lo supportano
+        data_only: Se True i file Excel contengono solo i dati, senza formattazione
+    
+    Raises:
+        ValueError: Se il formato non è supportato
+    """
+    from services.batch_import import SUPPORTED_EXTENSIONS
+    from services.excel_service import ExcelService
+    from services.jsonl_service import JsonlService
+    from services.step_export_service import StepExportService, EXPORT_FORMATS
+    from services.yaml_service import YamlService
+    
+    extension = os.path.splitext(file_path)[1].lower()
+    kind = SUPPORTED_EXTENSIONS.get(extension)
+    
+    if kind == 'yaml':
+        YamlService.export_workouts(workouts, file_path, {'name_prefix': name_prefix})
+    elif kind == 'excel':
+        ExcelService.export_workouts(workouts, file_path, styled=not data_only)
+    elif kind == 'jsonl':
+        JsonlService.export_workouts(workouts, file_path, {'name_prefix': name_prefix})
+    elif extension in EXPORT_FORMATS:
+        StepExportService.export_steps(workouts, file_path)
+    else:
+        raise ValueError(f"Formato di destinazione non supportato: {os.path.basename(file_path)}")
+
+
+def connect() -> 'GarminClient':
+    """
+    Riprende la sessione di Garmin Connect salvata dall'interfaccia grafica.
+    
+    Returns:
+        Client autenticato
+    
+    Raises:
+        RuntimeError: Se non c'è una sessione valida
+    """
+    from auth import get_auth
+    
+    auth = get_auth(oauth_folder=get_config().get('oauth_folder', '~/.garth'))
+    
+    resumed = threading.Event()
+    result = {}
+    
+    def on_resume(success, client):
+        result['client'] = client if success else None
+        resumed.set()
+    
+    auth.resume(on_resume)
+    
+    if not resumed.wait(RESUME_TIMEOUT) or not result.get('client'):
+        raise RuntimeError("Sessione di Garmin Connect non disponibile: "
+                           "accedi una volta dall'interfaccia grafica")
+    return result['client']
+
+
+def workout_date(workout: 'Workout') -> Optional[str]:
+    """
+    Restituisce la data di un allenamento.
+    
+    Args:
+        workout: Allenamento
+    
+    Returns:
+        Data nel formato YYYY-MM-DD o None
+    """
+    for step in workout.workout_steps:
+        if getattr(step, 'date', None):
+            return step.date
+    return None
+
+
+def parse_days(value: str) -> List[int]:
+    """
+    Converte l'elenco dei giorni preferiti di --days.
+    
+    Args:
+        value: Giorni separati da virgole, come numeri (0 = lunedì) o nomi (mon, tue, ...)
+    
+    Returns:
+        Lista dei giorni
+    
+    Raises:
+        argparse.ArgumentTypeError: Se un giorno non è valido
+    """
+    days = []
+    for part in value.split(','):
+        part = part.strip().lower()
+        if part.isdigit() and int(part) < 7:
+            days.append(int(part))
+        elif part[:3] in DAY_NAMES:
+            days.append(DAY_NAMES.index(part[:3]))
+        else:
+            raise argparse.ArgumentTypeError(f"Giorno non valido: {part}")
+    return sorted(set(days))
+
+
+def parse_month(value: str) -> Tuple[int, int]:
+    """
+    Converte un mese nel formato YYYY-MM.
+    
+    Args:
+        value: Mese
+    
+    Returns:
+        Tupla (anno, mese)
+    
+    Raises:
+        argparse.ArgumentTypeError: Se il formato non è valido
+    """
+    try:
+        date = datetime.datetime.strptime(value, '%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Mese non valido (atteso YYYY-MM): {value}")
+    return date.year, date.month
+
+
+# ----------------------------------------------------------------------
+# Comandi
+# ----------------------------------------------------------------------
+
+def cmd_import(args, reporter: ProgressReporter) -> int:
+    """Importa i piani nell'archivio locale usato dall'interfaccia grafica."""
+    from services.local_store import get_local_store
+    
+    workouts = load_workouts(args.sources, reporter, args.jobs)
+    
+    existing = [] if args.replace else load_store_workouts()
+    get_local_store().save_workouts(existing + workouts)
+    
+    return reporter.done(workouts=len(workouts), stored=len(existing) + len(workouts))
+
+
+def cmd_convert(args, reporter: ProgressReporter) -> int:
+    """Converte i piani in un altro formato."""
+    workouts = load_workouts(args.sources, reporter, args.jobs)
+    if not can_write(workouts, reporter):
+        return reporter.done(workouts=len(workouts), output=None)
+    
+    save_workouts(workouts, args.output, args.name_prefix, args.data_only)
+    
+    return reporter.done(workouts=len(workouts), output=args.output)
+
+
+def cmd_schedule(args, reporter: ProgressReporter) -> int:
+    """Assegna le date agli allenamenti a ritroso dalla data della gara."""
+    from services.local_store import get_local_store
+    from services.planning_service import PlanningService
+    
+    config = get_config()
+    race_day = args.race_day or config.get('planning.race_day')
+    preferred_days = args.days if args.days is not None else config.get('planning.preferred_days', [])
+    
+    if not race_day:
+        raise ValueError("Data della gara mancante: usa --race-day o imposta planning.race_day")
+    
+    workouts = load_store_workouts() if args.from_store else load_workouts(args.sources, reporter, args.jobs)
+    if not can_write(workouts, reporter):
+        return reporter.done(workouts=len(workouts), planned=0, output=None)
+    
+    planned = PlanningService.plan_workouts(workouts, race_day, preferred_days)
+    
+    for done, (name, date) in enumerate(planned.items(), start=1):
+        reporter.progress(done, len(planned), item=name, date=date)
+    
+    if args.output:
+        save_workouts(workouts, args.output, args.name_prefix, args.data_only)
+    else:
+        get_local_store().save_workouts(workouts)
+    
+    return reporter.done(workouts=len(workouts), planned=len(planned), output=args.output or 'store')
+
+
+def cmd_push(args, reporter: ProgressReporter) -> int:
+    """Carica gli allenamenti su Garmin Connect, pianificando quelli con una data."""
+    from services.garmin_service import GarminService
+    
+    workouts = load_store_workouts() if args.from_store else load_workouts(args.sources, reporter, args.jobs)
+    
+    if args.queue:
+        from services.local_store import get_local_store
+        
+        queued = get_local_store().queue_push(workouts)
+        return reporter.done(workouts=len(workouts), queued=queued)
+    
+    service = GarminService(connect())
+    
+    pushed = scheduled = 0
+    for done, (name, workout) in enumerate(workouts, start=1):
+        response = service.add_workout(workout)
+        workout_id = response.get('workoutId') if response else None
+        
+        if not workout_id:
+            reporter.error("Risposta non valida da Garmin Connect", item=name)
+            continue
+        pushed += 1
+        
+        date = workout_date(workout) if args.schedule else None
+        if date:
+            if service.schedule_workout(workout_id, date):
+                scheduled += 1
+            else:
+                reporter.error(f"Impossibile pianificare per il {date}", item=name)
+        
+        reporter.progress(done, len(workouts), item=name, workout_id=workout_id, date=date)
+    
+    return reporter.done(workouts=len(workouts), pushed=pushed, scheduled=scheduled)
+
+
+def cmd_pull(args, reporter: ProgressReporter) -> int:
+    """Scarica gli allenamenti da Garmin Connect in un file."""
+    from services.garmin_service import GarminService
+    
+    service = GarminService(connect())
+    summaries = service.get_workouts()
+    
+    workouts = []
+    for done, summary in enumerate(summaries, start=1):
+        name = summary.get('workoutName', '')
+        data = service.get_workout(summary.get('workoutId'))
+        workout = service.import_workout(data) if data else None
+        
+        if workout is None:
+            reporter.error("Impossibile leggere l'allenamento", item=name)
+            continue
+        
+        workouts.append((name, workout))
+        reporter.progress(done, len(summaries), item=name, workout_id=summary.get('workoutId'))
+    
+    if not can_write(workouts, reporter):
+        return reporter.done(workouts=len(workouts), output=None)
+    
+    save_workouts(workouts, args.output, args.name_prefix, args.data_only)
+    
+    return reporter.done(workouts=len(workouts), output=args.output)
+
+
+def cmd_calendar_dump(args, reporter: ProgressReporter) -> int:
+    """Aggiorna i mesi del calendario nell'archivio locale e li scrive in JSON."""
+    from services.garmin_service import GarminService
+    from services.local_store import get_local_store
+    
+    year, month = args.start or (datetime.date.today().year, datetime.date.today().month)
+    service = GarminService(connect())
+    store = get_local_store()
+    
+    months = []
+    for done in range(1, args.months + 1):
+        label = f"{year}-{month:02d}"
+        calendar_month = service.get_calendar_month(year, month)
+        
+        if calendar_month is None:
+            reporter.error("Impossibile leggere il calendario", item=label)
+        else:
+            store.save_calendar_month(calendar_month)
+            months.append(calendar_month.to_dict())
+            reporter.progress(done, args.months, item=label,
+                              items=sum(len(day.items) for day in calendar_month.days.values()))
+        
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'months': months}, f, ensure_ascii=False, indent=2, default=str)
+    
+    return reporter.done(months=len(months), output=args.output or 'store')
+
+
+def cmd_workspace(args, reporter: ProgressReporter) -> int:
+    """Gestisce gli atleti dello spazio di lavoro ed esegue le operazioni in blocco."""
+    from workspace import get_workspace
+    from services.workspace_service import WorkspaceService
+    
+    workspace = get_workspace(args.root)
+    
+    def on_progress(done, total, result):
+        if result.ok:
+            value = result.value if isinstance(result.value, dict) else {'items': len(result.value or [])}
+            for message in value.get('errors', []):
+                reporter.error(message, item=result.athlete_id)
+            fields = {key: item for key, item in value.items() if key != 'errors'}
+            reporter.progress(done, total, item=result.athlete_id, seconds=round(result.elapsed, 3), **fields)
+        else:
+            reporter.error(result.error, item=result.athlete_id)
+    
+    try:
+        if args.action == 'list':
+            for athlete in workspace.athletes:
+                reporter.emit('athlete', id=athlete.id, name=athlete.name, session=athlete.has_session)
+            return reporter.done(athletes=len(workspace.athletes))
+        
+        if args.action == 'add':
+            athlete = workspace.add_athlete(args.name, args.id, get_config() if args.copy_config else None)
+            return reporter.done(id=athlete.id, directory=athlete.directory)
+        
+        if args.action == 'login':
+            import getpass
+            
+            athlete = workspace.get_athlete(args.id)
+            password = os.environ.get('GARMIN_PASSWORD') or getpass.getpass('Password: ')
+            athlete.login(args.username, password, prompt_mfa=lambda: input('Codice MFA: '))
+            return reporter.done(id=athlete.id)
+        
+        if args.action == 'push':
+            results = WorkspaceService.push_plan(workspace, args.plan, args.athletes, args.schedule,
+                                                 args.jobs, on_progress)
+        elif args.action == 'calendars':
+            start = args.start or (datetime.date.today().year, datetime.date.today().month)
+            results = WorkspaceService.refresh_calendars(workspace, start, args.months, args.athletes,
+                                                         args.jobs, on_progress)
+        else:
+            results = WorkspaceService.pull_activities(workspace, args.start_date, args.end_date,
+                                                       args.athletes, args.jobs, on_progress)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump({result.athlete_id: result.value for result in results if result.ok},
+                              f, ensure_ascii=False, indent=2, default=str)
+        
+        return reporter.done(athletes=len(results), failed=sum(1 for result in results if not result.ok))
+    
+    finally:
+        workspace.close()
+
+
+def cmd_sync(args, reporter: ProgressReporter) -> int:
+    """Esegue la sincronizzazione periodica con Garmin Connect fino all'interruzione."""
+    import signal
+    from services.local_store import get_local_store
+    from services.sync_scheduler import create_scheduler
+    
+    scheduler = create_scheduler(connect(), get_local_store(), args.jobs_names)
+    
+    def on_job(job, success):
+        next_run = datetime.datetime.fromtimestamp(job.next_run).isoformat(timespec='seconds')
+        if success:
+            reporter.emit('job', item=job.name, next_run=next_run, **job.last_result)
+        else:
+            reporter.error(job.last_error, item=job.name)
+            reporter.emit('job', item=job.name, next_run=next_run, failures=job.failures)
+    
+    scheduler.add_listener(on_job)
+    
+    if args.once:
+        for job in scheduler.jobs:
+            scheduler.run_now(job.name)
+        return reporter.done(jobs=len(scheduler.jobs))
+    
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    
+    scheduler.start()
+    try:
+        stopped.wait()
+    finally:
+        scheduler.stop()
+    
+    return reporter.done(jobs=len(scheduler.jobs))
+
+
+# Comandi disponibili: nome -> funzione
+COMMANDS = {
+    'import': cmd_import,
+    'convert': cmd_convert,
+    'schedule': cmd_schedule,
+    'push': cmd_push,
+    'pull': cmd_pull,
+    'calendar-dump': cmd_calendar_dump,
+    'workspace': cmd_workspace,
+    'sync': cmd_sync,
+}
+
+
+def add_commands(subparsers) -> None:
+    """
+    Aggiunge i comandi al parser degli argomenti.
+    
+    Args:
+        subparsers: Oggetto restituito da ArgumentParser.add_subparsers()
+    """
+    def add_sources(parser, required=True):
+        parser.add_argument('sources', nargs='+' if required else '*', metavar='SORGENTE',
+                            help='File di piani (.yaml, .xlsx, .jsonl), cartelle o pattern glob')
+        parser.add_argument('--jobs', type=int, default=None,
+                            help='Processi per importare più file (predefinito: numero di core)')
+    
+    def add_output_options(parser):
+        parser.add_argument('--name-prefix', default='', help='Prefisso dei nomi nei file YAML e JSON-lines')
+        parser.add_argument('--data-only', action='store_true',
+                            help='Esporta i file Excel solo con i dati, senza formattazione (più veloce)')
+    
+    parser = subparsers.add_parser('import', help="Importa i piani nell'archivio locale")
+    add_sources(parser)
+    parser.add_argument('--replace', action='store_true',
+                        help='Sostituisce gli allenamenti già importati invece di aggiungerli')
+    
+    parser = subparsers.add_parser('convert', help='Converte i piani in un altro formato')
+    add_sources(parser)
+    parser.add_argument('-o', '--output', required=True,
+                        help='File di destinazione (.yaml, .xlsx, .jsonl, .csv, .parquet)')
+    add_output_options(parser)
+    
+    parser = subparsers.add_parser('schedule', help='Assegna le date agli allenamenti W##D##')
+    add_sources(parser, required=False)
+    parser.add_argument('--from-store', action='store_true', help="Usa gli allenamenti dell'archivio locale")
+    parser.add_argument('--race-day', help='Data della gara YYYY-MM-DD (predefinita: planning.race_day)')
+    parser.add_argument('--days', type=parse_days, default=None,
+                        help='Giorni preferiti, es. "mon,wed,sat" o "0,2,5" (predefiniti: planning.preferred_days)')
+    parser.add_argument('-o', '--output', help="File di destinazione (predefinito: archivio locale)")
+    add_output_options(parser)
+    
+    parser = subparsers.add_parser('push', help='Carica gli allenamenti su Garmin Connect')
+    add_sources(parser, required=False)
+    parser.add_argument('--from-store', action='store_true', help="Usa gli allenamenti dell'archivio locale")
+    parser.add_argument('--schedule', action='store_true', help='Pianifica nel calendario gli allenamenti con una data')
+    parser.add_argument('--queue', action='store_true',
+                        help='Accoda gli allenamenti per la sincronizzazione in background invece di caricarli')
+    
+    parser = subparsers.add_parser('pull', help='Scarica gli allenamenti da Garmin Connect')
+    parser.add_argument('-o', '--output', required=True, help='File di destinazione (.yaml, .xlsx, .jsonl, .csv, .parquet)')
+    add_output_options(parser)
+    
+    parser = subparsers.add_parser('calendar-dump', help='Aggiorna e scrive il calendario di Garmin Connect')
+    parser.add_argument('--start', type=parse_month, default=None, help='Primo mese YYYY-MM (predefinito: mese corrente)')
+    parser.add_argument('--months', type=int, default=1, help='Numero di mesi')
+    parser.add_argument('-o', '--output', help='File JSON di destinazione')
+    
+    parser = subparsers.add_parser('workspace', help='Gestisce gli atleti di uno spazio di lavoro')
+    parser.add_argument('--root', default=None,
+                        help='Cartella dello spazio di lavoro (predefinita: paths.workspace)')
+    actions = parser.add_subparsers(dest='action', required=True)
+    
+    def add_batch(action):
+        action.add_argument('--athletes', type=lambda value: [item for item in value.split(',') if item],
+                            default=None, help='Atleti separati da virgola (predefiniti: tutti)')
+        action.add_argument('--jobs', type=int, default=None, help='Atleti elaborati contemporaneamente')
+    
+    actions.add_parser('list', help='Elenca gli atleti')
+    
+    action = actions.add_parser('add', help='Aggiunge un atleta')
+    action.add_argument('name', help="Nome dell'atleta")
+    action.add_argument('--id', default=None, help='Identificativo (predefinito: ricavato dal nome)')
+    action.add_argument('--copy-config', action='store_true', help='Parte dalla configurazione corrente')
+    
+    action = actions.add_parser('login', help="Accede a Garmin Connect per un atleta")
+    action.add_argument('id', help="Identificativo dell'atleta")
+    action.add_argument('--username', required=True, help='Email di Garmin Connect')
+    
+    action = actions.add_parser('push', help='Carica un piano su Garmin Connect per più atleti')
+    action.add_argument('plan', help='File del piano (.yaml, .xlsx, .jsonl)')
+    action.add_argument('--schedule', action='store_true', help='Pianifica nel calendario gli allenamenti con una data')
+    add_batch(action)
+    
+    action = actions.add_parser('calendars', help='Aggiorna il calendario di più atleti')
+    action.add_argument('--start', type=parse_month, default=None, help='Primo mese YYYY-MM (predefinito: mese corrente)')
+    action.add_argument('--months', type=int, default=1, help='Numero di mesi')
+    add_batch(action)
+    
+    action = actions.add_parser('activities', help='Scarica le attività di più atleti')
+    action.add_argument('--start-date', required=True, help='Data di inizio YYYY-MM-DD')
+    action.add_argument('--end-date', required=True, help='Data di fine YYYY-MM-DD')
+    action.add_argument('-o', '--output', help='File JSON di destinazione')
+    add_batch(action)
+    
+    parser = subparsers.add_parser('sync', help='Sincronizza periodicamente con Garmin Connect')
+    parser.add_argument('--once', action='store_true', help='Esegue ogni job una sola volta e termina')
+    parser.add_argument('--jobs', dest='jobs_names', default=None,
+                        type=lambda value: [item for item in value.split(',') if item],
+                        help='Job separati da virgola: calendar, activities, push (predefiniti: tutti)')
+
+
+def run(args) -> int:
+    """
+    Esegue il comando indicato negli argomenti.
+    
+    Args:
+        args: Argomenti analizzati, con 'command' e 'config'
+    
+    Returns:
+        Codice di uscita
+    """
+    reporter = ProgressReporter(args.command)
+    
+    if args.command in ('schedule', 'push') and not args.from_store and not args.sources:
+        reporter.error("Indica almeno una sorgente o --from-store")
+        return reporter.done()
+    
+    get_config(args.config)
+    reporter.emit('start')
+    
+    try:
+        return COMMANDS[args.command](args, reporter)
+    except Exception as e:
+        logging.error(f"Errore nel comando {args.command}: {str(e)}")
+        reporter.error(str(e))
+        return reporter.done()
@@ -6,10 +6,18 @@ Gestione della configurazione per l'applicazione GarminPlannerGUI.
 """
 
 import os
-import yaml
+import copy
+import atexit
 import logging
 import json
-from typing import Dict, Any, Optional
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Callable, Iterator
+
+import yaml_io
 
 # Configurazione predefinita
 DEFAULT_CONFIG = {
@@ -102,15 +110,86 @@ DEFAULT_CONFIG = {
         'language': 'it',
     },
     
+    # Sincronizzazione periodica con Garmin Connect (intervalli in secondi)
+    'sync': {
+        'enabled': True,
+        'workers': 2,
+        'calendar_interval': 900,
+        'calendar_months': 2,
+        'activities_interval': 1800,
+        'activities_days': 14,
+        'push_interval': 300,
+    },
+    
     # Percorsi dei file
     'paths': {
         'last_import_dir': '',
         'last_export_dir': '',
+        'local_store': 'garmin_planner.db',
+        'plan_cache': 'plan_cache',
+        'workspace': 'workspace',
     }
 }
 
+# Ritardo (in secondi) con cui i salvataggi ravvicinati vengono raggruppati
+SAVE_DELAY = 0.5
+
+# Valore sentinella per le chiavi assenti nella cache delle letture
+_MISSING = object()
+
+
+@lru_cache(maxsize=1024)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """
+    Divide una chiave nidificata nei suoi componenti (con cache).
+    
+    Args:
+        key: Chiave nidificata con punto (es. 'sports.running.paces.Z1')
+    
+    Returns:
+        Tupla con i componenti della chiave
+    """
+    return tuple(key.split('.'))
+
+
+def _read_file_mode() -> int:
+    """
+    Legge la umask del processo e calcola i permessi dei nuovi file.
+    
+    Returns:
+        Permessi dei nuovi file (es. 0o644 con umask 022)
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Letti una sola volta all'importazione, nel thread principale: os.umask(0)
+# vale per tutto il processo e non va chiamata mentre altri thread creano file
+_FILE_MODE = _read_file_mode()
+
+
+def default_file_mode() -> int:
+    """
+    Restituisce i permessi dei nuovi file secondo la umask del processo.
+    
+    I file temporanei di tempfile.mkstemp() nascono con permessi 0600: prima di
+    rinominarli al posto del file definitivo vanno riportati a questo valore.
+    
+    Returns:
+        Permessi dei nuovi file (es. 0o644 con umask 022)
+    """
+    return _FILE_MODE
+
+
 class Config:
-    """Classe per gestire la configurazione dell'applicazione."""
+    """
+    Classe per gestire la configurazione dell'applicazione.
+    
+    Ogni modifica produce una nuova istantanea (copy-on-write lungo il percorso
+    della chiave) con un numero di versione crescente: le letture non richiedono
+    lock e possono avvenire da qualsiasi thread.
+    """
     
     def __init__(self, config_path: str = 'config.yaml'):
         """
@@ -120,8 +199,67 @@ class Config:
             config_path: Percorso del file di configurazione.
         """
         self.config_path = os.path.expanduser(config_path)
-        self.config = DEFAULT_CONFIG.copy()
-        self.load()
+        
+        # Lock per le scritture e sottoscrittori delle modifiche
+        self._lock = threading.RLock()
+        self._subscribers = []
+        
+        # Istantanea corrente: (versione, configurazione, cache delle letture)
+        self._snapshot = (0, copy.deepcopy(DEFAULT_CONFIG), {})
+        self._json_cache = (-1, None)
+        
+        # Salvataggio differito: save() pianifica, flush() scrive
+        self.persistence_enabled = True
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._saved_version = -1
+        
+        if self.load():
+            self._saved_version = self.version
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Dizionario della configurazione corrente (da non modificare direttamente)."""
+        return self._snapshot[1]
+    
+    @property
+    def version(self) -> int:
+        """Versione corrente della configurazione, incrementata a ogni modifica."""
+        return self._snapshot[0]
+    
+    def snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        Restituisce un'istantanea coerente della configurazione.
+        
+        Returns:
+            Tupla (versione, configurazione)
+        """
+        version, config, _ = self._snapshot
+        return version, config
+    
+    def subscribe(self, callback: Callable[[Optional[str], int], None], prefix: Optional[str] = None) -> None:
+        """
+        Registra una funzione da chiamare a ogni modifica della configurazione.
+        
+        La funzione riceve la chiave modificata (None se è cambiata l'intera
+        configurazione) e la nuova versione.
+        
+        Args:
+            callback: Funzione da chiamare
+            prefix: Se specificato, notifica solo le modifiche che riguardano questa chiave
+        """
+        with self._lock:
+            self._subscribers.append((callback, prefix))
+    
+    def unsubscribe(self, callback: Callable[[Optional[str], int], None]) -> None:
+        """
+        Rimuove una funzione registrata con subscribe.
+        
+        Args:
+            callback: Funzione da rimuovere
+        """
+        with self._lock:
+            self._subscribers = [(cb, prefix) for cb, prefix in self._subscribers if cb != callback]
     
     def load(self) -> bool:
         """
@@ -133,42 +271,98 @@ class Config:
         try:
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    loaded_config = yaml.safe_load(f)
+                    loaded_config = yaml_io.load(f)
                 
                 if loaded_config:
                     # Aggiorna la configurazione mantenendo i valori predefiniti per le chiavi mancanti
-                    self._recursive_update(self.config, loaded_config)
+                    self._merge(loaded_config)
                 
                 logging.info(f"Configuration loaded from {self.config_path}")
                 return True
             else:
                 logging.info(f"Configuration file {self.config_path} not found, using defaults")
                 return False
-                
+        
         except Exception as e:
             logging.error(f"Error loading configuration: {e}")
             return False
     
     def save(self) -> bool:
         """
-        Salva la configurazione nel file.
+        Pianifica il salvataggio della configurazione nel file.
+        
+        Le richieste ravvicinate vengono raggruppate in un'unica scrittura,
+        eseguita dopo SAVE_DELAY secondi (o subito con flush()).
         
         Returns:
-            True se il salvataggio è riuscito, False altrimenti.
+            True se il salvataggio è stato pianificato (o la persistenza è disabilitata).
         """
-        try:
-            # Assicurati che la directory esista
-            os.makedirs(os.path.dirname(os.path.abspath(self.config_path)), exist_ok=True)
+        if not self.persistence_enabled:
+            return True
+        
+        with self._lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+        
+        return True
+    
+    def flush(self) -> bool:
+        """
+        Scrive subito su file le modifiche in attesa di salvataggio.
+        
+        La scrittura è atomica: il file viene scritto in un file temporaneo nella
+        stessa cartella e poi rinominato, così un'interruzione non lascia mai un
+        file a metà.
+        
+        Returns:
+            True se il salvataggio è riuscito (o non era necessario), False altrimenti.
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        
+        if not self.persistence_enabled:
+            return True
+        
+        with self._save_lock:
+            version, config = self.snapshot()
             
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+            # Nessuna modifica dall'ultimo salvataggio
+            if version == self._saved_version and os.path.exists(self.config_path):
+                return True
             
-            logging.info(f"Configuration saved to {self.config_path}")
-            return True
+            tmp_path = None
+            try:
+                # Assicurati che la directory esista
+                directory = os.path.dirname(os.path.abspath(self.config_path))
+                os.makedirs(directory, exist_ok=True)
+                
+                fd, tmp_path = tempfile.mkstemp(prefix='.config-', suffix='.tmp', dir=directory)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    yaml_io.dump(config, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                
+                # Mantieni i permessi del file esistente (mkstemp crea file 0600)
+                if os.path.exists(self.config_path):
+                    shutil.copymode(self.config_path, tmp_path)
+                else:
+                    os.chmod(tmp_path, default_file_mode())
+                
+                os.replace(tmp_path, self.config_path)
+                self._saved_version = version
+                
+                logging.info(f"Configuration saved to {self.config_path}")
+                return True
             
-        except Exception as e:
-            logging.error(f"Error saving configuration: {e}")
-            return False
+            except Exception as e:
+                logging.error(f"Error saving configuration: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return False
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -177,19 +371,24 @@ class Config:
         Args:
             key: Chiave del valore da ottenere (può essere nidificata con punto, es. 'sports.running.paces.Z1')
             default: Valore predefinito se la chiave non esiste
-            
+        
         Returns:
             Il valore della configurazione o il valore predefinito
         """
-        parts = key.split('.')
-        value = self.config
+        # La cache appartiene all'istantanea: una modifica la sostituisce interamente
+        _, config, cache = self._snapshot
         
-        try:
-            for part in parts:
-                value = value[part]
-            return value
-        except (KeyError, TypeError):
-            return default
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = config
+            try:
+                for part in _split_key(key):
+                    value = value[part]
+            except (KeyError, TypeError):
+                value = _MISSING
+            cache[key] = value
+        
+        return default if value is _MISSING else value
     
     def set(self, key: str, value: Any) -> None:
         """
@@ -199,17 +398,113 @@ class Config:
             key: Chiave del valore da impostare (può essere nidificata con punto)
             value: Valore da impostare
         """
-        parts = key.split('.')
-        config = self.config
+        def assign(node: Dict, last_key: str) -> None:
+            node[last_key] = value
+        
+        self._update(key, assign)
+    
+    def delete(self, key: str) -> bool:
+        """
+        Rimuove un valore dalla configurazione.
+        
+        Args:
+            key: Chiave del valore da rimuovere (può essere nidificata con punto)
+        
+        Returns:
+            True se la chiave esisteva, False altrimenti
+        """
+        if self.get(key, _MISSING) is _MISSING:
+            return False
+        
+        def remove(node: Dict, last_key: str) -> None:
+            node.pop(last_key, None)
+        
+        self._update(key, remove)
+        return True
+    
+    def _update(self, key: str, update: Callable[[Dict, str], None]) -> int:
+        """
+        Applica una modifica copiando solo i dizionari lungo il percorso della chiave.
+        
+        Args:
+            key: Chiave da modificare
+            update: Funzione che riceve il dizionario genitore e l'ultima parte della chiave
+        
+        Returns:
+            Nuova versione della configurazione
+        """
+        parts = _split_key(key)
         
-        # Naviga fino all'ultimo elemento
-        for part in parts[:-1]:
-            if part not in config:
-                config[part] = {}
-            config = config[part]
+        with self._lock:
+            root = dict(self.config)
+            node = root
+            
+            # Copia i livelli intermedi (creandoli se non esistono)
+            for part in parts[:-1]:
+                child = node.get(part)
+                child = dict(child) if isinstance(child, dict) else {}
+                node[part] = child
+                node = child
+            
+            update(node, parts[-1])
+            version = self._commit(root)
+        
+        self._notify(key, version)
+        return version
+    
+    def _merge(self, update_dict: Dict) -> int:
+        """
+        Unisce ricorsivamente un dizionario alla configurazione corrente.
+        
+        Args:
+            update_dict: Dizionario con i nuovi valori
+        
+        Returns:
+            Nuova versione della configurazione
+        """
+        with self._lock:
+            root = copy.deepcopy(self.config)
+            self._recursive_update(root, update_dict)
+            version = self._commit(root)
         
-        # Imposta il valore
-        config[parts[-1]] = value
+        self._notify(None, version)
+        return version
+    
+    def _commit(self, new_config: Dict[str, Any]) -> int:
+        """
+        Pubblica una nuova istantanea della configurazione (da chiamare con il lock).
+        
+        Args:
+            new_config: Nuova configurazione
+        
+        Returns:
+            Nuova versione
+        """
+        version = self._snapshot[0] + 1
+        self._snapshot = (version, new_config, {})
+        return version
+    
+    def _notify(self, key: Optional[str], version: int) -> None:
+        """
+        Notifica la modifica ai sottoscrittori interessati.
+        
+        Args:
+            key: Chiave modificata (None per l'intera configurazione)
+            version: Nuova versione
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        
+        for callback, prefix in subscribers:
+            # Notifica se la modifica riguarda il prefisso, o una sezione che lo contiene
+            if key is not None and prefix is not None:
+                if not (key == prefix or key.startswith(prefix + '.') or prefix.startswith(key + '.')):
+                    continue
+            
+            try:
+                callback(key, version)
+            except Exception as e:
+                logging.error(f"Error in configuration subscriber: {e}")
     
     def _recursive_update(self, base_dict: Dict, update_dict: Dict) -> None:
         """
@@ -232,7 +527,15 @@ class Config:
         Returns:
             Stringa JSON della configurazione
         """
-        return json.dumps(self.config, indent=2)
+        version, config = self.snapshot()
+        
+        # Riserializza solo se la configurazione è cambiata
+        cached_version, cached_json = self._json_cache
+        if cached_version != version:
+            cached_json = json.dumps(config, indent=2)
+            self._json_cache = (version, cached_json)
+        
+        return cached_json
     
     def from_json(self, json_str: str) -> bool:
         """
@@ -240,13 +543,13 @@ class Config:
         
         Args:
             json_str: Stringa JSON da caricare
-            
+        
         Returns:
             True se il caricamento è riuscito, False altrimenti
         """
         try:
             loaded_config = json.loads(json_str)
-            self._recursive_update(self.config, loaded_config)
+            self._merge(loaded_config)
             return True
         except Exception as e:
             logging.error(f"Error loading configuration from JSON: {e}")
@@ -258,7 +561,7 @@ class Config:
         
         Args:
             sport: Nome dello sport (running, cycling, swimming)
-            
+        
         Returns:
             Dizionario con le zone di passo
         """
@@ -281,7 +584,7 @@ class Config:
             Dizionario con i valori di potenza
         """
         return self.get('sports.cycling.power_values', {})
-
+    
     def replace_section(self, section_key: str, new_data: Dict) -> None:
         """
         Sostituisce completamente una sezione della configurazione con nuovi dati.
@@ -291,26 +594,11 @@ class Config:
             section_key: Chiave della sezione da sostituire (es. 'sports.running.paces')
             new_data: Nuovi dati con cui sostituire la sezione
         """
-        parts = section_key.split('.')
-        config = self.config
-        
-        # Naviga fino al penultimo livello
-        for part in parts[:-1]:
-            if part not in config:
-                config[part] = {}
-            config = config[part]
-        
-        # Sostituisci l'ultimo livello con i nuovi dati
-        last_key = parts[-1]
-        if last_key in config:
-            # Rimuovi completamente il vecchio dizionario
-            config[last_key] = {}
-        else:
-            # Crea un nuovo dizionario se non esiste
-            config[last_key] = {}
+        def replace(node: Dict, last_key: str) -> None:
+            # Rimuovi completamente il vecchio dizionario e aggiungi i nuovi dati
+            node[last_key] = dict(new_data)
         
-        # Aggiungi i nuovi dati
-        config[last_key].update(new_data)
+        self._update(section_key, replace)
         
         logging.info(f"Sezione '{section_key}' sostituita completamente con nuovi dati")
 
@@ -318,22 +606,59 @@ class Config:
 # Istanza singleton della configurazione
 _config_instance: Optional[Config] = None
 
+# Configurazione attiva nel thread corrente (vedi use_config)
+_thread_state = threading.local()
+
 def get_config(config_path: str = 'config.yaml') -> Config:
     """
     Ottiene l'istanza singleton della configurazione.
     
+    Se nel thread corrente è attiva una configurazione impostata con
+    use_config(), viene restituita quella.
+    
     Args:
         config_path: Percorso del file di configurazione
-        
+    
     Returns:
         Istanza della configurazione
     """
+    active = getattr(_thread_state, 'config', None)
+    if active is not None:
+        return active
+    
     global _config_instance
     if _config_instance is None:
         _config_instance = Config(config_path)
+        
+        # Scrivi i salvataggi in attesa all'uscita del processo
+        atexit.register(_config_instance.flush)
     return _config_instance
 
 def reset_config() -> None:
     """Reimposta l'istanza della configurazione."""
     global _config_instance
+    if _config_instance is not None:
+        _config_instance.flush()
+        atexit.unregister(_config_instance.flush)
     _config_instance = None
+
+@contextmanager
+def use_config(config: Config) -> Iterator[Config]:
+    """
+    Rende una configurazione quella restituita da get_config() nel thread corrente.
+    
+    Permette di usare i servizi con la configurazione di un atleta diverso da
+    quello dell'applicazione, anche da più thread contemporaneamente.
+    
+    Args:
+        config: Configurazione da attivare
+    
+    Yields:
+        La configurazione attivata
+    """
+    previous = getattr(_thread_state, 'config', None)
+    _thread_state.config = config
+    try:
+        yield config
+    finally:
+        _thread_state.config = previous
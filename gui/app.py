@@ -9,19 +9,33 @@ import os
 import logging
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 from config import get_config
 from auth import get_auth, GarminClient
+from services.local_store import get_local_store
+from services.sync_scheduler import SyncScheduler, create_scheduler
 from gui.styles import setup_styles
+from gui.dispatcher import get_dispatcher, reset_dispatcher
 from gui.login_frame import LoginFrame
 from gui.workout_editor import WorkoutEditorFrame
 from gui.calendar_view import CalendarFrame
+from gui.season_view import SeasonFrame
 from gui.zones_manager import ZonesManagerFrame
 from gui.import_export import ImportExportFrame
 from gui.utils import center_window
 
 
+# Schede costruite al primo utilizzo: attributo -> (classe del frame, titolo)
+LAZY_TABS = {
+    'workout_editor': (WorkoutEditorFrame, "Editor Allenamenti"),
+    'calendar_frame': (CalendarFrame, "Calendario"),
+    'season_view': (SeasonFrame, "Stagione"),
+    'zones_manager': (ZonesManagerFrame, "Zone"),
+    'import_export': (ImportExportFrame, "Importa/Esporta"),
+}
+
+
 class GarminPlannerApp:
     """Classe principale dell'applicazione GarminPlannerGUI."""
     
@@ -44,6 +58,22 @@ class GarminPlannerApp:
         oauth_folder = self.config.get('oauth_folder', '~/.garth')
         self.auth = get_auth(oauth_folder=oauth_folder)
         
+        # Client dell'ultimo login, notificato alle schede costruite in seguito
+        self.client = None
+        
+        # Sincronizzazione periodica con Garmin Connect, attiva durante il login
+        self.sync_scheduler: Optional[SyncScheduler] = None
+        
+        # Schede costruite al primo utilizzo (nome -> frame) e relativi contenitori
+        self._tab_frames = {}
+        self._tab_hosts = {}
+        
+        # Allenamenti importati, condivisi tra editor e importazione (caricati al primo accesso)
+        self._imported_workouts = None
+        
+        # Coda degli aggiornamenti dell'interfaccia richiesti dai thread in background
+        self.dispatcher = get_dispatcher(self.root)
+        
         # Imposta gli stili
         setup_styles(self.root, theme=self.config.get('ui.theme', 'light'))
         
@@ -86,21 +116,12 @@ class GarminPlannerApp:
         self.login_frame = LoginFrame(self.notebook, self.auth)
         self.notebook.add(self.login_frame, text="Login")
         
-        # Frame per l'editor di allenamenti
-        self.workout_editor = WorkoutEditorFrame(self.notebook, self)
-        self.notebook.add(self.workout_editor, text="Editor Allenamenti")
-        
-        # Frame per il calendario
-        self.calendar_frame = CalendarFrame(self.notebook, self)
-        self.notebook.add(self.calendar_frame, text="Calendario")
-        
-        # Frame per la gestione delle zone
-        self.zones_manager = ZonesManagerFrame(self.notebook, self)
-        self.notebook.add(self.zones_manager, text="Zone")
-        
-        # Frame per importazione/esportazione
-        self.import_export = ImportExportFrame(self.notebook, self)
-        self.notebook.add(self.import_export, text="Importa/Esporta")
+        # Editor, calendario, zone e importazione/esportazione: per ora solo
+        # un contenitore vuoto, il frame viene costruito alla prima selezione
+        for name, (_, title) in LAZY_TABS.items():
+            host = ttk.Frame(self.notebook)
+            self.notebook.add(host, text=title)
+            self._tab_hosts[name] = host
         
         # Aggiungi il menu
         self._create_menu()
@@ -108,6 +129,121 @@ class GarminPlannerApp:
         # Associa evento di cambio tab
         self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
     
+    @property
+    def workout_editor(self) -> WorkoutEditorFrame:
+        """Frame dell'editor di allenamenti (costruito al primo accesso)."""
+        return self.get_tab('workout_editor')
+    
+    @property
+    def calendar_frame(self) -> CalendarFrame:
+        """Frame del calendario (costruito al primo accesso)."""
+        return self.get_tab('calendar_frame')
+    
+    @property
+    def season_view(self) -> SeasonFrame:
+        """Frame della vista della stagione (costruito al primo accesso)."""
+        return self.get_tab('season_view')
+    
+    @property
+    def zones_manager(self) -> ZonesManagerFrame:
+        """Frame della gestione delle zone (costruito al primo accesso)."""
+        return self.get_tab('zones_manager')
+    
+    @property
+    def import_export(self) -> ImportExportFrame:
+        """Frame di importazione/esportazione (costruito al primo accesso)."""
+        return self.get_tab('import_export')
+    
+    def get_tab(self, name: str) -> ttk.Frame:
+        """
+        Restituisce il frame di una scheda, costruendolo se necessario.
+        
+        Args:
+            name: Nome della scheda (chiave di LAZY_TABS)
+            
+        Returns:
+            Frame della scheda
+        """
+        frame = self._tab_frames.get(name)
+        if frame is None:
+            frame = self._build_tab(name)
+        return frame
+    
+    def get_built_tab(self, name: str) -> Optional[ttk.Frame]:
+        """
+        Restituisce il frame di una scheda solo se è già stato costruito.
+        
+        Da usare per le notifiche tra schede, che non devono costruire
+        (e far caricare da Garmin Connect) una scheda mai aperta.
+        
+        Args:
+            name: Nome della scheda (chiave di LAZY_TABS)
+            
+        Returns:
+            Frame della scheda o None
+        """
+        return self._tab_frames.get(name)
+    
+    @property
+    def imported_workouts(self) -> List[Tuple[str, Any]]:
+        """
+        Allenamenti importati come tuple (nome, allenamento).
+        
+        La lista è condivisa dalle schede di editor e importazione e viene
+        caricata dall'archivio locale al primo accesso, senza costruire la
+        scheda di importazione.
+        """
+        if self._imported_workouts is None:
+            self._imported_workouts = get_local_store().load_workouts()
+        return self._imported_workouts
+    
+    def save_imported_workouts(self) -> None:
+        """Salva gli allenamenti importati nell'archivio locale."""
+        try:
+            get_local_store().save_workouts(self.imported_workouts)
+        except Exception as e:
+            logging.error(f"Errore nel salvataggio nell'archivio locale: {str(e)}")
+    
+    def select_tab(self, name: str) -> ttk.Frame:
+        """
+        Seleziona una scheda, costruendola se necessario.
+        
+        Args:
+            name: Nome della scheda (chiave di LAZY_TABS)
+            
+        Returns:
+            Frame della scheda
+        """
+        frame = self.get_tab(name)
+        self.notebook.select(self._tab_hosts[name])
+        return frame
+    
+    def _build_tab(self, name: str) -> ttk.Frame:
+        """
+        Costruisce il frame di una scheda nel suo contenitore.
+        
+        Se l'utente è già connesso il frame riceve subito la notifica di login
+        che avrebbe ricevuto se fosse esistito al momento dell'accesso.
+        
+        Args:
+            name: Nome della scheda (chiave di LAZY_TABS)
+            
+        Returns:
+            Frame costruito
+        """
+        frame_class, title = LAZY_TABS[name]
+        logging.debug(f"Costruzione della scheda '{title}'")
+        
+        frame = frame_class(self._tab_hosts[name], self)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self._tab_frames[name] = frame
+        
+        # Consegna la notifica di login arrivata prima della costruzione
+        if self.client and hasattr(frame, 'on_login'):
+            frame.on_login(self.client)
+        
+        return frame
+    
     def _create_menu(self) -> None:
         """Crea il menu dell'applicazione."""
         self.menu = tk.Menu(self.root)
@@ -118,6 +254,7 @@ class GarminPlannerApp:
         self.menu.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Importa YAML...", command=self._on_import_yaml)
         file_menu.add_command(label="Importa Excel...", command=self._on_import_excel)
+        file_menu.add_command(label="Importa cartella...", command=self._on_import_folder)
         file_menu.add_separator()
         file_menu.add_command(label="Esporta YAML...", command=self._on_export_yaml)
         file_menu.add_command(label="Esporta Excel...", command=self._on_export_excel)
@@ -154,33 +291,55 @@ class GarminPlannerApp:
         """
         Gestisce il cambio di stato dell'autenticazione.
         
+        Viene chiamato dal thread di autenticazione: il profilo dell'utente
+        viene letto qui, l'interfaccia viene aggiornata nel thread di Tk.
+        
         Args:
             is_authenticated: True se autenticato, False altrimenti
             client: Client Garmin o None
         """
+        profile = None
         if is_authenticated and client:
-            self.auth_status_var.set("Connesso a Garmin Connect")
-            
             # Ottieni informazioni sull'utente
             try:
                 profile = client.get_user_profile()
-                if profile and 'fullName' in profile:
-                    self.auth_status_var.set(f"Connesso come {profile['fullName']}")
-                    
-                    # Aggiorna il nome dell'atleta nella configurazione
-                    if self.config.get('athlete_name', '') == '':
-                        self.config.set('athlete_name', profile['fullName'])
-                        self.config.save()
             except Exception as e:
                 logging.error(f"Error getting user profile: {str(e)}")
+        
+        self.dispatcher.post(self._apply_auth_change, is_authenticated, client, profile)
+    
+    def _apply_auth_change(self, is_authenticated: bool, client: Optional[GarminClient],
+                           profile: Optional[Dict[str, Any]]) -> None:
+        """
+        Aggiorna l'interfaccia dopo un cambio di stato dell'autenticazione.
+        
+        Args:
+            is_authenticated: True se autenticato, False altrimenti
+            client: Client Garmin o None
+            profile: Profilo dell'utente o None
+        """
+        if is_authenticated and client:
+            self.auth_status_var.set("Connesso a Garmin Connect")
+            
+            if profile and 'fullName' in profile:
+                self.auth_status_var.set(f"Connesso come {profile['fullName']}")
+                
+                # Aggiorna il nome dell'atleta nella configurazione
+                if self.config.get('athlete_name', '') == '':
+                    self.config.set('athlete_name', profile['fullName'])
+                    self.config.save()
             
             # Abilita funzionalità che richiedono l'autenticazione
             self._enable_auth_features()
             
-            # Notifica i frame
-            self.workout_editor.on_login(client)
-            self.calendar_frame.on_login(client)
-            self.import_export.on_login(client)
+            # Notifica i frame già costruiti; gli altri riceveranno
+            # il client quando verranno aperti
+            self.client = client
+            for frame in list(self._tab_frames.values()):
+                if hasattr(frame, 'on_login'):
+                    frame.on_login(client)
+            
+            self._start_sync(client)
             
         else:
             self.auth_status_var.set("Non connesso")
@@ -188,10 +347,39 @@ class GarminPlannerApp:
             # Disabilita funzionalità che richiedono l'autenticazione
             self._disable_auth_features()
             
-            # Notifica i frame
-            self.workout_editor.on_logout()
-            self.calendar_frame.on_logout()
-            self.import_export.on_logout()
+            self._stop_sync()
+            
+            # Notifica i frame già costruiti
+            self.client = None
+            for frame in list(self._tab_frames.values()):
+                if hasattr(frame, 'on_logout'):
+                    frame.on_logout()
+    
+    def _start_sync(self, client: GarminClient) -> None:
+        """
+        Avvia la sincronizzazione periodica, così i dati sono già aggiornati
+        nell'archivio locale quando si apre una scheda.
+        
+        Args:
+            client: Client Garmin
+        """
+        self._stop_sync()
+        
+        if not self.config.get('sync.enabled', True):
+            return
+        
+        try:
+            self.sync_scheduler = create_scheduler(client, get_local_store())
+            self.sync_scheduler.start()
+        except Exception as e:
+            logging.error(f"Impossibile avviare la sincronizzazione in background: {str(e)}")
+            self.sync_scheduler = None
+    
+    def _stop_sync(self) -> None:
+        """Arresta la sincronizzazione periodica senza attendere i job in corso."""
+        if self.sync_scheduler is not None:
+            self.sync_scheduler.stop(wait=False)
+            self.sync_scheduler = None
     
     def _enable_auth_features(self) -> None:
         """Abilita le funzionalità che richiedono l'autenticazione."""
@@ -214,15 +402,25 @@ class GarminPlannerApp:
         # Aggiorna la barra di stato
         self.status_var.set(f"Sezione: {tab_text}")
         
-        # Notifica il frame attivo
+        # Notifica il frame attivo, costruendolo alla prima selezione
         frame = self.notebook.nametowidget(tab_id)
+        for name, host in self._tab_hosts.items():
+            if host is frame:
+                frame = self.get_tab(name)
+                break
+        
         if hasattr(frame, 'on_activate'):
             frame.on_activate()
     
     def _on_close(self) -> None:
         """Gestisce la chiusura dell'applicazione."""
-        # Salva la configurazione
-        self.config.save()
+        # Arresta la sincronizzazione e scrivi subito le modifiche alla
+        # configurazione ancora in attesa
+        self._stop_sync()
+        self.config.flush()
+        
+        # Scarta gli aggiornamenti dell'interfaccia ancora in coda
+        reset_dispatcher()
         
         # Chiudi l'applicazione
         self.root.destroy()
@@ -230,26 +428,27 @@ class GarminPlannerApp:
     def _on_import_yaml(self) -> None:
         """Importa allenamenti da file YAML."""
         # Passa la richiesta al frame ImportExport
-        self.notebook.select(self.import_export)
-        self.import_export.import_yaml()
+        self.select_tab('import_export').import_yaml()
     
     def _on_import_excel(self) -> None:
         """Importa allenamenti da file Excel."""
         # Passa la richiesta al frame ImportExport
-        self.notebook.select(self.import_export)
-        self.import_export.import_excel()
+        self.select_tab('import_export').import_excel()
+    
+    def _on_import_folder(self) -> None:
+        """Importa tutti i piani di una cartella."""
+        # Passa la richiesta al frame ImportExport
+        self.select_tab('import_export').import_folder()
     
     def _on_export_yaml(self) -> None:
         """Esporta allenamenti in file YAML."""
         # Passa la richiesta al frame ImportExport
-        self.notebook.select(self.import_export)
-        self.import_export.export_yaml()
+        self.select_tab('import_export').export_yaml()
     
     def _on_export_excel(self) -> None:
         """Esporta allenamenti in file Excel."""
         # Passa la richiesta al frame ImportExport
-        self.notebook.select(self.import_export)
-        self.import_export.export_excel()
+        self.select_tab('import_export').export_excel()
     
     def _on_theme_change(self) -> None:
         """Gestisce il cambio di tema."""
@@ -261,14 +460,12 @@ class GarminPlannerApp:
     def _on_new_workout(self) -> None:
         """Crea un nuovo allenamento."""
         # Passa la richiesta al frame WorkoutEditor
-        self.notebook.select(self.workout_editor)
-        self.workout_editor.new_workout()
+        self.select_tab('workout_editor').new_workout()
     
     def _on_schedule_workout(self) -> None:
         """Pianifica gli allenamenti."""
         # Passa la richiesta al frame WorkoutEditor
-        self.notebook.select(self.workout_editor)
-        self.workout_editor.schedule_workouts_dialog()
+        self.select_tab('workout_editor').schedule_workouts_dialog()
     
     def _on_sync_workouts(self) -> None:
         """Sincronizza gli allenamenti con Garmin Connect."""
@@ -279,8 +476,7 @@ class GarminPlannerApp:
             return
         
         # Passa la richiesta al frame WorkoutEditor
-        self.notebook.select(self.workout_editor)
-        self.workout_editor.sync_with_garmin()
+        self.select_tab('workout_editor').sync_with_garmin()
     
     def _on_help(self) -> None:
         """Mostra il manuale utente."""
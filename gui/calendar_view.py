@@ -9,20 +9,193 @@ import os
 import logging
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import time
 import calendar
 import datetime
-from typing import Dict, Any, List, Tuple, Optional, Union, Callable
+from typing import Dict, Any, List, Set, Tuple, Optional, Union, Callable
 
 from config import get_config
 from auth import GarminClient
 from models.calendar import Calendar, CalendarMonth, CalendarDay, CalendarItem
 from services.garmin_service import GarminService
+from services.local_store import get_local_store
 from gui.utils import (
     create_tooltip, show_error, show_info, show_warning, ask_yes_no, 
     is_valid_date, date_to_weekday, create_scrollable_frame
 )
 from gui.styles import get_color_for_sport, get_icon_for_sport
 from gui.dialogs.date_picker import DatePickerDialog
+from gui.dispatcher import get_dispatcher, RefreshRunner
+
+
+class DayCell:
+    """
+    Cella riutilizzabile della griglia del calendario.
+    
+    I widget vengono creati una sola volta; update() ne cambia testo e
+    stile, e le righe degli item in eccesso vengono nascoste e conservate
+    per i mesi successivi.
+    """
+    
+    # Settimane della griglia
+    ROWS = 6
+    
+    # Lunghezza massima del titolo di un item
+    MAX_TITLE = 40
+    
+    def __init__(self, parent: ttk.Frame, on_day_click: Callable[[str], None],
+                 on_item_click: Callable[[CalendarItem], None]):
+        """
+        Crea i widget della cella.
+        
+        Args:
+            parent: Widget genitore (contenuto del calendario)
+            on_day_click: Funzione chiamata con la data (YYYY-MM-DD) al clic sul giorno
+            on_item_click: Funzione chiamata con l'item al clic su un item
+        """
+        self.on_day_click = on_day_click
+        self.on_item_click = on_item_click
+        
+        self.date_str = None
+        self.items = []
+        
+        # Stato visualizzato, per evitare configure inutili
+        self._day_state = None
+        self._item_states = []
+        
+        # Righe degli item: (frame, label), quelle oltre len(items) sono nascoste
+        self._rows = []
+        self._visible_rows = 0
+        self._hidden = False
+        
+        # Frame per il giorno
+        self.frame = ttk.Frame(parent, style="Card.TFrame")
+        self.frame.rowconfigure(1, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+        
+        # Intestazione del giorno
+        self.header_frame = ttk.Frame(self.frame)
+        self.header_frame.grid(row=0, column=0, sticky="new")
+        
+        # Numero del giorno
+        self.day_label = ttk.Label(self.header_frame)
+        self.day_label.pack(side=tk.LEFT, padx=5)
+        
+        # Contenuto del giorno
+        self.content_frame = ttk.Frame(self.frame)
+        self.content_frame.grid(row=1, column=0, sticky="nsew", padx=2, pady=2)
+        
+        # Associa eventi per selezionare il giorno
+        for widget in (self.frame, self.header_frame, self.day_label, self.content_frame):
+            widget.bind("<Button-1>", self._on_day_click)
+    
+    def grid(self, row: int, column: int):
+        """
+        Posiziona la cella nella griglia.
+        
+        Args:
+            row: Riga (settimana)
+            column: Colonna (giorno della settimana)
+        """
+        self.frame.grid(row=row, column=column, padx=1, pady=1, sticky="nsew")
+    
+    def show(self):
+        """Mostra la cella nella posizione assegnata."""
+        if self._hidden:
+            self.frame.grid()
+            self._hidden = False
+    
+    def hide(self):
+        """Nasconde la cella conservandone la posizione."""
+        if not self._hidden:
+            self.frame.grid_remove()
+            self._hidden = True
+        self.date_str = None
+    
+    def update(self, date: datetime.date, is_today: bool, is_current_month: bool,
+               items: List[CalendarItem], theme: str = 'light'):
+        """
+        Aggiorna il contenuto della cella.
+        
+        Args:
+            date: Data del giorno
+            is_today: Se True il giorno è oggi
+            is_current_month: Se False il giorno appartiene a un mese adiacente
+            items: Item del giorno
+            theme: Tema dell'interfaccia, per i colori degli sport
+        """
+        self.date_str = date.strftime("%Y-%m-%d")
+        self.items = list(items)
+        
+        # Numero del giorno
+        day_state = (date.day, is_today, is_current_month)
+        if day_state != self._day_state:
+            self.day_label.configure(
+                text=str(date.day),
+                style="Today.TLabel" if is_today else "TLabel",
+                foreground="" if is_today or is_current_month else "#999999")
+            self._day_state = day_state
+        
+        # Righe degli item
+        for index, item in enumerate(self.items):
+            if index == len(self._rows):
+                self._create_row(index)
+            
+            item_state = (item.title, item.sport_type, theme)
+            if index >= len(self._item_states):
+                self._item_states.append(None)
+            
+            if item_state != self._item_states[index]:
+                title = item.title
+                if len(title) > self.MAX_TITLE:
+                    title = title[:self.MAX_TITLE - 2] + "..."
+                
+                _, label = self._rows[index]
+                label.configure(text=f"{get_icon_for_sport(item.sport_type)} {title}",
+                                foreground=get_color_for_sport(item.sport_type, theme))
+                self._item_states[index] = item_state
+        
+        # Mostra le righe necessarie e nasconde le altre, nell'ordine
+        for index in range(self._visible_rows, len(self.items)):
+            self._rows[index][0].pack(fill=tk.X, pady=1)
+        
+        for index in range(len(self.items), self._visible_rows):
+            self._rows[index][0].pack_forget()
+        
+        self._visible_rows = len(self.items)
+    
+    def _create_row(self, index: int):
+        """
+        Crea una nuova riga per gli item.
+        
+        Args:
+            index: Posizione della riga
+        """
+        item_frame = ttk.Frame(self.content_frame)
+        item_label = ttk.Label(item_frame)
+        item_label.pack(side=tk.LEFT, padx=2)
+        
+        # Associa eventi per selezionare l'item visualizzato nella riga
+        handler = lambda e, i=index: self._on_item_click(i)
+        item_frame.bind("<Button-1>", handler)
+        item_label.bind("<Button-1>", handler)
+        
+        self._rows.append((item_frame, item_label))
+    
+    def _on_day_click(self, event=None):
+        """Gestisce il clic sul giorno."""
+        if self.date_str:
+            self.on_day_click(self.date_str)
+    
+    def _on_item_click(self, index: int):
+        """
+        Gestisce il clic su un item.
+        
+        Args:
+            index: Posizione della riga
+        """
+        if index < len(self.items):
+            self.on_item_click(self.items[index])
 
 
 class CalendarFrame(ttk.Frame):
@@ -43,8 +216,15 @@ class CalendarFrame(ttk.Frame):
         self.garmin_client = None
         self.garmin_service = None
         
-        # Calendario
+        # Calendario e archivio locale
         self.calendar = Calendar()
+        self.store = get_local_store()
+        
+        # Mesi già scaricati da Garmin Connect in questa sessione
+        self.fetched_months: Set[Tuple[int, int]] = set()
+        
+        # Caricamenti da Garmin Connect in background (conta solo l'ultimo)
+        self.refresh_runner = RefreshRunner(get_dispatcher(self))
         
         # Data corrente
         self.current_date = datetime.date.today()
@@ -122,6 +302,16 @@ class CalendarFrame(ttk.Frame):
         self.calendar_content = ttk.Frame(calendar_frame)
         self.calendar_content.pack(fill=tk.BOTH, expand=True, pady=5)
         
+        # Griglia fissa di celle, riutilizzate a ogni cambio di mese
+        self.day_cells = []
+        for index in range(DayCell.ROWS * 7):
+            cell = DayCell(self.calendar_content, self.show_day_details, self.show_item_details)
+            cell.grid(index // 7, index % 7)
+            self.day_cells.append(cell)
+        
+        for i in range(7):
+            self.calendar_content.columnconfigure(i, weight=1)
+        
         # Frame per i dettagli
         details_frame = ttk.LabelFrame(main_frame, text="Dettagli")
         details_frame.pack(fill=tk.X, pady=(10, 0))
@@ -181,21 +371,32 @@ class CalendarFrame(ttk.Frame):
         year = self.current_date.year
         month = self.current_date.month
         
+        # Il mese scaricato per la pagina precedente non serve più
+        self.refresh_runner.cancel('calendar')
+        
         # Verifica se il mese è già caricato
         month_obj = self.calendar.get_month(year, month)
         
         if not month_obj:
-            # Se è disponibile il servizio Garmin, carica da Garmin Connect
-            if self.garmin_service:
-                month_obj = self.garmin_service.get_calendar_month(year, month)
-                
-                if month_obj:
-                    self.calendar.add_month(month_obj)
+            # Mostra subito la copia dell'archivio locale (nessuna chiamata di rete)
+            month_obj = self.store.load_calendar_month(year, month)
             
-            # Se non è disponibile o non è stato possibile caricare, crea un mese vuoto
-            if not month_obj:
+            if month_obj:
+                self.calendar.add_month(month_obj)
+            elif not self.garmin_service:
+                # Senza servizio Garmin crea un mese vuoto
                 month_obj = self.calendar.get_or_create_month(year, month)
         
+        # La copia locale può essere vecchia: scarica il mese in background se
+        # non è stato scaricato in questa sessione e la sincronizzazione non
+        # lo ha aggiornato di recente
+        if self.garmin_service and (year, month) not in self.fetched_months and not self.is_month_fresh():
+            self.fetch_month(year, month)
+        
+        if not month_obj:
+            # Intanto mostra un mese vuoto senza aggiungerlo al calendario
+            month_obj = CalendarMonth(year, month)
+        
         # Visualizza il calendario
         self.display_calendar(month_obj)
     
@@ -203,143 +404,48 @@ class CalendarFrame(ttk.Frame):
         """
         Visualizza il calendario del mese.
         
+        Le celle della griglia vengono aggiornate al loro posto: cambiare
+        mese costa solo qualche configure invece di ricreare i widget.
+        
         Args:
             month_obj: Mese da visualizzare
         """
-        # Pulisci il contenuto precedente
-        for widget in self.calendar_content.winfo_children():
-            widget.destroy()
-        
         # Determina il primo giorno della settimana (0 = lunedì, 6 = domenica)
         first_day_of_week = self.config.get('ui.calendar_first_day', 0)
         
         # Ottieni il primo giorno del mese
         first_day = datetime.date(month_obj.year, month_obj.month, 1)
         
-        # Calcola il giorno della settimana del primo giorno del mese (0 = lunedì, 6 = domenica)
-        first_weekday = first_day.weekday()
-        
         # Calcola quanti giorni includere dal mese precedente
-        days_from_prev_month = (first_weekday - first_day_of_week) % 7
+        days_from_prev_month = (first_day.weekday() - first_day_of_week) % 7
         
         # Calcola la data del primo giorno da visualizzare
         start_date = first_day - datetime.timedelta(days=days_from_prev_month)
         
-        # Calcola l'ultimo giorno del mese
-        last_day = datetime.date(month_obj.year, month_obj.month, 
-                                calendar.monthrange(month_obj.year, month_obj.month)[1])
-        
-        # Calcola il giorno della settimana dell'ultimo giorno
-        last_weekday = last_day.weekday()
-        
-        # Calcola quanti giorni includere dal mese successivo
-        days_from_next_month = (6 - last_weekday + first_day_of_week) % 7
-        
-        # Calcola la data dell'ultimo giorno da visualizzare
-        end_date = last_day + datetime.timedelta(days=days_from_next_month)
+        # Numero di settimane da visualizzare (4-6)
+        days_in_month = calendar.monthrange(month_obj.year, month_obj.month)[1]
+        weeks = (days_from_prev_month + days_in_month + 6) // 7
         
-        # Crea la griglia del calendario
-        current_date = start_date
-        row = 0
-        col = 0
+        today = datetime.date.today()
+        theme = self.config.get('ui.theme', 'light')
         
-        while current_date <= end_date:
-            # Crea il frame per il giorno
-            day_frame = ttk.Frame(self.calendar_content, style="Card.TFrame")
-            day_frame.grid(row=row, column=col, padx=1, pady=1, sticky="nsew")
+        for index, cell in enumerate(self.day_cells):
+            if index >= weeks * 7:
+                cell.hide()
+                continue
             
-            # Configura il frame per espandersi
-            day_frame.rowconfigure(1, weight=1)
-            day_frame.columnconfigure(0, weight=1)
-            
-            # Formatta la data come stringa
+            current_date = start_date + datetime.timedelta(days=index)
             date_str = current_date.strftime("%Y-%m-%d")
-            
-            # Ottieni il giorno dal calendario
             day_obj = month_obj.get_day(date_str)
             
-            # Intestazione del giorno
-            header_frame = ttk.Frame(day_frame)
-            header_frame.grid(row=0, column=0, sticky="new")
-            
-            # Verifica se è il giorno corrente
-            is_today = current_date == datetime.date.today()
-            
-            # Verifica se è nel mese corrente
-            is_current_month = current_date.month == month_obj.month
-            
-            # Stile per il numero del giorno
-            day_style = "Today.TLabel" if is_today else "TLabel"
-            day_fg = None if is_today else "#999999" if not is_current_month else None
-            
-            # Numero del giorno
-            day_label = ttk.Label(header_frame, text=str(current_date.day), 
-                                style=day_style, foreground=day_fg)
-            day_label.pack(side=tk.LEFT, padx=5)
-            
-            # Contenuto del giorno
-            content_frame = ttk.Frame(day_frame)
-            content_frame.grid(row=1, column=0, sticky="nsew", padx=2, pady=2)
-            
-            # Aggiungi gli item del giorno
-            if day_obj:
-                for item in day_obj.items:
-                    self.create_day_item(content_frame, item)
-            
-            # Associa eventi per selezionare il giorno
-            day_frame.bind("<Button-1>", lambda e, d=date_str: self.show_day_details(d))
-            header_frame.bind("<Button-1>", lambda e, d=date_str: self.show_day_details(d))
-            content_frame.bind("<Button-1>", lambda e, d=date_str: self.show_day_details(d))
-            
-            # Passa al giorno successivo
-            current_date += datetime.timedelta(days=1)
-            
-            # Incrementa la colonna
-            col += 1
-            
-            # Se abbiamo completato una settimana, passa alla riga successiva
-            if col > 6:
-                col = 0
-                row += 1
-        
-        # Configura le righe e colonne per espandersi uniformemente
-        for i in range(7):
-            self.calendar_content.columnconfigure(i, weight=1)
-        
-        for i in range(row + 1):
-            self.calendar_content.rowconfigure(i, weight=1)
-    
-    def create_day_item(self, parent: ttk.Frame, item: CalendarItem):
-        """
-        Crea un widget per un item del giorno.
-        
-        Args:
-            parent: Widget genitore
-            item: Item da visualizzare
-        """
-        # Frame per l'item
-        item_frame = ttk.Frame(parent)
-        item_frame.pack(fill=tk.X, pady=1)
-        
-        # Colore in base al tipo di sport
-        sport_color = get_color_for_sport(item.sport_type, self.config.get('ui.theme', 'light'))
-        
-        # Icona in base al tipo di sport
-        sport_icon = get_icon_for_sport(item.sport_type)
-        
-        # Titolo dell'item
-        title = item.title
-        if len(title) > 40:  # Aumenta da 20 a 40 o altro valore
-            title = title[:38] + "..."  # Aumenta da 18 a 38
-        
-        # Label con l'icona e il titolo
-        item_label = ttk.Label(item_frame, text=f"{sport_icon} {title}", 
-                              foreground=sport_color)
-        item_label.pack(side=tk.LEFT, padx=2)
-        
-        # Associa eventi per selezionare l'item
-        item_frame.bind("<Button-1>", lambda e, i=item: self.show_item_details(i))
-        item_label.bind("<Button-1>", lambda e, i=item: self.show_item_details(i))
+            cell.update(current_date, current_date == today,
+                        current_date.month == month_obj.month,
+                        day_obj.items if day_obj else [], theme)
+            cell.show()
+        
+        # Le righe nascoste non devono occupare spazio
+        for row in range(DayCell.ROWS):
+            self.calendar_content.rowconfigure(row, weight=1 if row < weeks else 0)
     
     def show_day_details(self, date_str: str):
         """
@@ -823,7 +929,7 @@ class CalendarFrame(ttk.Frame):
             
             # Aggiorna il calendario
             self.refresh_calendar()
-            
+        
         except Exception as e:
             logging.error(f"Errore nell'annullamento della pianificazione: {str(e)}")
             show_error("Errore", 
@@ -849,15 +955,12 @@ class CalendarFrame(ttk.Frame):
         
         # Passa all'editor di allenamenti
         try:
-            # Trova l'editor di allenamenti nel controller
-            workout_editor = self.controller.workout_editor
-            
-            # Seleziona la scheda dell'editor
-            self.controller.notebook.select(workout_editor)
+            # Seleziona la scheda dell'editor (costruendola se necessario)
+            workout_editor = self.controller.select_tab('workout_editor')
             
             # Carica l'allenamento
             workout_editor.load_workout_by_id(item.source_id)
-            
+        
         except Exception as e:
             logging.error(f"Errore nell'apertura dell'editor di allenamenti: {str(e)}")
             show_error("Errore", 
@@ -865,7 +968,7 @@ class CalendarFrame(ttk.Frame):
                      parent=self)
     
     def refresh_calendar(self):
-        """Aggiorna il calendario."""
+        """Aggiorna il calendario in background, mostrando intanto i dati già disponibili."""
         # Verifica che il client Garmin sia disponibile
         if not self.garmin_client:
             show_error("Errore", "Devi prima effettuare il login a Garmin Connect", parent=self)
@@ -875,14 +978,48 @@ class CalendarFrame(ttk.Frame):
         year = self.current_date.year
         month = self.current_date.month
         
-        try:
-            # Ottieni il mese dal servizio Garmin
-            month_obj = self.garmin_service.get_calendar_month(year, month)
-            
+        # Mostra subito la copia dell'archivio locale, se il mese non è già visualizzato
+        if not self.calendar.get_month(year, month):
+            cached = self.store.load_calendar_month(year, month)
+            if cached:
+                self.calendar.add_month(cached)
+                self.display_calendar(cached)
+        
+        self.fetch_month(year, month, show_errors=True)
+    
+    def fetch_month(self, year: int, month: int, show_errors: bool = False):
+        """
+        Scarica un mese da Garmin Connect in background.
+        
+        Il mese scaricato viene salvato nell'archivio locale e visualizzato
+        solo se è ancora quello selezionato; una nuova richiesta (es. il
+        passaggio a un altro mese) rende superata quella in corso.
+        
+        Args:
+            year: Anno
+            month: Mese (1-12)
+            show_errors: Se True mostra un messaggio in caso di errore
+        """
+        service = self.garmin_service
+        store = self.store
+        
+        def fetch():
+            month_obj = service.get_calendar_month(year, month)
             if month_obj:
-                # Aggiungi al calendario
-                self.calendar.add_month(month_obj)
-                
+                store.save_calendar_month(month_obj)
+            return month_obj
+        
+        def on_result(month_obj):
+            if not month_obj:
+                self.controller.set_status("Impossibile ottenere i dati del calendario")
+                if show_errors:
+                    show_error("Errore", "Impossibile ottenere i dati del calendario", parent=self)
+                return
+            
+            self.calendar.add_month(month_obj)
+            self.fetched_months.add((year, month))
+            
+            if (self.current_date.year, self.current_date.month) == (year, month):
                 # Visualizza il calendario
                 self.display_calendar(month_obj)
                 
@@ -891,17 +1028,20 @@ class CalendarFrame(ttk.Frame):
                     widget.destroy()
                 
                 ttk.Label(self.details_content, text="Seleziona un giorno per vedere i dettagli").pack(pady=10)
-                
-                # Aggiorna la barra di stato
-                self.controller.set_status(f"Calendario aggiornato: {month_obj.month}/{month_obj.year}")
-            else:
-                show_error("Errore", "Impossibile ottenere i dati del calendario", parent=self)
             
-        except Exception as e:
-            logging.error(f"Errore nell'aggiornamento del calendario: {str(e)}")
-            show_error("Errore", 
-                     f"Impossibile aggiornare il calendario: {str(e)}", 
-                     parent=self)
+            # Aggiorna la barra di stato
+            self.controller.set_status(f"Calendario aggiornato: {month_obj.month}/{month_obj.year}")
+        
+        def on_error(error):
+            logging.error(f"Errore nell'aggiornamento del calendario: {str(error)}")
+            self.controller.set_status("Errore nell'aggiornamento del calendario")
+            if show_errors:
+                show_error("Errore", 
+                         f"Impossibile aggiornare il calendario: {str(error)}", 
+                         parent=self)
+        
+        self.controller.set_status(f"Aggiornamento del calendario {month}/{year}...")
+        self.refresh_runner.submit('calendar', fetch, on_result, on_error)
     
     def on_login(self, client: GarminClient):
         """
@@ -924,19 +1064,54 @@ class CalendarFrame(ttk.Frame):
         self.garmin_client = None
         self.garmin_service = None
         
+        # Scarta i caricamenti ancora in corso
+        self.refresh_runner.cancel('calendar')
+        
         # Disabilita i pulsanti
         self.refresh_button.config(state="disabled")
         
         # Pulisci il calendario
         self.calendar = Calendar()
+        self.fetched_months.clear()
         
         # Carica il mese corrente (vuoto)
         self.load_current_month()
     
+    def is_month_fresh(self) -> bool:
+        """
+        Verifica se il mese visualizzato è stato sincronizzato di recente.
+        
+        Con la sincronizzazione in background attiva l'archivio locale viene
+        aggiornato ogni 'sync.calendar_interval' secondi.
+        
+        Returns:
+            True se il mese nell'archivio locale è ancora aggiornato
+        """
+        config = get_config()
+        if not config.get('sync.enabled', True):
+            return False
+        
+        synced_at = self.store.calendar_synced_at(self.current_date.year, self.current_date.month)
+        return synced_at is not None and time.time() - synced_at < config.get('sync.calendar_interval', 900)
+    
+    def reload_from_store(self):
+        """Ricarica il mese visualizzato dall'archivio locale."""
+        month_obj = self.store.load_calendar_month(self.current_date.year, self.current_date.month)
+        
+        if month_obj:
+            self.calendar.add_month(month_obj)
+            self.update_month_title()
+            self.display_calendar(month_obj)
+        else:
+            self.load_current_month()
+    
     def on_activate(self):
         """Chiamato quando il frame viene attivato."""
-        # Aggiorna il calendario solo se è disponibile il client Garmin
-        if self.garmin_client:
+        # Aggiorna il calendario solo se è disponibile il client Garmin e
+        # la sincronizzazione in background non lo ha già fatto
+        if self.garmin_client and self.is_month_fresh():
+            self.reload_from_store()
+        elif self.garmin_client:
             self.refresh_calendar()
         else:
             # Carica comunque il mese corrente (vuoto)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Coda per aggiornare l'interfaccia Tk dai thread in background.
+
+Tk non è thread-safe: i thread di lavoro non devono toccare widget o
+variabili Tk. Le richieste vengono accodate con post() (o post_progress()
+per l'avanzamento) ed eseguite nel thread di Tk da un unico ciclo after().
+Gli aggiornamenti di avanzamento con la stessa chiave vengono accorpati:
+a ogni ciclo viene applicato solo l'ultimo.
+
+RefreshRunner esegue i caricamenti di rete in background: di ogni
+caricamento conta solo l'ultima richiesta, i risultati delle precedenti
+vengono scartati.
+"""
+
+import time
+import logging
+import threading
+import collections
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Optional
+
+
+# Intervallo del ciclo di svuotamento della coda (millisecondi)
+POLL_INTERVAL_MS = 30
+
+# Tempo massimo (secondi) dedicato alla coda in ogni ciclo, per non bloccare l'interfaccia
+DRAIN_BUDGET = 0.05
+
+# Thread per i caricamenti in background
+REFRESH_WORKERS = 4
+
+
+class UIDispatcher:
+    """Esegue nel thread di Tk le richieste accodate da qualsiasi thread."""
+    
+    def __init__(self, root: tk.Misc, interval: int = POLL_INTERVAL_MS):
+        """
+        Inizializza il dispatcher.
+        
+        Args:
+            root: Finestra principale Tk
+            interval: Intervallo del ciclo di svuotamento (millisecondi)
+        """
+        self.root = root
+        self.interval = interval
+        
+        # deque.append e popleft sono atomici, non serve un lock per la coda
+        self._queue = collections.deque()
+        
+        # Ultimo aggiornamento di avanzamento per ogni chiave
+        self._progress = {}
+        self._progress_lock = threading.Lock()
+        
+        self._after_id = None
+        self._executor = None
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Pool di thread per i caricamenti in background (creato al primo utilizzo)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS,
+                                                thread_name_prefix='refresh')
+        return self._executor
+    
+    @property
+    def is_running(self) -> bool:
+        """True se il ciclo di svuotamento è attivo."""
+        return self._after_id is not None
+    
+    def start(self) -> None:
+        """Avvia il ciclo di svuotamento (da chiamare nel thread di Tk)."""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval, self._poll)
+    
+    def stop(self) -> None:
+        """Arresta il ciclo di svuotamento; le richieste in coda vengono scartate."""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        
+        self._queue.clear()
+        with self._progress_lock:
+            self._progress.clear()
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def post(self, func: Callable, *args, **kwargs) -> None:
+        """
+        Accoda una funzione da eseguire nel thread di Tk.
+        
+        Le funzioni vengono eseguite nell'ordine in cui sono state accodate.
+        
+        Args:
+            func: Funzione da eseguire
+            *args: Argomenti posizionali
+            **kwargs: Argomenti nominali
+        """
+        self._queue.append((func, args, kwargs))
+    
+    def post_progress(self, key: Any, func: Callable, *args, **kwargs) -> None:
+        """
+        Accoda un aggiornamento di avanzamento, sostituendo quello non ancora
+        applicato con la stessa chiave.
+        
+        Gli aggiornamenti di avanzamento in attesa vengono applicati prima
+        delle funzioni accodate con post(), così la chiusura di una finestra
+        di avanzamento non viene seguita da un aggiornamento ormai superato.
+        
+        Args:
+            key: Chiave dell'operazione (es. la finestra di avanzamento)
+            func: Funzione da eseguire
+            *args: Argomenti posizionali
+            **kwargs: Argomenti nominali
+        """
+        with self._progress_lock:
+            self._progress[key] = (func, args, kwargs)
+    
+    def wrap(self, func: Callable) -> Callable:
+        """
+        Crea una funzione che, chiamata da qualsiasi thread, accoda func.
+        
+        Utile per i callback invocati dai thread di lavoro.
+        
+        Args:
+            func: Funzione da eseguire nel thread di Tk
+        
+        Returns:
+            Funzione che accoda la chiamata
+        """
+        def dispatched(*args, **kwargs):
+            self.post(func, *args, **kwargs)
+        return dispatched
+    
+    def drain(self) -> int:
+        """
+        Esegue gli aggiornamenti e le funzioni in coda (nel thread di Tk).
+        
+        Returns:
+            Numero di funzioni eseguite
+        """
+        with self._progress_lock:
+            progress, self._progress = self._progress, {}
+        
+        executed = 0
+        for func, args, kwargs in progress.values():
+            self._call(func, args, kwargs)
+            executed += 1
+        
+        # Le funzioni rimaste oltre il tempo massimo attendono il ciclo successivo
+        deadline = time.perf_counter() + DRAIN_BUDGET
+        while self._queue and time.perf_counter() < deadline:
+            func, args, kwargs = self._queue.popleft()
+            self._call(func, args, kwargs)
+            executed += 1
+        
+        return executed
+    
+    def _call(self, func: Callable, args: tuple, kwargs: dict) -> None:
+        """
+        Esegue una funzione accodata, registrando gli errori senza interrompere il ciclo.
+        
+        Args:
+            func: Funzione da eseguire
+            args: Argomenti posizionali
+            kwargs: Argomenti nominali
+        """
+        try:
+            func(*args, **kwargs)
+        except tk.TclError as e:
+            # Tipicamente un widget distrutto prima dell'aggiornamento
+            logging.debug(f"Aggiornamento dell'interfaccia ignorato: {str(e)}")
+        except Exception as e:
+            logging.error(f"Errore nell'aggiornamento dell'interfaccia: {str(e)}")
+    
+    def _poll(self) -> None:
+        """Ciclo di svuotamento della coda."""
+        self.drain()
+        
+        try:
+            self._after_id = self.root.after(self.interval, self._poll)
+        except tk.TclError:
+            # Finestra principale distrutta
+            self._after_id = None
+
+
+class RefreshRunner:
+    """
+    Esegue caricamenti in background di cui conta solo l'ultima richiesta.
+    
+    Ogni richiesta riceve un numero di generazione per la sua chiave: una
+    nuova richiesta (o cancel()) rende superate le precedenti, che vengono
+    annullate se non ancora avviate e i cui risultati vengono comunque
+    scartati. I risultati validi vengono applicati nel thread di Tk.
+    """
+    
+    def __init__(self, dispatcher: UIDispatcher):
+        """
+        Inizializza il runner.
+        
+        Args:
+            dispatcher: Dispatcher dell'interfaccia
+        """
+        self.dispatcher = dispatcher
+        self._generations = {}
+        self._futures: Dict[Any, Future] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, key: Any, func: Callable[[], Any], on_result: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None) -> int:
+        """
+        Avvia un caricamento in background, rendendo superati i precedenti con la stessa chiave.
+        
+        Args:
+            key: Chiave del caricamento (es. 'calendar')
+            func: Funzione eseguita in background
+            on_result: Funzione chiamata nel thread di Tk con il risultato
+            on_error: Funzione chiamata nel thread di Tk con l'eccezione
+        
+        Returns:
+            Generazione della richiesta
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            
+            previous = self._futures.pop(key, None)
+            if previous is not None:
+                previous.cancel()
+        
+        def run():
+            try:
+                result = func()
+            except Exception as e:
+                if on_error is not None:
+                    self.dispatcher.post(self._deliver, key, generation, on_error, e)
+                else:
+                    logging.error(f"Errore nel caricamento in background '{key}': {str(e)}")
+                return
+            self.dispatcher.post(self._deliver, key, generation, on_result, result)
+        
+        future = self.dispatcher.executor.submit(run)
+        with self._lock:
+            if self._generations.get(key) == generation:
+                self._futures[key] = future
+        
+        return generation
+    
+    def cancel(self, key: Any) -> None:
+        """
+        Rende superato il caricamento in corso con una chiave.
+        
+        Args:
+            key: Chiave del caricamento
+        """
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            future = self._futures.pop(key, None)
+        
+        if future is not None:
+            future.cancel()
+    
+    def is_current(self, key: Any, generation: int) -> bool:
+        """
+        Verifica se una richiesta è ancora l'ultima per la sua chiave.
+        
+        Args:
+            key: Chiave del caricamento
+            generation: Generazione della richiesta
+        
+        Returns:
+            True se la richiesta non è stata superata
+        """
+        with self._lock:
+            return self._generations.get(key) == generation
+    
+    def is_pending(self, key: Any) -> bool:
+        """
+        Verifica se c'è un caricamento in corso con una chiave.
+        
+        Args:
+            key: Chiave del caricamento
+        
+        Returns:
+            True se il caricamento non è ancora stato applicato
+        """
+        with self._lock:
+            return key in self._futures
+    
+    def _deliver(self, key: Any, generation: int, callback: Callable[[Any], None], value: Any) -> None:
+        """
+        Applica il risultato di un caricamento, se è ancora l'ultimo (nel thread di Tk).
+        
+        Args:
+            key: Chiave del caricamento
+            generation: Generazione della richiesta
+            callback: Funzione da chiamare
+            value: Risultato o eccezione
+        """
+        with self._lock:
+            if self._generations.get(key) != generation:
+                return
+            self._futures.pop(key, None)
+        
+        callback(value)
+
+
+# Istanza singleton del dispatcher
+_dispatcher_instance: Optional[UIDispatcher] = None
+
+def get_dispatcher(widget: Optional[tk.Misc] = None) -> UIDispatcher:
+    """
+    Ottiene l'istanza singleton del dispatcher, creandola e avviandola se necessario.
+    
+    Args:
+        widget: Widget della finestra principale, richiesto alla prima chiamata
+    
+    Returns:
+        Istanza del dispatcher
+    
+    Raises:
+        RuntimeError: Se il dispatcher non esiste e non è stato indicato un widget
+    """
+    global _dispatcher_instance
+    if _dispatcher_instance is None:
+        if widget is None:
+            raise RuntimeError("Il dispatcher dell'interfaccia non è stato inizializzato")
+        _dispatcher_instance = UIDispatcher(widget.winfo_toplevel())
+        _dispatcher_instance.start()
+    return _dispatcher_instance
+
+def reset_dispatcher() -> None:
+    """Arresta e reimposta l'istanza del dispatcher."""
+    global _dispatcher_instance
+    if _dispatcher_instance is not None:
+        _dispatcher_instance.stop()
+    _dispatcher_instance = None
@@ -7,6 +7,7 @@ Frame per l'importazione e l'esportazione di allenamenti.
 
 import os
 import logging
+import itertools
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
@@ -16,13 +17,23 @@ from config import get_config
 from auth import GarminClient
 from models.workout import Workout
 from services.yaml_service import YamlService
+from services.jsonl_service import JsonlService
+from services.step_export_service import StepExportService
 from services.excel_service import ExcelService
 from services.garmin_service import GarminService
+from services.local_store import get_local_store, StoredWorkout
+from services.plan_cache import get_plan_cache
+from services.batch_import import BatchImportService
 from gui.utils import (
     create_tooltip, show_error, show_info, show_warning, ask_yes_no,
     create_scrollable_frame
 )
 from gui.styles import get_icon_for_sport
+from gui.dispatcher import get_dispatcher
+
+
+# Allenamenti aggiunti alla lista a ogni passo dell'importazione YAML
+YAML_IMPORT_BATCH = 25
 
 
 class ImportExportFrame(ttk.Frame):
@@ -43,11 +54,23 @@ class ImportExportFrame(ttk.Frame):
         self.garmin_client = None
         self.garmin_service = None
         
-        # Variabili
-        self.imported_workouts = []  # Lista di tuple (nome, allenamento)
+        # Archivio locale
+        self.store = get_local_store()
+        
+        # Variabili (gli allenamenti della sessione precedente vengono ripristinati
+        # dall'archivio locale, con gli step caricati al primo accesso; la lista
+        # è condivisa con l'editor tramite il controller)
+        if hasattr(controller, 'imported_workouts'):
+            self.imported_workouts = controller.imported_workouts  # Lista di tuple (nome, allenamento)
+        else:
+            self.imported_workouts = self.store.load_workouts()
         
         # Creazione dei widget
         self.create_widgets()
+        
+        # Mostra subito gli allenamenti ripristinati
+        if self.imported_workouts:
+            self.update_workout_list()
     
     def create_widgets(self):
         """Crea i widget del frame."""
@@ -87,6 +110,20 @@ class ImportExportFrame(ttk.Frame):
         
         create_tooltip(excel_button, "Importa allenamenti da un file Excel")
         
+        # Importa da JSON-lines
+        jsonl_button = ttk.Button(import_frame, text="Importa da JSONL...", 
+                                command=self.import_jsonl)
+        jsonl_button.pack(fill=tk.X, padx=10, pady=5)
+        
+        create_tooltip(jsonl_button, "Importa allenamenti da un file JSON-lines (formato compatto)")
+        
+        # Importa una cartella
+        folder_button = ttk.Button(import_frame, text="Importa cartella...", 
+                                 command=self.import_folder)
+        folder_button.pack(fill=tk.X, padx=10, pady=5)
+        
+        create_tooltip(folder_button, "Importa tutti i file YAML, Excel e JSON-lines di una cartella")
+        
         # Importa da Garmin Connect
         self.garmin_import_button = ttk.Button(import_frame, text="Importa da Garmin Connect", 
                                             command=self.import_from_garmin,
@@ -113,6 +150,20 @@ class ImportExportFrame(ttk.Frame):
         
         create_tooltip(excel_export_button, "Esporta allenamenti in un file Excel")
         
+        # Esporta in JSON-lines
+        jsonl_export_button = ttk.Button(export_frame, text="Esporta in JSONL...", 
+                                       command=self.export_jsonl)
+        jsonl_export_button.pack(fill=tk.X, padx=10, pady=5)
+        
+        create_tooltip(jsonl_export_button, "Esporta allenamenti in un file JSON-lines (formato compatto)")
+        
+        # Esporta gli step in formato tabellare
+        steps_export_button = ttk.Button(export_frame, text="Esporta step (CSV/Parquet)...", 
+                                       command=self.export_steps)
+        steps_export_button.pack(fill=tk.X, padx=10, pady=5)
+        
+        create_tooltip(steps_export_button, "Esporta una riga per ogni step, per l'analisi dei piani con altri strumenti")
+        
         # Crea esempio Excel
         excel_example_button = ttk.Button(export_frame, text="Crea Esempio Excel...", 
                                         command=self.create_excel_example)
@@ -396,16 +447,30 @@ class ImportExportFrame(ttk.Frame):
         
         # Aggiungi gli allenamenti filtrati alla lista
         for i, (name, workout) in enumerate(filtered_workouts):
-            # Icona in base al tipo di sport
-            sport_icon = get_icon_for_sport(workout.sport_type)
-            
-            # Conta gli step
+            self._insert_workout_row(i, name, workout)
+    
+    def _insert_workout_row(self, index: int, name: str, workout: Workout) -> None:
+        """
+        Aggiunge un allenamento in fondo alla lista.
+        
+        Args:
+            index: Indice memorizzato nel tag della riga
+            name: Nome dell'allenamento
+            workout: Allenamento
+        """
+        # Icona in base al tipo di sport
+        sport_icon = get_icon_for_sport(workout.sport_type)
+        
+        # Conta gli step (senza caricare gli allenamenti salvati non ancora aperti)
+        if isinstance(workout, StoredWorkout):
+            step_count = workout.step_count
+        else:
             step_count = len(workout.workout_steps)
-            
-            # Aggiungi alla lista
-            self.workout_tree.insert("", "end", 
-                                  values=(name, f"{sport_icon} {workout.sport_type}", step_count), 
-                                  tags=(str(i)))
+        
+        # Aggiungi alla lista
+        self.workout_tree.insert("", "end", 
+                              values=(name, f"{sport_icon} {workout.sport_type}", step_count), 
+                              tags=(str(index)))
     
     def on_workout_selected(self, event):
         """
@@ -642,6 +707,9 @@ class ImportExportFrame(ttk.Frame):
         for index in indices:
             del self.imported_workouts[index]
         
+        # Aggiorna l'archivio locale
+        self.save_to_store()
+        
         # Aggiorna la lista
         self.update_workout_list()
         
@@ -674,33 +742,94 @@ class ImportExportFrame(ttk.Frame):
         self.config.set('paths.last_import_dir', os.path.dirname(file_path))
         self.config.save()
         
+        # Importa gli allenamenti uno alla volta, mostrandoli man mano nella lista
+        self.controller.set_status(f"Importazione da {file_path}...")
+        workouts = get_plan_cache().iter_workouts(file_path, YamlService.iter_workouts)
+        self._import_yaml_batch(workouts, file_path, 0)
+    
+    def import_jsonl(self):
+        """Importa allenamenti da un file JSON-lines."""
+        # Percorso dell'ultimo import
+        last_dir = self.config.get('paths.last_import_dir', '')
+        
+        # Chiedi il file da importare
+        file_path = filedialog.askopenfilename(
+            title="Importa allenamenti da JSON-lines",
+            filetypes=[("JSON-lines files", "*.jsonl"), ("All files", "*.*")],
+            initialdir=last_dir
+        )
+        
+        if not file_path:
+            return
+        
+        # Salva il percorso
+        self.config.set('paths.last_import_dir', os.path.dirname(file_path))
+        self.config.save()
+        
+        # Le righe vengono lette man mano, come per i file YAML
+        self.controller.set_status(f"Importazione da {file_path}...")
+        workouts = JsonlService.iter_workouts(file_path)
+        self._import_yaml_batch(workouts, file_path, 0, 'JSON-lines')
+    
+    def _import_yaml_batch(self, workouts, file_path: str, imported: int, file_type: str = 'YAML') -> None:
+        """
+        Importa il gruppo successivo di allenamenti da un file YAML o JSON-lines.
+        
+        Ogni gruppo viene aggiunto alla lista e il successivo viene pianificato
+        con after(), così l'interfaccia resta reattiva durante l'importazione.
+        
+        Args:
+            workouts: Generatore di tuple (nome, allenamento)
+            file_path: Percorso del file
+            imported: Allenamenti importati finora
+            file_type: Tipo di file, per i messaggi di errore
+        """
+        filter_text = self.filter_var.get().lower()
+        batch = 0
+        
         try:
-            # Importa gli allenamenti
-            imported = YamlService.import_workouts(file_path)
-            
-            # Aggiungi agli allenamenti importati
-            self.imported_workouts.extend(imported)
+            for name, workout in itertools.islice(workouts, YAML_IMPORT_BATCH):
+                index = len(self.imported_workouts)
+                self.imported_workouts.append((name, workout))
+                
+                # Aggiungi alla lista se rispetta il filtro
+                if not filter_text or filter_text in name.lower():
+                    self._insert_workout_row(index, name, workout)
+                
+                batch += 1
             
-            # Aggiorna la lista
-            self.update_workout_list()
+            imported += batch
             
-            # Mostra messaggio di conferma
-            show_info("Importazione completata", 
-                   f"Importati {len(imported)} allenamenti", 
-                   parent=self)
+            # Gruppo completo: potrebbero esserci altri allenamenti
+            if batch == YAML_IMPORT_BATCH:
+                self.controller.set_status(f"Importati {imported} allenamenti da {file_path}...")
+                self.after(1, lambda: self._import_yaml_batch(workouts, file_path, imported, file_type))
+                return
             
-            # Aggiorna la barra di stato
-            self.controller.set_status(f"Importati {len(imported)} allenamenti da {file_path}")
+        except Exception as e:
+            logging.error(f"Errore nell'importazione del file {file_type}: {str(e)}")
             
-            # Notifica il WorkoutEditorFrame
-            if hasattr(self.controller, 'workout_editor'):
-                self.controller.workout_editor.on_workouts_imported()
+            # Conserva gli allenamenti già importati
+            if imported + batch:
+                self.save_to_store()
             
-        except Exception as e:
-            logging.error(f"Errore nell'importazione del file YAML: {str(e)}")
             show_error("Errore", 
-                     f"Impossibile importare il file YAML: {str(e)}", 
+                     f"Impossibile importare il file {file_type}: {str(e)}", 
                      parent=self)
+            return
+        
+        self.save_to_store()
+        
+        # Mostra messaggio di conferma
+        show_info("Importazione completata", 
+               f"Importati {imported} allenamenti", 
+               parent=self)
+        
+        # Aggiorna la barra di stato
+        self.controller.set_status(f"Importati {imported} allenamenti da {file_path}")
+        
+        # Notifica il WorkoutEditorFrame
+        self.notify_workout_editor()
     
     def import_excel(self):
         """Importa allenamenti da un file Excel."""
@@ -723,10 +852,11 @@ class ImportExportFrame(ttk.Frame):
         
         try:
             # Importa gli allenamenti
-            imported = ExcelService.import_workouts(file_path)
+            imported = get_plan_cache().import_workouts(file_path, ExcelService.import_workouts)
             
             # Aggiungi agli allenamenti importati
             self.imported_workouts.extend(imported)
+            self.save_to_store()
             
             # Aggiorna la lista
             self.update_workout_list()
@@ -740,8 +870,7 @@ class ImportExportFrame(ttk.Frame):
             self.controller.set_status(f"Importati {len(imported)} allenamenti da {file_path}")
             
             # Notifica il WorkoutEditorFrame
-            if hasattr(self.controller, 'workout_editor'):
-                self.controller.workout_editor.on_workouts_imported()
+            self.notify_workout_editor()
             
         except Exception as e:
             logging.error(f"Errore nell'importazione del file Excel: {str(e)}")
@@ -749,6 +878,116 @@ class ImportExportFrame(ttk.Frame):
                      f"Impossibile importare il file Excel: {str(e)}", 
                      parent=self)
     
+    def import_folder(self):
+        """Importa in parallelo tutti i file YAML, Excel e JSON-lines di una cartella."""
+        # Percorso dell'ultimo import
+        last_dir = self.config.get('paths.last_import_dir', '')
+        
+        # Chiedi la cartella da importare
+        folder = filedialog.askdirectory(
+            title="Importa cartella di piani",
+            initialdir=last_dir
+        )
+        
+        if not folder:
+            return
+        
+        # Salva il percorso
+        self.config.set('paths.last_import_dir', folder)
+        self.config.save()
+        
+        file_paths = BatchImportService.find_plan_files(folder)
+        if not file_paths:
+            show_info("Importazione", 
+                   "La cartella non contiene file YAML, Excel o JSON-lines", 
+                   parent=self)
+            return
+        
+        # Mostra un progress dialog
+        progress_window = tk.Toplevel(self)
+        progress_window.title("Importazione in corso")
+        progress_window.geometry("350x100")
+        progress_window.transient(self)
+        progress_window.grab_set()
+        
+        # Frame principale
+        progress_frame = ttk.Frame(progress_window, padding=20)
+        progress_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Messaggio
+        message_var = tk.StringVar(value=f"Importazione di {len(file_paths)} file...")
+        message_label = ttk.Label(progress_frame, textvariable=message_var)
+        message_label.pack(pady=(0, 10))
+        
+        # Progressbar
+        progress_var = tk.DoubleVar(value=0)
+        progress_bar = ttk.Progressbar(progress_frame, variable=progress_var, maximum=100)
+        progress_bar.pack(fill=tk.X)
+        
+        # Il thread di importazione aggiorna l'interfaccia solo tramite il dispatcher
+        ui = get_dispatcher(self)
+        
+        def update_progress(message, value):
+            message_var.set(message)
+            progress_var.set(value)
+        
+        def on_progress(done, total, result):
+            ui.post_progress(progress_window, update_progress,
+                             f"Analizzato {os.path.basename(result.file_path)} ({done}/{total})",
+                             done / total * 100)
+        
+        def on_complete(batch):
+            # Aggiungi agli allenamenti importati
+            imported = batch.workouts
+            self.imported_workouts.extend(imported)
+            self.save_to_store()
+            
+            # Aggiorna la lista
+            self.update_workout_list()
+            
+            # Chiudi la finestra di progresso
+            progress_window.destroy()
+            
+            # Mostra il riepilogo, con gli eventuali file non importati
+            message = (f"Importati {len(imported)} allenamenti da "
+                       f"{len(file_paths) - len(batch.errors)} file su {len(file_paths)}")
+            if batch.errors:
+                details = "\n".join(f"- {os.path.basename(path)}: {error}"
+                                    for path, error in batch.errors.items())
+                show_warning("Importazione completata con errori", 
+                           f"{message}\n\nFile non importati:\n{details}", 
+                           parent=self)
+            else:
+                show_info("Importazione completata", message, parent=self)
+            
+            # Aggiorna la barra di stato
+            self.controller.set_status(f"{message} ({batch.elapsed:.1f}s)")
+            
+            # Notifica il WorkoutEditorFrame
+            self.notify_workout_editor()
+        
+        def on_failure(error):
+            # Chiudi la finestra di progresso
+            progress_window.destroy()
+            
+            show_error("Errore", 
+                     f"Impossibile importare la cartella: {error}", 
+                     parent=self)
+        
+        # Funzione per importare i file
+        def import_thread():
+            try:
+                batch = BatchImportService.import_files(file_paths, progress_callback=on_progress)
+            except Exception as e:
+                logging.error(f"Errore nell'importazione della cartella: {str(e)}")
+                ui.post(on_failure, str(e))
+                return
+            
+            ui.post(on_complete, batch)
+        
+        # Avvia il thread di importazione
+        threading.Thread(target=import_thread, daemon=True).start()
+    
     def import_from_garmin(self):
         """Importa allenamenti da Garmin Connect."""
         # Verifica che il client Garmin sia disponibile
@@ -802,6 +1041,41 @@ class ImportExportFrame(ttk.Frame):
             progress_bar = ttk.Progressbar(progress_frame, variable=progress_var, maximum=100)
             progress_bar.pack(fill=tk.X)
             
+            # Il thread di importazione aggiorna l'interfaccia solo tramite il dispatcher
+            ui = get_dispatcher(self)
+            
+            def update_progress(message, value):
+                message_var.set(message)
+                progress_var.set(value)
+            
+            def on_complete(imported):
+                # Aggiungi agli allenamenti importati
+                self.imported_workouts.extend(imported)
+                self.save_to_store()
+                
+                # Aggiorna la lista
+                self.update_workout_list()
+                
+                # Chiudi la finestra di progresso
+                progress_window.destroy()
+                
+                # Mostra messaggio di conferma
+                show_info("Importazione completata", 
+                        f"Importati {len(imported)} allenamenti", 
+                        parent=self)
+                
+                # Aggiorna la barra di stato
+                self.controller.set_status(f"Importati {len(imported)} allenamenti da Garmin Connect")
+            
+            def on_failure(error):
+                # Chiudi la finestra di progresso
+                progress_window.destroy()
+                
+                # Mostra messaggio di errore
+                show_error("Errore", 
+                         f"Impossibile importare gli allenamenti: {error}", 
+                         parent=self)
+            
             # Funzione per importare gli allenamenti
             def import_thread():
                 try:
@@ -810,12 +1084,11 @@ class ImportExportFrame(ttk.Frame):
                     # Per ogni allenamento
                     for i, workout_data in enumerate(workouts_data):
                         try:
-                            # Aggiorna il messaggio
+                            # Aggiorna il messaggio e la progressbar
                             workout_name = workout_data.get('workoutName', 'Allenamento')
-                            message_var.set(f"Importazione di '{workout_name}'...")
-                            
-                            # Aggiorna la progressbar
-                            progress_var.set((i + 1) / len(workouts_data) * 100)
+                            ui.post_progress(progress_window, update_progress,
+                                             f"Importazione di '{workout_name}'...",
+                                             (i + 1) / len(workouts_data) * 100)
                             
                             # Ottieni i dettagli dell'allenamento
                             workout_id = str(workout_data.get('workoutId', ''))
@@ -833,36 +1106,14 @@ class ImportExportFrame(ttk.Frame):
                         except Exception as e:
                             logging.error(f"Errore nell'importazione dell'allenamento {workout_id}: {str(e)}")
                     
-                    # Aggiungi agli allenamenti importati
-                    self.imported_workouts.extend(imported)
-                    
-                    # Aggiorna la lista
-                    self.update_workout_list()
-                    
-                    # Chiudi la finestra di progresso
-                    progress_window.destroy()
-                    
-                    # Mostra messaggio di conferma
-                    show_info("Importazione completata", 
-                            f"Importati {len(imported)} allenamenti", 
-                            parent=self)
-                    
-                    # Aggiorna la barra di stato
-                    self.controller.set_status(f"Importati {len(imported)} allenamenti da Garmin Connect")
+                    ui.post(on_complete, imported)
                     
                 except Exception as e:
                     logging.error(f"Errore nell'importazione da Garmin Connect: {str(e)}")
-                    
-                    # Chiudi la finestra di progresso
-                    progress_window.destroy()
-                    
-                    # Mostra messaggio di errore
-                    show_error("Errore", 
-                             f"Impossibile importare gli allenamenti: {str(e)}", 
-                             parent=self)
+                    ui.post(on_failure, str(e))
             
             # Avvia il thread di importazione
-            threading.Thread(target=import_thread).start()
+            threading.Thread(target=import_thread, daemon=True).start()
             
         except Exception as e:
             logging.error(f"Errore nell'importazione da Garmin Connect: {str(e)}")
@@ -934,6 +1185,61 @@ class ImportExportFrame(ttk.Frame):
                      f"Impossibile esportare in YAML: {str(e)}", 
                      parent=self)
     
+    def export_jsonl(self):
+        """Esporta allenamenti in un file JSON-lines."""
+        # Verifica che ci siano allenamenti da esportare
+        if not self.imported_workouts:
+            show_error("Errore", "Non ci sono allenamenti da esportare", parent=self)
+            return
+        
+        # Ottieni gli allenamenti selezionati
+        selection = self.workout_tree.selection()
+        
+        # Se non ci sono selezioni, usa tutti gli allenamenti
+        selected_workouts = []
+        if selection:
+            for item in selection:
+                index = int(self.workout_tree.item(item, "tags")[0])
+                selected_workouts.append(self.imported_workouts[index])
+        else:
+            selected_workouts = self.imported_workouts
+        
+        # Percorso dell'ultimo export
+        last_dir = self.config.get('paths.last_export_dir', '')
+        
+        # Chiedi il file da esportare
+        file_path = filedialog.asksaveasfilename(
+            title="Esporta allenamenti in JSON-lines",
+            filetypes=[("JSON-lines files", "*.jsonl"), ("All files", "*.*")],
+            defaultextension=".jsonl",
+            initialdir=last_dir
+        )
+        
+        if not file_path:
+            return
+        
+        # Salva il percorso
+        self.config.set('paths.last_export_dir', os.path.dirname(file_path))
+        self.config.save()
+        
+        try:
+            # Esporta gli allenamenti con le zone correnti
+            JsonlService.export_workouts(selected_workouts, file_path, {'name_prefix': self.prefix_var.get()})
+            
+            # Mostra messaggio di conferma
+            show_info("Esportazione completata", 
+                   f"Esportati {len(selected_workouts)} allenamenti", 
+                   parent=self)
+            
+            # Aggiorna la barra di stato
+            self.controller.set_status(f"Esportati {len(selected_workouts)} allenamenti in {file_path}")
+            
+        except Exception as e:
+            logging.error(f"Errore nell'esportazione in JSON-lines: {str(e)}")
+            show_error("Errore", 
+                     f"Impossibile esportare in JSON-lines: {str(e)}", 
+                     parent=self)
+    
     def export_excel(self):
         """Esporta allenamenti in un file Excel."""
         # Verifica che ci siano allenamenti da esportare
@@ -992,6 +1298,61 @@ class ImportExportFrame(ttk.Frame):
                      f"Impossibile esportare in Excel: {str(e)}", 
                      parent=self)
     
+    def export_steps(self):
+        """Esporta gli step degli allenamenti in un file CSV o Parquet."""
+        # Verifica che ci siano allenamenti da esportare
+        if not self.imported_workouts:
+            show_error("Errore", "Non ci sono allenamenti da esportare", parent=self)
+            return
+        
+        # Ottieni gli allenamenti selezionati
+        selection = self.workout_tree.selection()
+        
+        # Se non ci sono selezioni, usa tutti gli allenamenti
+        selected_workouts = []
+        if selection:
+            for item in selection:
+                index = int(self.workout_tree.item(item, "tags")[0])
+                selected_workouts.append(self.imported_workouts[index])
+        else:
+            selected_workouts = self.imported_workouts
+        
+        # Percorso dell'ultimo export
+        last_dir = self.config.get('paths.last_export_dir', '')
+        
+        # Chiedi il file da esportare
+        file_path = filedialog.asksaveasfilename(
+            title="Esporta step degli allenamenti",
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("All files", "*.*")],
+            defaultextension=".csv",
+            initialdir=last_dir
+        )
+        
+        if not file_path:
+            return
+        
+        # Salva il percorso
+        self.config.set('paths.last_export_dir', os.path.dirname(file_path))
+        self.config.save()
+        
+        try:
+            # Esporta gli step
+            rows = StepExportService.export_steps(selected_workouts, file_path)
+            
+            # Mostra messaggio di conferma
+            show_info("Esportazione completata", 
+                   f"Esportati {rows} step di {len(selected_workouts)} allenamenti", 
+                   parent=self)
+            
+            # Aggiorna la barra di stato
+            self.controller.set_status(f"Esportati {rows} step in {file_path}")
+            
+        except Exception as e:
+            logging.error(f"Errore nell'esportazione degli step: {str(e)}")
+            show_error("Errore", 
+                     f"Impossibile esportare gli step: {str(e)}", 
+                     parent=self)
+    
     def export_to_garmin(self):
         """Esporta allenamenti in Garmin Connect."""
         # Verifica che ci siano allenamenti da esportare
@@ -1014,7 +1375,7 @@ class ImportExportFrame(ttk.Frame):
                 index = int(self.workout_tree.item(item, "tags")[0])
                 selected_workouts.append(self.imported_workouts[index])
         else:
-            selected_workouts = self.imported_workouts
+            selected_workouts = list(self.imported_workouts)
         
         # Chiedi conferma
         if not ask_yes_no("Conferma esportazione", 
@@ -1059,6 +1420,60 @@ class ImportExportFrame(ttk.Frame):
         # Lista per tenere traccia degli errori
         errors = []
         
+        # Il thread di esportazione aggiorna l'interfaccia solo tramite il dispatcher
+        ui = get_dispatcher(self)
+        
+        def update_progress(message, counter, value):
+            message_var.set(message)
+            counter_var.set(counter)
+            progress_var.set(value)
+        
+        def on_complete(exported, total):
+            # Chiudi la finestra di progresso
+            progress_window.destroy()
+            
+            # Mostra il riepilogo
+            if exported == total and not errors:
+                # Tutti gli allenamenti esportati con successo
+                show_info("Esportazione completata", 
+                        f"Esportati con successo tutti i {exported} allenamenti", 
+                        parent=self)
+            elif exported > 0:
+                # Alcuni allenamenti esportati con successo
+                error_details = "\n".join(errors[:5])  # Mostra solo i primi 5 errori
+                if len(errors) > 5:
+                    error_details += f"\n... e altri {len(errors) - 5} errori"
+                
+                show_warning("Esportazione parziale", 
+                           f"Esportati {exported} allenamenti su {total}.\n\n"
+                           f"Errori:\n{error_details}", 
+                           parent=self)
+            else:
+                # Nessun allenamento esportato
+                error_details = "\n".join(errors[:5])
+                if len(errors) > 5:
+                    error_details += f"\n... e altri {len(errors) - 5} errori"
+                
+                show_error("Esportazione fallita", 
+                         f"Impossibile esportare gli allenamenti.\n\n"
+                         f"Errori:\n{error_details}", 
+                         parent=self)
+            
+            # Aggiorna la barra di stato
+            self.controller.set_status(f"Esportati {exported} allenamenti su {total} in Garmin Connect")
+        
+        def on_failure(error):
+            # Chiudi la finestra di progresso
+            try:
+                progress_window.destroy()
+            except tk.TclError:
+                pass
+            
+            # Mostra messaggio di errore
+            show_error("Errore critico", 
+                     f"Errore critico durante l'esportazione: {error}", 
+                     parent=self)
+        
         # Funzione per esportare gli allenamenti
         def export_thread():
             try:
@@ -1068,12 +1483,10 @@ class ImportExportFrame(ttk.Frame):
                 # Per ogni allenamento
                 for i, (name, workout) in enumerate(selected_workouts):
                     try:
-                        # Aggiorna il messaggio
-                        message_var.set(f"Esportazione di '{name}'...")
-                        counter_var.set(f"{i + 1} / {total}")
-                        
-                        # Aggiorna la progressbar
-                        progress_var.set((i / total) * 100)
+                        # Aggiorna il messaggio, il contatore e la progressbar
+                        ui.post_progress(progress_window, update_progress,
+                                         f"Esportazione di '{name}'...", f"{i + 1} / {total}",
+                                         (i / total) * 100)
                         
                         # Log per debug
                         logging.info(f"Esportazione allenamento {i+1}/{total}: '{name}'")
@@ -1097,65 +1510,37 @@ class ImportExportFrame(ttk.Frame):
                         continue
                 
                 # Aggiorna la progressbar al 100%
-                progress_var.set(100)
-                counter_var.set(f"{total} / {total}")
-                message_var.set("Esportazione completata")
+                ui.post_progress(progress_window, update_progress,
+                                 "Esportazione completata", f"{total} / {total}", 100)
                 
                 # Attendi un momento per mostrare il completamento
                 time.sleep(0.5)
                 
-                # Chiudi la finestra di progresso
-                progress_window.destroy()
-                
-                # Mostra il riepilogo
-                if exported == total and not errors:
-                    # Tutti gli allenamenti esportati con successo
-                    show_info("Esportazione completata", 
-                            f"Esportati con successo tutti i {exported} allenamenti", 
-                            parent=self)
-                elif exported > 0:
-                    # Alcuni allenamenti esportati con successo
-                    error_details = "\n".join(errors[:5])  # Mostra solo i primi 5 errori
-                    if len(errors) > 5:
-                        error_details += f"\n... e altri {len(errors) - 5} errori"
-                    
-                    show_warning("Esportazione parziale", 
-                               f"Esportati {exported} allenamenti su {total}.\n\n"
-                               f"Errori:\n{error_details}", 
-                               parent=self)
-                else:
-                    # Nessun allenamento esportato
-                    error_details = "\n".join(errors[:5])
-                    if len(errors) > 5:
-                        error_details += f"\n... e altri {len(errors) - 5} errori"
-                    
-                    show_error("Esportazione fallita", 
-                             f"Impossibile esportare gli allenamenti.\n\n"
-                             f"Errori:\n{error_details}", 
-                             parent=self)
-                
-                # Aggiorna la barra di stato
-                self.controller.set_status(f"Esportati {exported} allenamenti su {total} in Garmin Connect")
+                ui.post(on_complete, exported, total)
                 
             except Exception as e:
                 logging.error(f"Errore critico nell'esportazione in Garmin Connect: {str(e)}")
-                
-                # Chiudi la finestra di progresso
-                try:
-                    progress_window.destroy()
-                except:
-                    pass
-                
-                # Mostra messaggio di errore
-                show_error("Errore critico", 
-                         f"Errore critico durante l'esportazione: {str(e)}", 
-                         parent=self)
+                ui.post(on_failure, str(e))
         
         # Avvia il thread di esportazione
-        import threading
         import time
         threading.Thread(target=export_thread, daemon=True).start()
     
+    def notify_workout_editor(self):
+        """Notifica i nuovi allenamenti all'editor, solo se la scheda è già stata costruita."""
+        get_built_tab = getattr(self.controller, 'get_built_tab', None)
+        editor = get_built_tab('workout_editor') if get_built_tab else None
+        
+        if editor is not None:
+            editor.on_workouts_imported()
+    
+    def save_to_store(self):
+        """Salva gli allenamenti importati nell'archivio locale."""
+        try:
+            self.store.save_workouts(self.imported_workouts)
+        except Exception as e:
+            logging.error(f"Errore nel salvataggio nell'archivio locale: {str(e)}")
+    
     def save_configuration(self):
         """Salva la configurazione."""
         # Salva il prefisso
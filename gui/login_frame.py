@@ -14,6 +14,7 @@ from typing import Optional, Dict, Any
 
 from auth import GarminAuth, GarminClient, get_auth, reset_auth
 from gui.utils import create_tooltip, show_error
+from gui.dispatcher import get_dispatcher
 from config import get_config
 
 
@@ -335,8 +336,8 @@ class LoginFrame(ttk.Frame):
         # Salva le credenziali se richiesto
         self.save_credentials()
         
-        # Effettua il login in un thread separato
-        self.auth.login(email, password, self.on_login_complete)
+        # Effettua il login in un thread separato; il risultato torna nel thread di Tk
+        self.auth.login(email, password, get_dispatcher(self).wrap(self.on_login_complete))
     
     def submit_mfa_code(self):
         """Invia il codice MFA per completare il login."""
@@ -362,8 +363,8 @@ class LoginFrame(ttk.Frame):
         self.progress.pack(side=tk.RIGHT, padx=(5, 0))
         self.progress.start()
         
-        # Invia il codice
-        self.auth.submit_mfa_code(mfa_code, self.on_mfa_complete)
+        # Invia il codice; il risultato torna nel thread di Tk
+        self.auth.submit_mfa_code(mfa_code, get_dispatcher(self).wrap(self.on_mfa_complete))
     
     def cancel_mfa(self):
         """Annulla il processo MFA e torna al login normale."""
@@ -405,8 +406,8 @@ class LoginFrame(ttk.Frame):
         # Aggiorna l'interfaccia
         self.update_idletasks()
         
-        # Riprendi la sessione in un thread separato
-        self.auth.resume(self.on_login_complete)
+        # Riprendi la sessione in un thread separato; il risultato torna nel thread di Tk
+        self.auth.resume(get_dispatcher(self).wrap(self.on_login_complete))
     
     def on_login_complete(self, success: bool, client: Optional[GarminClient]):
         """
@@ -0,0 +1,574 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Vista della stagione: fino a un anno di allenamenti disegnato su un unico canvas.
+
+Ogni giorno è un rettangolo (una colonna per settimana, una riga per giorno
+della settimana) colorato in base allo sport prevalente e al carico del
+giorno. I clic vengono ricondotti al giorno con un calcolo sulla griglia,
+senza un widget per giorno.
+"""
+
+import logging
+import datetime
+import tkinter as tk
+from tkinter import ttk
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import get_config
+from auth import GarminClient
+from models.calendar import Calendar, CalendarItem
+from services.garmin_service import GarminService
+from services.local_store import get_local_store
+from gui.utils import show_error, is_valid_date
+from gui.styles import get_color_for_sport, get_icon_for_sport, LIGHT_COLORS, DARK_COLORS
+from gui.dispatcher import get_dispatcher, RefreshRunner
+
+
+# Durate selezionabili (settimane)
+WEEK_CHOICES = (12, 24, 36, 52)
+DEFAULT_WEEKS = 24
+
+# Settimane di spostamento dei pulsanti di navigazione
+NAV_STEP = 4
+
+# Geometria della griglia (pixel)
+MIN_CELL = 10
+MAX_CELL = 36
+GAP = 2
+LEFT_MARGIN = 40
+TOP_MARGIN = 22
+
+# Numero di item oltre il quale il colore del giorno è pieno
+FULL_LOAD = 3
+
+WEEKDAYS = ["Lunedì", "Martedì", "Mercoledì", "Giovedì", "Venerdì", "Sabato", "Domenica"]
+MONTHS = ["Gennaio", "Febbraio", "Marzo", "Aprile", "Maggio", "Giugno",
+          "Luglio", "Agosto", "Settembre", "Ottobre", "Novembre", "Dicembre"]
+
+
+def blend(color: str, background: str, factor: float) -> str:
+    """
+    Mescola due colori hex.
+    
+    Args:
+        color: Colore principale (#RRGGBB)
+        background: Colore di sfondo (#RRGGBB)
+        factor: Peso del colore principale (0-1)
+    
+    Returns:
+        Colore risultante (#RRGGBB)
+    """
+    channels = []
+    for i in (1, 3, 5):
+        front = int(color[i:i + 2], 16)
+        back = int(background[i:i + 2], 16)
+        channels.append(round(back + (front - back) * factor))
+    
+    return "#{:02X}{:02X}{:02X}".format(*channels)
+
+
+class SeasonFrame(ttk.Frame):
+    """Frame per la visualizzazione di una stagione di allenamenti."""
+    
+    def __init__(self, parent: ttk.Notebook, controller):
+        """
+        Inizializza il frame della stagione.
+        
+        Args:
+            parent: Widget genitore (notebook)
+            controller: Controller principale dell'applicazione
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.controller = controller
+        self.config = get_config()
+        self.garmin_client = None
+        self.garmin_service = None
+        
+        self.store = get_local_store()
+        
+        # Item dell'intervallo visualizzato, raggruppati per data
+        self.calendar = Calendar()
+        self.items_by_date: Dict[str, List[CalendarItem]] = {}
+        
+        # Intervallo visualizzato: primo giorno (inizio settimana) e settimane
+        self.weeks = DEFAULT_WEEKS
+        self.start_date = self._default_start()
+        
+        # Geometria dell'ultimo disegno, usata per i clic
+        self._cell = MIN_CELL
+        self._selected: Optional[datetime.date] = None
+        
+        # Caricamenti da Garmin Connect in background (conta solo l'ultimo)
+        self.refresh_runner = RefreshRunner(get_dispatcher(self))
+        
+        # Mesi che Garmin Connect non ha restituito: non vengono riscaricati
+        # in automatico fino al prossimo "Aggiorna" o login
+        self.failed_months: Set[Tuple[int, int]] = set()
+        
+        # Creazione dei widget
+        self.create_widgets()
+        
+        # Carica l'intervallo iniziale
+        self.load_range()
+    
+    def create_widgets(self):
+        """Crea i widget del frame."""
+        # Frame principale
+        main_frame = ttk.Frame(self, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Frame superiore per la navigazione
+        top_frame = ttk.Frame(main_frame)
+        top_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        nav_frame = ttk.Frame(top_frame)
+        nav_frame.pack(side=tk.LEFT)
+        
+        ttk.Button(nav_frame, text="<", width=3,
+                 command=lambda: self.shift(-NAV_STEP)).pack(side=tk.LEFT, padx=(0, 5))
+        
+        # Titolo dell'intervallo
+        self.range_var = tk.StringVar()
+        ttk.Label(nav_frame, textvariable=self.range_var, style="Heading.TLabel").pack(side=tk.LEFT, padx=10)
+        
+        ttk.Button(nav_frame, text=">", width=3,
+                 command=lambda: self.shift(NAV_STEP)).pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Button(nav_frame, text="Oggi",
+                 command=self.go_to_today).pack(side=tk.LEFT, padx=(20, 0))
+        
+        # Opzioni di visualizzazione
+        options_frame = ttk.Frame(top_frame)
+        options_frame.pack(side=tk.RIGHT)
+        
+        self.refresh_button = ttk.Button(options_frame, text="Aggiorna",
+                                      command=self.refresh_season, state="disabled")
+        self.refresh_button.pack(side=tk.RIGHT, padx=(5, 0))
+        
+        self.weeks_var = tk.StringVar(value=str(self.weeks))
+        weeks_combo = ttk.Combobox(options_frame, textvariable=self.weeks_var, width=4,
+                                 values=[str(w) for w in WEEK_CHOICES], state="readonly")
+        weeks_combo.pack(side=tk.RIGHT, padx=(5, 10))
+        weeks_combo.bind("<<ComboboxSelected>>", self.on_weeks_change)
+        
+        ttk.Label(options_frame, text="Settimane:").pack(side=tk.RIGHT)
+        
+        # Canvas della stagione
+        season_frame = ttk.LabelFrame(main_frame, text="Stagione")
+        season_frame.pack(fill=tk.BOTH, expand=True)
+        
+        theme = self.config.get('ui.theme', 'light')
+        self.colors = DARK_COLORS if theme == 'dark' else LIGHT_COLORS
+        
+        self.canvas = tk.Canvas(season_frame, background=self.colors["bg_light"],
+                              highlightthickness=0, height=7 * (MAX_CELL + GAP) + TOP_MARGIN)
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Double-Button-1>", self.on_double_click)
+        
+        # Frame per i dettagli del giorno selezionato
+        details_frame = ttk.LabelFrame(main_frame, text="Dettagli")
+        details_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        self.details_var = tk.StringVar(value="Seleziona un giorno per vedere i dettagli "
+                                            "(doppio clic per aprirlo nel calendario)")
+        ttk.Label(details_frame, textvariable=self.details_var, justify=tk.LEFT).pack(
+            fill=tk.X, padx=5, pady=10)
+    
+    def _default_start(self) -> datetime.date:
+        """
+        Calcola il primo giorno dell'intervallo predefinito.
+        
+        Se è impostata una data di gara futura l'intervallo termina con la
+        settimana della gara, altrimenti inizia con la settimana corrente.
+        
+        Returns:
+            Primo giorno della prima settimana
+        """
+        today = datetime.date.today()
+        race_day = self.config.get('planning.race_day', '')
+        
+        if race_day and is_valid_date(race_day):
+            race_date = datetime.date.fromisoformat(race_day)
+            if race_date >= today:
+                return self._week_start(race_date) - datetime.timedelta(weeks=self.weeks - 1)
+        
+        return self._week_start(today)
+    
+    def _week_start(self, date: datetime.date) -> datetime.date:
+        """
+        Restituisce il primo giorno della settimana di una data.
+        
+        Args:
+            date: Data
+        
+        Returns:
+            Primo giorno della settimana ('ui.calendar_first_day')
+        """
+        first_day_of_week = self.config.get('ui.calendar_first_day', 0)
+        return date - datetime.timedelta(days=(date.weekday() - first_day_of_week) % 7)
+    
+    @property
+    def end_date(self) -> datetime.date:
+        """Ultimo giorno dell'intervallo visualizzato."""
+        return self.start_date + datetime.timedelta(days=self.weeks * 7 - 1)
+    
+    def _months_in_range(self) -> List[Tuple[int, int]]:
+        """
+        Restituisce i mesi toccati dall'intervallo visualizzato.
+        
+        Returns:
+            Lista di tuple (anno, mese)
+        """
+        year, month = self.start_date.year, self.start_date.month
+        last = (self.end_date.year, self.end_date.month)
+        
+        months = []
+        while (year, month) <= last:
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        
+        return months
+    
+    def update_range_title(self):
+        """Aggiorna il titolo dell'intervallo."""
+        start, end = self.start_date, self.end_date
+        self.range_var.set(f"{start.day} {MONTHS[start.month - 1]} {start.year} - "
+                           f"{end.day} {MONTHS[end.month - 1]} {end.year}")
+    
+    def shift(self, weeks: int):
+        """
+        Sposta l'intervallo visualizzato.
+        
+        Args:
+            weeks: Settimane da aggiungere (positivo) o sottrarre (negativo)
+        """
+        self.start_date += datetime.timedelta(weeks=weeks)
+        self.load_range()
+    
+    def go_to_today(self):
+        """Torna all'intervallo predefinito."""
+        self.start_date = self._default_start()
+        self.load_range()
+    
+    def on_weeks_change(self, event=None):
+        """Gestisce il cambio della durata visualizzata."""
+        self.weeks = int(self.weeks_var.get())
+        self.load_range()
+    
+    def load_range(self, fetch: bool = True):
+        """
+        Carica dall'archivio locale gli item dell'intervallo e ridisegna.
+        
+        Se è disponibile il client Garmin, i mesi mai sincronizzati vengono
+        scaricati in background, tranne quelli già falliti.
+        
+        Args:
+            fetch: Se False ridisegna soltanto, senza scaricare i mesi mancanti
+        """
+        self.update_range_title()
+        
+        self.calendar = Calendar()
+        missing = []
+        for year, month in self._months_in_range():
+            month_obj = self.store.load_calendar_month(year, month)
+            if month_obj:
+                self.calendar.add_month(month_obj)
+            elif (year, month) not in self.failed_months:
+                missing.append((year, month))
+        
+        items = self.calendar.get_items_by_date_range(self.start_date.isoformat(),
+                                                      self.end_date.isoformat())
+        
+        self.items_by_date = {}
+        for item in items:
+            self.items_by_date.setdefault(item.date, []).append(item)
+        
+        self.redraw()
+        
+        if not fetch:
+            return
+        
+        if missing and self.garmin_service:
+            self.fetch_months(missing)
+        else:
+            # L'intervallo precedente non serve più
+            self.refresh_runner.cancel('season')
+    
+    def refresh_season(self):
+        """Aggiorna da Garmin Connect tutti i mesi dell'intervallo."""
+        # Verifica che il client Garmin sia disponibile
+        if not self.garmin_client:
+            show_error("Errore", "Devi prima effettuare il login a Garmin Connect", parent=self)
+            return
+        
+        months = self._months_in_range()
+        self.failed_months.difference_update(months)
+        self.fetch_months(months, show_errors=True)
+    
+    def fetch_months(self, months: List[Tuple[int, int]], show_errors: bool = False):
+        """
+        Scarica alcuni mesi da Garmin Connect in background e li salva nell'archivio locale.
+        
+        Al termine l'intervallo visualizzato viene ridisegnato dall'archivio
+        senza nuovi download: i mesi non restituiti restano in failed_months.
+        Una nuova richiesta rende superata quella in corso.
+        
+        Args:
+            months: Mesi da scaricare come tuple (anno, mese)
+            show_errors: Se True mostra un messaggio in caso di errore
+        """
+        service = self.garmin_service
+        store = self.store
+        
+        def fetch():
+            failed = []
+            for year, month in months:
+                month_obj = service.get_calendar_month(year, month)
+                if month_obj:
+                    store.save_calendar_month(month_obj)
+                else:
+                    failed.append((year, month))
+            return failed
+        
+        def on_result(failed):
+            self.failed_months.update(failed)
+            self.load_range(fetch=False)
+            self.controller.set_status(f"Stagione aggiornata: {len(months) - len(failed)} mesi su {len(months)}")
+            if failed and show_errors:
+                show_error("Errore",
+                         f"Impossibile scaricare {len(failed)} mesi da Garmin Connect",
+                         parent=self)
+        
+        def on_error(error):
+            self.failed_months.update(months)
+            logging.error(f"Errore nell'aggiornamento della stagione: {str(error)}")
+            self.controller.set_status("Errore nell'aggiornamento della stagione")
+            if show_errors:
+                show_error("Errore",
+                         f"Impossibile aggiornare la stagione: {str(error)}",
+                         parent=self)
+        
+        self.controller.set_status(f"Aggiornamento della stagione ({len(months)} mesi)...")
+        self.refresh_runner.submit('season', fetch, on_result, on_error)
+    
+    def day_colors(self, items: List[CalendarItem], theme: str) -> Tuple[str, str]:
+        """
+        Calcola i colori di un giorno.
+        
+        Il colore è quello dello sport prevalente, più intenso al crescere
+        del numero di item; i giorni con soli allenamenti pianificati (senza
+        attività svolte) sono più chiari e con il bordo colorato.
+        
+        Args:
+            items: Item del giorno
+            theme: Tema dell'interfaccia
+        
+        Returns:
+            Tupla (riempimento, bordo)
+        """
+        empty = self.colors["bg_medium"]
+        if not items:
+            return empty, empty
+        
+        activities = [item for item in items if item.item_type == 'activity']
+        sport = Counter(item.sport_type for item in activities or items).most_common(1)[0][0]
+        color = get_color_for_sport(sport or 'other', theme)
+        
+        load = min(len(items), FULL_LOAD) / FULL_LOAD
+        if activities:
+            return blend(color, empty, 0.4 + 0.6 * load), color
+        
+        return blend(color, empty, 0.15 + 0.25 * load), color
+    
+    def redraw(self):
+        """Ridisegna l'intera stagione sul canvas."""
+        canvas = self.canvas
+        canvas.delete("all")
+        
+        # Dimensione delle celle in base alla larghezza disponibile
+        width = max(canvas.winfo_width(), 1)
+        height = max(canvas.winfo_height(), 1)
+        step = min((width - LEFT_MARGIN - GAP) // self.weeks,
+                   (height - TOP_MARGIN - GAP) // 7)
+        self._cell = max(MIN_CELL, min(MAX_CELL, step - GAP))
+        step = self._cell + GAP
+        
+        theme = self.config.get('ui.theme', 'light')
+        today = datetime.date.today()
+        race_day = self.config.get('planning.race_day', '')
+        text_color = self.colors["fg_light"]
+        
+        # Nomi dei giorni della settimana
+        first_day_of_week = self.config.get('ui.calendar_first_day', 0)
+        for row in range(7):
+            canvas.create_text(LEFT_MARGIN - 6, TOP_MARGIN + row * step + self._cell / 2,
+                               text=WEEKDAYS[(row + first_day_of_week) % 7][:3],
+                               anchor="e", fill=text_color)
+        
+        # Giorni, una colonna per settimana
+        for index in range(self.weeks * 7):
+            column, row = divmod(index, 7)
+            date = self.start_date + datetime.timedelta(days=index)
+            date_str = date.isoformat()
+            
+            x = LEFT_MARGIN + column * step
+            y = TOP_MARGIN + row * step
+            
+            # Nome del mese sopra la settimana che ne contiene il primo giorno
+            if date.day == 1 or index == 0:
+                canvas.create_text(x, TOP_MARGIN - 6, text=MONTHS[date.month - 1][:3],
+                                   anchor="sw", fill=text_color)
+            
+            fill, outline = self.day_colors(self.items_by_date.get(date_str, []), theme)
+            outline_width = 1
+            
+            if date_str == race_day:
+                outline, outline_width = self.colors["error"], 2
+            elif date == today:
+                outline, outline_width = self.colors["accent"], 2
+            
+            canvas.create_rectangle(x, y, x + self._cell, y + self._cell,
+                                    fill=fill, outline=outline, width=outline_width)
+        
+        # Evidenzia il giorno selezionato
+        if self._selected and self.start_date <= self._selected <= self.end_date:
+            column, row = divmod((self._selected - self.start_date).days, 7)
+            x = LEFT_MARGIN + column * step
+            y = TOP_MARGIN + row * step
+            canvas.create_rectangle(x - 1, y - 1, x + self._cell + 1, y + self._cell + 1,
+                                    outline=self.colors["fg_dark"], width=2)
+    
+    def day_at(self, x: int, y: int) -> Optional[datetime.date]:
+        """
+        Restituisce il giorno disegnato in un punto del canvas.
+        
+        Args:
+            x: Ascissa nel canvas
+            y: Ordinata nel canvas
+        
+        Returns:
+            Data del giorno, None se il punto è fuori dai giorni
+        """
+        step = self._cell + GAP
+        column, column_offset = divmod(x - LEFT_MARGIN, step)
+        row, row_offset = divmod(y - TOP_MARGIN, step)
+        
+        if not (0 <= column < self.weeks and 0 <= row < 7):
+            return None
+        
+        # Lo spazio tra le celle non appartiene a nessun giorno
+        if column_offset > self._cell or row_offset > self._cell:
+            return None
+        
+        return self.start_date + datetime.timedelta(days=column * 7 + row)
+    
+    def on_click(self, event):
+        """
+        Mostra i dettagli del giorno cliccato.
+        
+        Args:
+            event: Evento Tkinter
+        """
+        date = self.day_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if date is None:
+            return
+        
+        self._selected = date
+        self.redraw()
+        
+        heading = f"{WEEKDAYS[date.weekday()]}, {date.day} {MONTHS[date.month - 1]} {date.year}"
+        items = self.items_by_date.get(date.isoformat(), [])
+        
+        if not items:
+            self.details_var.set(f"{heading}\nNessun allenamento o attività pianificata")
+            return
+        
+        lines = [heading]
+        for item in items:
+            type_text = "Allenamento" if item.item_type == "workout" else "Attività"
+            lines.append(f"{get_icon_for_sport(item.sport_type)} {item.title} ({type_text})")
+        
+        self.details_var.set("\n".join(lines))
+    
+    def on_double_click(self, event):
+        """
+        Apre il mese del giorno cliccato nella scheda del calendario.
+        
+        Args:
+            event: Evento Tkinter
+        """
+        date = self.day_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if date is None or not hasattr(self.controller, 'select_tab'):
+            return
+        
+        calendar_frame = self.controller.select_tab('calendar_frame')
+        calendar_frame.current_date = date.replace(day=1)
+        calendar_frame.load_current_month()
+        calendar_frame.show_day_details(date.isoformat())
+    
+    def on_login(self, client: GarminClient):
+        """
+        Gestisce l'evento di login.
+        
+        Args:
+            client: Client Garmin
+        """
+        self.garmin_client = client
+        self.garmin_service = GarminService(client)
+        
+        # Con la nuova sessione si può riprovare anche con i mesi falliti
+        self.failed_months.clear()
+        
+        # Abilita i pulsanti
+        self.refresh_button.config(state="normal")
+        
+        # Scarica i mesi dell'intervallo mai sincronizzati
+        self.load_range()
+    
+    def on_logout(self):
+        """Gestisce l'evento di logout."""
+        self.garmin_client = None
+        self.garmin_service = None
+        
+        # Scarta i caricamenti ancora in corso
+        self.refresh_runner.cancel('season')
+        
+        # Disabilita i pulsanti
+        self.refresh_button.config(state="disabled")
+        
+        # Ricarica l'intervallo dall'archivio locale
+        self.load_range()
+    
+    def on_activate(self):
+        """Chiamato quando il frame viene attivato."""
+        # La sincronizzazione in background aggiorna l'archivio locale
+        self.load_range()
+
+
+if __name__ == "__main__":
+    # Test del frame
+    root = tk.Tk()
+    root.title("Season View Test")
+    root.geometry("1200x500")
+    
+    # Crea un notebook
+    notebook = ttk.Notebook(root)
+    notebook.pack(fill=tk.BOTH, expand=True)
+    
+    # Controller fittizio
+    class DummyController:
+        def set_status(self, message):
+            print(message)
+    
+    # Crea il frame
+    frame = SeasonFrame(notebook, DummyController())
+    notebook.add(frame, text="Stagione")
+    
+    root.mainloop()
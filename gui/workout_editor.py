@@ -17,11 +17,111 @@ from datetime import datetime
 from config import get_config
 from auth import GarminClient
 from models.workout import Workout, WorkoutStep, Target
+from services.local_store import get_local_store
+from services.planning_service import PlanningService
 from gui.utils import (
     create_tooltip, show_error, show_info, show_warning, ask_yes_no,
     create_scrollable_frame, is_valid_date, convert_date_for_garmin, is_valid_display_date
 )
 from gui.styles import get_icon_for_sport, get_icon_for_step, get_color_for_step
+from gui.dispatcher import get_dispatcher, RefreshRunner
+
+
+# Attesa (millisecondi) dopo l'ultimo tasto prima di applicare il filtro
+FILTER_DELAY_MS = 150
+
+
+class WorkoutRow:
+    """Riga precalcolata della lista degli allenamenti."""
+    
+    __slots__ = ('workout_id', 'values', 'search_key', 'iid')
+    
+    def __init__(self, workout_id: str, name: str, displayed_name: str, sport_type: str,
+                 date_display: str, step_count: int):
+        """
+        Inizializza la riga.
+        
+        Args:
+            workout_id: ID dell'allenamento
+            name: Nome dell'allenamento
+            displayed_name: Nome visualizzato (es. con il prefisso [Local])
+            sport_type: Tipo di sport
+            date_display: Data nel formato DD/MM/YYYY o stringa vuota
+            step_count: Numero di step (esclusi quelli con la data)
+        """
+        self.workout_id = workout_id
+        self.values = (displayed_name, f"{get_icon_for_sport(sport_type)} {sport_type}", date_display, step_count)
+        self.search_key = name.lower()
+        
+        # Item dell'albero che visualizza la riga
+        self.iid = None
+    
+    @staticmethod
+    def _format_date(date_str: str) -> str:
+        """
+        Converte una data da YYYY-MM-DD a DD/MM/YYYY.
+        
+        Args:
+            date_str: Data da convertire
+            
+        Returns:
+            Data convertita, o quella originale se non è nel formato atteso
+        """
+        try:
+            year, month, day = date_str.split('-')
+            return f"{day}/{month}/{year}"
+        except ValueError:
+            return date_str
+    
+    @classmethod
+    def from_workout(cls, workout_id: str, workout_data) -> 'WorkoutRow':
+        """
+        Crea la riga di un allenamento.
+        
+        Args:
+            workout_id: ID dell'allenamento
+            workout_data: Dizionario nel formato di Garmin Connect o oggetto Workout
+            
+        Returns:
+            Riga dell'allenamento
+        """
+        if isinstance(workout_data, dict):
+            # Se è un dizionario (come nel caso dei dati importati o di Garmin)
+            sport_type = workout_data.get('sportType', {}).get('sportTypeKey', 'running')
+            
+            # Per il conteggio degli step - ESCLUDIAMO QUELLI CON DATA
+            step_count = 0
+            if workout_data.get('workoutSegments'):
+                steps = workout_data['workoutSegments'][0].get('workoutSteps', [])
+                for step in steps:
+                    if isinstance(step, dict) and not step.get('date'):
+                        step_count += 1
+                    elif hasattr(step, 'date') and not step.date:
+                        step_count += 1
+            
+            name = workout_data.get('workoutName', '')
+            
+            date_str = workout_data.get('date')
+            date_display = cls._format_date(date_str) if date_str and date_str.strip() else ""
+            
+            # Verifica se è un allenamento locale
+            displayed_name = ("[Local] " if workout_data.get('local', False) else "") + name
+        else:
+            # Se è un oggetto Workout
+            sport_type = workout_data.sport_type
+            name = displayed_name = workout_data.workout_name
+            
+            # Conteggio step escludendo quelli con data, e data del primo che ce l'ha
+            step_count = 0
+            date_display = ""
+            for step in workout_data.workout_steps:
+                step_date = getattr(step, 'date', None)
+                if not step_date:
+                    step_count += 1
+                elif not date_display and step_date.strip():
+                    date_display = cls._format_date(step_date)
+        
+        return cls(workout_id, name, displayed_name, sport_type, date_display, step_count)
 
 
 class WorkoutEditorFrame(ttk.Frame):
@@ -44,8 +144,8 @@ class WorkoutEditorFrame(ttk.Frame):
         self._internal_race_day = self.config.get('planning.race_day', '')
         self._internal_date = None
         
-        # Lista degli allenamenti disponibili
-        self.workouts = []
+        # Lista degli allenamenti disponibili (copia locale dell'ultima sincronizzazione)
+        self.workouts = get_local_store().load_garmin_workouts()
         
         # Lista degli allenamenti importati
         self.imported_workouts = []
@@ -58,6 +158,16 @@ class WorkoutEditorFrame(ttk.Frame):
         # Step selezionato
         self.selected_step_index = None
         
+        # Righe della lista degli allenamenti, item dell'albero visibili e
+        # filtro applicato
+        self._workout_rows: List[WorkoutRow] = []
+        self._attached_items = set()
+        self._applied_filter = ""
+        self._filter_after_id = None
+        
+        # Caricamenti da Garmin Connect in background (conta solo l'ultimo)
+        self.refresh_runner = RefreshRunner(get_dispatcher(self))
+        
         # Creazione dei widget
         self.create_widgets()
     
@@ -177,8 +287,8 @@ class WorkoutEditorFrame(ttk.Frame):
                     workouts_to_plan.append((wid, wdata))
         else:  # source == "imported"
             # Usa gli allenamenti importati
-            import_export_frame = self.controller.import_export
-            for i, (name, workout) in enumerate(import_export_frame.imported_workouts):
+            imported_workouts = self.controller.imported_workouts
+            for i, (name, workout) in enumerate(imported_workouts):
                 workout_id = f"imported_{i}"
                 # Crea un dict simile agli allenamenti Garmin
                 wdata = {
@@ -223,42 +333,9 @@ class WorkoutEditorFrame(ttk.Frame):
                        f"Ci sono settimane con {max_sessions} sessioni, ma solo {len(preferred_days)} giorni preferiti", 
                        parent=self)
         
-        # Calcola le date degli allenamenti
-        race_date = datetime.datetime.strptime(race_day_internal, '%Y-%m-%d').date()       
-
-        # Pianifica all'indietro a partire dalla data della gara
-        dates = {}  # Dizionario settimana,sessione -> data
-        
-        # Ordina le settimane in ordine decrescente (a partire dalla gara)
-        weeks = sorted(week_sessions.keys(), reverse=True)
-        
-        current_date = race_date
-        
-        # Per ogni settimana, in ordine decrescente
-        for week in weeks:
-            sessions = sorted(week_sessions[week])
-            
-            # Per ogni sessione, in ordine decrescente
-            for session in sorted(sessions, reverse=True):
-                # Trova il giorno preferito più vicino
-                days_to_subtract = 0
-                current_weekday = current_date.weekday()
-                
-                # Trova il giorno preferito più vicino all'indietro
-                while days_to_subtract < 7:
-                    check_day = (current_weekday - days_to_subtract) % 7
-                    if check_day in preferred_days:
-                        break
-                    days_to_subtract += 1
-                
-                # Calcola la data dell'allenamento
-                workout_date = current_date - datetime.timedelta(days=days_to_subtract)
-                
-                # Salva la data
-                dates[(week, session)] = workout_date
-                
-                # Vai al giorno precedente per la prossima sessione
-                current_date = workout_date - datetime.timedelta(days=1)
+        # Calcola le date degli allenamenti a ritroso dalla data della gara
+        race_date = datetime.strptime(race_day_internal, '%Y-%m-%d').date()
+        dates = PlanningService.compute_dates(week_sessions, race_date, preferred_days)
         
         # Associa le date agli allenamenti
         updated_workouts = []
@@ -279,10 +356,10 @@ class WorkoutEditorFrame(ttk.Frame):
                     if 'imported' in wdata:
                         # Trova l'allenamento originale
                         if source == "imported":
-                            import_export_frame = self.controller.import_export
+                            imported_workouts = self.controller.imported_workouts
                             idx = int(wid.split('_')[1])
-                            if idx < len(import_export_frame.imported_workouts):
-                                _, workout = import_export_frame.imported_workouts[idx]
+                            if idx < len(imported_workouts):
+                                _, workout = imported_workouts[idx]
                                 
                                 # Cerca uno step con la data o ne crea uno nuovo
                                 date_step = None
@@ -389,10 +466,10 @@ class WorkoutEditorFrame(ttk.Frame):
                     self.workouts[i] = (wid, wdata)
         else:  # source == "imported"
             # Usa gli allenamenti importati
-            import_export_frame = self.controller.import_export
+            imported_workouts = self.controller.imported_workouts
             
-            if hasattr(import_export_frame, 'imported_workouts'):
-                for i, (name, workout) in enumerate(import_export_frame.imported_workouts):
+            if imported_workouts:
+                for i, (name, workout) in enumerate(imported_workouts):
                     # Cerca uno step con la data
                     date_steps = []
                     for j, step in enumerate(workout.workout_steps):
@@ -551,7 +628,7 @@ class WorkoutEditorFrame(ttk.Frame):
         filter_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
         # Associa evento di modifica del filtro
-        self.filter_var.trace_add("write", lambda *args: self.update_workout_list())
+        self.filter_var.trace_add("write", lambda *args: self.schedule_filter())
         
         # Lista degli allenamenti
         list_frame = ttk.LabelFrame(left_frame, text="Allenamenti disponibili")
@@ -1045,7 +1122,7 @@ class WorkoutEditorFrame(ttk.Frame):
                         export_workouts.append((workout_name, workout))
             else:  # source == "imported"
                 # Usa gli allenamenti importati
-                import_export_frame = self.controller.import_export
+                imported_workouts = self.controller.imported_workouts
                 
                 for item in selection:
                     # Ottieni l'ID dell'allenamento
@@ -1054,8 +1131,8 @@ class WorkoutEditorFrame(ttk.Frame):
                     
                     if workout_id.startswith("imported_"):
                         index = int(workout_id.split("_")[1])
-                        if index < len(import_export_frame.imported_workouts):
-                            name, workout = import_export_frame.imported_workouts[index]
+                        if index < len(imported_workouts):
+                            name, workout = imported_workouts[index]
                             export_workouts.append((name, workout))
             
             # Esporta gli allenamenti
@@ -1163,7 +1240,7 @@ class WorkoutEditorFrame(ttk.Frame):
                         export_workouts.append((workout_name, workout))
             else:  # source == "imported"
                 # Usa gli allenamenti importati
-                import_export_frame = self.controller.import_export
+                imported_workouts = self.controller.imported_workouts
                 
                 for item in selection:
                     # Ottieni l'ID dell'allenamento
@@ -1172,8 +1249,8 @@ class WorkoutEditorFrame(ttk.Frame):
                     
                     if workout_id.startswith("imported_"):
                         index = int(workout_id.split("_")[1])
-                        if index < len(import_export_frame.imported_workouts):
-                            name, workout = import_export_frame.imported_workouts[index]
+                        if index < len(imported_workouts):
+                            name, workout = imported_workouts[index]
                             export_workouts.append((name, workout))
             
             custom_config = None
@@ -1323,6 +1400,116 @@ class WorkoutEditorFrame(ttk.Frame):
                 # Lista per tenere traccia degli errori
                 errors = []
                 
+                # Il thread aggiorna l'interfaccia solo tramite il dispatcher
+                ui = get_dispatcher(self)
+                
+                def update_progress(message, counter, value):
+                    message_var.set(message)
+                    counter_var.set(counter)
+                    progress_var.set(value)
+                
+                def on_complete(deleted, total):
+                    # Chiudi la finestra di progresso
+                    progress_window.destroy()
+                    
+                    # Elimina anche gli allenamenti locali (senza progress bar)
+                    local_deleted = len(local_workouts_to_delete)
+                    
+                    # Aggiorna la lista degli allenamenti se qualcosa è stato eliminato
+                    if deleted > 0 or local_deleted > 0:
+                        # Raccogli gli ID degli allenamenti eliminati con successo
+                        deleted_ids = set()
+                        error_names = set()
+                        
+                        # Estrai i nomi degli allenamenti che hanno avuto errori
+                        for error in errors:
+                            # Gli errori hanno il formato "Impossibile eliminare 'nome': ..."
+                            if "Impossibile eliminare '" in error:
+                                start = error.find("'") + 1
+                                end = error.find("'", start)
+                                if end > start:
+                                    error_names.add(error[start:end])
+                        
+                        # Aggiungi gli ID degli allenamenti eliminati con successo
+                        for wid, wname in workouts_to_delete:
+                            if wname not in error_names:
+                                deleted_ids.add(wid)
+                        
+                        # Aggiungi gli ID degli allenamenti locali
+                        for wid, _ in local_workouts_to_delete:
+                            deleted_ids.add(wid)
+                        
+                        # Rimuovi dalla lista workouts
+                        self.workouts = [(wid, wdata) for wid, wdata in self.workouts 
+                                       if wid not in deleted_ids]
+                        
+                        # Rimuovi gli elementi dalla vista dell'albero
+                        self.remove_workout_items(selection)
+                        
+                        # Se era selezionato l'allenamento corrente, resettalo
+                        if self.current_workout_id in deleted_ids:
+                            self.current_workout = None
+                            self.current_workout_id = None
+                            self.current_workout_modified = False
+                            self.update_steps_list()
+                            self.save_button.config(state="disabled")
+                            self.send_button.config(state="disabled")
+                            self.discard_button.config(state="disabled")
+                        
+                        # Aggiorna la lista da Garmin
+                        self.refresh_workouts()
+                    
+                    # Mostra il riepilogo
+                    if deleted == total and not errors and local_deleted == 0:
+                        # Tutti eliminati con successo
+                        show_info("Eliminazione completata", 
+                                f"Eliminati con successo tutti i {deleted} allenamenti", 
+                                parent=self)
+                    elif deleted > 0 or local_deleted > 0:
+                        # Alcuni eliminati con successo
+                        msg = []
+                        if deleted > 0:
+                            msg.append(f"{deleted} allenamenti eliminati da Garmin Connect")
+                        if local_deleted > 0:
+                            msg.append(f"{local_deleted} allenamenti locali eliminati")
+                        
+                        result_msg = "\n".join(msg)
+                        
+                        if errors:
+                            error_details = "\n".join(errors[:5])
+                            if len(errors) > 5:
+                                error_details += f"\n... e altri {len(errors) - 5} errori"
+                            result_msg += f"\n\nErrori:\n{error_details}"
+                            show_warning("Eliminazione parziale", result_msg, parent=self)
+                        else:
+                            show_info("Eliminazione completata", result_msg, parent=self)
+                    else:
+                        # Nessun allenamento eliminato
+                        error_details = "\n".join(errors[:5])
+                        if len(errors) > 5:
+                            error_details += f"\n... e altri {len(errors) - 5} errori"
+                        
+                        show_error("Eliminazione fallita", 
+                                 f"Impossibile eliminare gli allenamenti.\n\n"
+                                 f"Errori:\n{error_details}", 
+                                 parent=self)
+                    
+                    # Aggiorna la barra di stato
+                    total_deleted = deleted + local_deleted
+                    self.controller.set_status(f"Eliminati {total_deleted} allenamenti")
+                
+                def on_failure(error):
+                    # Chiudi la finestra di progresso
+                    try:
+                        progress_window.destroy()
+                    except tk.TclError:
+                        pass
+                    
+                    # Mostra messaggio di errore
+                    show_error("Errore critico", 
+                             f"Errore critico durante l'eliminazione: {error}", 
+                             parent=self)
+                
                 # Funzione per eliminare gli allenamenti
                 def delete_thread():
                     try:
@@ -1332,12 +1519,10 @@ class WorkoutEditorFrame(ttk.Frame):
                         # Per ogni allenamento da eliminare
                         for i, (workout_id, workout_name) in enumerate(workouts_to_delete):
                             try:
-                                # Aggiorna il messaggio
-                                message_var.set(f"Eliminazione di '{workout_name}'...")
-                                counter_var.set(f"{i + 1} / {total}")
-                                
-                                # Aggiorna la progressbar
-                                progress_var.set((i / total) * 100)
+                                # Aggiorna il messaggio, il contatore e la progressbar
+                                ui.post_progress(progress_window, update_progress,
+                                                 f"Eliminazione di '{workout_name}'...", f"{i + 1} / {total}",
+                                                 (i / total) * 100)
                                 
                                 # Log per debug
                                 logging.info(f"Eliminazione allenamento {i+1}/{total}: '{workout_name}' (ID: {workout_id})")
@@ -1364,120 +1549,21 @@ class WorkoutEditorFrame(ttk.Frame):
                                 continue
                         
                         # Aggiorna la progressbar al 100%
-                        progress_var.set(100)
-                        counter_var.set(f"{total} / {total}")
-                        message_var.set("Eliminazione completata")
+                        ui.post_progress(progress_window, update_progress,
+                                         "Eliminazione completata", f"{total} / {total}", 100)
                         
                         # Attendi un momento per mostrare il completamento
-                        import time
                         time.sleep(0.5)
                         
-                        # Chiudi la finestra di progresso
-                        progress_window.destroy()
-                        
-                        # Elimina anche gli allenamenti locali (senza progress bar)
-                        local_deleted = len(local_workouts_to_delete)
-                        
-                        # Aggiorna la lista degli allenamenti se qualcosa è stato eliminato
-                        if deleted > 0 or local_deleted > 0:
-                            # Raccogli gli ID degli allenamenti eliminati con successo
-                            deleted_ids = set()
-                            error_names = set()
-                            
-                            # Estrai i nomi degli allenamenti che hanno avuto errori
-                            for error in errors:
-                                # Gli errori hanno il formato "Impossibile eliminare 'nome': ..."
-                                if "Impossibile eliminare '" in error:
-                                    start = error.find("'") + 1
-                                    end = error.find("'", start)
-                                    if end > start:
-                                        error_names.add(error[start:end])
-                            
-                            # Aggiungi gli ID degli allenamenti eliminati con successo
-                            for wid, wname in workouts_to_delete:
-                                if wname not in error_names:
-                                    deleted_ids.add(wid)
-                            
-                            # Aggiungi gli ID degli allenamenti locali
-                            for wid, _ in local_workouts_to_delete:
-                                deleted_ids.add(wid)
-                            
-                            # Rimuovi dalla lista workouts
-                            self.workouts = [(wid, wdata) for wid, wdata in self.workouts 
-                                           if wid not in deleted_ids]
-                            
-                            # Rimuovi gli elementi dalla vista dell'albero
-                            for item in selection:
-                                self.workout_tree.delete(item)
-                            
-                            # Se era selezionato l'allenamento corrente, resettalo
-                            if self.current_workout_id in deleted_ids:
-                                self.current_workout = None
-                                self.current_workout_id = None
-                                self.current_workout_modified = False
-                                self.update_steps_list()
-                                self.save_button.config(state="disabled")
-                                self.send_button.config(state="disabled")
-                                self.discard_button.config(state="disabled")
-                            
-                            # Aggiorna la lista da Garmin
-                            self.refresh_workouts()
-                        
-                        # Mostra il riepilogo
-                        if deleted == total and not errors and local_deleted == 0:
-                            # Tutti eliminati con successo
-                            show_info("Eliminazione completata", 
-                                    f"Eliminati con successo tutti i {deleted} allenamenti", 
-                                    parent=self)
-                        elif deleted > 0 or local_deleted > 0:
-                            # Alcuni eliminati con successo
-                            msg = []
-                            if deleted > 0:
-                                msg.append(f"{deleted} allenamenti eliminati da Garmin Connect")
-                            if local_deleted > 0:
-                                msg.append(f"{local_deleted} allenamenti locali eliminati")
-                            
-                            result_msg = "\n".join(msg)
-                            
-                            if errors:
-                                error_details = "\n".join(errors[:5])
-                                if len(errors) > 5:
-                                    error_details += f"\n... e altri {len(errors) - 5} errori"
-                                result_msg += f"\n\nErrori:\n{error_details}"
-                                show_warning("Eliminazione parziale", result_msg, parent=self)
-                            else:
-                                show_info("Eliminazione completata", result_msg, parent=self)
-                        else:
-                            # Nessun allenamento eliminato
-                            error_details = "\n".join(errors[:5])
-                            if len(errors) > 5:
-                                error_details += f"\n... e altri {len(errors) - 5} errori"
-                            
-                            show_error("Eliminazione fallita", 
-                                     f"Impossibile eliminare gli allenamenti.\n\n"
-                                     f"Errori:\n{error_details}", 
-                                     parent=self)
-                        
-                        # Aggiorna la barra di stato
-                        total_deleted = deleted + local_deleted
-                        self.controller.set_status(f"Eliminati {total_deleted} allenamenti")
+                        ui.post(on_complete, deleted, total)
                         
                     except Exception as e:
                         logging.error(f"Errore critico nell'eliminazione: {str(e)}")
-                        
-                        # Chiudi la finestra di progresso
-                        try:
-                            progress_window.destroy()
-                        except:
-                            pass
-                        
-                        # Mostra messaggio di errore
-                        show_error("Errore critico", 
-                                 f"Errore critico durante l'eliminazione: {str(e)}", 
-                                 parent=self)
+                        ui.post(on_failure, str(e))
                 
                 # Avvia il thread di eliminazione
                 import threading
+                import time
                 threading.Thread(target=delete_thread, daemon=True).start()
                 
             else:
@@ -1491,8 +1577,7 @@ class WorkoutEditorFrame(ttk.Frame):
                                    if wid not in workout_ids_to_remove]
                     
                     # Rimuovi gli elementi dalla vista dell'albero
-                    for item in selection:
-                        self.workout_tree.delete(item)
+                    self.remove_workout_items(selection)
                     
                     # Se era selezionato l'allenamento corrente, resettalo
                     if self.current_workout_id in workout_ids_to_remove:
@@ -1509,7 +1594,7 @@ class WorkoutEditorFrame(ttk.Frame):
                            parent=self)
                     
         else:  # source == "imported"
-            import_export_frame = self.controller.import_export
+            imported_workouts = self.controller.imported_workouts
             
             # Salva gli indici degli allenamenti da eliminare
             indices_to_remove = []
@@ -1526,12 +1611,14 @@ class WorkoutEditorFrame(ttk.Frame):
             
             # Elimina gli allenamenti
             for index in indices_to_remove:
-                if index < len(import_export_frame.imported_workouts):
-                    del import_export_frame.imported_workouts[index]
+                if index < len(imported_workouts):
+                    del imported_workouts[index]
+            
+            # Aggiorna l'archivio locale
+            self.controller.save_imported_workouts()
             
             # Rimuovi gli elementi selezionati dalla vista dell'albero
-            for item in selection:
-                self.workout_tree.delete(item)
+            self.remove_workout_items(selection)
             
             # Ricarica la lista degli allenamenti importati
             self.load_imported_workouts()
@@ -1658,15 +1745,15 @@ class WorkoutEditorFrame(ttk.Frame):
         self.update_workout_list()
 
     def load_imported_workouts(self):
-        """Carica gli allenamenti importati dall'ImportExportFrame."""
-        # Accedi all'ImportExportFrame tramite il controller
-        import_export_frame = self.controller.import_export
+        """Carica gli allenamenti importati (condivisi con l'ImportExportFrame)."""
+        # Lista condivisa tramite il controller, senza costruire la scheda di importazione
+        imported_workouts = self.controller.imported_workouts
         
-        if hasattr(import_export_frame, 'imported_workouts') and import_export_frame.imported_workouts:
+        if imported_workouts:
             # Converti gli allenamenti importati nel formato usato dal WorkoutEditorFrame
             self.imported_workouts = []
             
-            for idx, (name, workout) in enumerate(import_export_frame.imported_workouts):
+            for idx, (name, workout) in enumerate(imported_workouts):
                 # Trova la data dell'allenamento se presente
                 workout_date = None
                 for step in workout.workout_steps:
@@ -1703,14 +1790,13 @@ class WorkoutEditorFrame(ttk.Frame):
                         parent=self)
 
     def update_workout_list(self):
-        """Aggiorna la lista degli allenamenti disponibili."""
-        # Ottieni il filtro
-        filter_text = self.filter_var.get().lower()
-        
-        # Pulisci la lista attuale
-        for item in self.workout_tree.get_children():
-            self.workout_tree.delete(item)
+        """
+        Aggiorna la lista degli allenamenti disponibili.
         
+        Da chiamare quando cambiano gli allenamenti: le righe vengono
+        ricalcolate e gli item dell'albero esistenti riutilizzati; il filtro
+        si limita poi a nascondere e mostrare gli item.
+        """
         # Determina la fonte degli allenamenti
         source = self.source_var.get()
         
@@ -1720,90 +1806,92 @@ class WorkoutEditorFrame(ttk.Frame):
         else:  # source == "imported"
             workouts_list = getattr(self, 'imported_workouts', [])
         
-        # Filtra gli allenamenti
-        filtered_workouts = []
-        for workout_id, workout_data in workouts_list:
-            # Estrai i dati dell'allenamento
-            if isinstance(workout_data, dict):
-                name = workout_data.get('workoutName', '')
-            else:
-                name = workout_data.workout_name
-            
-            # Applica il filtro
-            if filter_text and filter_text not in name.lower():
-                continue
-            
-            # Aggiungi all'elenco filtrato
-            filtered_workouts.append((workout_id, workout_data))
-        
-        # Aggiungi gli allenamenti filtrati alla lista
-        for workout_id, workout_data in filtered_workouts:
-            # Estrai il tipo di sport correttamente in base al tipo di dati
-            if isinstance(workout_data, dict):
-                # Se è un dizionario (come nel caso dei dati importati o di Garmin)
-                sport_type = workout_data.get('sportType', {}).get('sportTypeKey', 'running')
-                sport_icon = get_icon_for_sport(sport_type)
-                
-                # Per il conteggio degli step - ESCLUDIAMO QUELLI CON DATA
-                step_count = 0
-                if 'workoutSegments' in workout_data and workout_data['workoutSegments']:
-                    steps = workout_data.get('workoutSegments', [{}])[0].get('workoutSteps', [])
-                    # Contiamo solo gli step che non hanno data
-                    for step in steps:
-                        if isinstance(step, dict) and not ('date' in step and step['date']):
-                            step_count += 1
-                        elif hasattr(step, 'date') and not step.date:
-                            step_count += 1
-                
-                # Nome dell'allenamento
-                name = workout_data.get('workoutName', '')
-                
-                # Gestione data per dizionari
-                date_display = ""
-                if workout_data.get('date') and workout_data.get('date').strip():
-                    date_str = workout_data.get('date')
-                    # Tenta di formattare se nel formato YYYY-MM-DD
-                    try:
-                        year, month, day = date_str.split('-')
-                        date_display = f"{day}/{month}/{year}"
-                    except:
-                        date_display = date_str
-                        
-                # Verifica se è un allenamento locale
-                is_local = workout_data.get('local', False)
-                name_prefix = "[Local] " if is_local else ""
-                displayed_name = name_prefix + name
+        rows = [WorkoutRow.from_workout(workout_id, workout_data)
+                for workout_id, workout_data in workouts_list]
+        
+        # Riutilizza gli item dell'albero delle righe precedenti
+        old_rows = self._workout_rows
+        replaced = set()
+        for index, row in enumerate(rows):
+            if index < len(old_rows):
+                old = old_rows[index]
+                row.iid = old.iid
+                if row.workout_id != old.workout_id:
+                    replaced.add(row.iid)
+                if row.values != old.values or row.workout_id != old.workout_id:
+                    self.workout_tree.item(row.iid, values=row.values, tags=(row.workout_id,))
             else:
-                # Se è un oggetto Workout
-                sport_type = workout_data.sport_type
-                sport_icon = get_icon_for_sport(sport_type)
-                
-                # Conteggio step escludendo quelli con data
-                step_count = 0
-                for step in workout_data.workout_steps:
-                    if not (hasattr(step, 'date') and step.date):
-                        step_count += 1
-                        
-                name = workout_data.workout_name
-                displayed_name = name
-                
-                # Gestione data per oggetti Workout
-                date_display = ""
-                for step in workout_data.workout_steps:
-                    if hasattr(step, 'date') and step.date and step.date.strip():
-                        # Converti da YYYY-MM-DD a DD/MM/YYYY
-                        try:
-                            year, month, day = step.date.split('-')
-                            date_display = f"{day}/{month}/{year}"
-                        except:
-                            date_display = step.date
-                        break
-            
-            # Aggiungi alla lista
-            self.workout_tree.insert("", "end", 
-                                   values=(displayed_name, f"{sport_icon} {sport_type}", date_display, step_count), 
-                                   tags=(workout_id,))   
-
+                row.iid = self.workout_tree.insert("", "end", values=row.values, tags=(row.workout_id,))
+                self._attached_items.add(row.iid)
+        
+        # Elimina gli item in eccesso
+        extra = [old.iid for old in old_rows[len(rows):]]
+        if extra:
+            self.workout_tree.delete(*extra)
+            self._attached_items.difference_update(extra)
+        
+        self._workout_rows = rows
+        
+        # Un item che ora mostra un altro allenamento non deve restare selezionato,
+        # altrimenti Elimina e Invia agirebbero su quest'ultimo
+        deselect = [iid for iid in self.workout_tree.selection() if iid in replaced]
+        if deselect:
+            self.workout_tree.selection_remove(*deselect)
+        
+        # Riapplica il filtro a tutte le righe
+        self._applied_filter = None
+        self.apply_filter()
+    
+    def schedule_filter(self):
+        """Applica il filtro dopo una breve pausa nella digitazione."""
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+        
+        self._filter_after_id = self.after(FILTER_DELAY_MS, self.apply_filter)
+    
+    def apply_filter(self):
+        """Mostra solo gli allenamenti il cui nome contiene il testo del filtro."""
+        self._filter_after_id = None
+        filter_text = self.filter_var.get().lower()
+        
+        if filter_text == self._applied_filter:
+            return
+        
+        # Se il nuovo filtro restringe il precedente basta cercare tra le righe visibili
+        if self._applied_filter is not None and self._applied_filter in filter_text:
+            candidates = [row for row in self._workout_rows if row.iid in self._attached_items]
+        else:
+            candidates = self._workout_rows
+        
+        visible = [row for row in candidates if filter_text in row.search_key]
+        visible_items = {row.iid for row in visible}
+        
+        # Nascondi gli item esclusi dal filtro
+        hidden = [iid for iid in self._attached_items if iid not in visible_items]
+        if hidden:
+            self.workout_tree.detach(*hidden)
+        
+        # Reinserisci quelli di nuovo visibili, nella posizione originale
+        for index, row in enumerate(visible):
+            if row.iid not in self._attached_items:
+                self.workout_tree.move(row.iid, "", index)
+        
+        self._attached_items = visible_items
+        self._applied_filter = filter_text
+    
+    def remove_workout_items(self, items):
+        """
+        Elimina alcuni item dall'albero degli allenamenti.
+        
+        Args:
+            items: Item dell'albero da eliminare
+        """
+        items = set(items)
+        self.workout_tree.delete(*items)
+        
+        self._workout_rows = [row for row in self._workout_rows if row.iid not in items]
+        self._attached_items.difference_update(items)
+    
     def load_workout(self):
         """Carica l'allenamento selezionato nell'editor."""
         # Verifica che sia selezionato un allenamento
@@ -1896,13 +1984,13 @@ class WorkoutEditorFrame(ttk.Frame):
         else:  # source == "imported"
             try:
                 # Trova l'allenamento importato
-                import_export_frame = self.controller.import_export
+                imported_workouts = self.controller.imported_workouts
                 
                 # L'ID per gli allenamenti importati è nel formato "imported_X"
                 if workout_id.startswith("imported_"):
                     index = int(workout_id.split("_")[1])
-                    if index < len(import_export_frame.imported_workouts):
-                        name, workout = import_export_frame.imported_workouts[index]
+                    if index < len(imported_workouts):
+                        name, workout = imported_workouts[index]
                         
                         # Imposta l'allenamento corrente
                         self.current_workout = workout
@@ -1965,20 +2053,37 @@ class WorkoutEditorFrame(ttk.Frame):
             self.load_imported_workouts()
             self.update_workout_list()
     
-    def refresh_workouts(self):
-        """Aggiorna la lista degli allenamenti da Garmin Connect."""
+    def refresh_workouts(self, select_id: Optional[str] = None):
+        """
+        Aggiorna la lista degli allenamenti da Garmin Connect.
+        
+        La lista viene scaricata in background: nel frattempo resta visibile
+        quella attuale, e una nuova richiesta rende superata quella in corso.
+        
+        Args:
+            select_id: ID dell'allenamento da selezionare a lista aggiornata (opzionale)
+        """
         # Verifica che ci sia un client Garmin
         if not self.garmin_client:
             show_error("Errore", "Devi prima effettuare il login a Garmin Connect", parent=self)
             return
         
+        # Aggiorna lo stato per informare l'utente
+        self.controller.set_status("Aggiornamento allenamenti da Garmin Connect...")
+        
+        self.refresh_runner.submit('workouts', self.garmin_client.list_workouts,
+                                   lambda workouts_data: self._apply_workouts(workouts_data, select_id),
+                                   self._on_refresh_error)
+    
+    def _apply_workouts(self, workouts_data: List[Dict[str, Any]], select_id: Optional[str] = None):
+        """
+        Applica la lista degli allenamenti scaricata da Garmin Connect.
+        
+        Args:
+            workouts_data: Allenamenti restituiti da Garmin Connect
+            select_id: ID dell'allenamento da selezionare (opzionale)
+        """
         try:
-            # Aggiorna lo stato per informare l'utente
-            self.controller.set_status("Aggiornamento allenamenti da Garmin Connect...")
-            
-            # Ottieni la lista degli allenamenti
-            workouts_data = self.garmin_client.list_workouts()
-            
             # Conserva gli allenamenti locali
             local_workouts = [(wid, wdata) for wid, wdata in self.workouts if wid.startswith("local_") or (isinstance(wdata, dict) and wdata.get('local', False))]
             
@@ -1991,9 +2096,15 @@ class WorkoutEditorFrame(ttk.Frame):
             # Unisci gli allenamenti Garmin con quelli locali
             self.workouts = garmin_workouts + local_workouts
             
+            # Aggiorna la copia locale
+            get_local_store().save_garmin_workouts(self.workouts)
+            
             # Aggiorna la lista solo se siamo in modalità Garmin
             if self.source_var.get() == "garmin":
                 self.update_workout_list()
+                
+                if select_id:
+                    self.select_workout(select_id)
             
             # Mostra messaggio di conferma
             count_garmin = len(garmin_workouts)
@@ -2003,11 +2114,33 @@ class WorkoutEditorFrame(ttk.Frame):
             self.controller.set_status(msg_status)
             
         except Exception as e:
-            logging.error(f"Errore nell'aggiornamento degli allenamenti: {str(e)}")
-            show_error("Errore", 
-                     f"Impossibile aggiornare gli allenamenti: {str(e)}", 
-                     parent=self)
-            self.controller.set_status("Errore nell'aggiornamento degli allenamenti")
+            self._on_refresh_error(e)
+    
+    def _on_refresh_error(self, error: Exception):
+        """
+        Segnala un errore nell'aggiornamento degli allenamenti.
+        
+        Args:
+            error: Eccezione sollevata
+        """
+        logging.error(f"Errore nell'aggiornamento degli allenamenti: {str(error)}")
+        show_error("Errore", 
+                 f"Impossibile aggiornare gli allenamenti: {str(error)}", 
+                 parent=self)
+        self.controller.set_status("Errore nell'aggiornamento degli allenamenti")
+    
+    def select_workout(self, workout_id: str):
+        """
+        Seleziona un allenamento nella lista.
+        
+        Args:
+            workout_id: ID dell'allenamento
+        """
+        for item in self.workout_tree.get_children():
+            if self.workout_tree.item(item, "tags")[0] == workout_id:
+                self.workout_tree.selection_set(item)
+                self.workout_tree.see(item)  # Assicura che sia visibile
+                break
 
 
     def new_workout(self):
@@ -2840,24 +2973,25 @@ class WorkoutEditorFrame(ttk.Frame):
             
         else:  # source == "imported"
             # Salva nella lista degli importati
-            import_export_frame = self.controller.import_export
-            if not hasattr(import_export_frame, 'imported_workouts'):
-                import_export_frame.imported_workouts = []
+            imported_workouts = self.controller.imported_workouts
             
             # Cerca se l'allenamento è già presente
             found = False
             if self.current_workout_id and self.current_workout_id.startswith("imported_"):
                 index = int(self.current_workout_id.split("_")[1])
-                if index < len(import_export_frame.imported_workouts):
+                if index < len(imported_workouts):
                     # Aggiorna l'allenamento esistente
-                    import_export_frame.imported_workouts[index] = (self.current_workout.workout_name, self.current_workout)
+                    imported_workouts[index] = (self.current_workout.workout_name, self.current_workout)
                     found = True
             
             if not found:
                 # Aggiungi un nuovo allenamento
-                import_export_frame.imported_workouts.append((self.current_workout.workout_name, self.current_workout))
+                imported_workouts.append((self.current_workout.workout_name, self.current_workout))
                 # Assegna un ID importato
-                self.current_workout_id = f"imported_{len(import_export_frame.imported_workouts) - 1}"
+                self.current_workout_id = f"imported_{len(imported_workouts) - 1}"
+            
+            # Aggiorna l'archivio locale
+            self.controller.save_imported_workouts()
             
             # Resetta il flag di modifica
             self.current_workout_modified = False
@@ -2918,7 +3052,7 @@ class WorkoutEditorFrame(ttk.Frame):
                         break
                         
         else:  # source == "imported"
-            import_export_frame = self.controller.import_export
+            imported_workouts = self.controller.imported_workouts
             
             for item in selection:
                 workout_id = self.workout_tree.item(item, "tags")[0]
@@ -2926,8 +3060,8 @@ class WorkoutEditorFrame(ttk.Frame):
                 
                 if workout_id.startswith("imported_"):
                     index = int(workout_id.split("_")[1])
-                    if index < len(import_export_frame.imported_workouts):
-                        name, workout = import_export_frame.imported_workouts[index]
+                    if index < len(imported_workouts):
+                        name, workout = imported_workouts[index]
                         selected_workouts.append((name, workout))
         
         if not selected_workouts:
@@ -2977,6 +3111,68 @@ class WorkoutEditorFrame(ttk.Frame):
         # Lista per tenere traccia degli errori
         errors = []
         
+        # Il thread aggiorna l'interfaccia solo tramite il dispatcher
+        ui = get_dispatcher(self)
+        
+        def update_progress(message, counter, value):
+            message_var.set(message)
+            counter_var.set(counter)
+            progress_var.set(value)
+        
+        def on_complete(sent, scheduled, total):
+            # Chiudi la finestra di progresso
+            progress_window.destroy()
+            
+            # Aggiorna la lista degli allenamenti se qualcosa è stato inviato
+            if sent > 0:
+                self.controller.set_status("Aggiornamento della lista allenamenti...")
+                self.refresh_workouts()
+            
+            # Mostra il riepilogo
+            if sent == total and not errors:
+                # Tutti gli allenamenti inviati con successo
+                msg = f"Inviati con successo tutti i {sent} allenamenti"
+                if scheduled > 0:
+                    msg += f"\n{scheduled} allenamenti pianificati"
+                show_info("Invio completato", msg, parent=self)
+            elif sent > 0:
+                # Alcuni allenamenti inviati con successo
+                error_details = "\n".join(errors[:5])  # Mostra solo i primi 5 errori
+                if len(errors) > 5:
+                    error_details += f"\n... e altri {len(errors) - 5} errori"
+                
+                msg = f"Inviati {sent} allenamenti su {total}"
+                if scheduled > 0:
+                    msg += f"\n{scheduled} allenamenti pianificati"
+                msg += f"\n\nErrori:\n{error_details}"
+                
+                show_warning("Invio parziale", msg, parent=self)
+            else:
+                # Nessun allenamento inviato
+                error_details = "\n".join(errors[:5])
+                if len(errors) > 5:
+                    error_details += f"\n... e altri {len(errors) - 5} errori"
+                
+                show_error("Invio fallito", 
+                         f"Impossibile inviare gli allenamenti.\n\n"
+                         f"Errori:\n{error_details}", 
+                         parent=self)
+            
+            # Aggiorna la barra di stato
+            self.controller.set_status(f"Inviati {sent} allenamenti su {total} a Garmin Connect")
+        
+        def on_failure(error):
+            # Chiudi la finestra di progresso
+            try:
+                progress_window.destroy()
+            except tk.TclError:
+                pass
+            
+            # Mostra messaggio di errore
+            show_error("Errore critico", 
+                     f"Errore critico durante l'invio: {error}", 
+                     parent=self)
+        
         # Funzione per inviare gli allenamenti
         def send_thread():
             try:
@@ -2987,12 +3183,10 @@ class WorkoutEditorFrame(ttk.Frame):
                 # Per ogni allenamento
                 for i, (name, workout) in enumerate(selected_workouts):
                     try:
-                        # Aggiorna il messaggio
-                        message_var.set(f"Invio di '{name}'...")
-                        counter_var.set(f"{i + 1} / {total}")
-                        
-                        # Aggiorna la progressbar
-                        progress_var.set((i / total) * 100)
+                        # Aggiorna il messaggio, il contatore e la progressbar
+                        ui.post_progress(progress_window, update_progress,
+                                         f"Invio di '{name}'...", f"{i + 1} / {total}",
+                                         (i / total) * 100)
                         
                         # Log per debug
                         logging.info(f"Invio allenamento {i+1}/{total}: '{name}'")
@@ -3045,71 +3239,21 @@ class WorkoutEditorFrame(ttk.Frame):
                         continue
                 
                 # Aggiorna la progressbar al 100%
-                progress_var.set(100)
-                counter_var.set(f"{total} / {total}")
-                message_var.set("Invio completato")
+                ui.post_progress(progress_window, update_progress,
+                                 "Invio completato", f"{total} / {total}", 100)
                 
                 # Attendi un momento per mostrare il completamento
-                import time
                 time.sleep(0.5)
                 
-                # Chiudi la finestra di progresso
-                progress_window.destroy()
-                
-                # Aggiorna la lista degli allenamenti se qualcosa è stato inviato
-                if sent > 0:
-                    self.controller.set_status("Aggiornamento della lista allenamenti...")
-                    self.refresh_workouts()
-                
-                # Mostra il riepilogo
-                if sent == total and not errors:
-                    # Tutti gli allenamenti inviati con successo
-                    msg = f"Inviati con successo tutti i {sent} allenamenti"
-                    if scheduled > 0:
-                        msg += f"\n{scheduled} allenamenti pianificati"
-                    show_info("Invio completato", msg, parent=self)
-                elif sent > 0:
-                    # Alcuni allenamenti inviati con successo
-                    error_details = "\n".join(errors[:5])  # Mostra solo i primi 5 errori
-                    if len(errors) > 5:
-                        error_details += f"\n... e altri {len(errors) - 5} errori"
-                    
-                    msg = f"Inviati {sent} allenamenti su {total}"
-                    if scheduled > 0:
-                        msg += f"\n{scheduled} allenamenti pianificati"
-                    msg += f"\n\nErrori:\n{error_details}"
-                    
-                    show_warning("Invio parziale", msg, parent=self)
-                else:
-                    # Nessun allenamento inviato
-                    error_details = "\n".join(errors[:5])
-                    if len(errors) > 5:
-                        error_details += f"\n... e altri {len(errors) - 5} errori"
-                    
-                    show_error("Invio fallito", 
-                             f"Impossibile inviare gli allenamenti.\n\n"
-                             f"Errori:\n{error_details}", 
-                             parent=self)
-                
-                # Aggiorna la barra di stato
-                self.controller.set_status(f"Inviati {sent} allenamenti su {total} a Garmin Connect")
+                ui.post(on_complete, sent, scheduled, total)
                 
             except Exception as e:
                 logging.error(f"Errore critico nell'invio a Garmin Connect: {str(e)}")
-                
-                # Chiudi la finestra di progresso
-                try:
-                    progress_window.destroy()
-                except:
-                    pass
-                
-                # Mostra messaggio di errore
-                show_error("Errore critico", 
-                         f"Errore critico durante l'invio: {str(e)}", 
-                         parent=self)
+                ui.post(on_failure, str(e))
         
         # Avvia il thread di invio
         import threading
+        import time
         threading.Thread(target=send_thread, daemon=True).start()
 
     def _send_single_workout_to_garmin(self, workout, workout_id):
@@ -3190,16 +3334,10 @@ class WorkoutEditorFrame(ttk.Frame):
                 # Resetta il flag di modifica
                 self.current_workout_modified = False
                 
-                # Aggiorna la lista degli allenamenti da Garmin Connect
+                # Aggiorna la lista degli allenamenti da Garmin Connect e
+                # seleziona il nuovo allenamento quando la lista è pronta
                 self.controller.set_status("Aggiornamento della lista allenamenti...")
-                self.refresh_workouts()
-                
-                # Seleziona il nuovo allenamento nell'albero
-                for item in self.workout_tree.get_children():
-                    if self.workout_tree.item(item, "tags")[0] == new_workout_id:
-                        self.workout_tree.selection_set(item)
-                        self.workout_tree.see(item)  # Assicura che sia visibile
-                        break
+                self.refresh_workouts(select_id=new_workout_id)
                 
                 # Mostra messaggio di conferma
                 if date_str:
@@ -3278,12 +3416,12 @@ class WorkoutEditorFrame(ttk.Frame):
             else:  # source == "imported"
                 try:
                     # Trova l'allenamento importato
-                    import_export_frame = self.controller.import_export
+                    imported_workouts = self.controller.imported_workouts
                     
                     if self.current_workout_id.startswith("imported_"):
                         index = int(self.current_workout_id.split("_")[1])
-                        if index < len(import_export_frame.imported_workouts):
-                            name, workout = import_export_frame.imported_workouts[index]
+                        if index < len(imported_workouts):
+                            name, workout = imported_workouts[index]
                             
                             # Imposta l'allenamento corrente
                             self.current_workout = workout
@@ -3338,6 +3476,9 @@ class WorkoutEditorFrame(ttk.Frame):
         """Gestisce l'evento di logout."""
         self.garmin_client = None
         
+        # Scarta l'aggiornamento ancora in corso
+        self.refresh_runner.cancel('workouts')
+        
         # Disabilita i pulsanti
         self.refresh_button.config(state="disabled")
         
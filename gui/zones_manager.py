@@ -451,7 +451,7 @@ class ZonesManagerFrame(ttk.Frame):
         
         def on_zone_added(zone):
             # Aggiungi la zona alla configurazione
-            self.config.config['heart_rates'][zone.name] = zone.to_string()
+            self.config.set(f'heart_rates.{zone.name}', zone.to_string())
             
             # Aggiorna la lista
             self.update_hr_zones_list()
@@ -484,11 +484,10 @@ class ZonesManagerFrame(ttk.Frame):
             # Controlla se il nome è cambiato
             if edited_zone.name != zone_name:
                 # Rimuovi la vecchia zona
-                if zone_name in self.config.config['heart_rates']:
-                    del self.config.config['heart_rates'][zone_name]
+                self.config.delete(f'heart_rates.{zone_name}')
             
             # Aggiorna o aggiungi la zona
-            self.config.config['heart_rates'][edited_zone.name] = edited_zone.to_string()
+            self.config.set(f'heart_rates.{edited_zone.name}', edited_zone.to_string())
             
             # Aggiorna la lista
             self.update_hr_zones_list()
@@ -513,8 +512,7 @@ class ZonesManagerFrame(ttk.Frame):
             return
         
         # Elimina la zona
-        if zone_name in self.config.config['heart_rates']:
-            del self.config.config['heart_rates'][zone_name]
+        self.config.delete(f'heart_rates.{zone_name}')
         
         # Aggiorna la lista
         self.update_hr_zones_list()
@@ -541,7 +539,7 @@ class ZonesManagerFrame(ttk.Frame):
         
         def on_zone_added(zone):
             # Aggiungi la zona alla configurazione
-            self.config.config['sports'][sport_type]['paces'][zone.name] = zone.to_string()
+            self.config.set(f'sports.{sport_type}.paces.{zone.name}', zone.to_string())
             
             # Aggiorna la lista
             self.update_pace_zones_list(sport_type)
@@ -580,11 +578,10 @@ class ZonesManagerFrame(ttk.Frame):
             # Controlla se il nome è cambiato
             if edited_zone.name != zone_name:
                 # Rimuovi la vecchia zona
-                if zone_name in self.config.config['sports'][sport_type]['paces']:
-                    del self.config.config['sports'][sport_type]['paces'][zone_name]
+                self.config.delete(f'sports.{sport_type}.paces.{zone_name}')
             
             # Aggiorna o aggiungi la zona
-            self.config.config['sports'][sport_type]['paces'][edited_zone.name] = edited_zone.to_string()
+            self.config.set(f'sports.{sport_type}.paces.{edited_zone.name}', edited_zone.to_string())
             
             # Aggiorna la lista
             self.update_pace_zones_list(sport_type)
@@ -615,8 +612,7 @@ class ZonesManagerFrame(ttk.Frame):
             return
         
         # Elimina la zona
-        if zone_name in self.config.config['sports'][sport_type]['paces']:
-            del self.config.config['sports'][sport_type]['paces'][zone_name]
+        self.config.delete(f'sports.{sport_type}.paces.{zone_name}')
         
         # Aggiorna la lista
         self.update_pace_zones_list(sport_type)
@@ -653,7 +649,7 @@ class ZonesManagerFrame(ttk.Frame):
         
         def on_zone_added(zone):
             # Aggiungi la zona alla configurazione
-            self.config.config['sports']['cycling']['power_values'][zone.name] = zone.to_string()
+            self.config.set(f'sports.cycling.power_values.{zone.name}', zone.to_string())
             
             # Aggiorna la lista
             self.update_power_zones_list()
@@ -686,11 +682,10 @@ class ZonesManagerFrame(ttk.Frame):
             # Controlla se il nome è cambiato
             if edited_zone.name != zone_name:
                 # Rimuovi la vecchia zona
-                if zone_name in self.config.config['sports']['cycling']['power_values']:
-                    del self.config.config['sports']['cycling']['power_values'][zone_name]
+                self.config.delete(f'sports.cycling.power_values.{zone_name}')
             
             # Aggiorna o aggiungi la zona
-            self.config.config['sports']['cycling']['power_values'][edited_zone.name] = edited_zone.to_string()
+            self.config.set(f'sports.cycling.power_values.{edited_zone.name}', edited_zone.to_string())
             
             # Aggiorna la lista
             self.update_power_zones_list()
@@ -715,8 +710,7 @@ class ZonesManagerFrame(ttk.Frame):
             return
         
         # Elimina la zona
-        if zone_name in self.config.config['sports']['cycling']['power_values']:
-            del self.config.config['sports']['cycling']['power_values'][zone_name]
+        self.config.delete(f'sports.cycling.power_values.{zone_name}')
         
         # Aggiorna la lista
         self.update_power_zones_list()
@@ -978,10 +972,10 @@ class ZonesManagerFrame(ttk.Frame):
         self.power_down_var.set(str(default_config['sports']['cycling']['margins']['power_down']))
         
         # Ripristina tutte le zone
-        self.config.config['heart_rates'] = default_config['heart_rates'].copy()
-        self.config.config['sports']['running']['paces'] = default_config['sports']['running']['paces'].copy()
-        self.config.config['sports']['swimming']['paces'] = default_config['sports']['swimming']['paces'].copy()
-        self.config.config['sports']['cycling']['power_values'] = default_config['sports']['cycling']['power_values'].copy()
+        self.config.replace_section('heart_rates', default_config['heart_rates'])
+        self.config.replace_section('sports.running.paces', default_config['sports']['running']['paces'])
+        self.config.replace_section('sports.swimming.paces', default_config['sports']['swimming']['paces'])
+        self.config.replace_section('sports.cycling.power_values', default_config['sports']['cycling']['power_values'])
         
         # Aggiorna le liste
         self.load_zones()
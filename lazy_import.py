@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Importazione differita delle dipendenze pesanti (pandas, openpyxl, garth).
+"""
+
+import importlib
+import importlib.util
+import logging
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Segnaposto di un modulo che viene importato al primo accesso a un attributo.
+    
+    Permette di scrivere `pd = lazy_import('pandas')` in cima a un modulo
+    e usare `pd.DataFrame` come al solito, spostando il costo
+    dell'importazione al primo utilizzo effettivo.
+    """
+    
+    def __init__(self, name: str):
+        """
+        Inizializza il segnaposto.
+        
+        Args:
+            name: Nome completo del modulo da importare
+        """
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+    
+    def _load(self) -> types.ModuleType:
+        """
+        Importa il modulo reale, una sola volta.
+        
+        Returns:
+            Il modulo importato
+        
+        Raises:
+            ImportError: Se il modulo non è installato
+        """
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    logging.debug(f"Importazione differita di {self.__name__}")
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+    
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+    
+    def __dir__(self):
+        return dir(self._load())
+    
+    def __repr__(self) -> str:
+        state = 'caricato' if self.__dict__['_lazy_module'] is not None else 'non caricato'
+        return f"<modulo differito '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Restituisce un modulo che verrà importato al primo utilizzo.
+    
+    Se il modulo è già stato importato viene restituito direttamente.
+    
+    Args:
+        name: Nome completo del modulo
+    
+    Returns:
+        Il modulo, o un segnaposto che lo importa al primo accesso
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_available(*names: str) -> bool:
+    """
+    Verifica se dei moduli sono installati, senza importarli.
+    
+    Args:
+        names: Nomi dei pacchetti di primo livello (es. 'pandas')
+    
+    Returns:
+        True se tutti i moduli sono installati
+    """
+    for name in names:
+        if name in sys.modules:
+            continue
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):
+            return False
+    return True
+
@@ -7,9 +7,92 @@ Punto di ingresso principale per l'applicazione GarminPlannerGUI.
 
 import os
 import sys
+import time
+import builtins
 import logging
 import argparse
-from tkinter import Tk
+import threading
+import multiprocessing
+import importlib.util
+
+
+class StartupProfiler:
+    """
+    Misura il tempo di avvio e il costo di importazione di ogni modulo.
+    
+    Sostituisce temporaneamente __import__ per cronometrare i moduli importati
+    per la prima volta nel thread principale, distinguendo il tempo proprio
+    di ogni modulo da quello cumulativo (comprese le sue dipendenze).
+    """
+    
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.phases = []    # (fase, secondi dall'avvio)
+        self.modules = []   # (modulo, tempo proprio, tempo cumulativo)
+        self._children = []
+        self._original_import = None
+    
+    def start(self):
+        """Inizia a cronometrare le importazioni."""
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+    
+    def stop(self):
+        """Smette di cronometrare le importazioni."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+    
+    def mark(self, phase):
+        """
+        Registra il completamento di una fase dell'avvio.
+        
+        Args:
+            phase: Descrizione della fase
+        """
+        self.phases.append((phase, time.perf_counter() - self.start_time))
+    
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module_name = name
+        if level:
+            package = (globals or {}).get('__package__') or ''
+            try:
+                module_name = importlib.util.resolve_name('.' * level + name, package)
+            except (ImportError, ValueError):
+                pass
+        
+        # Cronometra solo i moduli nuovi importati dal thread principale
+        if module_name in sys.modules or threading.current_thread() is not threading.main_thread():
+            return self._original_import(name, globals, locals, fromlist, level)
+        
+        self._children.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self.modules.append((module_name, elapsed - children, elapsed))
+    
+    def report(self, limit=25):
+        """
+        Scrive nel log il riepilogo dell'avvio.
+        
+        Args:
+            limit: Numero di moduli più costosi da riportare
+        """
+        logging.info("Profilo di avvio:")
+        for phase, elapsed in self.phases:
+            logging.info(f"  {elapsed * 1000:8.1f} ms  {phase}")
+        
+        total = sum(own for _, own, _ in self.modules)
+        logging.info(f"Importazione di {len(self.modules)} moduli: {total * 1000:.1f} ms")
+        logging.info(f"  {'proprio':>10}  {'cumulativo':>10}  modulo")
+        for name, own, cumulative in sorted(self.modules, key=lambda m: m[1], reverse=True)[:limit]:
+            logging.info(f"  {own * 1000:7.1f} ms  {cumulative * 1000:7.1f} ms  {name}")
+
 
 # Configurazione del logging
 def setup_logging(log_level=logging.INFO):
@@ -46,14 +129,32 @@ def parse_arguments():
     
     parser.add_argument('--debug', action='store_true', help='Abilita il logging di debug')
     parser.add_argument('--config', default='config.yaml', help='Percorso del file di configurazione')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Riporta nel log i tempi di avvio e il costo di importazione dei moduli")
+    
+    # Comandi senza interfaccia grafica: senza comando si avvia l'interfaccia
+    import cli
+    subparsers = parser.add_subparsers(dest='command', metavar='COMANDO',
+                                       title='comandi senza interfaccia grafica')
+    cli.add_commands(subparsers)
     
     return parser.parse_args()
 
 def main():
     """Funzione principale dell'applicazione."""
+    # Avvia il profilo di avvio se richiesto, prima di analizzare gli argomenti:
+    # parse_arguments() importa cli e con esso config e yaml
+    profiler = None
+    if '--profile-startup' in sys.argv[1:]:
+        profiler = StartupProfiler()
+        profiler.start()
+    
     # Parsa gli argomenti
     args = parse_arguments()
     
+    if profiler:
+        profiler.mark("Argomenti")
+    
     # Setup del logging
     if args.debug:
         setup_logging(logging.DEBUG)
@@ -65,17 +166,49 @@ def main():
     # Crea le directory necessarie
     create_required_directories()
     
+    if profiler:
+        profiler.mark("Logging e directory")
+    
+    # Esegue un comando senza importare tkinter
+    if args.command:
+        import cli
+        exit_code = cli.run(args)
+        
+        if profiler:
+            profiler.mark(f"Comando {args.command}")
+            profiler.stop()
+            profiler.report()
+        
+        sys.exit(exit_code)
+    
     # Importa il modulo app solo dopo la configurazione del logging
+    from tkinter import Tk
     from gui.app import GarminPlannerApp
     
+    if profiler:
+        profiler.mark("Importazione dell'interfaccia")
+    
     # Crea l'applicazione Tkinter
     root = Tk()
     app = GarminPlannerApp(root, config_path=args.config)
     
+    if profiler:
+        profiler.mark("Creazione della finestra")
+        
+        def _report_startup():
+            profiler.mark("Prima finestra visualizzata")
+            profiler.stop()
+            profiler.report()
+        
+        # Il riepilogo viene scritto quando il loop principale è partito
+        root.after_idle(_report_startup)
+    
     # Avvia il loop principale dell'applicazione
     root.mainloop()
     
     logging.info("GarminPlannerGUI terminated.")
 
 if __name__ == "__main__":
+    # Necessario per i processi di importazione nell'eseguibile PyInstaller
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
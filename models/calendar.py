@@ -7,6 +7,7 @@ Modello per il calendario di allenamenti.
 
 import datetime
 import calendar
+from bisect import bisect_left, bisect_right, insort
 from typing import Dict, Any, List, Tuple, Optional, Union
 
 
@@ -248,6 +249,9 @@ class CalendarMonth:
         self.year = year
         self.month = month
         self.days = {}
+        
+        # Calendario che indicizza questo mese (impostato da Calendar)
+        self._calendar = None
     
     def add_day(self, day: CalendarDay) -> None:
         """
@@ -257,6 +261,10 @@ class CalendarMonth:
             day: Giorno da aggiungere
         """
         self.days[day.date] = day
+        
+        # Aggiorna l'indice del calendario
+        if self._calendar is not None:
+            self._calendar._index_day(day)
     
     def get_day(self, date: str) -> Optional[CalendarDay]:
         """
@@ -281,7 +289,7 @@ class CalendarMonth:
             Giorno
         """
         if date not in self.days:
-            self.days[date] = CalendarDay(date)
+            self.add_day(CalendarDay(date))
         return self.days[date]
     
     def add_item(self, item: CalendarItem) -> None:
@@ -369,6 +377,10 @@ class Calendar:
     def __init__(self):
         """Inizializza un calendario."""
         self.months = {}
+        
+        # Indice ordinato delle date (ordinali) per le query per intervallo
+        self._date_index = []
+        self._days_by_ordinal = {}
     
     def add_month(self, month: CalendarMonth) -> None:
         """
@@ -378,7 +390,19 @@ class Calendar:
             month: Mese da aggiungere
         """
         key = f"{month.year}-{month.month:02d}"
+        
+        # Se il mese sostituisce uno già presente, rimuovi i vecchi giorni dall'indice
+        previous = self.months.get(key)
+        if previous is not None and previous is not month:
+            for day in previous.days.values():
+                self._unindex_day(day)
+            previous._calendar = None
+        
         self.months[key] = month
+        month._calendar = self
+        
+        for day in month.days.values():
+            self._index_day(day)
     
     def get_month(self, year: int, month: int) -> Optional[CalendarMonth]:
         """
@@ -407,7 +431,7 @@ class Calendar:
         """
         key = f"{year}-{month:02d}"
         if key not in self.months:
-            self.months[key] = CalendarMonth(year, month)
+            self.add_month(CalendarMonth(year, month))
         return self.months[key]
     
     def add_item(self, item: CalendarItem) -> None:
@@ -425,9 +449,40 @@ class Calendar:
         # Ottieni o crea il mese
         month_obj = self.get_or_create_month(year, month)
         
-        # Aggiungi l'item
+        # Aggiungi l'item (il giorno viene indicizzato alla creazione)
         month_obj.add_item(item)
     
+    def remove_item(self, item_id: str, date: Optional[str] = None) -> bool:
+        """
+        Rimuove un item dal calendario.
+        
+        Args:
+            item_id: ID dell'item da rimuovere
+            date: Data dell'item (formato YYYY-MM-DD), se nota evita la ricerca su tutto il calendario
+            
+        Returns:
+            True se l'item è stato trovato e rimosso, False altrimenti
+        """
+        if date:
+            day = self._days_by_ordinal.get(self._date_to_ordinal(date))
+            days = [day] if day else []
+        else:
+            days = [self._days_by_ordinal[ordinal] for ordinal in self._date_index]
+        
+        for day in days:
+            if day.get_item(item_id):
+                day.remove_item(item_id)
+                
+                # I giorni senza item non servono più nell'indice
+                if not day.items:
+                    self._unindex_day(day)
+                    month_obj = self.get_month(*map(int, day.date.split('-')[:2]))
+                    if month_obj:
+                        month_obj.days.pop(day.date, None)
+                return True
+        
+        return False
+    
     def get_items_by_date_range(self, start_date: str, end_date: str) -> List[CalendarItem]:
         """
         Ottiene gli item in un intervallo di date.
@@ -437,37 +492,55 @@ class Calendar:
             end_date: Data di fine (formato YYYY-MM-DD)
             
         Returns:
-            Lista di item
+            Lista di item ordinata per data
         """
-        # Converti le date in oggetti datetime
-        start_obj = datetime.datetime.strptime(start_date, '%Y-%m-%d')
-        end_obj = datetime.datetime.strptime(end_date, '%Y-%m-%d')
+        start = bisect_left(self._date_index, self._date_to_ordinal(start_date))
+        end = bisect_right(self._date_index, self._date_to_ordinal(end_date))
         
-        # Raccogli gli item
         items = []
-        
-        # Per ogni mese nell'intervallo
-        current = start_obj
-        while current <= end_obj:
-            # Ottieni il mese
-            month_obj = self.get_month(current.year, current.month)
-            
-            if month_obj:
-                # Per ogni giorno nel mese
-                for date, day in month_obj.days.items():
-                    # Verifica che la data sia nell'intervallo
-                    date_obj = datetime.datetime.strptime(date, '%Y-%m-%d')
-                    if start_obj <= date_obj <= end_obj:
-                        items.extend(day.items)
-            
-            # Passa al mese successivo
-            if current.month == 12:
-                current = datetime.datetime(current.year + 1, 1, 1)
-            else:
-                current = datetime.datetime(current.year, current.month + 1, 1)
+        for ordinal in self._date_index[start:end]:
+            items.extend(self._days_by_ordinal[ordinal].items)
         
         return items
     
+    def _index_day(self, day: CalendarDay) -> None:
+        """
+        Aggiunge un giorno all'indice ordinato delle date.
+        
+        Args:
+            day: Giorno da indicizzare
+        """
+        ordinal = self._date_to_ordinal(day.date)
+        if ordinal not in self._days_by_ordinal:
+            insort(self._date_index, ordinal)
+        self._days_by_ordinal[ordinal] = day
+    
+    def _unindex_day(self, day: CalendarDay) -> None:
+        """
+        Rimuove un giorno dall'indice ordinato delle date.
+        
+        Args:
+            day: Giorno da rimuovere
+        """
+        ordinal = self._date_to_ordinal(day.date)
+        if self._days_by_ordinal.get(ordinal) is day:
+            del self._days_by_ordinal[ordinal]
+            position = bisect_left(self._date_index, ordinal)
+            del self._date_index[position]
+    
+    @staticmethod
+    def _date_to_ordinal(date: str) -> int:
+        """
+        Converte una data nel formato YYYY-MM-DD in ordinale.
+        
+        Args:
+            date: Data da convertire
+            
+        Returns:
+            Ordinale della data
+        """
+        return datetime.date.fromisoformat(date).toordinal()
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Converte il calendario in un dizionario.
@@ -10,6 +10,24 @@ import re
 from typing import Dict, Any, List, Optional, Union
 from config import get_config
 
+
+def _pace_to_seconds(pace: str) -> int:
+    """
+    Converte un passo nel formato mm:ss in secondi.
+    
+    Args:
+        pace: Passo da convertire
+        
+    Returns:
+        Secondi totali (0 se il formato non è valido)
+    """
+    try:
+        minutes, seconds = pace.split(':')
+        return int(minutes) * 60 + int(seconds)
+    except (ValueError, IndexError, AttributeError):
+        return 0
+
+
 class Target:
     """Classe per i target degli step."""
     
@@ -123,9 +141,8 @@ class Target:
         slower_margin = margins.get('slower', '0:05')
         
         # Converti i margini in secondi
-        from gui.utils import pace_to_seconds
-        faster_seconds = pace_to_seconds(faster_margin)
-        slower_seconds = pace_to_seconds(slower_margin)
+        faster_seconds = _pace_to_seconds(faster_margin)
+        slower_seconds = _pace_to_seconds(slower_margin)
         
         # Calcola i valori di passo con i margini
         # Prendi il valore di base (solitamente to_value)
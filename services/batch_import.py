@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Importazione in parallelo di più file di piani di allenamento.
+"""
+
+import os
+import glob
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterable
+
+from config import get_config, reset_config
+from models.workout import Workout
+
+
+# Formati supportati: estensione -> tipo di file
+SUPPORTED_EXTENSIONS = {
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.xlsx': 'excel',
+    '.xls': 'excel',
+    '.jsonl': 'jsonl',
+}
+
+# Sezioni della configurazione che un'importazione può modificare
+IMPORTED_CONFIG_KEYS = ('athlete_name', 'planning', 'sports', 'heart_rates', 'hr_margins')
+
+
+class FileImportResult:
+    """Risultato dell'importazione di un singolo file."""
+    
+    def __init__(self, file_path: str, workouts: Optional[List[Tuple[str, Workout]]] = None,
+                 config_changes: Optional[List[Tuple[str, Any]]] = None,
+                 error: Optional[str] = None, elapsed: float = 0.0):
+        """
+        Inizializza il risultato.
+        
+        Args:
+            file_path: Percorso del file
+            workouts: Allenamenti importati (nome, allenamento)
+            config_changes: Modifiche alla configurazione (chiave, valore)
+            error: Messaggio di errore, None se l'importazione è riuscita
+            elapsed: Tempo di analisi in secondi
+        """
+        self.file_path = file_path
+        self.workouts = workouts or []
+        self.config_changes = config_changes or []
+        self.error = error
+        self.elapsed = elapsed
+    
+    @property
+    def ok(self) -> bool:
+        """True se l'importazione è riuscita."""
+        return self.error is None
+
+
+class BatchImportResult:
+    """Risultato complessivo dell'importazione di più file."""
+    
+    def __init__(self, files: List[FileImportResult], elapsed: float = 0.0):
+        """
+        Inizializza il risultato.
+        
+        Args:
+            files: Risultati dei singoli file, nell'ordine di importazione
+            elapsed: Tempo totale in secondi
+        """
+        self.files = files
+        self.elapsed = elapsed
+    
+    @property
+    def workouts(self) -> List[Tuple[str, Workout]]:
+        """Allenamenti di tutti i file importati correttamente, nell'ordine dei file."""
+        return [item for result in self.files for item in result.workouts]
+    
+    @property
+    def errors(self) -> Dict[str, str]:
+        """Errori per file (percorso -> messaggio)."""
+        return {result.file_path: result.error for result in self.files if not result.ok}
+
+
+def importer_for(file_path: str) -> Callable[[str], Iterable[Tuple[str, Workout]]]:
+    """
+    Restituisce la funzione di importazione adatta all'estensione di un file.
+    
+    Args:
+        file_path: Percorso del file
+    
+    Returns:
+        Funzione che riceve il percorso e restituisce le tuple (nome, allenamento)
+    
+    Raises:
+        ValueError: Se il formato non è supportato
+    """
+    # Importati qui per non caricarli nel processo principale se non servono
+    from services.excel_service import ExcelService
+    from services.yaml_service import YamlService
+    from services.jsonl_service import JsonlService
+    
+    kind = SUPPORTED_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+    if kind == 'yaml':
+        return YamlService.iter_workouts
+    if kind == 'excel':
+        return ExcelService.import_workouts
+    if kind == 'jsonl':
+        return JsonlService.iter_workouts
+    raise ValueError(f"Formato non supportato: {os.path.basename(file_path)}")
+
+
+def _import_file(file_path: str, config_path: str, base_config: str) -> FileImportResult:
+    """
+    Importa un file in un processo di lavoro.
+    
+    Ogni file parte dalla stessa configurazione del processo principale, così
+    le sezioni di un file non influiscono sugli altri; la configurazione del
+    processo di lavoro non viene mai salvata su disco.
+    
+    Args:
+        file_path: Percorso del file
+        config_path: Percorso del file di configurazione
+        base_config: Configurazione del processo principale (JSON)
+    
+    Returns:
+        Risultato dell'importazione
+    """
+    from services.plan_cache import get_plan_cache
+    
+    started = time.perf_counter()
+    
+    # La configurazione del processo di lavoro non deve mai essere scritta
+    get_config(config_path).persistence_enabled = False
+    reset_config()
+    
+    config = get_config(config_path)
+    config.persistence_enabled = False
+    config.from_json(base_config)
+    
+    # Registra le chiavi della configurazione modificate dall'importazione
+    changed_keys = []
+    
+    def record(changed_key: Optional[str], version: int) -> None:
+        if changed_key and changed_key.split('.', 1)[0] in IMPORTED_CONFIG_KEYS and changed_key not in changed_keys:
+            changed_keys.append(changed_key)
+    
+    config.subscribe(record)
+    try:
+        workouts = get_plan_cache().import_workouts(file_path, importer_for(file_path))
+        config_changes = [(key, config.get(key)) for key in changed_keys]
+        
+        return FileImportResult(file_path, workouts, config_changes, elapsed=time.perf_counter() - started)
+    
+    except Exception as e:
+        return FileImportResult(file_path, error=str(e), elapsed=time.perf_counter() - started)
+    finally:
+        config.unsubscribe(record)
+
+
+class BatchImportService:
+    """Servizio per l'importazione in parallelo di cartelle di piani."""
+    
+    @staticmethod
+    def find_plan_files(source: str) -> List[str]:
+        """
+        Trova i file di piani in una cartella o corrispondenti a un pattern glob.
+        
+        Args:
+            source: Cartella o pattern (es. 'training_plans/*.yaml')
+        
+        Returns:
+            Percorsi dei file supportati, in ordine alfabetico
+        """
+        if os.path.isdir(source):
+            paths = [os.path.join(source, name) for name in os.listdir(source)]
+        else:
+            paths = glob.glob(source)
+        
+        return sorted(
+            path for path in paths
+            if os.path.isfile(path)
+            and os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS
+            and not os.path.basename(path).startswith('~$')  # File di blocco di Excel
+        )
+    
+    @staticmethod
+    def import_files(file_paths: List[str], max_workers: Optional[int] = None,
+                     progress_callback: Optional[Callable[[int, int, FileImportResult], None]] = None,
+                     apply_config: bool = True) -> BatchImportResult:
+        """
+        Importa più file in parallelo su processi separati.
+        
+        Args:
+            file_paths: Percorsi dei file
+            max_workers: Numero massimo di processi (predefinito: numero di core)
+            progress_callback: Funzione chiamata con (completati, totale, risultato)
+                               al termine di ogni file
+            apply_config: Se True applica alla configurazione le sezioni dei file,
+                          nell'ordine dei file, come con importazioni successive
+        
+        Returns:
+            Risultato complessivo, con i file nell'ordine ricevuto
+        """
+        started = time.perf_counter()
+        results = {}
+        
+        if file_paths:
+            config = get_config()
+            base_config = config.to_json()
+            workers = max(1, min(len(file_paths), max_workers or os.cpu_count() or 1))
+            
+            logging.info(f"Importazione di {len(file_paths)} file con {workers} processi")
+            
+            # Processi avviati con spawn: il fork di un processo con più thread
+            # (Tk, dispatcher, sincronizzazione) può lasciare nel figlio un lock
+            # acquisito e bloccarlo; i processi ricostruiscono comunque la
+            # configurazione dal JSON
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = {
+                    executor.submit(_import_file, path, config.config_path, base_config): path
+                    for path in file_paths
+                }
+                
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Il processo di lavoro è terminato in modo anomalo
+                        result = FileImportResult(path, error=str(e))
+                    
+                    if result.ok:
+                        logging.info(f"Importati {len(result.workouts)} allenamenti da {path} "
+                                     f"in {result.elapsed:.2f}s")
+                    else:
+                        logging.error(f"Errore nell'importazione di {path}: {result.error}")
+                    
+                    results[path] = result
+                    if progress_callback:
+                        progress_callback(len(results), len(file_paths), result)
+        
+        batch = BatchImportResult([results[path] for path in file_paths], time.perf_counter() - started)
+        
+        if apply_config:
+            BatchImportService.apply_config_changes(batch)
+        
+        return batch
+    
+    @staticmethod
+    def import_folder(source: str, max_workers: Optional[int] = None,
+                      progress_callback: Optional[Callable[[int, int, FileImportResult], None]] = None,
+                      apply_config: bool = True) -> BatchImportResult:
+        """
+        Importa in parallelo tutti i file di piani di una cartella o di un pattern glob.
+        
+        Args:
+            source: Cartella o pattern
+            max_workers: Numero massimo di processi (predefinito: numero di core)
+            progress_callback: Funzione chiamata con (completati, totale, risultato)
+            apply_config: Se True applica alla configurazione le sezioni dei file
+        
+        Returns:
+            Risultato complessivo
+        """
+        return BatchImportService.import_files(BatchImportService.find_plan_files(source),
+                                               max_workers, progress_callback, apply_config)
+    
+    @staticmethod
+    def apply_config_changes(batch: BatchImportResult) -> None:
+        """
+        Applica alla configurazione le modifiche dei file importati, nell'ordine dei file.
+        
+        Args:
+            batch: Risultato dell'importazione
+        """
+        config = get_config()
+        changed = False
+        
+        for result in batch.files:
+            for key, value in result.config_changes:
+                if value is None:
+                    config.delete(key)
+                else:
+                    config.set(key, value)
+                changed = True
+        
+        if changed:
+            config.save()
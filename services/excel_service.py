@@ -8,20 +8,44 @@ Servizio per la gestione dei file Excel.
 import logging
 import re
 import os
+import datetime
+from copy import copy
 from typing import Dict, Any, List, Tuple, Optional
 
-try:
-    import pandas as pd
-    import openpyxl
-    from openpyxl.styles import PatternFill, Border, Side, Alignment, Protection, Font, NamedStyle
-    from openpyxl.utils import get_column_letter
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-
 from config import get_config
+from lazy_import import lazy_import, is_available
 from models.workout import Workout, WorkoutStep, Target
 
+# pandas, numpy e openpyxl vengono importati solo al primo utilizzo
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+PANDAS_AVAILABLE = is_available('numpy', 'pandas', 'openpyxl')
+
+
+# Colonne lette da ciascun foglio in importazione, con il relativo tipo.
+# I valori restano 'object' per conservare numeri, testi e date così come
+# sono nelle celle.
+IMPORT_SHEET_COLUMNS = {
+    'Config': {'Parameter': object, 'Value': object},
+    'Paces': {'Name': object, 'Value': object},
+    'HeartRates': {'Name': object, 'Value': object},
+    'Workouts': {'Week': object, 'Session': object, 'Date': object, 'Sport': object,
+                 'Description': object, 'Steps': object},
+}
+
+# Colonne di ciascun foglio in esportazione
+EXPORT_SHEET_COLUMNS = {
+    'Config': ['Parametro', 'Valore', 'Descrizione'],
+    'Paces': ['Name', 'Value', 'Note'],
+    'HeartRates': ['Name', 'Value', 'Description'],
+    'Workouts': ['Week', 'Session', 'Date', 'Sport', 'Description', 'Steps'],
+    'Examples': ['Type', 'Example', 'Description'],
+}
+
+# Larghezze minima e massima (predefinita) delle colonne esportate
+MIN_COLUMN_WIDTH = 10
+MAX_COLUMN_WIDTH = 60
+
 
 class ExcelService:
     """Servizio per la gestione dei file Excel."""
@@ -37,6 +61,27 @@ class ExcelService:
         if not PANDAS_AVAILABLE:
             raise ImportError("pandas e openpyxl sono richiesti per gestire i file Excel")
     
+    @staticmethod
+    def _read_sheet(xls: 'pd.ExcelFile', sheet_name: str) -> Optional['pd.DataFrame']:
+        """
+        Legge un foglio dalla cartella di lavoro già aperta.
+        
+        Vengono lette solo le colonne usate dall'importazione, con tipi espliciti,
+        senza riaprire né rianalizzare il file.
+        
+        Args:
+            xls: Cartella di lavoro aperta
+            sheet_name: Nome del foglio
+            
+        Returns:
+            DataFrame del foglio o None se il foglio non esiste
+        """
+        if sheet_name not in xls.sheet_names:
+            return None
+        
+        columns = IMPORT_SHEET_COLUMNS[sheet_name]
+        return xls.parse(sheet_name, usecols=lambda column: column in columns, dtype=columns)
+    
 
     @staticmethod
     def import_workouts(file_path: str) -> List[Tuple[str, Workout]]:
@@ -56,163 +101,28 @@ class ExcelService:
         ExcelService.check_pandas()
         
         try:
-            # Leggi il file Excel
-            xls = pd.ExcelFile(file_path)
+            # Leggi il file Excel una sola volta: openpyxl lo apre in sola lettura
+            # e tutti i fogli vengono estratti dalla stessa cartella di lavoro
+            with pd.ExcelFile(file_path, engine='openpyxl') as xls:
+                config_df = ExcelService._read_sheet(xls, 'Config')
+                paces_df = ExcelService._read_sheet(xls, 'Paces')
+                hr_df = ExcelService._read_sheet(xls, 'HeartRates')
+                workouts_df = ExcelService._read_sheet(xls, 'Workouts')
             
             # Ottieni la configurazione corrente
             config = get_config()
             
             # Processa i fogli di configurazione se presenti
-            if 'Config' in xls.sheet_names:
-                config_df = pd.read_excel(file_path, sheet_name='Config')
-                
-                logging.info(f"Foglio 'Config' trovato. Colonne: {config_df.columns.tolist()}")
-                
-                # Verifica che le colonne necessarie siano presenti
-                if 'Parameter' in config_df.columns and 'Value' in config_df.columns:
-                    for _, row in config_df.iterrows():
-                        param = row.get('Parameter')
-                        value = row.get('Value')
-                        
-                        if pd.notna(param) and pd.notna(value):
-                            str_value = str(value).strip()
-                            
-                            # Imposta i parametri nella configurazione
-                            if param == 'athlete_name':
-                                config.set('athlete_name', str_value)
-                            elif param == 'name_prefix':
-                                config.set('planning.name_prefix', str_value)
-                            elif param == 'race_day':
-                                config.set('planning.race_day', str_value)
-                            elif param == 'preferred_days':
-                                # Converti la stringa in lista di interi
-                                try:
-                                    # Gestisci vari formati
-                                    if '[' in str_value:
-                                        # Formato: [1, 3, 5] o [1,3,5]
-                                        days_str = str_value.strip('[]')
-                                        days = [int(d.strip()) for d in days_str.split(',') if d.strip()]
-                                    else:
-                                        # Formato: 1,3,5 o 1 3 5
-                                        days = [int(d.strip()) for d in re.split('[,\\s]+', str_value) if d.strip()]
-                                    config.set('planning.preferred_days', days)
-                                except Exception as e:
-                                    logging.warning(f"Impossibile parsare preferred_days '{str_value}': {e}")
-                            elif param.startswith('margins.'):
-                                # Gestione margini
-                                margin_type = param.split('.')[1]
-                                if margin_type == 'faster':
-                                    config.set('sports.running.margins.faster', value)
-                                    config.set('sports.swimming.margins.faster', value)
-                                elif margin_type == 'slower':
-                                    config.set('sports.running.margins.slower', value)
-                                    config.set('sports.swimming.margins.slower', value)
-                                elif margin_type == 'power_up':
-                                    config.set('sports.cycling.margins.power_up', value)
-                                elif margin_type == 'power_down':
-                                    config.set('sports.cycling.margins.power_down', value)
-                                elif margin_type == 'hr_up':
-                                    config.set('hr_margins.hr_up', value)
-                                elif margin_type == 'hr_down':
-                                    config.set('hr_margins.hr_down', value)
-                                    
-                    logging.info("Configurazione importata con successo")
+            if config_df is not None:
+                ExcelService._import_config_sheet(config_df, config)
             
             # Carica i valori di passo, nuoto e potenza se presenti
-            if 'Paces' in xls.sheet_names:
-                paces_df = pd.read_excel(file_path, sheet_name='Paces')
-                
-                logging.info(f"Foglio 'Paces' trovato. Colonne: {paces_df.columns.tolist()}")
-                
-                # Verifica l'esistenza delle sezioni
-                sections = paces_df[paces_df['Value'].isna() & ~paces_df['Name'].isna()]['Name'].tolist()
-                logging.info(f"Sezioni trovate: {sections}")
-                
-                run_section = "RITMI PER LA CORSA"
-                cycle_section = "POTENZA PER IL CICLISMO"
-                swim_section = "PASSI VASCA PER IL NUOTO"
-                
-                current_section = None
-                
-                # Dizionari per raccogliere tutti i valori di ogni sezione
-                running_paces = {}
-                cycling_powers = {}
-                swimming_paces = {}
-                
-                # Processa riga per riga
-                for idx, row in paces_df.iterrows():
-                    name = row.get('Name')
-                    value = row.get('Value')
-                    
-                    # Stampa ogni riga per il debug
-                    logging.debug(f"Riga {idx}: name='{name}', value='{value}'")
-                    
-                    # Cambiamento di sezione
-                    if pd.isna(value) and pd.notna(name):
-                        for section_name, section_type in [(run_section, "running"), 
-                                                          (cycle_section, "cycling"), 
-                                                          (swim_section, "swimming")]:
-                            if section_name in str(name) or str(name) == section_name:
-                                current_section = section_type
-                                logging.info(f"Cambiato a sezione: {current_section}")
-                                break
-                    
-                    # Processa i valori
-                    elif pd.notna(name) and pd.notna(value) and current_section:
-                        name_str = str(name).strip()
-                        value_str = str(value).strip()
-                        
-                        logging.info(f"Processando {current_section}: {name_str} = {value_str}")
-                        
-                        # Aggiunge al dizionario appropriato
-                        if current_section == "running":
-                            running_paces[name_str] = value_str
-                        elif current_section == "cycling":
-                            cycling_powers[name_str] = value_str
-                        elif current_section == "swimming":
-                            swimming_paces[name_str] = value_str
-                
-                # Sostituisci completamente le sezioni con i nuovi valori
-                if running_paces:
-                    config.replace_section('sports.running.paces', running_paces)
-                    logging.info(f"Sostituita sezione running paces con {len(running_paces)} valori")
-                    
-                if cycling_powers:
-                    config.replace_section('sports.cycling.power_values', cycling_powers)
-                    logging.info(f"Sostituita sezione cycling power con {len(cycling_powers)} valori")
-                    
-                if swimming_paces:
-                    config.replace_section('sports.swimming.paces', swimming_paces)
-                    logging.info(f"Sostituita sezione swimming paces con {len(swimming_paces)} valori")
-                
-                logging.info("Valori di pace/potenza importati con successo")
+            if paces_df is not None:
+                ExcelService._import_paces_sheet(paces_df, config)
             
             # Carica i valori di frequenza cardiaca se presenti
-            if 'HeartRates' in xls.sheet_names:
-                hr_df = pd.read_excel(file_path, sheet_name='HeartRates')
-                
-                logging.info(f"Foglio 'HeartRates' trovato. Colonne: {hr_df.columns.tolist()}")
-                
-                # Dizionario per raccogliere tutti i valori HR
-                heart_rates = {}
-                
-                # Verifica che le colonne necessarie siano presenti
-                if 'Name' in hr_df.columns and 'Value' in hr_df.columns:
-                    for _, row in hr_df.iterrows():
-                        name = row.get('Name')
-                        value = row.get('Value')
-                        
-                        if pd.notna(name) and pd.notna(value):
-                            str_value = str(value)
-                            heart_rates[name] = str_value
-                            logging.info(f"Raccolto heart rate: {name} = {str_value}")
-                
-                # Usa replace_section per sostituire completamente la sezione
-                if heart_rates:
-                    config.replace_section('heart_rates', heart_rates)
-                    logging.info(f"Sostituita sezione heart rates con {len(heart_rates)} valori")
-                
-                logging.info("Valori di frequenza cardiaca importati con successo")
+            if hr_df is not None:
+                ExcelService._import_heart_rates_sheet(hr_df, config)
             
             # Salva le modifiche alla configurazione
             config.save()
@@ -221,84 +131,20 @@ class ExcelService:
             imported_workouts = []
             
             # Importa gli allenamenti se presenti
-            if 'Workouts' in xls.sheet_names:
-                workouts_df = pd.read_excel(file_path, sheet_name='Workouts')
-                
+            if workouts_df is not None:
                 logging.info(f"Foglio 'Workouts' trovato. Righe: {len(workouts_df)}")
                 
-                # Processa riga per riga
-                for row_idx, row in workouts_df.iterrows():
+                # Nomi, sport e date calcolati per colonna
+                names = ExcelService._build_workout_names(workouts_df)
+                sports = ExcelService._column(workouts_df, 'Sport', 'running').map(str).str.lower()
+                dates = ExcelService._parse_workout_dates(ExcelService._column(workouts_df, 'Date', ''))
+                descriptions = ExcelService._column(workouts_df, 'Description', '')
+                steps_texts = ExcelService._column(workouts_df, 'Steps', '')
+                
+                # Solo il testo degli step viene analizzato riga per riga
+                for row_idx, workout_name, sport_type, workout_date, description, steps_text in zip(
+                        workouts_df.index, names, sports, dates, descriptions, steps_texts):
                     try:
-                        # Estrai informazioni di base
-                        week = row.get('Week')
-                        session = row.get('Session', '')
-                        sport_type = str(row.get('Sport', 'running')).lower()
-                        description = row.get('Description', '')
-                        steps_text = row.get('Steps', '')
-                        
-                        # Data nel formato DD/MM/YYYY
-                        date_text = row.get('Date', '')
-                        workout_date = None
-                        
-                        if pd.notna(date_text) and date_text:
-                            try:
-                                # Se è già una stringa, usala direttamente
-                                if isinstance(date_text, str):
-                                    date_parts = date_text.split('/')
-                                    if len(date_parts) == 3:
-                                        day, month, year = date_parts
-                                        workout_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                                # Se è un datetime di pandas
-                                else:
-                                    workout_date = date_text.strftime('%Y-%m-%d')
-                            except Exception as e:
-                                logging.warning(f"Impossibile parsare la data '{date_text}': {e}")
-                        
-                        # Nome dell'allenamento - GESTIONE CORRETTA DEI TIPI
-                        if pd.notna(session) and session != '':
-                            # Converti session in stringa per sicurezza
-                            session_str = str(session)
-                            
-                            # Se session contiene già il formato completo (es. "W9D5"), usalo
-                            if session_str.startswith('W') and 'D' in session_str:
-                                workout_name = f"{session_str} - {description}"
-                            # Altrimenti, se abbiamo week, ricostruisci il nome
-                            elif pd.notna(week):
-                                try:
-                                    # Gestisci week che può essere numero o stringa
-                                    if isinstance(week, str) and week.startswith('W'):
-                                        week_num = int(week[1:])
-                                    else:
-                                        week_num = int(week)
-                                    
-                                    # Gestisci session che può essere numero o stringa
-                                    if isinstance(session, (int, float)):
-                                        # Session è già un numero
-                                        session_num = int(session)
-                                        workout_name = f"W{week_num}D{session_num} - {description}"
-                                    elif session_str.isdigit():
-                                        # Session è una stringa numerica
-                                        session_num = int(session_str)
-                                        workout_name = f"W{week_num}D{session_num} - {description}"
-                                    elif session_str.startswith('D'):
-                                        # Session è nel formato "D5"
-                                        workout_name = f"W{week_num}{session_str} - {description}"
-                                    else:
-                                        # Altri formati
-                                        workout_name = f"{session_str} - {description}"
-                                except Exception as e:
-                                    logging.warning(f"Errore nel parsing week/session: {e}")
-                                    workout_name = f"{session_str} - {description}"
-                            else:
-                                workout_name = f"{session_str} - {description}"
-                        else:
-                            workout_name = description
-                        
-                        # Log per debug
-                        logging.debug(f"Week: {week} (type: {type(week)}), Session: {session} (type: {type(session)})")
-                        logging.debug(f"Nome allenamento costruito: {workout_name}")
-
-                        
                         # Creare l'allenamento
                         workout = Workout(sport_type, workout_name, description)
                         
@@ -310,318 +156,15 @@ class ExcelService:
                         
                         # Verifica che gli steps siano validi
                         if not pd.isna(steps_text) and steps_text:
-                            # Parsa gli step
-                            logging.info(f"Parsing steps per '{workout_name}'")
-                            steps_lines = str(steps_text).strip().split('\n')
-                            
-                            # Tieni traccia dello stato corrente del parsing
-                            current_repeat = None
-                            indent_level = 0
-                            
-                            for line_num, line in enumerate(steps_lines, 1):
-                                # Salta linee vuote
-                                if not line.strip():
-                                    continue
-                                
-                                logging.debug(f"Processing line {line_num}: {line}")
-                                
-                                # Calcola il livello di indentazione
-                                line_indent = len(line) - len(line.lstrip())
-                                
-                                # Normalizza la linea
-                                line = line.strip()
-                                
-
-                                # Controlla se è una ripetizione
-                                if line.startswith('repeat'):
-                                    try:
-                                        # Rimuovi i due punti alla fine se presenti
-                                        line_clean = line.replace(':', '')
-                                        
-                                        # Estrai il numero di ripetizioni
-                                        iterations = 1  # default
-                                        # Usa una regex per estrarre il numero
-                                        import re
-                                        numbers = re.findall(r'\d+', line_clean)
-                                        if numbers:
-                                            iterations = int(numbers[0])
-                                        else:
-                                            logging.warning(f"Nessun numero trovato in '{line}', usando 1 ripetizione")
-                                        
-                                        logging.debug(f"Creato repeat step con {iterations} ripetizioni")
-                                        current_repeat = WorkoutStep(
-                                            order=0,
-                                            step_type='repeat',
-                                            end_condition='iterations',
-                                            end_condition_value=iterations
-                                        )
-                                        
-                                        # Aggiungi all'allenamento
-                                        workout.add_step(current_repeat)
-                                        indent_level = line_indent
-                                        
-                                    except Exception as e:
-                                        logging.error(f"Errore nel parsing del repeat '{line}': {str(e)}")
-                                        # NON c'è continue qui, continua con il resto del codice
-                                
-                                # Controlla se è la fine di una ripetizione
-                                elif current_repeat and line_indent <= indent_level:
-                                    # Se siamo a un livello di indentazione uguale o inferiore a quello del repeat,
-                                    # significa che siamo usciti dal blocco repeat
-                                    logging.debug(f"Fine ripetizione (indent {line_indent} <= {indent_level})")
-                                    
-                                    # Salviamo l'indentazione corrente per questo step non in repeat
-                                    current_line_indent = line_indent
-                                    
-                                    # Chiudiamo il repeat
-                                    current_repeat = None
-                                    indent_level = 0
-                                    
-                                    # NON processare questo step qui, lascia che venga processato nel blocco else sotto
-                                
-                                # Se non è un repeat e non è la fine di un repeat, è uno step normale
-                                if not line.startswith('repeat'):
-                                    try:
-                                        # Determina il tipo di step
-                                        if ':' not in line:
-                                            logging.warning(f"Linea '{line}' non contiene ':' - saltata")
-                                            continue
-                                        
-                                        step_type, step_data = line.split(':', 1)
-                                        step_type = step_type.strip()
-                                        step_data = step_data.strip()
-                                        
-                                        logging.debug(f"Tipo di step: {step_type}, Dati: {step_data}")
-                                        
-                                        # Parsa i dati dello step
-                                        end_condition = "lap.button"
-                                        end_condition_value = None
-                                        description = ""
-                                        target = None
-                                        
-                                        # Estrai la descrizione se presente
-                                        if '--' in step_data:
-                                            step_data, description = step_data.split('--', 1)
-                                            step_data = step_data.strip()
-                                            description = description.strip()
-                                        
-                                        # Estrai il target se presente
-                                        if '@' in step_data:
-                                            step_data, target_data = step_data.split('@', 1)
-                                            step_data = step_data.strip()
-                                            target_data = target_data.strip()
-                                            
-                                            # Determina il tipo di target
-                                            if target_data.startswith('Z') and '_HR' in target_data:
-                                                # Zona di frequenza cardiaca
-                                                target_type = "heart.rate.zone"
-                                                
-                                                # Ottieni i valori HR dalla configurazione
-                                                heart_rates = config.get('heart_rates', {})
-                                                max_hr = int(heart_rates.get('max_hr', 180))
-                                                
-                                                # Cerca la zona corrispondente
-                                                if target_data in heart_rates:
-                                                    hr_range = heart_rates[target_data]
-                                                    
-                                                    if '-' in hr_range and 'max_hr' in hr_range:
-                                                        # Formato: 62-76% max_hr
-                                                        parts = hr_range.split('-')
-                                                        min_percent = float(parts[0])
-                                                        max_percent = float(parts[1].split('%')[0])
-                                                        
-                                                        # Converti in valori assoluti
-                                                        target_from = int(min_percent * max_hr / 100)
-                                                        target_to = int(max_percent * max_hr / 100)
-                                                        target = Target(target_type, target_to, target_from)
-                                                        target.target_zone_name = target_data
-                                                    else:
-                                                        # Default se formato non riconosciuto
-                                                        target = Target(target_type, 140, 120)
-                                                        target.target_zone_name = target_data
-                                                else:
-                                                    # Default se la zona non è trovata
-                                                    target = Target(target_type, 140, 120)
-                                            
-                                            elif target_data.startswith('Z') or target_data in ['recovery', 'threshold', 'marathon', 'race_pace']:
-                                                # Zona di passo
-                                                target_type = "pace.zone"
-                                                
-                                                # Ottieni i valori di passo dalla configurazione
-                                                paces = config.get('sports.running.paces', {})
-                                                
-                                                # Cerca la zona corrispondente
-                                                if target_data in paces:
-                                                    pace_range = paces[target_data]
-                                                    
-                                                    if '-' in pace_range:
-                                                        # Formato: min:sec-min:sec
-                                                        min_pace, max_pace = pace_range.split('-')
-                                                        
-                                                        # Converti da min:sec a secondi
-                                                        def parse_pace(pace_str):
-                                                            parts = pace_str.strip().split(':')
-                                                            return int(parts[0]) * 60 + int(parts[1])
-                                                        
-                                                        try:
-                                                            min_pace_secs = parse_pace(min_pace)
-                                                            max_pace_secs = parse_pace(max_pace)
-                                                            
-                                                            # Converti da secondi a m/s (inverti min e max)
-                                                            target_from = 1000 / max_pace_secs  # Passo più veloce
-                                                            target_to = 1000 / min_pace_secs    # Passo più lento
-                                                            target = Target(target_type, target_to, target_from)
-                                                            target.target_zone_name = target_data
-                                                        except (ValueError, IndexError):
-                                                            # Default se non riesce a interpretare
-                                                            target = Target(target_type, 2.5, 3.0)
-                                                            target.target_zone_name = target_data
-                                                    else:
-                                                        # Valore singolo
-                                                        try:
-                                                            pace_parts = pace_range.strip().split(':')
-                                                            pace_secs = int(pace_parts[0]) * 60 + int(pace_parts[1])
-                                                            # Per un valore singolo, usa lo stesso valore per from e to
-                                                            pace_ms = 1000 / pace_secs
-                                                            target = Target(target_type, pace_ms, pace_ms)
-                                                            target.target_zone_name = target_data
-                                                        except (ValueError, IndexError):
-                                                            # Default se non riesce a interpretare
-                                                            target = Target(target_type, 3.0, 3.0)
-                                                            target.target_zone_name = target_data
-                                                else:
-                                                    # Default se la zona non è trovata
-                                                    target = Target(target_type, 2.5, 3.0)
-                                            
-                                            elif ':' in target_data:
-                                                # Passo specifico (es. "6:00" o "5:00-5:30")
-                                                target_type = "pace.zone"
-                                                
-                                                if '-' in target_data:
-                                                    # Formato: min:sec-min:sec
-                                                    min_pace, max_pace = target_data.split('-')
-                                                    
-                                                    # Converti da min:sec a secondi
-                                                    def parse_pace(pace_str):
-                                                        parts = pace_str.strip().split(':')
-                                                        return int(parts[0]) * 60 + int(parts[1])
-                                                    
-                                                    try:
-                                                        min_pace_secs = parse_pace(min_pace)
-                                                        max_pace_secs = parse_pace(max_pace)
-                                                        
-                                                        # Converti da secondi a m/s (inverti min e max)
-                                                        target_from = 1000 / max_pace_secs  # Passo più veloce
-                                                        target_to = 1000 / min_pace_secs    # Passo più lento
-                                                        target = Target(target_type, target_to, target_from)
-                                                    except (ValueError, IndexError):
-                                                        # Default se non riesce a interpretare
-                                                        target = Target(target_type, 2.5, 3.0)
-                                                else:
-                                                    # Formato: min:sec (passo singolo)
-                                                    try:
-                                                        parts = target_data.strip().split(':')
-                                                        pace_secs = int(parts[0]) * 60 + int(parts[1])
-                                                        
-                                                        # Per un passo singolo, usa lo stesso valore per from e to
-                                                        pace_ms = 1000 / pace_secs
-                                                        target = Target(target_type, pace_ms, pace_ms)
-                                                    except (ValueError, IndexError):
-                                                        # Default se non riesce a interpretare
-                                                        target = Target(target_type, 3.0, 3.0)
-                                            
-                                            else:
-                                                # Altri tipi di target...
-                                                target = Target("no.target", None, None)
-                                        
-                                        # Parsa la durata/distanza
-                                        if step_data == 'lap-button':
-                                            end_condition = 'lap.button'
-                                        elif ':' in step_data and 'min' in step_data:
-                                            # Minuti con secondi: 5:30min
-                                            end_condition = 'time'
-                                            try:
-                                                time_part = step_data.replace('min', '').strip()
-                                                if ':' in time_part:
-                                                    mins, secs = time_part.split(':')
-                                                    end_condition_value = int(mins) * 60 + int(secs)
-                                                    logging.debug(f"Tempo parsato: {mins}:{secs}min = {end_condition_value}s")
-                                                else:
-                                                    # Solo minuti
-                                                    mins = int(time_part)
-                                                    end_condition_value = mins * 60
-                                                    logging.debug(f"Tempo parsato: {mins}min = {end_condition_value}s")
-                                            except Exception as e:
-                                                end_condition_value = 60
-                                                logging.warning(f"Errore nel parsing del tempo '{step_data}': {e}")
-                                        elif 'min' in step_data:
-                                            # Solo minuti: 10min
-                                            end_condition = 'time'
-                                            try:
-                                                time_part = step_data.replace('min', '').strip()
-                                                mins = int(time_part)
-                                                end_condition_value = mins * 60
-                                                logging.debug(f"Tempo parsato: {mins}min = {end_condition_value}s")
-                                            except Exception as e:
-                                                end_condition_value = 60
-                                                logging.warning(f"Errore nel parsing del tempo '{time_part}': {e}")
-                                        elif step_data.strip().endswith('m') and not step_data.strip().endswith('km'):
-                                            # Metri
-                                            end_condition = 'distance'
-                                            try:
-                                                # Rimuovi 'm' alla fine
-                                                distance_part = step_data.split(' ')[0].replace('m', '')
-                                                distance = float(distance_part.strip())
-                                                end_condition_value = distance
-                                                logging.debug(f"Distanza parsata: {distance}m")
-                                            except Exception as e:
-                                                end_condition_value = 100
-                                                logging.warning(f"Errore nel parsing della distanza '{step_data}': {e}")
-                                        elif 'km' in step_data:
-                                            end_condition = 'distance'
-                                            try:
-                                                # Rimuovi 'km' alla fine
-                                                distance_part = step_data.split(' ')[0].replace('km', '')
-                                                distance = float(distance_part.strip())
-                                                end_condition_value = distance * 1000  # Converti in metri
-                                                logging.debug(f"Distanza parsata: {distance}km = {end_condition_value}m")
-                                            except Exception as e:
-                                                end_condition_value = 1000
-                                                logging.warning(f"Errore nel parsing della distanza '{step_data}': {e}")
-                                        
-                                        # Crea lo step
-                                        step = WorkoutStep(
-                                            order=0,
-                                            step_type=step_type,
-                                            description=description,
-                                            end_condition=end_condition,
-                                            end_condition_value=end_condition_value,
-                                            target=target
-                                        )
-                                        
-                                        logging.debug(f"Creato step: {step}")
-                                        
-                                        # Aggiungi lo step al gruppo corrente o all'allenamento
-                                        if current_repeat and line_indent > indent_level:
-                                            current_repeat.add_step(step)
-                                            logging.debug(f"Step aggiunto al repeat")
-                                        else:
-                                            workout.add_step(step)
-                                            logging.debug(f"Step aggiunto all'allenamento")
-                                        
-                                    except Exception as e:
-                                        logging.error(f"Errore nel parsing dello step '{line}': {str(e)}")
-                                        continue
-
+                            ExcelService._parse_steps_text(workout, steps_text, config)
                         
                         # Aggiungi l'allenamento alla lista degli importati
                         imported_workouts.append((workout_name, workout))
-                        logging.info(f"Allenamento '{workout_name}' importato con successo, con {len(workout.workout_steps)} step")
-                        
+                    
                     except Exception as e:
                         logging.error(f"Errore nell'importazione dell'allenamento alla riga {row_idx}: {str(e)}")
                         raise ValueError(f"Errore nell'importazione dell'allenamento alla riga {row_idx}: {str(e)}")
-            
+
             # Log del risultato
             logging.info(f"Importati {len(imported_workouts)} allenamenti")
             return imported_workouts
@@ -629,10 +172,550 @@ class ExcelService:
         except Exception as e:
             logging.error(f"Errore nell'importazione degli allenamenti da Excel: {str(e)}")
             raise
+    
+    @staticmethod
+    def _column(df: 'pd.DataFrame', column: str, default: Any) -> 'pd.Series':
+        """
+        Restituisce una colonna del DataFrame o una colonna costante se assente.
+        
+        Args:
+            df: DataFrame del foglio
+            column: Nome della colonna
+            default: Valore da usare se la colonna non esiste
+        
+        Returns:
+            Serie con i valori della colonna
+        """
+        if column in df.columns:
+            return df[column]
+        return pd.Series(default, index=df.index, dtype=object)
+    
+    @staticmethod
+    def _import_config_sheet(config_df: 'pd.DataFrame', config) -> None:
+        """
+        Applica alla configurazione i parametri del foglio 'Config'.
+        
+        Args:
+            config_df: DataFrame del foglio
+            config: Configurazione da aggiornare
+        """
+        logging.info(f"Foglio 'Config' trovato. Colonne: {config_df.columns.tolist()}")
+        
+        # Verifica che le colonne necessarie siano presenti
+        if 'Parameter' not in config_df.columns or 'Value' not in config_df.columns:
+            return
+        
+        # Mantieni solo le righe con parametro e valore
+        valid = config_df['Parameter'].notna() & config_df['Value'].notna()
+        params = config_df.loc[valid, 'Parameter']
+        values = config_df.loc[valid, 'Value']
+        
+        # Percorsi dei margini nella configurazione
+        margin_keys = {
+            'faster': ['sports.running.margins.faster', 'sports.swimming.margins.faster'],
+            'slower': ['sports.running.margins.slower', 'sports.swimming.margins.slower'],
+            'power_up': ['sports.cycling.margins.power_up'],
+            'power_down': ['sports.cycling.margins.power_down'],
+            'hr_up': ['hr_margins.hr_up'],
+            'hr_down': ['hr_margins.hr_down'],
+        }
+        
+        for param, value in zip(params, values):
+            str_value = str(value).strip()
+            
+            # Imposta i parametri nella configurazione
+            if param == 'athlete_name':
+                config.set('athlete_name', str_value)
+            elif param == 'name_prefix':
+                config.set('planning.name_prefix', str_value)
+            elif param == 'race_day':
+                config.set('planning.race_day', str_value)
+            elif param == 'preferred_days':
+                # Converti la stringa in lista di interi
+                try:
+                    # Gestisci vari formati
+                    if '[' in str_value:
+                        # Formato: [1, 3, 5] o [1,3,5]
+                        days_str = str_value.strip('[]')
+                        days = [int(d.strip()) for d in days_str.split(',') if d.strip()]
+                    else:
+                        # Formato: 1,3,5 o 1 3 5
+                        days = [int(d.strip()) for d in re.split('[,\\s]+', str_value) if d.strip()]
+                    config.set('planning.preferred_days', days)
+                except Exception as e:
+                    logging.warning(f"Impossibile parsare preferred_days '{str_value}': {e}")
+            elif param.startswith('margins.'):
+                # Gestione margini
+                for key in margin_keys.get(param.split('.')[1], []):
+                    config.set(key, value)
+        
+        logging.info("Configurazione importata con successo")
+    
+    @staticmethod
+    def _import_paces_sheet(paces_df: 'pd.DataFrame', config) -> None:
+        """
+        Applica alla configurazione i passi e le potenze del foglio 'Paces'.
+        
+        Le sezioni sono individuate dalle righe di intestazione (nome senza valore)
+        e propagate alle righe successive con un riempimento in avanti.
+        
+        Args:
+            paces_df: DataFrame del foglio
+            config: Configurazione da aggiornare
+        """
+        logging.info(f"Foglio 'Paces' trovato. Colonne: {paces_df.columns.tolist()}")
+        
+        names = paces_df['Name']
+        values = paces_df['Value']
+        
+        # Righe di intestazione delle sezioni
+        is_header = values.isna() & names.notna()
+        logging.info(f"Sezioni trovate: {names[is_header].tolist()}")
+        
+        header_names = names.where(is_header, '').astype(str)
+        section_types = [("RITMI PER LA CORSA", "running"),
+                         ("POTENZA PER IL CICLISMO", "cycling"),
+                         ("PASSI VASCA PER IL NUOTO", "swimming")]
+        
+        # Sezione indicata dalle intestazioni riconosciute (la prima corrispondenza vince),
+        # propagata alle righe seguenti fino alla prossima intestazione riconosciuta
+        section = pd.Series(
+            np.select([is_header & header_names.str.contains(name, regex=False) for name, _ in section_types],
+                      [section_type for _, section_type in section_types], default=None),
+            index=paces_df.index, dtype=object).ffill()
+        
+        # Righe con valori da importare
+        rows = names.notna() & values.notna() & section.notna()
+        sections = {'running': {}, 'cycling': {}, 'swimming': {}}
+        for section_type, name, value in zip(section[rows],
+                                             names[rows].astype(str).str.strip(),
+                                             values[rows].astype(str).str.strip()):
+            sections[section_type][name] = value
+        
+        # Sostituisci completamente le sezioni con i nuovi valori
+        for section_type, section_key in [('running', 'sports.running.paces'),
+                                          ('cycling', 'sports.cycling.power_values'),
+                                          ('swimming', 'sports.swimming.paces')]:
+            if sections[section_type]:
+                config.replace_section(section_key, sections[section_type])
+                logging.info(f"Sostituita sezione {section_key} con {len(sections[section_type])} valori")
+        
+        logging.info("Valori di pace/potenza importati con successo")
+    
+    @staticmethod
+    def _import_heart_rates_sheet(hr_df: 'pd.DataFrame', config) -> None:
+        """
+        Applica alla configurazione le zone del foglio 'HeartRates'.
+        
+        Args:
+            hr_df: DataFrame del foglio
+            config: Configurazione da aggiornare
+        """
+        logging.info(f"Foglio 'HeartRates' trovato. Colonne: {hr_df.columns.tolist()}")
+        
+        # Verifica che le colonne necessarie siano presenti
+        if 'Name' not in hr_df.columns or 'Value' not in hr_df.columns:
+            return
+        
+        valid = hr_df['Name'].notna() & hr_df['Value'].notna()
+        heart_rates = dict(zip(hr_df.loc[valid, 'Name'], hr_df.loc[valid, 'Value'].astype(str)))
+        
+        # Usa replace_section per sostituire completamente la sezione
+        if heart_rates:
+            config.replace_section('heart_rates', heart_rates)
+            logging.info(f"Sostituita sezione heart rates con {len(heart_rates)} valori")
+        
+        logging.info("Valori di frequenza cardiaca importati con successo")
+    
+    @staticmethod
+    def _parse_workout_dates(dates: 'pd.Series') -> List[Optional[str]]:
+        """
+        Converte la colonna Date (GG/MM/AAAA o data Excel) nel formato YYYY-MM-DD.
+        
+        Args:
+            dates: Colonna delle date
+        
+        Returns:
+            Lista di date nel formato YYYY-MM-DD (None se assente o non valida)
+        """
+        is_text = dates.map(type) == str
+        
+        # Solo le celle formattate come data arrivano come date: un numero (es. un
+        # seriale Excel non formattato) verrebbe letto come nanosecondi dal 1970
+        is_date = dates.map(lambda value: isinstance(value, datetime.date))
+        
+        # Date testuali nel formato GG/MM/AAAA e date già convertite da Excel
+        parsed = pd.to_datetime(dates.where(is_text).str.strip(), format='%d/%m/%Y', errors='coerce')
+        native = pd.to_datetime(dates.where(is_date), errors='coerce')
+        parsed = parsed.fillna(native)
+        
+        invalid = parsed.isna() & dates.notna() & (dates != '')
+        if invalid.any():
+            logging.warning(f"Impossibile parsare le date: {dates[invalid].tolist()}")
+        
+        return [None if pd.isna(value) else value for value in parsed.dt.strftime('%Y-%m-%d')]
+    
+    @staticmethod
+    def _build_workout_names(workouts_df: 'pd.DataFrame') -> List[Any]:
+        """
+        Costruisce i nomi degli allenamenti (W##D## - descrizione) per colonna.
+        
+        Args:
+            workouts_df: DataFrame del foglio 'Workouts'
+        
+        Returns:
+            Lista dei nomi, nell'ordine delle righe
+        """
+        week = ExcelService._column(workouts_df, 'Week', None)
+        session = ExcelService._column(workouts_df, 'Session', '')
+        description = ExcelService._column(workouts_df, 'Description', '')
+        
+        has_session = session.notna() & (session != '')
+        session_str = session.map(str)
+        description_str = description.map(str)
+        
+        # Numero della settimana: numerico o nel formato "W3"
+        week_num = np.trunc(pd.to_numeric(week.map(str).str.replace(r'^W', '', regex=True),
+                                          errors='coerce').where(week.notna()))
+        week_str = 'W' + week_num.astype('Int64').astype(str)
+        
+        # Sessione numerica (numero o stringa di sole cifre)
+        is_number = session.map(lambda value: isinstance(value, (int, float)) and not isinstance(value, bool))
+        is_digits = session_str.str.fullmatch(r'\d+') & ~is_number
+        session_num = pd.to_numeric(session.where(is_number | is_digits), errors='coerce')
+        session_num_str = np.trunc(session_num).astype('Int64').astype(str)
+        
+        # Casi in ordine di priorità
+        is_full = has_session & session_str.str.startswith('W') & session_str.str.contains('D', regex=False)
+        with_week = has_session & ~is_full & week_num.notna()
+        is_numeric_session = with_week & (is_number | is_digits) & session_num.notna()
+        is_d_session = with_week & ~is_numeric_session & session_str.str.startswith('D')
+        
+        names = np.select(
+            [is_numeric_session, is_d_session, has_session],
+            [week_str + 'D' + session_num_str + ' - ' + description_str,
+             week_str + session_str + ' - ' + description_str,
+             session_str + ' - ' + description_str],
+            default=None)
+        
+        # Senza sessione il nome è la descrizione
+        return [name if has else desc for name, has, desc in zip(names, has_session, description)]
+    
+    @staticmethod
+    def _parse_steps_text(workout: Workout, steps_text: Any, config) -> None:
+        """
+        Analizza il testo degli step di una riga e li aggiunge all'allenamento.
+        
+        Args:
+            workout: Allenamento a cui aggiungere gli step
+            steps_text: Testo degli step (una riga per step, ripetizioni indentate)
+            config: Configurazione per la risoluzione delle zone
+        """
+        steps_lines = str(steps_text).strip().split('\n')
+        
+        # Tieni traccia dello stato corrente del parsing
+        current_repeat = None
+        indent_level = 0
+        
+        for line_num, line in enumerate(steps_lines, 1):
+            # Salta linee vuote
+            if not line.strip():
+                continue
+            
+            logging.debug(f"Processing line {line_num}: {line}")
+            
+            # Calcola il livello di indentazione
+            line_indent = len(line) - len(line.lstrip())
+            
+            # Normalizza la linea
+            line = line.strip()
+            
+            
+            # Controlla se è una ripetizione
+            if line.startswith('repeat'):
+                try:
+                    # Rimuovi i due punti alla fine se presenti
+                    line_clean = line.replace(':', '')
+                    
+                    # Estrai il numero di ripetizioni
+                    iterations = 1  # default
+                    # Usa una regex per estrarre il numero
+                    import re
+                    numbers = re.findall(r'\d+', line_clean)
+                    if numbers:
+                        iterations = int(numbers[0])
+                    else:
+                        logging.warning(f"Nessun numero trovato in '{line}', usando 1 ripetizione")
+                    
+                    logging.debug(f"Creato repeat step con {iterations} ripetizioni")
+                    current_repeat = WorkoutStep(
+                        order=0,
+                        step_type='repeat',
+                        end_condition='iterations',
+                        end_condition_value=iterations
+                    )
+                    
+                    # Aggiungi all'allenamento
+                    workout.add_step(current_repeat)
+                    indent_level = line_indent
+                
+                except Exception as e:
+                    logging.error(f"Errore nel parsing del repeat '{line}': {str(e)}")
+                    # NON c'è continue qui, continua con il resto del codice
+            
+            # Controlla se è la fine di una ripetizione
+            elif current_repeat and line_indent <= indent_level:
+                # Se siamo a un livello di indentazione uguale o inferiore a quello del repeat,
+                # significa che siamo usciti dal blocco repeat
+                logging.debug(f"Fine ripetizione (indent {line_indent} <= {indent_level})")
+                
+                # Salviamo l'indentazione corrente per questo step non in repeat
+                current_line_indent = line_indent
+                
+                # Chiudiamo il repeat
+                current_repeat = None
+                indent_level = 0
+                
+                # NON processare questo step qui, lascia che venga processato nel blocco else sotto
+            
+            # Se non è un repeat e non è la fine di un repeat, è uno step normale
+            if not line.startswith('repeat'):
+                try:
+                    # Determina il tipo di step
+                    if ':' not in line:
+                        logging.warning(f"Linea '{line}' non contiene ':' - saltata")
+                        continue
+                    
+                    step_type, step_data = line.split(':', 1)
+                    step_type = step_type.strip()
+                    step_data = step_data.strip()
+                    
+                    logging.debug(f"Tipo di step: {step_type}, Dati: {step_data}")
+                    
+                    # Parsa i dati dello step
+                    end_condition = "lap.button"
+                    end_condition_value = None
+                    description = ""
+                    target = None
+                    
+                    # Estrai la descrizione se presente
+                    if '--' in step_data:
+                        step_data, description = step_data.split('--', 1)
+                        step_data = step_data.strip()
+                        description = description.strip()
+                    
+                    # Estrai il target se presente
+                    if '@' in step_data:
+                        step_data, target_data = step_data.split('@', 1)
+                        step_data = step_data.strip()
+                        target_data = target_data.strip()
+                        
+                        # Determina il tipo di target
+                        if target_data.startswith('Z') and '_HR' in target_data:
+                            # Zona di frequenza cardiaca
+                            target_type = "heart.rate.zone"
+                            
+                            # Ottieni i valori HR dalla configurazione
+                            heart_rates = config.get('heart_rates', {})
+                            max_hr = int(heart_rates.get('max_hr', 180))
+                            
+                            # Cerca la zona corrispondente
+                            if target_data in heart_rates:
+                                hr_range = heart_rates[target_data]
+                                
+                                if '-' in hr_range and 'max_hr' in hr_range:
+                                    # Formato: 62-76% max_hr
+                                    parts = hr_range.split('-')
+                                    min_percent = float(parts[0])
+                                    max_percent = float(parts[1].split('%')[0])
+                                    
+                                    # Converti in valori assoluti
+                                    target_from = int(min_percent * max_hr / 100)
+                                    target_to = int(max_percent * max_hr / 100)
+                                    target = Target(target_type, target_to, target_from)
+                                    target.target_zone_name = target_data
+                                else:
+                                    # Default se formato non riconosciuto
+                                    target = Target(target_type, 140, 120)
+                                    target.target_zone_name = target_data
+                            else:
+                                # Default se la zona non è trovata
+                                target = Target(target_type, 140, 120)
+                        
+                        elif target_data.startswith('Z') or target_data in ['recovery', 'threshold', 'marathon', 'race_pace']:
+                            # Zona di passo
+                            target_type = "pace.zone"
+                            
+                            # Ottieni i valori di passo dalla configurazione
+                            paces = config.get('sports.running.paces', {})
+                            
+                            # Cerca la zona corrispondente
+                            if target_data in paces:
+                                pace_range = paces[target_data]
+                                
+                                if '-' in pace_range:
+                                    # Formato: min:sec-min:sec
+                                    min_pace, max_pace = pace_range.split('-')
+                                    
+                                    # Converti da min:sec a secondi
+                                    def parse_pace(pace_str):
+                                        parts = pace_str.strip().split(':')
+                                        return int(parts[0]) * 60 + int(parts[1])
+                                    
+                                    try:
+                                        min_pace_secs = parse_pace(min_pace)
+                                        max_pace_secs = parse_pace(max_pace)
+                                        
+                                        # Converti da secondi a m/s (inverti min e max)
+                                        target_from = 1000 / max_pace_secs  # Passo più veloce
+                                        target_to = 1000 / min_pace_secs    # Passo più lento
+                                        target = Target(target_type, target_to, target_from)
+                                        target.target_zone_name = target_data
+                                    except (ValueError, IndexError):
+                                        # Default se non riesce a interpretare
+                                        target = Target(target_type, 2.5, 3.0)
+                                        target.target_zone_name = target_data
+                                else:
+                                    # Valore singolo
+                                    try:
+                                        pace_parts = pace_range.strip().split(':')
+                                        pace_secs = int(pace_parts[0]) * 60 + int(pace_parts[1])
+                                        # Per un valore singolo, usa lo stesso valore per from e to
+                                        pace_ms = 1000 / pace_secs
+                                        target = Target(target_type, pace_ms, pace_ms)
+                                        target.target_zone_name = target_data
+                                    except (ValueError, IndexError):
+                                        # Default se non riesce a interpretare
+                                        target = Target(target_type, 3.0, 3.0)
+                                        target.target_zone_name = target_data
+                            else:
+                                # Default se la zona non è trovata
+                                target = Target(target_type, 2.5, 3.0)
+                        
+                        elif ':' in target_data:
+                            # Passo specifico (es. "6:00" o "5:00-5:30")
+                            target_type = "pace.zone"
+                            
+                            if '-' in target_data:
+                                # Formato: min:sec-min:sec
+                                min_pace, max_pace = target_data.split('-')
+                                
+                                # Converti da min:sec a secondi
+                                def parse_pace(pace_str):
+                                    parts = pace_str.strip().split(':')
+                                    return int(parts[0]) * 60 + int(parts[1])
+                                
+                                try:
+                                    min_pace_secs = parse_pace(min_pace)
+                                    max_pace_secs = parse_pace(max_pace)
+                                    
+                                    # Converti da secondi a m/s (inverti min e max)
+                                    target_from = 1000 / max_pace_secs  # Passo più veloce
+                                    target_to = 1000 / min_pace_secs    # Passo più lento
+                                    target = Target(target_type, target_to, target_from)
+                                except (ValueError, IndexError):
+                                    # Default se non riesce a interpretare
+                                    target = Target(target_type, 2.5, 3.0)
+                            else:
+                                # Formato: min:sec (passo singolo)
+                                try:
+                                    parts = target_data.strip().split(':')
+                                    pace_secs = int(parts[0]) * 60 + int(parts[1])
+                                    
+                                    # Per un passo singolo, usa lo stesso valore per from e to
+                                    pace_ms = 1000 / pace_secs
+                                    target = Target(target_type, pace_ms, pace_ms)
+                                except (ValueError, IndexError):
+                                    # Default se non riesce a interpretare
+                                    target = Target(target_type, 3.0, 3.0)
+                        
+                        else:
+                            # Altri tipi di target...
+                            target = Target("no.target", None, None)
+                    
+                    # Parsa la durata/distanza
+                    if step_data == 'lap-button':
+                        end_condition = 'lap.button'
+                    elif ':' in step_data and 'min' in step_data:
+                        # Minuti con secondi: 5:30min
+                        end_condition = 'time'
+                        try:
+                            time_part = step_data.replace('min', '').strip()
+                            if ':' in time_part:
+                                mins, secs = time_part.split(':')
+                                end_condition_value = int(mins) * 60 + int(secs)
+                                logging.debug(f"Tempo parsato: {mins}:{secs}min = {end_condition_value}s")
+                            else:
+                                # Solo minuti
+                                mins = int(time_part)
+                                end_condition_value = mins * 60
+                                logging.debug(f"Tempo parsato: {mins}min = {end_condition_value}s")
+                        except Exception as e:
+                            end_condition_value = 60
+                            logging.warning(f"Errore nel parsing del tempo '{step_data}': {e}")
+                    elif 'min' in step_data:
+                        # Solo minuti: 10min
+                        end_condition = 'time'
+                        try:
+                            time_part = step_data.replace('min', '').strip()
+                            mins = int(time_part)
+                            end_condition_value = mins * 60
+                            logging.debug(f"Tempo parsato: {mins}min = {end_condition_value}s")
+                        except Exception as e:
+                            end_condition_value = 60
+                            logging.warning(f"Errore nel parsing del tempo '{time_part}': {e}")
+                    elif step_data.strip().endswith('m') and not step_data.strip().endswith('km'):
+                        # Metri
+                        end_condition = 'distance'
+                        try:
+                            # Rimuovi 'm' alla fine
+                            distance_part = step_data.split(' ')[0].replace('m', '')
+                            distance = float(distance_part.strip())
+                            end_condition_value = distance
+                            logging.debug(f"Distanza parsata: {distance}m")
+                        except Exception as e:
+                            end_condition_value = 100
+                            logging.warning(f"Errore nel parsing della distanza '{step_data}': {e}")
+                    elif 'km' in step_data:
+                        end_condition = 'distance'
+                        try:
+                            # Rimuovi 'km' alla fine
+                            distance_part = step_data.split(' ')[0].replace('km', '')
+                            distance = float(distance_part.strip())
+                            end_condition_value = distance * 1000  # Converti in metri
+                            logging.debug(f"Distanza parsata: {distance}km = {end_condition_value}m")
+                        except Exception as e:
+                            end_condition_value = 1000
+                            logging.warning(f"Errore nel parsing della distanza '{step_data}': {e}")
+                    
+                    # Crea lo step
+                    step = WorkoutStep(
+                        order=0,
+                        step_type=step_type,
+                        description=description,
+                        end_condition=end_condition,
+                        end_condition_value=end_condition_value,
+                        target=target
+                    )
+                    
+                    logging.debug(f"Creato step: {step}")
+                    
+                    # Aggiungi lo step al gruppo corrente o all'allenamento
+                    if current_repeat and line_indent > indent_level:
+                        current_repeat.add_step(step)
+                        logging.debug(f"Step aggiunto al repeat")
+                    else:
+                        workout.add_step(step)
+                        logging.debug(f"Step aggiunto all'allenamento")
+                
+                except Exception as e:
+                    logging.error(f"Errore nel parsing dello step '{line}': {str(e)}")
+                    continue
 
 
     @staticmethod
-    def export_workouts(workouts: List[Tuple[str, Workout]], file_path: str, custom_config: Optional[Dict[str, Any]] = None) -> None:
+    def export_workouts(workouts: List[Tuple[str, Workout]], file_path: str, custom_config: Optional[Dict[str, Any]] = None,
+                        styled: bool = True) -> None:
         """
         Esporta allenamenti in un file Excel con multipli fogli.
         
@@ -640,6 +723,7 @@ class ExcelService:
             workouts: Lista di tuple (nome, allenamento)
             file_path: Percorso del file
             custom_config: Configurazione personalizzata (opzionale)
+            styled: Se False esporta solo i dati, senza formattazione (più veloce)
             
         Raises:
             ImportError: Se pandas non è disponibile
@@ -652,13 +736,9 @@ class ExcelService:
             # Ottieni la configurazione
             config = get_config()
             
-            # Crea i DataFrame per ogni foglio
-            config_df = pd.DataFrame(columns=['Parametro', 'Valore', 'Descrizione'])
-            paces_df = pd.DataFrame(columns=['Name', 'Value', 'Note'])
-            heart_rates_df = pd.DataFrame(columns=['Name', 'Value', 'Description'])
-            workouts_df = pd.DataFrame(columns=['Week', 'Session', 'Date', 'Sport', 'Description', 'Steps'])
-            examples_df = pd.DataFrame(columns=['Type', 'Example', 'Description'])
-                
+            # Le righe di ogni foglio vengono raccolte in liste e ogni DataFrame
+            # viene costruito una sola volta
+            
             # Popola il DataFrame della configurazione
             # Ottieni la data della gara nel formato YYYY-MM-DD
             race_day = config.get('planning.race_day', '')
@@ -694,7 +774,7 @@ class ExcelService:
                 {'Parametro': 'margin.hr_down', 'Valore': config.get('hr_margins.hr_down', 5), 
                  'Descrizione': 'Margine inferiore frequenza cardiaca'},
             ]
-            config_df = pd.DataFrame(config_rows)
+            config_df = pd.DataFrame(config_rows, columns=EXPORT_SHEET_COLUMNS['Config'])
             
             # Popola il DataFrame dei paces
             paces_rows = []
@@ -790,7 +870,7 @@ class ExcelService:
                 paces_rows.append({'Name': name, 'Value': value, 'Note': description})
             
             # Crea il DataFrame dai dati raccolti
-            paces_df = pd.DataFrame(paces_rows)
+            paces_df = pd.DataFrame(paces_rows, columns=EXPORT_SHEET_COLUMNS['Paces'])
             
             # Popola il DataFrame delle frequenze cardiache
             hr_rows = []
@@ -815,7 +895,7 @@ class ExcelService:
                 hr_rows.append({'Name': name, 'Value': value, 'Description': description})
             
             # Crea il DataFrame dai dati raccolti
-            heart_rates_df = pd.DataFrame(hr_rows)
+            heart_rates_df = pd.DataFrame(hr_rows, columns=EXPORT_SHEET_COLUMNS['HeartRates'])
             
             # Popola il DataFrame degli esempi
             examples_rows = [
@@ -846,7 +926,7 @@ class ExcelService:
                 {'Type': 'Distanza km', 'Example': '5km', 'Description': '5 chilometri'},
                 {'Type': 'Lap Button', 'Example': 'lap-button', 'Description': 'Terminato manualmente'},
             ]
-            examples_df = pd.DataFrame(examples_rows)
+            examples_df = pd.DataFrame(examples_rows, columns=EXPORT_SHEET_COLUMNS['Examples'])
             
             # Popola il DataFrame degli allenamenti
             workout_rows = []
@@ -906,7 +986,7 @@ class ExcelService:
                 })
             
             # Crea il DataFrame dai dati raccolti
-            workouts_df = pd.DataFrame(workout_rows)
+            workouts_df = pd.DataFrame(workout_rows, columns=EXPORT_SHEET_COLUMNS['Workouts'])
             
             # Salva i DataFrame in un file Excel
             with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
@@ -917,187 +997,260 @@ class ExcelService:
                 workouts_df.to_excel(writer, sheet_name='Workouts', index=False)
                 examples_df.to_excel(writer, sheet_name='Examples', index=False)
                 
-                # Ottieni il workbook e i worksheets
-                workbook = writer.book
-                
-                # Definizione degli stili
-                # Stile per intestazioni
-                header_style = NamedStyle(name="header_style")
-                header_style.font = Font(name='Arial', size=12, bold=True, color="FFFFFF")
-                header_style.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                header_style.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-                header_style.border = Border(
-                    left=Side(border_style="thin", color="000000"),
-                    right=Side(border_style="thin", color="000000"),
-                    top=Side(border_style="thin", color="000000"),
-                    bottom=Side(border_style="thin", color="000000")
-                )
-                
-                # Stile per celle di dati normali
-                normal_style = NamedStyle(name="normal_style")
-                normal_style.font = Font(name='Arial', size=11)
-                normal_style.alignment = Alignment(wrap_text=True, vertical="top")
-                normal_style.border = Border(
-                    left=Side(border_style="thin", color="D9D9D9"),
-                    right=Side(border_style="thin", color="D9D9D9"),
-                    top=Side(border_style="thin", color="D9D9D9"),
-                    bottom=Side(border_style="thin", color="D9D9D9")
-                )
-                
-                # Stile per celle di dati alternate (righe dispari)
-                alt_style = NamedStyle(name="alt_style")
-                alt_style.font = Font(name='Arial', size=11)
-                alt_style.fill = PatternFill(start_color="EBF1F9", end_color="EBF1F9", fill_type="solid")
-                alt_style.alignment = Alignment(wrap_text=True, vertical="top")
-                alt_style.border = Border(
-                    left=Side(border_style="thin", color="D9D9D9"),
-                    right=Side(border_style="thin", color="D9D9D9"),
-                    top=Side(border_style="thin", color="D9D9D9"),
-                    bottom=Side(border_style="thin", color="D9D9D9")
-                )
-                
-                # Stile per titoli di sezione (usato in Paces)
-                section_style = NamedStyle(name="section_style")
-                section_style.font = Font(name='Arial', size=12, bold=True)
-                section_style.fill = PatternFill(start_color="B4C6E7", end_color="B4C6E7", fill_type="solid")
-                section_style.alignment = Alignment(horizontal="left", vertical="center")
-                section_style.border = Border(
-                    left=Side(border_style="thin", color="000000"),
-                    right=Side(border_style="thin", color="000000"),
-                    top=Side(border_style="thin", color="000000"),
-                    bottom=Side(border_style="thin", color="000000")
-                )
-                
-                # Aggiungi gli stili al workbook
-                if "header_style" not in workbook.named_styles:
-                    workbook.add_named_style(header_style)
-                if "normal_style" not in workbook.named_styles:
-                    workbook.add_named_style(normal_style)
-                if "alt_style" not in workbook.named_styles:
-                    workbook.add_named_style(alt_style)
-                if "section_style" not in workbook.named_styles:
-                    workbook.add_named_style(section_style)
+                # Esportazione di soli dati: nessuna formattazione
+                if not styled:
+                    return
                 
-                # Funzione per applicare stili a un foglio
-                def style_worksheet(worksheet, col_widths, freeze_panes="A2"):
-                    # Imposta larghezza colonne
-                    for col_letter, width in col_widths.items():
-                        worksheet.column_dimensions[col_letter].width = width
-                    
-                    # Applica stile alle intestazioni
-                    for cell in worksheet[1]:
-                        cell.style = "header_style"
-                        
-                    # Imposta altezza intestazioni
-                    worksheet.row_dimensions[1].height = 30
-                    
-                    # Applica stili alternati alle righe di dati
-                    max_row = worksheet.max_row
-                    for row in range(2, max_row + 1):
-                        for cell in worksheet[row]:
-                            if row % 2 == 0:  # Righe pari
-                                cell.style = "normal_style"
-                            else:  # Righe dispari
-                                cell.style = "alt_style"
-                    
-                    # Freezing panes (blocca intestazioni)
-                    if freeze_panes:
-                        worksheet.freeze_panes = freeze_panes
-                        
-                    # Aggiungi filtro automatico alle intestazioni
-                    worksheet.auto_filter.ref = f"A1:{get_column_letter(worksheet.max_column)}{worksheet.max_row}"
-                    
-                    # Regola l'altezza delle righe in base al contenuto
-                    for row in range(2, max_row + 1):
-                        # Imposta un'altezza minima ragionevole
-                        row_height = 20  # Altezza minima
-                        
-                        # Se ci sono celle con molto testo, aumenta l'altezza
-                        for cell in worksheet[row]:
-                            if cell.value and isinstance(cell.value, str) and len(cell.value) > 100:
-                                row_height = max(row_height, 75)  # Celle con molto testo
-                            elif cell.value and isinstance(cell.value, str) and len(cell.value) > 50:
-                                row_height = max(row_height, 40)  # Celle con testo medio
-                        
-                        worksheet.row_dimensions[row].height = row_height
+                # Registra una sola volta gli stili condivisi nel workbook
+                ExcelService._register_export_styles(writer.book)
                 
                 # Formatta il foglio Config
                 config_sheet = writer.sheets['Config']
-                config_col_widths = {'A': 30, 'B': 35, 'C': 45}
-                style_worksheet(config_sheet, config_col_widths)
+                ExcelService._style_worksheet(config_sheet, config_df, {'A': 30, 'B': 35, 'C': 45})
                 
                 # Assicura che la colonna Valore in Config sia formattata come testo
-                for row in range(2, len(config_df) + 2):
-                    cell = config_sheet.cell(row=row, column=2)  # Colonna B (Valore)
-                    cell.number_format = '@'  # Formato testo
-                    if cell.value is not None:
-                        cell.value = str(cell.value)
+                ExcelService._format_text_column(config_sheet, 2)
                 
                 # Formatta il foglio Paces
                 paces_sheet = writer.sheets['Paces']
-                paces_col_widths = {'A': 30, 'B': 25, 'C': 45}
-                style_worksheet(paces_sheet, paces_col_widths)
+                ExcelService._style_worksheet(paces_sheet, paces_df, {'A': 30, 'B': 25, 'C': 45})
                 
                 # Applica stile speciale alle righe di intestazioni di sezione in Paces
-                run_section = "RITMI PER LA CORSA"
-                cycle_section = "POTENZA PER IL CICLISMO"
-                swim_section = "PASSI VASCA PER IL NUOTO"
-                
-                for row in range(1, paces_sheet.max_row + 1):
-                    cell_val = paces_sheet.cell(row=row, column=1).value
-                    if cell_val and isinstance(cell_val, str) and (run_section in cell_val or cycle_section in cell_val or swim_section in cell_val):
-                        for cell in paces_sheet[row]:
-                            cell.style = "section_style"
-                        paces_sheet.row_dimensions[row].height = 25
+                section_names = paces_df['Name'].astype(object).where(paces_df['Name'].notna(), '').map(str)
+                is_section = (section_names.str.contains("RITMI PER LA CORSA", regex=False) |
+                              section_names.str.contains("POTENZA PER IL CICLISMO", regex=False) |
+                              section_names.str.contains("PASSI VASCA PER IL NUOTO", regex=False))
+                ExcelService._style_section_rows(paces_sheet, [int(i) + 2 for i in np.flatnonzero(is_section)])
                 
                 # Assicura che la colonna Value in Paces sia formattata come testo
-                for row in range(2, len(paces_df) + 2):
-                    cell = paces_sheet.cell(row=row, column=2)  # Colonna B (Value)
-                    cell.number_format = '@'  # Formato testo
-                    if cell.value is not None:
-                        cell.value = str(cell.value)
+                ExcelService._format_text_column(paces_sheet, 2)
                 
                 # Formatta il foglio HeartRates
                 hr_sheet = writer.sheets['HeartRates']
-                hr_col_widths = {'A': 30, 'B': 25, 'C': 45}
-                style_worksheet(hr_sheet, hr_col_widths)
+                ExcelService._style_worksheet(hr_sheet, heart_rates_df, {'A': 30, 'B': 25, 'C': 45})
                 
                 # Assicura che la colonna Value in HeartRates sia formattata come testo
-                for row in range(2, len(heart_rates_df) + 2):
-                    cell = hr_sheet.cell(row=row, column=2)  # Colonna B (Value)
-                    cell.number_format = '@'  # Formato testo
-                    if cell.value is not None:
-                        cell.value = str(cell.value)
+                ExcelService._format_text_column(hr_sheet, 2)
                 
-                # Formatta il foglio Workouts
+                # Formatta il foglio Workouts, con righe più alte per il testo degli step
                 workouts_sheet = writer.sheets['Workouts']
-                workouts_col_widths = {'A': 15, 'B': 15, 'C': 15, 'D': 20, 'E': 35, 'F': 90}
-                style_worksheet(workouts_sheet, workouts_col_widths)
-                
-                # Imposta altezza maggiore per le righe nel foglio Workouts
-                for row in range(2, len(workouts_df) + 2):
-                    workouts_sheet.row_dimensions[row].height = 150
+                ExcelService._style_worksheet(workouts_sheet, workouts_df,
+                                              {'A': 15, 'B': 15, 'C': 15, 'D': 20, 'E': 35, 'F': 90},
+                                              row_height=150)
                 
                 # Formatta il foglio Examples
                 examples_sheet = writer.sheets['Examples']
-                examples_col_widths = {'A': 30, 'B': 35, 'C': 50}
-                style_worksheet(examples_sheet, examples_col_widths)
+                ExcelService._style_worksheet(examples_sheet, examples_df, {'A': 30, 'B': 35, 'C': 50})
                 
                 # Applica stile speciale alle righe di intestazioni di sezione in Examples
-                for row in range(1, examples_sheet.max_row + 1):
-                    cell_val = examples_sheet.cell(row=row, column=1).value
-                    cell_val_col2 = examples_sheet.cell(row=row, column=2).value
-                    
-                    # Identifica le righe di intestazione (hanno colonna B vuota e colonna A non vuota)
-                    if cell_val and isinstance(cell_val, str) and cell_val.isupper() and (cell_val_col2 is None or cell_val_col2 == ''):
-                        for cell in examples_sheet[row]:
-                            cell.style = "section_style"
-                        examples_sheet.row_dimensions[row].height = 25
+                # (colonna A in maiuscolo e colonna B vuota)
+                example_types = examples_df['Type'].fillna('').map(str)
+                is_section = (example_types != '') & example_types.str.isupper() & \
+                             (examples_df['Example'].isna() | (examples_df['Example'] == ''))
+                ExcelService._style_section_rows(examples_sheet, [int(i) + 2 for i in np.flatnonzero(is_section)])
             
         except Exception as e:
             logging.error(f"Errore nell'esportazione degli allenamenti in Excel: {str(e)}")
             raise
 
+    
+    @staticmethod
+    def _register_export_styles(workbook) -> None:
+        """
+        Registra nel workbook gli stili con nome usati dall'esportazione.
+        
+        Args:
+            workbook: Workbook openpyxl
+        """
+        from openpyxl.styles import PatternFill, Border, Side, Alignment, Font, NamedStyle
+        
+        dark_border = Border(
+            left=Side(border_style="thin", color="000000"),
+            right=Side(border_style="thin", color="000000"),
+            top=Side(border_style="thin", color="000000"),
+            bottom=Side(border_style="thin", color="000000")
+        )
+        light_border = Border(
+            left=Side(border_style="thin", color="D9D9D9"),
+            right=Side(border_style="thin", color="D9D9D9"),
+            top=Side(border_style="thin", color="D9D9D9"),
+            bottom=Side(border_style="thin", color="D9D9D9")
+        )
+        
+        # Stile per intestazioni
+        header_style = NamedStyle(name="header_style")
+        header_style.font = Font(name='Arial', size=12, bold=True, color="FFFFFF")
+        header_style.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_style.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        header_style.border = dark_border
+        
+        # Stile per celle di dati normali
+        normal_style = NamedStyle(name="normal_style")
+        normal_style.font = Font(name='Arial', size=11)
+        normal_style.alignment = Alignment(wrap_text=True, vertical="top")
+        normal_style.border = light_border
+        
+        # Stile per celle di dati alternate (righe dispari)
+        alt_style = NamedStyle(name="alt_style")
+        alt_style.font = Font(name='Arial', size=11)
+        alt_style.fill = PatternFill(start_color="EBF1F9", end_color="EBF1F9", fill_type="solid")
+        alt_style.alignment = Alignment(wrap_text=True, vertical="top")
+        alt_style.border = light_border
+        
+        # Stile per titoli di sezione (usato in Paces ed Examples)
+        section_style = NamedStyle(name="section_style")
+        section_style.font = Font(name='Arial', size=12, bold=True)
+        section_style.fill = PatternFill(start_color="B4C6E7", end_color="B4C6E7", fill_type="solid")
+        section_style.alignment = Alignment(horizontal="left", vertical="center")
+        section_style.border = dark_border
+        
+        # Aggiungi gli stili al workbook
+        for style in (header_style, normal_style, alt_style, section_style):
+            if style.name not in workbook.named_styles:
+                workbook.add_named_style(style)
+    
+    @staticmethod
+    def _apply_style(cells, style_name: str, cache: Dict[str, Any]) -> None:
+        """
+        Applica uno stile con nome a un gruppo di celle.
+        
+        Lo stile viene risolto una sola volta; alle altre celle viene copiato
+        il riferimento già risolto invece di ripetere la ricerca per nome.
+        
+        Args:
+            cells: Celle da formattare
+            style_name: Nome dello stile registrato nel workbook
+            cache: Stili già risolti (nome -> riferimento)
+        """
+        for cell in cells:
+            resolved = cache.get(style_name)
+            if resolved is None:
+                cell.style = style_name
+                cache[style_name] = copy(cell._style)
+            else:
+                cell._style = copy(resolved)
+    
+    @staticmethod
+    def _column_widths(df: 'pd.DataFrame', max_widths: Dict[str, float]) -> Dict[str, float]:
+        """
+        Calcola le larghezze delle colonne con un solo passaggio sulle lunghezze dei testi.
+        
+        Args:
+            df: DataFrame del foglio
+            max_widths: Larghezza massima per colonna (lettera -> larghezza)
+        
+        Returns:
+            Larghezza di ogni colonna (lettera -> larghezza)
+        """
+        from openpyxl.utils import get_column_letter
+        
+        widths = {}
+        for index, column in enumerate(df.columns, 1):
+            letter = get_column_letter(index)
+            
+            # Riga più lunga di ogni cella (i testi degli step sono su più righe)
+            values = df[column].dropna().map(str)
+            longest = values.str.split('\n').map(lambda lines: max(map(len, lines))).max() if len(values) else 0
+            longest = max(longest, len(str(column)))
+            
+            widths[letter] = min(max(longest + 2, MIN_COLUMN_WIDTH), max_widths.get(letter, MAX_COLUMN_WIDTH))
+        
+        return widths
+    
+    @staticmethod
+    def _row_heights(df: 'pd.DataFrame') -> 'np.ndarray':
+        """
+        Calcola l'altezza delle righe di dati in base alla lunghezza del testo.
+        
+        Args:
+            df: DataFrame del foglio
+        
+        Returns:
+            Altezza di ogni riga di dati
+        """
+        if df.empty:
+            return np.array([], dtype=int)
+        
+        lengths = df.apply(lambda column: column.map(lambda value: len(value) if isinstance(value, str) else 0))
+        longest = lengths.max(axis=1).to_numpy()
+        
+        # Altezza minima ragionevole, aumentata per le celle con molto testo
+        return np.select([longest > 100, longest > 50], [75, 40], default=20)
+    
+    @staticmethod
+    def _style_worksheet(worksheet, df: 'pd.DataFrame', max_widths: Dict[str, float],
+                         freeze_panes: Optional[str] = "A2", row_height: Optional[int] = None) -> None:
+        """
+        Applica la formattazione a un foglio esportato.
+        
+        Larghezze e altezze sono calcolate dal DataFrame, senza rileggere le celle.
+        
+        Args:
+            worksheet: Foglio openpyxl
+            df: DataFrame scritto nel foglio
+            max_widths: Larghezza massima per colonna (lettera -> larghezza)
+            freeze_panes: Cella da cui bloccare i riquadri (None per non bloccare)
+            row_height: Altezza fissa delle righe di dati (None per calcolarla dal contenuto)
+        """
+        from openpyxl.utils import get_column_letter
+        
+        styles = {}
+        
+        # Imposta larghezza colonne
+        for col_letter, width in ExcelService._column_widths(df, max_widths).items():
+            worksheet.column_dimensions[col_letter].width = width
+        
+        # Applica stile alle intestazioni
+        ExcelService._apply_style(worksheet[1], "header_style", styles)
+        
+        # Imposta altezza intestazioni
+        worksheet.row_dimensions[1].height = 30
+        
+        # Applica stili alternati alle righe di dati
+        max_row = len(df) + 1
+        for row_idx, row in enumerate(worksheet.iter_rows(min_row=2, max_row=max_row), 2):
+            ExcelService._apply_style(row, "normal_style" if row_idx % 2 == 0 else "alt_style", styles)
+        
+        # Freezing panes (blocca intestazioni)
+        if freeze_panes:
+            worksheet.freeze_panes = freeze_panes
+        
+        # Aggiungi filtro automatico alle intestazioni
+        worksheet.auto_filter.ref = f"A1:{get_column_letter(max(len(df.columns), 1))}{max_row}"
+        
+        # Regola l'altezza delle righe in base al contenuto
+        heights = ExcelService._row_heights(df) if row_height is None else [row_height] * len(df)
+        for row_idx, height in enumerate(heights, 2):
+            worksheet.row_dimensions[row_idx].height = int(height)
+    
+    @staticmethod
+    def _style_section_rows(worksheet, rows: List[int]) -> None:
+        """
+        Applica lo stile dei titoli di sezione ad alcune righe.
+        
+        Args:
+            worksheet: Foglio openpyxl
+            rows: Numeri delle righe (a partire da 1)
+        """
+        styles = {}
+        for row in rows:
+            ExcelService._apply_style(worksheet[row], "section_style", styles)
+            worksheet.row_dimensions[row].height = 25
+    
+    @staticmethod
+    def _format_text_column(worksheet, column: int) -> None:
+        """
+        Formatta come testo una colonna di valori.
+        
+        Args:
+            worksheet: Foglio openpyxl
+            column: Numero della colonna (a partire da 1)
+        """
+        for (cell,) in worksheet.iter_rows(min_row=2, min_col=column, max_col=column):
+            cell.number_format = '@'  # Formato testo
+            if cell.value is not None:
+                cell.value = str(cell.value)
+
     @staticmethod
     def format_steps_for_export(workout: Workout, indent_level: int = 0) -> str:
         """
@@ -1236,213 +1389,3 @@ class ExcelService:
         
         # Combina tutto
         return f"{indent}{step_type}: {duration}{target_text}{description_text}"
-    
-    @staticmethod
-    def add_steps_to_dataframe(df: 'pd.DataFrame', steps: List[WorkoutStep], start_row: int, indent: str = '') -> int:
-        """
-        Aggiunge step a un dataframe.
-        
-        Args:
-            df: Dataframe da popolare
-            steps: Lista di step da aggiungere
-            start_row: Indice di riga iniziale
-            indent: Indentazione per gli step nidificati
-            
-        Returns:
-            Indice della prossima riga libera
-        """
-        row_idx = start_row
-        
-        # Ottieni la configurazione per convertire i valori in nomi di zone
-        config = get_config()
-        
-        # Per ogni step
-        for step in steps:
-            # Caso speciale: repeat
-            if step.step_type == 'repeat':
-                # Aggiungi la riga repeat
-                df.loc[row_idx] = {
-                    'Nome': '',
-                    'Sport': '',
-                    'Data': '',
-                    'Tipo': f"{indent}repeat",
-                    'Condizione di fine': 'iterations',
-                    'Valore': step.end_condition_value,
-                    'Descrizione': '',
-                    'Target': ''
-                }
-                
-                row_idx += 1
-                
-                # Aggiungi gli step figli con indentazione
-                row_idx = ExcelService.add_steps_to_dataframe(df, step.workout_steps, row_idx, indent + '  ')
-                
-                # Aggiungi la riga end_repeat
-                df.loc[row_idx] = {
-                    'Nome': '',
-                    'Sport': '',
-                    'Data': '',
-                    'Tipo': f"{indent}end_repeat",
-                    'Condizione di fine': '',
-                    'Valore': '',
-                    'Descrizione': '',
-                    'Target': ''
-                }
-                
-                row_idx += 1
-                
-            else:
-                # Step normale
-                # Formatta il valore della condizione di fine
-                end_value = ''
-                
-                if step.end_condition == 'lap.button':
-                    end_value = 'lap-button'
-                elif step.end_condition == 'time':
-                    # Formatta il tempo
-                    if isinstance(step.end_condition_value, str) and ":" in step.end_condition_value:
-                        # Già nel formato mm:ss
-                        end_value = step.end_condition_value
-                    elif isinstance(step.end_condition_value, (int, float)):
-                        # Converti secondi in mm:ss
-                        seconds = int(step.end_condition_value)
-                        minutes = seconds // 60
-                        seconds = seconds % 60
-                        end_value = f"{minutes}:{seconds:02d}"
-                    else:
-                        end_value = str(step.end_condition_value)
-                elif step.end_condition == 'distance':
-                    # Formatta la distanza
-                    if isinstance(step.end_condition_value, str):
-                        end_value = step.end_condition_value
-                    elif isinstance(step.end_condition_value, (int, float)):
-                        # Converti metri in m o km
-                        if step.end_condition_value >= 1000:
-                            end_value = f"{step.end_condition_value / 1000:.2f}km".replace('.00', '')
-                        else:
-                            end_value = f"{int(step.end_condition_value)}m"
-                    else:
-                        end_value = str(step.end_condition_value)
-                else:
-                    end_value = str(step.end_condition_value) if step.end_condition_value is not None else ''
-                
-                # Formatta il target
-                target_str = ''
-                
-                if step.target and step.target.target != 'no.target':
-                    # Converti valori numerici in nomi di zone
-                    if step.target.target == 'pace.zone' and step.target.from_value and step.target.to_value:
-                        # Cerca la zona di passo corrispondente
-                        paces = config.get(f'sports.{step.sport_type if hasattr(step, "sport_type") else "running"}.paces', {})
-                        zone_name = None
-                        
-                        # Converti da m/s a min/km
-                        min_pace_secs = int(1000 / step.target.from_value)
-                        max_pace_secs = int(1000 / step.target.to_value)
-                        
-                        min_pace = f"{min_pace_secs // 60}:{min_pace_secs % 60:02d}"
-                        max_pace = f"{max_pace_secs // 60}:{max_pace_secs % 60:02d}"
-                        
-                        # Cerca la zona corrispondente
-                        for name, pace_range in paces.items():
-                            if '-' in pace_range:
-                                pace_min, pace_max = pace_range.split('-')
-                                if pace_min.strip() == min_pace and pace_max.strip() == max_pace:
-                                    zone_name = name
-                                    break
-                            elif pace_range == min_pace and pace_range == max_pace:
-                                zone_name = name
-                                break
-                        
-                        if zone_name:
-                            target_str = f"@ {zone_name}"
-                        else:
-                            if min_pace == max_pace:
-                                target_str = f"{min_pace}"
-                            else:
-                                target_str = f"{min_pace}-{max_pace}"
-                    
-                    elif step.target.target == 'heart.rate.zone' and step.target.from_value and step.target.to_value:
-                        # Cerca la zona HR corrispondente
-                        heart_rates = config.get('heart_rates', {})
-                        zone_name = None
-                        
-                        # Valori numerici della zona
-                        from_value = int(step.target.from_value)
-                        to_value = int(step.target.to_value)
-                        
-                        # Cerca la zona corrispondente
-                        for name, hr_range in heart_rates.items():
-                            if name.endswith('_HR'):
-                                # Calcola valori effettivi usando max_hr
-                                max_hr = heart_rates.get('max_hr', 180)
-                                
-                                if '-' in hr_range and 'max_hr' in hr_range:
-                                    # Formato: 62-76% max_hr
-                                    parts = hr_range.split('-')
-                                    min_percent = float(parts[0])
-                                    max_percent = float(parts[1].split('%')[0])
-                                    hr_min = int(min_percent * max_hr / 100)
-                                    hr_max = int(max_percent * max_hr / 100)
-                                    
-                                    if hr_min <= from_value <= hr_max and hr_min <= to_value <= hr_max:
-                                        zone_name = name
-                                        break
-                        
-                        if zone_name:
-                            target_str = f"@ {zone_name}"
-                        else:
-                            target_str = f"{from_value}-{to_value} bpm"
-                    
-                    elif step.target.target == 'power.zone' and step.target.from_value and step.target.to_value:
-                        # Cerca la zona di potenza corrispondente
-                        power_values = config.get('sports.cycling.power_values', {})
-                        zone_name = None
-                        
-                        # Valori numerici della zona
-                        from_value = int(step.target.from_value)
-                        to_value = int(step.target.to_value)
-                        
-                        # Cerca la zona corrispondente
-                        for name, power_range in power_values.items():
-                            if '-' in power_range:
-                                power_min, power_max = power_range.split('-')
-                                if int(power_min) == from_value and int(power_max) == to_value:
-                                    zone_name = name
-                                    break
-                            elif power_range.startswith('<'):
-                                power_val = int(power_range[1:])
-                                if from_value == 0 and to_value == power_val:
-                                    zone_name = name
-                                    break
-                            elif power_range.endswith('+'):
-                                power_val = int(power_range[:-1])
-                                if from_value == power_val and to_value == 9999:
-                                    zone_name = name
-                                    break
-                            else:
-                                power_val = int(power_range)
-                                if from_value == power_val and to_value == power_val:
-                                    zone_name = name
-                                    break
-                        
-                        if zone_name:
-                            target_str = f"@ {zone_name}"
-                        else:
-                            target_str = f"{from_value}-{to_value} W"
-                
-                # Aggiungi lo step al dataframe
-                df.loc[row_idx] = {
-                    'Nome': '',
-                    'Sport': '',
-                    'Data': '',
-                    'Tipo': f"{indent}{step.step_type}",
-                    'Condizione di fine': step.end_condition,
-                    'Valore': end_value,
-                    'Descrizione': step.description,
-                    'Target': target_str
-                }
-                
-                row_idx += 1
-        
-        return row_idx
\ No newline at end of file
@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Servizio per il formato JSON-lines dei piani di allenamento.
+
+Il file contiene una riga di intestazione con le sezioni di configurazione
+e poi un allenamento per riga. Accanto al file viene scritto un indice
+(stesso nome con estensione .idx) con la posizione di ogni riga, che
+permette di leggere un singolo allenamento senza leggere l'intero file.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterator
+
+from config import get_config, default_file_mode
+from models.workout import Workout
+from services.yaml_service import YamlService, CONFIG_SECTIONS
+
+
+# Identificativo e versione del formato
+FORMAT_NAME = 'garmin-planner-jsonl'
+FORMAT_VERSION = 1
+
+# Estensione del file indice
+INDEX_SUFFIX = '.idx'
+
+
+class JsonlService:
+    """Servizio per la gestione dei file JSON-lines."""
+    
+    @staticmethod
+    def export_workouts(workouts: List[Tuple[str, Workout]], file_path: str,
+                        config: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Esporta allenamenti in un file JSON-lines e scrive il relativo indice.
+        
+        Args:
+            workouts: Lista di tuple (nome, allenamento)
+            file_path: Percorso del file
+            config: Valori aggiuntivi della sezione 'config' (es. name_prefix)
+        
+        Raises:
+            IOError: Se il file non può essere scritto
+        """
+        try:
+            header = {
+                'format': FORMAT_NAME,
+                'version': FORMAT_VERSION,
+                'config': YamlService.build_config_sections(config),
+            }
+            
+            entries = []
+            directory = os.path.dirname(os.path.abspath(file_path))
+            fd, tmp_path = tempfile.mkstemp(prefix='.plan-', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(JsonlService._encode(header))
+                    
+                    # Una riga per allenamento, con la posizione per l'indice
+                    for name, workout in workouts:
+                        line = JsonlService._encode({'name': name, 'workout': workout.to_dict()})
+                        entries.append((name, f.tell(), len(line)))
+                        f.write(line)
+                
+                # mkstemp crea file 0600: usa i permessi normali dei nuovi file
+                os.chmod(tmp_path, default_file_mode())
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            
+            JsonlService._write_index(file_path, entries)
+            
+            logging.info(f"Esportati {len(entries)} allenamenti in {file_path}")
+        
+        except Exception as e:
+            logging.error(f"Errore nell'esportazione degli allenamenti in JSON-lines: {str(e)}")
+            raise
+    
+    @staticmethod
+    def read_header(file_path: str) -> Dict[str, Any]:
+        """
+        Legge l'intestazione di un file JSON-lines.
+        
+        Args:
+            file_path: Percorso del file
+        
+        Returns:
+            Intestazione con 'format', 'version' e 'config'
+        
+        Raises:
+            ValueError: Se il file non è nel formato atteso
+        """
+        with open(file_path, 'rb') as f:
+            return JsonlService._parse_header(f.readline())
+    
+    @staticmethod
+    def import_workouts(file_path: str) -> List[Tuple[str, Workout]]:
+        """
+        Importa tutti gli allenamenti di un file JSON-lines.
+        
+        Args:
+            file_path: Percorso del file
+        
+        Returns:
+            Lista di tuple (nome, allenamento)
+        """
+        return list(JsonlService.iter_workouts(file_path))
+    
+    @staticmethod
+    def iter_workouts(file_path: str,
+                      on_config: Optional[Callable[[str, Any], None]] = None) -> Iterator[Tuple[str, Workout]]:
+        """
+        Importa gli allenamenti di un file JSON-lines uno alla volta.
+        
+        Le sezioni di configurazione dell'intestazione vengono applicate
+        prima di restituire il primo allenamento.
+        
+        Args:
+            file_path: Percorso del file
+            on_config: Funzione chiamata con (sezione, dati) per ogni sezione
+                       di configurazione applicata (opzionale)
+        
+        Yields:
+            Tuple (nome, allenamento) nell'ordine del file
+        
+        Raises:
+            IOError: Se il file non può essere letto
+            ValueError: Se il file non è nel formato atteso
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                header = JsonlService._parse_header(f.readline())
+                sections = header.get('config') or {}
+                
+                # Applica le sezioni di configurazione
+                app_config = get_config()
+                applied = False
+                for section in CONFIG_SECTIONS:
+                    if section in sections:
+                        YamlService.apply_config_section(section, sections[section] or {}, app_config)
+                        applied = True
+                        if on_config:
+                            on_config(section, sections[section])
+                
+                if applied:
+                    app_config.save()
+                
+                name_prefix = (sections.get('config') or {}).get('name_prefix', '')
+                
+                for line in f:
+                    if not line.strip():
+                        continue
+                    
+                    name, workout = JsonlService._parse_record(line)
+                    
+                    # Se il nome comincia con il prefisso, usa solo la parte finale
+                    if name_prefix and name.startswith(name_prefix):
+                        name = name[len(name_prefix):].strip()
+                    
+                    yield name, workout
+        
+        except Exception as e:
+            logging.error(f"Errore nell'importazione degli allenamenti da JSON-lines: {str(e)}")
+            raise
+    
+    @staticmethod
+    def list_workouts(file_path: str) -> List[str]:
+        """
+        Restituisce i nomi degli allenamenti di un file, usando l'indice.
+        
+        Args:
+            file_path: Percorso del file
+        
+        Returns:
+            Nomi degli allenamenti nell'ordine del file
+        """
+        return [name for name, _, _ in JsonlService.load_index(file_path)]
+    
+    @staticmethod
+    def load_workout(file_path: str, name: str) -> Optional[Workout]:
+        """
+        Legge un singolo allenamento senza leggere l'intero file.
+        
+        La configurazione dell'intestazione non viene applicata.
+        
+        Args:
+            file_path: Percorso del file
+            name: Nome dell'allenamento (come scritto nel file)
+        
+        Returns:
+            Allenamento, o None se non presente nel file
+        """
+        for entry_name, offset, length in JsonlService.load_index(file_path):
+            if entry_name == name:
+                with open(file_path, 'rb') as f:
+                    f.seek(offset)
+                    return JsonlService._parse_record(f.read(length))[1]
+        return None
+    
+    @staticmethod
+    def load_index(file_path: str) -> List[Tuple[str, int, int]]:
+        """
+        Carica l'indice di un file, ricostruendolo se manca o non è aggiornato.
+        
+        Args:
+            file_path: Percorso del file
+        
+        Returns:
+            Lista di tuple (nome, posizione, lunghezza) nell'ordine del file
+        """
+        stat = os.stat(file_path)
+        
+        try:
+            with open(file_path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            
+            # L'indice vale solo per il file con cui è stato scritto
+            if index.get('size') == stat.st_size and index.get('mtime_ns') == stat.st_mtime_ns:
+                return [tuple(entry) for entry in index['workouts']]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        
+        logging.info(f"Ricostruzione dell'indice di {file_path}")
+        
+        entries = []
+        with open(file_path, 'rb') as f:
+            JsonlService._parse_header(f.readline())
+            offset = f.tell()
+            for line in f:
+                if line.strip():
+                    entries.append((json.loads(line)['name'], offset, len(line)))
+                offset += len(line)
+        
+        JsonlService._write_index(file_path, entries)
+        return entries
+    
+    @staticmethod
+    def _write_index(file_path: str, entries: List[Tuple[str, int, int]]) -> None:
+        """
+        Scrive l'indice di un file.
+        
+        Args:
+            file_path: Percorso del file
+            entries: Lista di tuple (nome, posizione, lunghezza)
+        """
+        stat = os.stat(file_path)
+        index = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'workouts': [list(entry) for entry in entries],
+        }
+        
+        try:
+            directory = os.path.dirname(os.path.abspath(file_path))
+            fd, tmp_path = tempfile.mkstemp(prefix='.index-', suffix='.tmp', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+            os.chmod(tmp_path, default_file_mode())
+            os.replace(tmp_path, file_path + INDEX_SUFFIX)
+        except OSError as e:
+            # Senza indice il file resta leggibile: verrà ricostruito alla prossima lettura
+            logging.warning(f"Impossibile scrivere l'indice di {file_path}: {str(e)}")
+    
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        """
+        Codifica un record come riga JSON compatta.
+        
+        Args:
+            record: Record da codificare
+        
+        Returns:
+            Riga codificata in UTF-8, terminata da un a capo
+        """
+        return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+    
+    @staticmethod
+    def _parse_header(line: bytes) -> Dict[str, Any]:
+        """
+        Decodifica e verifica la riga di intestazione.
+        
+        Args:
+            line: Prima riga del file
+        
+        Returns:
+            Intestazione
+        
+        Raises:
+            ValueError: Se il file non è nel formato atteso
+        """
+        try:
+            header = json.loads(line)
+        except ValueError:
+            header = None
+        
+        if not isinstance(header, dict) or header.get('format') != FORMAT_NAME:
+            raise ValueError("Il file non è un piano JSON-lines di GarminPlannerGUI")
+        
+        if header.get('version', 0) > FORMAT_VERSION:
+            raise ValueError(f"Versione del formato non supportata: {header.get('version')}")
+        
+        return header
+    
+    @staticmethod
+    def _parse_record(line: bytes) -> Tuple[str, Workout]:
+        """
+        Decodifica la riga di un allenamento.
+        
+        Args:
+            line: Riga del file
+        
+        Returns:
+            Tupla (nome, allenamento)
+        """
+        record = json.loads(line)
+        return record['name'], Workout.from_dict(record['workout'])
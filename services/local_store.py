@@ -0,0 +1,706 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Archivio locale persistente (SQLite) per allenamenti, calendario e attività.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+import weakref
+from typing import Dict, Any, List, Tuple, Optional
+
+from models.workout import Workout
+from models.calendar import CalendarItem, CalendarMonth
+
+
+# Percorso predefinito del database
+DEFAULT_STORE_PATH = 'garmin_planner.db'
+
+# Collezioni di allenamenti gestite dall'archivio
+COLLECTION_IMPORTED = 'imported'
+COLLECTION_GARMIN = 'garmin'
+
+# Schema del database
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workouts (
+    collection TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    sport_type TEXT,
+    date TEXT,
+    remote_id TEXT,
+    step_count INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (collection, position)
+);
+CREATE INDEX IF NOT EXISTS idx_workouts_date ON workouts (date);
+CREATE INDEX IF NOT EXISTS idx_workouts_sport ON workouts (sport_type);
+CREATE INDEX IF NOT EXISTS idx_workouts_remote ON workouts (remote_id);
+
+CREATE TABLE IF NOT EXISTS calendar_items (
+    item_type TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    title TEXT,
+    sport_type TEXT,
+    description TEXT,
+    source TEXT,
+    source_id TEXT,
+    PRIMARY KEY (item_type, item_id, date)
+);
+CREATE INDEX IF NOT EXISTS idx_calendar_date ON calendar_items (date);
+CREATE INDEX IF NOT EXISTS idx_calendar_sport ON calendar_items (sport_type);
+CREATE INDEX IF NOT EXISTS idx_calendar_remote ON calendar_items (source_id);
+
+CREATE TABLE IF NOT EXISTS calendar_months (
+    month TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    date TEXT,
+    data TEXT NOT NULL,
+    queued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    remote_id TEXT
+);
+"""
+
+
+class StoredWorkout(Workout):
+    """
+    Allenamento salvato nell'archivio locale.
+    
+    Nome, sport e descrizione sono disponibili subito; l'albero degli step
+    viene caricato dal database solo al primo accesso.
+    """
+    
+    def __init__(self, store: 'LocalStore', collection: str, position: int,
+                 sport_type: str, workout_name: str, description: str = "",
+                 step_count: int = 0, date: Optional[str] = None):
+        """
+        Inizializza un allenamento salvato.
+        
+        Args:
+            store: Archivio da cui caricare gli step
+            collection: Collezione dell'allenamento
+            position: Posizione nella collezione
+            sport_type: Tipo di sport
+            workout_name: Nome dell'allenamento
+            description: Descrizione dell'allenamento
+            step_count: Numero di step di primo livello
+            date: Data pianificata dell'allenamento
+        """
+        self._store = store
+        self._collection = collection
+        self._position = position
+        self._step_count = step_count
+        self._date = date
+        self._steps = None
+        super().__init__(sport_type, workout_name, description)
+    
+    @property
+    def workout_steps(self) -> List:
+        """Step dell'allenamento, caricati al primo accesso."""
+        if self._steps is None:
+            data = self._store.get_workout_data(self._collection, self._position) or {}
+            loaded = Workout.from_dict(data)
+            self._steps = loaded.workout_steps
+        return self._steps
+    
+    @workout_steps.setter
+    def workout_steps(self, steps: List) -> None:
+        # Il costruttore di Workout inizializza una lista vuota: in quel caso
+        # gli step restano da caricare
+        if steps == [] and self._steps is None:
+            return
+        self._steps = steps
+    
+    @property
+    def step_count(self) -> int:
+        """Numero di step di primo livello, senza caricare l'albero se possibile."""
+        if self._steps is None:
+            return self._step_count
+        return len(self._steps)
+    
+    @property
+    def is_loaded(self) -> bool:
+        """True se gli step sono già stati caricati dal database."""
+        return self._steps is not None
+
+
+class LocalStore:
+    """Archivio locale basato su SQLite in modalità WAL."""
+    
+    def __init__(self, db_path: str = DEFAULT_STORE_PATH):
+        """
+        Inizializza l'archivio e crea lo schema se necessario.
+        
+        Args:
+            db_path: Percorso del file del database
+        """
+        self.db_path = os.path.expanduser(db_path)
+        
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+        
+        # La connessione è condivisa tra i thread e protetta da un lock
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        
+        # Allenamenti restituiti da load_workouts ancora in uso, con gli step da caricare
+        self._pending_workouts = weakref.WeakSet()
+        
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            
+            # Archivi creati prima dei ritentativi della sola pianificazione
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(sync_outbox)")}
+            if 'remote_id' not in columns:
+                self._conn.execute("ALTER TABLE sync_outbox ADD COLUMN remote_id TEXT")
+            
+            self._conn.commit()
+        
+        logging.info(f"Archivio locale aperto: {self.db_path}")
+    
+    def close(self) -> None:
+        """Chiude la connessione al database."""
+        with self._lock:
+            self._conn.close()
+    
+    # ------------------------------------------------------------------
+    # Allenamenti importati (oggetti Workout)
+    # ------------------------------------------------------------------
+    
+    def save_workouts(self, workouts: List[Tuple[str, Workout]],
+                      collection: str = COLLECTION_IMPORTED) -> None:
+        """
+        Sostituisce il contenuto di una collezione di allenamenti.
+        
+        Gli allenamenti salvati non ancora caricati vengono riscritti senza
+        deserializzare il loro albero di step.
+        
+        Args:
+            workouts: Lista di tuple (nome, allenamento)
+            collection: Collezione da sostituire
+        """
+        now = time.time()
+        rows = []
+        
+        with self._lock:
+            # Gli allenamenti tolti dalla collezione ma ancora referenziati (es.
+            # dall'editor) perderebbero la loro riga: caricali prima di riscriverla
+            kept = {id(workout) for _, workout in workouts}
+            self._load_removed_workouts(collection, kept)
+            
+            for position, (name, workout) in enumerate(workouts):
+                if isinstance(workout, StoredWorkout) and not workout.is_loaded:
+                    data = self.get_workout_data(workout._collection, workout._position, raw=True)
+                else:
+                    data = json.dumps(workout.to_dict())
+                
+                rows.append((collection, position, name, workout.sport_type,
+                             self._workout_date(workout), None, self._step_count(workout),
+                             data, now))
+            
+            with self._conn:
+                self._conn.execute("DELETE FROM workouts WHERE collection = ?", (collection,))
+                self._conn.executemany(
+                    "INSERT INTO workouts (collection, position, name, sport_type, date, "
+                    "remote_id, step_count, data, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows)
+            
+            # Gli allenamenti salvati puntano ora alle nuove posizioni
+            for position, (name, workout) in enumerate(workouts):
+                if isinstance(workout, StoredWorkout):
+                    workout._collection = collection
+                    workout._position = position
+        
+        logging.debug(f"Archivio locale: salvati {len(rows)} allenamenti in '{collection}'")
+    
+    def _load_removed_workouts(self, collection: str, kept: set) -> None:
+        """
+        Carica gli step degli allenamenti salvati che stanno per perdere la loro riga.
+        
+        Args:
+            collection: Collezione che verrà riscritta
+            kept: id() degli allenamenti che restano nella collezione
+        """
+        for workout in list(self._pending_workouts):
+            if workout.is_loaded:
+                self._pending_workouts.discard(workout)
+            elif workout._collection == collection and id(workout) not in kept:
+                workout.workout_steps
+                self._pending_workouts.discard(workout)
+    
+    def load_workouts(self, collection: str = COLLECTION_IMPORTED) -> List[Tuple[str, Workout]]:
+        """
+        Carica una collezione di allenamenti senza deserializzare gli step.
+        
+        Args:
+            collection: Collezione da caricare
+        
+        Returns:
+            Lista di tuple (nome, allenamento) con step caricati al primo accesso
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT position, name, sport_type, date, step_count, "
+                "json_extract(data, '$.description') AS description "
+                "FROM workouts WHERE collection = ? ORDER BY position",
+                (collection,)).fetchall()
+        
+        workouts = [(row['name'], StoredWorkout(self, collection, row['position'],
+                                                row['sport_type'] or '', row['name'],
+                                                row['description'] or '', row['step_count'],
+                                                row['date']))
+                    for row in rows]
+        
+        with self._lock:
+            self._pending_workouts.update(workout for _, workout in workouts)
+        return workouts
+    
+    def list_workouts(self, collection: str = COLLECTION_IMPORTED, sport_type: Optional[str] = None,
+                      start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Elenca i dati sintetici degli allenamenti di una collezione.
+        
+        Args:
+            collection: Collezione da interrogare
+            sport_type: Filtra per tipo di sport
+            start_date: Data minima (formato YYYY-MM-DD)
+            end_date: Data massima (formato YYYY-MM-DD)
+        
+        Returns:
+            Lista di dizionari con position, name, sport_type, date, remote_id e step_count
+        """
+        query = ("SELECT position, name, sport_type, date, remote_id, step_count "
+                 "FROM workouts WHERE collection = ?")
+        params = [collection]
+        
+        if sport_type:
+            query += " AND sport_type = ?"
+            params.append(sport_type)
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+        
+        query += " ORDER BY position"
+        
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params)]
+    
+    def get_workout_data(self, collection: str, position: int, raw: bool = False) -> Optional[Any]:
+        """
+        Ottiene i dati completi di un allenamento.
+        
+        Args:
+            collection: Collezione dell'allenamento
+            position: Posizione nella collezione
+            raw: Se True restituisce il JSON senza decodificarlo
+        
+        Returns:
+            Dizionario con i dati (o stringa JSON), None se non trovato
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM workouts WHERE collection = ? AND position = ?",
+                (collection, position)).fetchone()
+        
+        if not row:
+            return None
+        return row['data'] if raw else json.loads(row['data'])
+    
+    # ------------------------------------------------------------------
+    # Allenamenti di Garmin Connect (dizionari dell'API)
+    # ------------------------------------------------------------------
+    
+    def save_garmin_workouts(self, workouts: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Sostituisce la copia locale degli allenamenti di Garmin Connect.
+        
+        Args:
+            workouts: Lista di tuple (id, dati dell'API)
+        """
+        now = time.time()
+        rows = []
+        
+        for position, (workout_id, data) in enumerate(workouts):
+            sport_type = (data.get('sportType') or {}).get('sportTypeKey')
+            segments = data.get('workoutSegments') or [{}]
+            step_count = len(segments[0].get('workoutSteps', []))
+            
+            rows.append((COLLECTION_GARMIN, position, data.get('workoutName', ''), sport_type,
+                         data.get('date') or None, str(workout_id), step_count,
+                         json.dumps(data, default=str), now))
+        
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM workouts WHERE collection = ?", (COLLECTION_GARMIN,))
+            self._conn.executemany(
+                "INSERT INTO workouts (collection, position, name, sport_type, date, "
+                "remote_id, step_count, data, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+    
+    def load_garmin_workouts(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Carica la copia locale degli allenamenti di Garmin Connect.
+        
+        Returns:
+            Lista di tuple (id, dati dell'API)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT remote_id, data FROM workouts WHERE collection = ? ORDER BY position",
+                (COLLECTION_GARMIN,)).fetchall()
+        
+        return [(row['remote_id'], json.loads(row['data'])) for row in rows]
+    
+    def find_garmin_workout(self, remote_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cerca un allenamento di Garmin Connect per ID remoto.
+        
+        Args:
+            remote_id: ID dell'allenamento su Garmin Connect
+        
+        Returns:
+            Dati dell'API o None se non trovato
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM workouts WHERE collection = ? AND remote_id = ?",
+                (COLLECTION_GARMIN, str(remote_id))).fetchone()
+        
+        return json.loads(row['data']) if row else None
+    
+    # ------------------------------------------------------------------
+    # Calendario e attività
+    # ------------------------------------------------------------------
+    
+    def save_calendar_month(self, month: CalendarMonth) -> None:
+        """
+        Sostituisce gli item (allenamenti e attività) di un mese.
+        
+        Args:
+            month: Mese da salvare
+        """
+        start, end = self._month_bounds(month.year, month.month)
+        
+        rows = []
+        for day in month.days.values():
+            for item in day.items:
+                rows.append((item.item_type, item.item_id, item.date, item.title,
+                             item.sport_type, item.description, item.source, item.source_id))
+        
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM calendar_items WHERE date BETWEEN ? AND ?", (start, end))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO calendar_items (item_type, item_id, date, title, "
+                "sport_type, description, source, source_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO calendar_months (month, synced_at) VALUES (?, ?)",
+                (f"{month.year}-{month.month:02d}", time.time()))
+    
+    def load_calendar_month(self, year: int, month: int) -> Optional[CalendarMonth]:
+        """
+        Carica un mese dall'archivio.
+        
+        Args:
+            year: Anno
+            month: Mese (1-12)
+        
+        Returns:
+            Mese ricostruito, None se il mese non è mai stato sincronizzato
+        """
+        with self._lock:
+            synced = self._conn.execute(
+                "SELECT synced_at FROM calendar_months WHERE month = ?",
+                (f"{year}-{month:02d}",)).fetchone()
+        
+        if not synced:
+            return None
+        
+        start, end = self._month_bounds(year, month)
+        month_obj = CalendarMonth(year, month)
+        for item in self.get_calendar_items(start, end):
+            month_obj.add_item(item)
+        
+        return month_obj
+    
+    def calendar_synced_at(self, year: int, month: int) -> Optional[float]:
+        """
+        Restituisce l'istante dell'ultima sincronizzazione di un mese.
+        
+        Args:
+            year: Anno
+            month: Mese (1-12)
+        
+        Returns:
+            Timestamp dell'ultima sincronizzazione, None se mai sincronizzato
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM calendar_months WHERE month = ?",
+                (f"{year}-{month:02d}",)).fetchone()
+        
+        return row['synced_at'] if row else None
+    
+    def save_calendar_items(self, items: List[CalendarItem]) -> None:
+        """
+        Aggiunge o aggiorna singoli item del calendario (es. attività appena scaricate).
+        
+        Args:
+            items: Item da salvare
+        """
+        rows = [(item.item_type, item.item_id, item.date, item.title,
+                 item.sport_type, item.description, item.source, item.source_id)
+                for item in items]
+        
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO calendar_items (item_type, item_id, date, title, "
+                "sport_type, description, source, source_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+    
+    def get_calendar_items(self, start_date: str, end_date: str, item_type: Optional[str] = None,
+                           sport_type: Optional[str] = None) -> List[CalendarItem]:
+        """
+        Ottiene gli item del calendario in un intervallo di date.
+        
+        Args:
+            start_date: Data di inizio (formato YYYY-MM-DD)
+            end_date: Data di fine (formato YYYY-MM-DD)
+            item_type: Filtra per tipo di item ('workout' o 'activity')
+            sport_type: Filtra per tipo di sport
+        
+        Returns:
+            Lista di item ordinata per data
+        """
+        query = "SELECT * FROM calendar_items WHERE date BETWEEN ? AND ?"
+        params = [start_date, end_date]
+        
+        if item_type:
+            query += " AND item_type = ?"
+            params.append(item_type)
+        if sport_type:
+            query += " AND sport_type = ?"
+            params.append(sport_type)
+        
+        query += " ORDER BY date"
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        
+        return [CalendarItem.from_dict(dict(row)) for row in rows]
+    
+    def find_calendar_items(self, source_id: str) -> List[CalendarItem]:
+        """
+        Cerca gli item del calendario collegati a un ID remoto.
+        
+        Args:
+            source_id: ID dell'allenamento o dell'attività su Garmin Connect
+        
+        Returns:
+            Lista di item trovati
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM calendar_items WHERE source_id = ? ORDER BY date",
+                (str(source_id),)).fetchall()
+        
+        return [CalendarItem.from_dict(dict(row)) for row in rows]
+    
+    # ------------------------------------------------------------------
+    # Sincronizzazione in background
+    # ------------------------------------------------------------------
+    
+    def load_sync_state(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Carica lo stato salvato dei job di sincronizzazione.
+        
+        Returns:
+            Dizionario nome del job -> stato
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT name, state FROM sync_jobs").fetchall()
+        
+        return {row['name']: json.loads(row['state']) for row in rows}
+    
+    def save_sync_state(self, name: str, state: Dict[str, Any]) -> None:
+        """
+        Salva lo stato di un job di sincronizzazione.
+        
+        Args:
+            name: Nome del job
+            state: Stato del job
+        """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sync_jobs (name, state) VALUES (?, ?)",
+                               (name, json.dumps(state, default=str)))
+    
+    def queue_push(self, workouts: List[Tuple[str, Workout]]) -> int:
+        """
+        Accoda allenamenti da caricare su Garmin Connect alla prossima sincronizzazione.
+        
+        Args:
+            workouts: Lista di tuple (nome, allenamento)
+        
+        Returns:
+            Numero di allenamenti accodati
+        """
+        now = time.time()
+        rows = [(name, self._workout_date(workout), json.dumps(workout.to_dict()), now)
+                for name, workout in workouts]
+        
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO sync_outbox (name, date, data, queued_at) VALUES (?, ?, ?, ?)", rows)
+        
+        return len(rows)
+    
+    def pending_pushes(self, limit: Optional[int] = None) -> List[Tuple[int, str, Workout, Optional[str]]]:
+        """
+        Restituisce gli allenamenti in attesa di caricamento, dal più vecchio.
+        
+        Args:
+            limit: Numero massimo di allenamenti
+        
+        Returns:
+            Lista di tuple (id della coda, nome, allenamento, id su Garmin Connect);
+            l'id è presente se l'allenamento è già caricato e resta da pianificare
+        """
+        query = "SELECT id, name, data, remote_id FROM sync_outbox ORDER BY id"
+        params = []
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        
+        return [(row['id'], row['name'], Workout.from_dict(json.loads(row['data'])), row['remote_id'])
+                for row in rows]
+    
+    def complete_push(self, entry_id: int) -> None:
+        """
+        Rimuove dalla coda un allenamento caricato.
+        
+        Args:
+            entry_id: Id della coda
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sync_outbox WHERE id = ?", (entry_id,))
+    
+    def fail_push(self, entry_id: int, error: str, remote_id: Optional[str] = None) -> None:
+        """
+        Registra un tentativo di caricamento fallito; l'allenamento resta in coda.
+        
+        Args:
+            entry_id: Id della coda
+            error: Messaggio di errore
+            remote_id: Id su Garmin Connect se il caricamento è riuscito ma la
+                pianificazione no: il prossimo tentativo si limita a pianificare
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE sync_outbox SET attempts = attempts + 1, last_error = ?, "
+                "remote_id = COALESCE(?, remote_id) WHERE id = ?",
+                (error, remote_id, entry_id))
+    
+    @staticmethod
+    def _month_bounds(year: int, month: int) -> Tuple[str, str]:
+        """
+        Calcola il primo e l'ultimo giorno di un mese.
+        
+        Args:
+            year: Anno
+            month: Mese (1-12)
+        
+        Returns:
+            Tupla (primo giorno, ultimo giorno) nel formato YYYY-MM-DD
+        """
+        # Il giorno 31 funziona come limite superiore per qualsiasi mese nel confronto tra stringhe
+        return f"{year}-{month:02d}-01", f"{year}-{month:02d}-31"
+    
+    @staticmethod
+    def _workout_date(workout: Workout) -> Optional[str]:
+        """
+        Restituisce la data pianificata di un allenamento, se presente.
+        
+        Args:
+            workout: Allenamento
+        
+        Returns:
+            Data nel formato YYYY-MM-DD o None
+        """
+        if isinstance(workout, StoredWorkout) and not workout.is_loaded:
+            return workout._date
+        
+        for step in workout.workout_steps:
+            if getattr(step, 'date', None):
+                return step.date
+        return None
+    
+    @staticmethod
+    def _step_count(workout: Workout) -> int:
+        """
+        Restituisce il numero di step di primo livello di un allenamento.
+        
+        Args:
+            workout: Allenamento
+        
+        Returns:
+            Numero di step
+        """
+        if isinstance(workout, StoredWorkout):
+            return workout.step_count
+        return len(workout.workout_steps)
+
+
+# Istanza singleton dell'archivio
+_store_instance: Optional[LocalStore] = None
+
+def get_local_store(db_path: Optional[str] = None) -> LocalStore:
+    """
+    Ottiene l'istanza singleton dell'archivio locale.
+    
+    Args:
+        db_path: Percorso del database (predefinito: 'paths.local_store' della configurazione)
+    
+    Returns:
+        Istanza dell'archivio
+    """
+    global _store_instance
+    if _store_instance is None:
+        if db_path is None:
+            from config import get_config
+            db_path = get_config().get('paths.local_store') or DEFAULT_STORE_PATH
+        _store_instance = LocalStore(db_path)
+    return _store_instance
+
+def reset_local_store() -> None:
+    """Chiude e reimposta l'istanza dell'archivio locale."""
+    global _store_instance
+    if _store_instance is not None:
+        _store_instance.close()
+    _store_instance = None
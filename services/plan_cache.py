@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache dei piani di allenamento già analizzati, indicizzata per contenuto del file.
+"""
+
+import os
+import json
+import zlib
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterable, Iterator
+
+from config import get_config
+from models.workout import Workout
+
+
+# Versione del formato dei dati analizzati: va incrementata quando cambiano
+# i parser o le classi degli allenamenti, per invalidare le voci esistenti
+PARSER_VERSION = 1
+
+# Cartella e dimensione massima predefinite della cache
+DEFAULT_CACHE_DIR = 'plan_cache'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Estensione dei file della cache
+CACHE_SUFFIX = '.plan'
+
+# Sezioni della configurazione da cui dipende l'analisi degli step
+ZONE_CONFIG_KEYS = ('sports', 'heart_rates', 'hr_margins')
+
+# Sezioni della configurazione che un'importazione può modificare
+IMPORTED_CONFIG_KEYS = ('athlete_name', 'planning', 'sports', 'heart_rates', 'hr_margins')
+
+
+class PlanCache:
+    """
+    Cache su disco degli allenamenti e delle modifiche di configurazione
+    prodotti dall'importazione di un file.
+    
+    Ogni voce è indicizzata dall'hash del contenuto del file, dalla versione
+    del parser e dall'importatore usato, ed è valida solo se le zone
+    configurate coincidono con quelle prima o dopo l'importazione che l'ha
+    prodotta. Le voci meno usate di recente vengono eliminate quando la
+    cartella supera la dimensione massima.
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inizializza la cache.
+        
+        Args:
+            cache_dir: Cartella della cache
+            max_bytes: Dimensione massima complessiva dei file della cache
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+    
+    def key(self, file_path: str, importer: Callable) -> str:
+        """
+        Calcola la chiave della cache per un file.
+        
+        Args:
+            file_path: Percorso del file
+            importer: Funzione di importazione usata per il file
+        
+        Returns:
+            Chiave esadecimale
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        
+        digest.update(f"|{PARSER_VERSION}|{importer.__module__}.{importer.__qualname__}".encode('utf-8'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def zones_version() -> str:
+        """
+        Calcola l'impronta delle zone configurate.
+        
+        Le zone influiscono sugli step dei file che non le definiscono.
+        
+        Returns:
+            Impronta esadecimale delle zone
+        """
+        config = get_config()
+        zones = {key: config.get(key) for key in ZONE_CONFIG_KEYS}
+        return hashlib.sha256(json.dumps(zones, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Legge una voce della cache.
+        
+        Args:
+            key: Chiave della voce
+        
+        Returns:
+            Dizionario con 'workouts', 'config' e 'zones', o None se la voce
+            non esiste, non è leggibile o non vale per le zone correnti
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Voce della cache non leggibile, verrà rigenerata: {str(e)}")
+            self._remove(path)
+            return None
+        
+        if self.zones_version() not in entry.get('zones', ()):
+            return None
+        
+        # Segna la voce come usata di recente
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        return entry
+    
+    def put(self, key: str, workouts: List[Tuple[str, Workout]], config_changes: List[Tuple[str, Any]],
+            zones: Iterable[str]) -> None:
+        """
+        Salva una voce nella cache.
+        
+        Args:
+            key: Chiave della voce
+            workouts: Lista di tuple (nome, allenamento)
+            config_changes: Modifiche alla configurazione (chiave, valore),
+                            con valore None per le chiavi rimosse
+            zones: Impronte delle zone per cui la voce è valida
+        """
+        entry = {'workouts': workouts, 'config': config_changes, 'zones': list(zones)}
+        
+        try:
+            data = zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            logging.warning(f"Impossibile salvare il piano nella cache: {str(e)}")
+            return
+        
+        with self._lock:
+            tmp_path = None
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+                tmp_path = None
+            except OSError as e:
+                logging.warning(f"Impossibile scrivere la cache dei piani: {str(e)}")
+                return
+            finally:
+                if tmp_path:
+                    self._remove(tmp_path)
+            
+            self._evict()
+    
+    def iter_workouts(self, file_path: str,
+                      importer: Callable[[str], Iterable[Tuple[str, Workout]]]) -> Iterator[Tuple[str, Workout]]:
+        """
+        Importa gli allenamenti di un file, usando la cache se il file è già noto.
+        
+        In caso di cache valida le modifiche di configurazione registrate
+        vengono riapplicate e gli allenamenti restituiti senza analizzare il file.
+        Altrimenti gli allenamenti dell'importatore vengono restituiti man mano
+        e salvati nella cache al termine dell'importazione.
+        
+        Args:
+            file_path: Percorso del file
+            importer: Funzione che riceve il percorso e restituisce le tuple (nome, allenamento)
+        
+        Yields:
+            Tuple (nome, allenamento)
+        """
+        key = self.key(file_path, importer)
+        entry = self.get(key)
+        config = get_config()
+        
+        if entry is not None:
+            logging.info(f"Piano letto dalla cache: {file_path}")
+            for config_key, value in entry['config']:
+                if value is None:
+                    config.delete(config_key)
+                else:
+                    config.set(config_key, value)
+            if entry['config']:
+                config.save()
+            
+            yield from entry['workouts']
+            return
+        
+        # Gli step vengono analizzati con le zone finali (quelle del file applicate
+        # alle precedenti), quindi la voce vale per le zone di prima e di dopo
+        zones_before = self.zones_version()
+        
+        # Registra le chiavi della configurazione modificate dall'importazione
+        changed_keys = []
+        
+        def record(changed_key: Optional[str], version: int) -> None:
+            if changed_key and changed_key.split('.', 1)[0] in IMPORTED_CONFIG_KEYS and changed_key not in changed_keys:
+                changed_keys.append(changed_key)
+        
+        config.subscribe(record)
+        try:
+            workouts = []
+            for item in importer(file_path):
+                workouts.append(item)
+                yield item
+        finally:
+            config.unsubscribe(record)
+        
+        self.put(key, workouts, [(changed_key, config.get(changed_key)) for changed_key in changed_keys],
+                 {zones_before, self.zones_version()})
+    
+    def import_workouts(self, file_path: str,
+                        importer: Callable[[str], Iterable[Tuple[str, Workout]]]) -> List[Tuple[str, Workout]]:
+        """
+        Importa tutti gli allenamenti di un file, usando la cache se possibile.
+        
+        Args:
+            file_path: Percorso del file
+            importer: Funzione che riceve il percorso e restituisce le tuple (nome, allenamento)
+        
+        Returns:
+            Lista di tuple (nome, allenamento)
+        """
+        return list(self.iter_workouts(file_path, importer))
+    
+    def size(self) -> int:
+        """
+        Restituisce la dimensione complessiva dei file della cache.
+        
+        Returns:
+            Dimensione in byte
+        """
+        return sum(size for _, size, _ in self._entries())
+    
+    def clear(self) -> None:
+        """Elimina tutte le voci della cache."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+    
+    def _evict(self) -> None:
+        """Elimina le voci meno usate di recente finché la cache supera la dimensione massima."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logging.debug(f"Voce eliminata dalla cache dei piani: {os.path.basename(path)}")
+    
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        """
+        Elenca i file della cache.
+        
+        Returns:
+            Lista di tuple (percorso, dimensione, ultimo utilizzo)
+        """
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(CACHE_SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            # Eliminato nel frattempo da un altro processo
+                            continue
+                        entries.append((entry.path, stat.st_size, stat.st_mtime))
+        except FileNotFoundError:
+            pass
+        return entries
+    
+    def _path(self, key: str) -> str:
+        """
+        Restituisce il percorso del file di una voce.
+        
+        Args:
+            key: Chiave della voce
+        
+        Returns:
+            Percorso del file
+        """
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+    
+    @staticmethod
+    def _remove(path: str) -> None:
+        """
+        Elimina un file ignorando gli errori.
+        
+        Args:
+            path: Percorso del file
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Istanza singleton
+_cache_instance = None
+
+def get_plan_cache(cache_dir: Optional[str] = None) -> PlanCache:
+    """
+    Ottiene l'istanza singleton della cache dei piani.
+    
+    Args:
+        cache_dir: Cartella della cache (predefinita: 'paths.plan_cache' della configurazione)
+    
+    Returns:
+        Istanza della cache
+    """
+    global _cache_instance
+    if _cache_instance is None:
+        if cache_dir is None:
+            cache_dir = get_config().get('paths.plan_cache') or DEFAULT_CACHE_DIR
+        _cache_instance = PlanCache(cache_dir)
+    return _cache_instance
+
+def reset_plan_cache() -> None:
+    """Reimposta l'istanza della cache dei piani."""
+    global _cache_instance
+    _cache_instance = None
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Servizio per la pianificazione delle date degli allenamenti rispetto alla data della gara.
+"""
+
+import re
+import datetime
+import logging
+from typing import Dict, List, Tuple, Optional
+
+from models.workout import Workout, WorkoutStep
+
+
+# Pattern dei nomi degli allenamenti pianificati (es. "W03D2 - Ripetute" o "W03S2")
+WEEK_SESSION_PATTERN = re.compile(r'W(\d+)[SD](\d+)')
+
+
+class PlanningService:
+    """Servizio per il calcolo delle date di un piano di allenamento."""
+    
+    @staticmethod
+    def parse_week_session(name: str) -> Optional[Tuple[int, int]]:
+        """
+        Estrae settimana e sessione dal nome di un allenamento.
+        
+        Args:
+            name: Nome dell'allenamento
+        
+        Returns:
+            Tupla (settimana, sessione) o None se il nome non contiene W##D## o W##S##
+        """
+        match = WEEK_SESSION_PATTERN.search(name) if isinstance(name, str) else None
+        if not match:
+            return None
+        return int(match.group(1)), int(match.group(2))
+    
+    @staticmethod
+    def group_sessions(names: List[str]) -> Dict[int, List[int]]:
+        """
+        Raggruppa le sessioni per settimana.
+        
+        Args:
+            names: Nomi degli allenamenti
+        
+        Returns:
+            Dizionario settimana -> lista di sessioni
+        """
+        week_sessions = {}
+        for name in names:
+            parsed = PlanningService.parse_week_session(name)
+            if parsed:
+                week, session = parsed
+                week_sessions.setdefault(week, []).append(session)
+        return week_sessions
+    
+    @staticmethod
+    def compute_dates(week_sessions: Dict[int, List[int]], race_date: datetime.date,
+                      preferred_days: List[int]) -> Dict[Tuple[int, int], datetime.date]:
+        """
+        Calcola le date delle sessioni a ritroso a partire dalla data della gara.
+        
+        L'ultima sessione dell'ultima settimana cade nel giorno preferito più
+        vicino alla gara (gara compresa), ogni sessione precedente nel giorno
+        preferito più vicino prima della successiva.
+        
+        Args:
+            week_sessions: Dizionario settimana -> lista di sessioni
+            race_date: Data della gara
+            preferred_days: Giorni preferiti (0 = lunedì, 6 = domenica)
+        
+        Returns:
+            Dizionario (settimana, sessione) -> data
+        """
+        dates = {}
+        current_date = race_date
+        
+        # Settimane e sessioni in ordine decrescente, a partire dalla gara
+        for week in sorted(week_sessions, reverse=True):
+            for session in sorted(week_sessions[week], reverse=True):
+                # Trova il giorno preferito più vicino all'indietro
+                days_to_subtract = 0
+                current_weekday = current_date.weekday()
+                
+                while days_to_subtract < 7:
+                    check_day = (current_weekday - days_to_subtract) % 7
+                    if check_day in preferred_days:
+                        break
+                    days_to_subtract += 1
+                
+                workout_date = current_date - datetime.timedelta(days=days_to_subtract)
+                dates[(week, session)] = workout_date
+                
+                # La sessione precedente cade almeno un giorno prima
+                current_date = workout_date - datetime.timedelta(days=1)
+        
+        return dates
+    
+    @staticmethod
+    def set_workout_date(workout: Workout, date: str) -> None:
+        """
+        Imposta la data di un allenamento nello step speciale della data.
+        
+        Args:
+            workout: Allenamento
+            date: Data nel formato YYYY-MM-DD
+        """
+        for step in workout.workout_steps:
+            if getattr(step, 'date', None):
+                step.date = date
+                return
+        
+        date_step = WorkoutStep(0, "warmup")
+        date_step.date = date
+        workout.workout_steps.insert(0, date_step)
+    
+    @staticmethod
+    def plan_workouts(workouts: List[Tuple[str, Workout]], race_day: str,
+                      preferred_days: List[int]) -> Dict[str, str]:
+        """
+        Assegna le date agli allenamenti con nomi nel formato W##D##.
+        
+        Args:
+            workouts: Lista di tuple (nome, allenamento), modificati sul posto
+            race_day: Data della gara nel formato YYYY-MM-DD
+            preferred_days: Giorni preferiti (0 = lunedì, 6 = domenica)
+        
+        Returns:
+            Dizionario nome -> data assegnata
+        
+        Raises:
+            ValueError: Se la data della gara non è valida o non ci sono giorni preferiti
+        """
+        if not preferred_days:
+            raise ValueError("Serve almeno un giorno preferito")
+        
+        race_date = datetime.datetime.strptime(race_day, '%Y-%m-%d').date()
+        
+        week_sessions = PlanningService.group_sessions([name for name, _ in workouts])
+        max_sessions = max((max(sessions) for sessions in week_sessions.values()), default=0)
+        if max_sessions > len(preferred_days):
+            logging.warning(f"Ci sono settimane con {max_sessions} sessioni, "
+                            f"ma solo {len(preferred_days)} giorni preferiti")
+        
+        dates = PlanningService.compute_dates(week_sessions, race_date, preferred_days)
+        
+        planned = {}
+        for name, workout in workouts:
+            parsed = PlanningService.parse_week_session(name)
+            if parsed in dates:
+                workout_date = dates[parsed].strftime('%Y-%m-%d')
+                PlanningService.set_workout_date(workout, workout_date)
+                planned[name] = workout_date
+        
+        return planned
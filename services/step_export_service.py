@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Servizio per l'esportazione colonnare (CSV/Parquet) degli step degli allenamenti.
+"""
+
+import os
+import logging
+from typing import Dict, Any, List, Tuple, Optional, Iterator
+
+from lazy_import import lazy_import, is_available
+from models.workout import Workout, WorkoutStep
+from services.training_load_service import TrainingLoadService
+
+# pandas e numpy vengono importati solo al primo utilizzo
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+PANDAS_AVAILABLE = is_available('numpy', 'pandas')
+
+# Motori di pandas per la scrittura dei file Parquet
+PARQUET_AVAILABLE = is_available('pyarrow') or is_available('fastparquet')
+
+# Colonne della tabella esportata
+EXPORT_COLUMNS = ['workout', 'week', 'session', 'date', 'sport', 'step_path', 'step_type',
+                  'end_condition', 'value', 'target_type', 'low', 'high', 'zone', 'description']
+
+# Formati supportati: estensione -> formato
+EXPORT_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+
+class StepExportService:
+    """Servizio per l'esportazione tabellare degli step per l'analisi esterna."""
+    
+    @staticmethod
+    def build_table(workouts: List[Tuple[str, Workout]]) -> 'pd.DataFrame':
+        """
+        Costruisce la tabella con una riga per ogni step di ogni allenamento.
+        
+        Le ripetute hanno una propria riga (condizione 'iterations') seguita
+        dagli step figli; il percorso dello step ne indica la posizione
+        (es. '3' per il terzo step, '3.2' per il secondo figlio della ripetuta).
+        
+        Args:
+            workouts: Lista di tuple (nome, allenamento)
+        
+        Returns:
+            DataFrame con le colonne EXPORT_COLUMNS
+        
+        Raises:
+            ImportError: Se pandas non è disponibile
+        """
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas e numpy sono richiesti per l'esportazione degli step")
+        
+        columns = {name: [] for name in EXPORT_COLUMNS}
+        
+        for name, workout in workouts:
+            name = name or workout.workout_name
+            week, session = TrainingLoadService.parse_week_session(str(name))
+            sport = (workout.sport_type or 'running').lower()
+            
+            # La data è memorizzata in uno step speciale
+            workout_date = next((step.date for step in workout.workout_steps
+                                 if getattr(step, 'date', None)), None)
+            
+            for path, step in StepExportService._iter_steps(workout.workout_steps):
+                target = step.target
+                
+                columns['workout'].append(name)
+                columns['week'].append(week)
+                columns['session'].append(session)
+                columns['date'].append(workout_date)
+                columns['sport'].append(sport)
+                columns['step_path'].append(path)
+                columns['step_type'].append(step.step_type)
+                columns['end_condition'].append(step.end_condition)
+                columns['value'].append(step._parse_end_condition_value())
+                columns['target_type'].append(target.target if target else 'no.target')
+                columns['low'].append(target.from_value if target else None)
+                columns['high'].append(target.to_value if target else None)
+                columns['zone'].append(TrainingLoadService._zone_label(step))
+                columns['description'].append(step.description or '')
+        
+        df = pd.DataFrame(columns)
+        
+        # Tipi colonnari: numeri con valori mancanti, date come datetime
+        df['week'] = pd.to_numeric(df['week']).astype('Int64')
+        df['session'] = pd.to_numeric(df['session']).astype('Int64')
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
+        df['value'] = pd.to_numeric(df['value'], errors='coerce')
+        
+        # I valori del target possono essere in ordine decrescente (es. passo)
+        from_value = pd.to_numeric(df['low'], errors='coerce')
+        to_value = pd.to_numeric(df['high'], errors='coerce')
+        df['low'] = np.fmin(from_value, to_value)
+        df['high'] = np.fmax(from_value, to_value)
+        
+        return df
+    
+    @staticmethod
+    def export_steps(workouts: List[Tuple[str, Workout]], file_path: str,
+                     file_format: Optional[str] = None) -> int:
+        """
+        Esporta gli step degli allenamenti in un file CSV o Parquet.
+        
+        Args:
+            workouts: Lista di tuple (nome, allenamento)
+            file_path: Percorso del file
+            file_format: 'csv' o 'parquet' (predefinito: ricavato dall'estensione)
+        
+        Returns:
+            Numero di righe esportate
+        
+        Raises:
+            ValueError: Se il formato non è supportato
+            ImportError: Se manca una libreria richiesta dal formato
+        """
+        if file_format is None:
+            file_format = EXPORT_FORMATS.get(os.path.splitext(file_path)[1].lower())
+        
+        if file_format not in ('csv', 'parquet'):
+            raise ValueError(f"Formato di esportazione non supportato: {file_format or file_path}")
+        
+        if file_format == 'parquet' and not PARQUET_AVAILABLE:
+            raise ImportError("pyarrow o fastparquet sono richiesti per l'esportazione in Parquet")
+        
+        try:
+            df = StepExportService.build_table(workouts)
+            
+            if file_format == 'csv':
+                df.to_csv(file_path, index=False, date_format='%Y-%m-%d')
+            else:
+                df.to_parquet(file_path, index=False)
+            
+            logging.info(f"Esportati {len(df)} step di {len(workouts)} allenamenti in {file_path}")
+            return len(df)
+        
+        except Exception as e:
+            logging.error(f"Errore nell'esportazione degli step: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _iter_steps(steps: List[WorkoutStep], prefix: str = '') -> Iterator[Tuple[str, WorkoutStep]]:
+        """
+        Itera sugli step in profondità, con il percorso di ciascuno.
+        
+        Args:
+            steps: Lista di step
+            prefix: Percorso della ripetuta che contiene gli step
+        
+        Yields:
+            Tuple (percorso, step), con indici a partire da 1
+        """
+        index = 0
+        for step in steps:
+            # Salta gli step speciali con la data
+            if getattr(step, 'date', None):
+                continue
+            
+            index += 1
+            path = f"{prefix}{index}"
+            yield path, step
+            
+            if step.workout_steps:
+                yield from StepExportService._iter_steps(step.workout_steps, path + '.')
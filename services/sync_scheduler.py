@@ -0,0 +1,521 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pianificatore della sincronizzazione periodica con Garmin Connect.
+
+I job (aggiornamento del calendario, download delle attività, caricamento
+degli allenamenti in coda) vengono eseguiti su un pool di thread; dopo un
+errore il job viene ritentato con attesa esponenziale. Lo stato dei job è
+salvato nell'archivio locale, così i tempi delle esecuzioni sopravvivono
+al riavvio dell'applicazione.
+"""
+
+import time
+import random
+import logging
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional, Callable
+
+from auth import GarminClient
+from config import get_config
+from models.calendar import CalendarItem
+from services.garmin_service import GarminService
+from services.local_store import LocalStore
+
+
+# Attesa massima (secondi) tra due controlli dei job da eseguire
+POLL_INTERVAL = 5.0
+
+# Attesa (secondi) dopo il primo errore, raddoppiata a ogni errore successivo
+RETRY_DELAY = 60.0
+
+# Attesa massima (secondi) dopo errori ripetuti
+MAX_BACKOFF = 3600.0
+
+# Variazione casuale degli intervalli, in frazione dell'intervallo
+DEFAULT_JITTER = 0.1
+
+# Nomi dei job predefiniti
+JOB_CALENDAR = 'calendar'
+JOB_ACTIVITIES = 'activities'
+JOB_PUSH = 'push'
+
+
+class SyncJob:
+    """Job periodico con stato persistente."""
+    
+    def __init__(self, name: str, func: Callable[[GarminClient, LocalStore], Dict[str, Any]],
+                 interval: float, jitter: float = DEFAULT_JITTER,
+                 retry_delay: float = RETRY_DELAY, max_backoff: float = MAX_BACKOFF):
+        """
+        Inizializza il job.
+        
+        Args:
+            name: Nome del job
+            func: Funzione che riceve client e archivio e restituisce un riepilogo
+            interval: Intervallo tra due esecuzioni riuscite (secondi)
+            jitter: Variazione casuale degli intervalli (frazione)
+            retry_delay: Attesa dopo il primo errore (secondi)
+            max_backoff: Attesa massima dopo errori ripetuti (secondi)
+        """
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        
+        # Stato persistente
+        self.last_run = None
+        self.last_success = None
+        self.next_run = 0.0
+        self.failures = 0
+        self.last_error = None
+        self.last_result = None
+    
+    def is_due(self, now: float) -> bool:
+        """
+        Verifica se il job deve essere eseguito.
+        
+        Args:
+            now: Istante corrente (time.time())
+        
+        Returns:
+            True se il job è scaduto
+        """
+        return now >= self.next_run
+    
+    def record_success(self, result: Dict[str, Any], now: float) -> None:
+        """
+        Registra un'esecuzione riuscita e pianifica la successiva.
+        
+        Args:
+            result: Riepilogo dell'esecuzione
+            now: Istante di fine esecuzione
+        """
+        self.last_run = self.last_success = now
+        self.failures = 0
+        self.last_error = None
+        self.last_result = result
+        self.next_run = now + self._spread(self.interval)
+    
+    def record_failure(self, error: str, now: float) -> None:
+        """
+        Registra un errore e pianifica un nuovo tentativo con attesa esponenziale.
+        
+        Args:
+            error: Messaggio di errore
+            now: Istante di fine esecuzione
+        """
+        self.last_run = now
+        self.failures += 1
+        self.last_error = error
+        delay = min(self.max_backoff, self.retry_delay * 2 ** (self.failures - 1))
+        self.next_run = now + self._spread(delay)
+    
+    def _spread(self, delay: float) -> float:
+        """
+        Applica la variazione casuale a un'attesa.
+        
+        Evita che più istanze (o più atleti) interroghino Garmin Connect
+        tutte nello stesso momento.
+        
+        Args:
+            delay: Attesa nominale (secondi)
+        
+        Returns:
+            Attesa con variazione casuale
+        """
+        return max(0.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converte lo stato del job in un dizionario.
+        
+        Returns:
+            Dizionario con lo stato
+        """
+        return {
+            'last_run': self.last_run,
+            'last_success': self.last_success,
+            'next_run': self.next_run,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'last_result': self.last_result,
+        }
+    
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Ripristina lo stato salvato del job.
+        
+        Args:
+            state: Dizionario con lo stato
+        """
+        self.last_run = state.get('last_run')
+        self.last_success = state.get('last_success')
+        self.next_run = state.get('next_run') or 0.0
+        self.failures = state.get('failures', 0)
+        self.last_error = state.get('last_error')
+        self.last_result = state.get('last_result')
+
+
+class SyncScheduler:
+    """Esegue periodicamente i job di sincronizzazione su un pool di thread."""
+    
+    def __init__(self, client: GarminClient, store: LocalStore, max_workers: int = 2):
+        """
+        Inizializza il pianificatore.
+        
+        Args:
+            client: Client Garmin autenticato
+            store: Archivio locale in cui scrivere i dati e lo stato dei job
+            max_workers: Job eseguiti contemporaneamente
+        """
+        self.client = client
+        self.store = store
+        self.max_workers = max(1, max_workers)
+        
+        self._jobs = {}
+        self._running = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._executor = None
+        self._thread = None
+        self._saved_state = store.load_sync_state()
+    
+    @property
+    def jobs(self) -> List[SyncJob]:
+        """Job registrati."""
+        return list(self._jobs.values())
+    
+    @property
+    def is_running(self) -> bool:
+        """True se il pianificatore è avviato."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def add_job(self, job: SyncJob) -> None:
+        """
+        Registra un job, ripristinandone lo stato salvato.
+        
+        Args:
+            job: Job da registrare
+        """
+        if job.name in self._saved_state:
+            job.restore(self._saved_state[job.name])
+        with self._lock:
+            self._jobs[job.name] = job
+        self._wakeup.set()
+    
+    def get_job(self, name: str) -> Optional[SyncJob]:
+        """
+        Restituisce un job registrato.
+        
+        Args:
+            name: Nome del job
+        
+        Returns:
+            Job o None se non registrato
+        """
+        return self._jobs.get(name)
+    
+    def add_listener(self, callback: Callable[[SyncJob, bool], None]) -> None:
+        """
+        Registra una funzione chiamata al termine di ogni esecuzione.
+        
+        La funzione riceve il job e True se l'esecuzione è riuscita; viene
+        chiamata dal thread che ha eseguito il job.
+        
+        Args:
+            callback: Funzione da chiamare
+        """
+        self._listeners.append(callback)
+    
+    def start(self) -> None:
+        """Avvia il pianificatore in un thread in background."""
+        if self.is_running:
+            return
+        
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='sync')
+        self._thread = threading.Thread(target=self._loop, name='sync-scheduler', daemon=True)
+        self._thread.start()
+        
+        logging.info(f"Sincronizzazione in background avviata ({len(self._jobs)} job)")
+    
+    def stop(self, wait: bool = True) -> None:
+        """
+        Arresta il pianificatore.
+        
+        Args:
+            wait: Se True attende la fine dei job in esecuzione
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        
+        if self._thread is not None:
+            if wait:
+                self._thread.join()
+            self._thread = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        
+        logging.info("Sincronizzazione in background arrestata")
+    
+    def run_pending(self) -> int:
+        """
+        Avvia i job scaduti che non sono già in esecuzione.
+        
+        Returns:
+            Numero di job avviati
+        """
+        now = time.time()
+        with self._lock:
+            due = [job for job in self._jobs.values()
+                   if job.is_due(now) and job.name not in self._running]
+        
+        for job in due:
+            self._submit(job)
+        return len(due)
+    
+    def run_now(self, name: str) -> Future:
+        """
+        Esegue subito un job, se non è già in esecuzione.
+        
+        Args:
+            name: Nome del job
+        
+        Returns:
+            Future dell'esecuzione (quella in corso se il job è già in esecuzione)
+        
+        Raises:
+            KeyError: Se il job non è registrato
+        """
+        with self._lock:
+            job = self._jobs[name]
+        return self._submit(job)
+    
+    def _submit(self, job: SyncJob) -> Future:
+        """
+        Invia un job al pool; senza pool (pianificatore fermo) lo esegue subito.
+        
+        Args:
+            job: Job da eseguire
+        
+        Returns:
+            Future dell'esecuzione (quella in corso se il job è già in esecuzione)
+        """
+        if self._executor is None:
+            future = Future()
+            future.set_result(self._run_job(job))
+            return future
+        
+        # Il job rimuove la propria voce sotto lo stesso lock, quindi
+        # non può terminare prima che la voce sia stata registrata
+        with self._lock:
+            if job.name not in self._running:
+                self._running[job.name] = self._executor.submit(self._run_job, job)
+            return self._running[job.name]
+    
+    def _run_job(self, job: SyncJob) -> bool:
+        """
+        Esegue un job, ne aggiorna e salva lo stato e notifica i listener.
+        
+        Args:
+            job: Job da eseguire
+        
+        Returns:
+            True se l'esecuzione è riuscita
+        """
+        started = time.perf_counter()
+        try:
+            result = job.func(self.client, self.store) or {}
+            result['seconds'] = round(time.perf_counter() - started, 3)
+            job.record_success(result, time.time())
+            success = True
+            logging.info(f"Sincronizzazione '{job.name}' completata: {result}")
+        except Exception as e:
+            job.record_failure(str(e), time.time())
+            success = False
+            logging.warning(f"Sincronizzazione '{job.name}' non riuscita "
+                            f"(tentativo {job.failures}): {str(e)}")
+        
+        try:
+            self.store.save_sync_state(job.name, job.to_dict())
+        except Exception as e:
+            logging.error(f"Impossibile salvare lo stato della sincronizzazione '{job.name}': {str(e)}")
+        
+        with self._lock:
+            self._running.pop(job.name, None)
+        
+        for callback in list(self._listeners):
+            try:
+                callback(job, success)
+            except Exception as e:
+                logging.error(f"Errore nel listener della sincronizzazione: {str(e)}")
+        
+        self._wakeup.set()
+        return success
+    
+    def _loop(self) -> None:
+        """Ciclo del thread del pianificatore."""
+        while not self._stopped.is_set():
+            self.run_pending()
+            
+            # Attendi il prossimo job in scadenza (o un risveglio esplicito)
+            with self._lock:
+                waiting = [job.next_run for job in self._jobs.values() if job.name not in self._running]
+            timeout = min([POLL_INTERVAL] + [max(0.0, next_run - time.time()) for next_run in waiting])
+            
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+
+# ----------------------------------------------------------------------
+# Job predefiniti
+# ----------------------------------------------------------------------
+
+def refresh_calendar(client: GarminClient, store: LocalStore, months: int = 2) -> Dict[str, Any]:
+    """
+    Aggiorna nell'archivio il mese corrente e i successivi.
+    
+    Args:
+        client: Client Garmin
+        store: Archivio locale
+        months: Numero di mesi a partire da quello corrente
+    
+    Returns:
+        Riepilogo con mesi e item aggiornati
+    
+    Raises:
+        RuntimeError: Se nessun mese è stato letto
+    """
+    service = GarminService(client)
+    today = datetime.date.today()
+    year, month = today.year, today.month
+    
+    saved = items = 0
+    for _ in range(max(1, months)):
+        calendar_month = service.get_calendar_month(year, month)
+        if calendar_month is not None:
+            store.save_calendar_month(calendar_month)
+            saved += 1
+            items += sum(len(day.items) for day in calendar_month.days.values())
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    
+    if saved == 0:
+        raise RuntimeError("Impossibile leggere il calendario da Garmin Connect")
+    
+    return {'months': saved, 'items': items}
+
+
+def pull_activities(client: GarminClient, store: LocalStore, days: int = 14) -> Dict[str, Any]:
+    """
+    Scarica nell'archivio le attività degli ultimi giorni.
+    
+    Args:
+        client: Client Garmin
+        store: Archivio locale
+        days: Numero di giorni
+    
+    Returns:
+        Riepilogo con il numero di attività
+    """
+    today = datetime.date.today()
+    start_date = (today - datetime.timedelta(days=days)).strftime('%Y-%m-%d')
+    end_date = today.strftime('%Y-%m-%d')
+    
+    activities = client.get_activities(start_date, end_date) or []
+    store.save_calendar_items([CalendarItem.from_garmin_activity(activity) for activity in activities])
+    
+    return {'activities': len(activities)}
+
+
+def push_pending(client: GarminClient, store: LocalStore) -> Dict[str, Any]:
+    """
+    Carica su Garmin Connect gli allenamenti in coda, pianificando quelli con una data.
+    
+    Se la pianificazione fallisce l'allenamento resta in coda come fallito, con
+    l'id ottenuto: il tentativo successivo lo pianifica senza caricarlo di nuovo.
+    
+    Args:
+        client: Client Garmin
+        store: Archivio locale
+    
+    Returns:
+        Riepilogo con allenamenti caricati, pianificati e falliti
+    
+    Raises:
+        RuntimeError: Se nessuno degli allenamenti in coda è stato caricato o pianificato
+    """
+    service = GarminService(client)
+    pending = store.pending_pushes()
+    
+    pushed = scheduled = failed = 0
+    for entry_id, name, workout, workout_id in pending:
+        if not workout_id:
+            response = service.add_workout(workout)
+            workout_id = response.get('workoutId') if response else None
+            
+            if not workout_id:
+                store.fail_push(entry_id, "Risposta non valida da Garmin Connect")
+                failed += 1
+                continue
+            
+            pushed += 1
+        
+        date = next((step.date for step in workout.workout_steps if getattr(step, 'date', None)), None)
+        if date:
+            if not service.schedule_workout(workout_id, date):
+                store.fail_push(entry_id, f"Pianificazione non riuscita per il {date}", str(workout_id))
+                failed += 1
+                continue
+            scheduled += 1
+        
+        store.complete_push(entry_id)
+    
+    if pending and pushed == 0 and scheduled == 0:
+        raise RuntimeError(f"Nessuno dei {len(pending)} allenamenti in coda è stato caricato")
+    
+    return {'pushed': pushed, 'scheduled': scheduled, 'failed': failed}
+
+
+def create_scheduler(client: GarminClient, store: LocalStore,
+                     job_names: Optional[List[str]] = None) -> SyncScheduler:
+    """
+    Crea un pianificatore con i job predefiniti configurati nella sezione 'sync'.
+    
+    Args:
+        client: Client Garmin autenticato
+        store: Archivio locale
+        job_names: Job da registrare (predefiniti: tutti)
+    
+    Returns:
+        Pianificatore (non avviato)
+    """
+    config = get_config()
+    scheduler = SyncScheduler(client, store, config.get('sync.workers', 2))
+    
+    months = config.get('sync.calendar_months', 2)
+    days = config.get('sync.activities_days', 14)
+    
+    jobs = [
+        SyncJob(JOB_CALENDAR, lambda client, store: refresh_calendar(client, store, months),
+                config.get('sync.calendar_interval', 900)),
+        SyncJob(JOB_ACTIVITIES, lambda client, store: pull_activities(client, store, days),
+                config.get('sync.activities_interval', 1800)),
+        SyncJob(JOB_PUSH, push_pending, config.get('sync.push_interval', 300)),
+    ]
+    
+    for job in jobs:
+        if job_names is None or job.name in job_names:
+            scheduler.add_job(job)
+    
+    return scheduler
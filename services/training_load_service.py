@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Servizio per l'analisi quantitativa del carico di allenamento di un piano.
+"""
+
+import re
+import logging
+from typing import Dict, Any, List, Tuple, Optional
+
+from lazy_import import lazy_import, is_available
+from models.workout import Workout, WorkoutStep
+
+# pandas e numpy vengono importati solo al primo utilizzo
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+PANDAS_AVAILABLE = is_available('numpy', 'pandas')
+
+
+# Pattern dei nomi degli allenamenti pianificati (es. "W03D2 - Ripetute")
+WEEK_SESSION_PATTERN = re.compile(r'^\s*W(\d+)\s*D(\d+)', re.IGNORECASE)
+
+# Velocità stimate (m/s) per gli step senza target di passo
+DEFAULT_SPEEDS = {
+    'running': 1000 / 360,     # 6:00 min/km
+    'cycling': 30000 / 3600,   # 30 km/h
+    'swimming': 100 / 125,     # 2:05 min/100m
+}
+
+# Colonne della tabella degli step
+STEP_COLUMNS = ['workout', 'week', 'session', 'date', 'sport', 'step_type',
+                'end_condition', 'value', 'speed', 'zone']
+
+
+class TrainingLoadService:
+    """Servizio per l'aggregazione del carico settimanale di un piano di allenamento."""
+    
+    @staticmethod
+    def check_pandas():
+        """
+        Verifica che pandas sia disponibile.
+        
+        Raises:
+            ImportError: Se pandas non è disponibile
+        """
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas e numpy sono richiesti per l'analisi del carico")
+    
+    @staticmethod
+    def build_step_table(workouts: List[Tuple[str, Workout]]) -> 'pd.DataFrame':
+        """
+        Costruisce la tabella colonnare degli step di tutti gli allenamenti.
+        
+        Le ripetute vengono espanse moltiplicando gli step figli per il numero
+        di iterazioni. Durata e distanza sono stimate in modo vettoriale
+        a partire dalla condizione di fine e dal target di passo.
+        
+        Args:
+            workouts: Lista di tuple (nome, allenamento)
+        
+        Returns:
+            DataFrame con una riga per ogni step eseguibile
+        """
+        TrainingLoadService.check_pandas()
+        
+        columns = {name: [] for name in STEP_COLUMNS}
+        
+        for name, workout in workouts:
+            week, session = TrainingLoadService.parse_week_session(name or workout.workout_name)
+            sport = (workout.sport_type or 'running').lower()
+            
+            # Trova la data dell'allenamento (step speciale)
+            workout_date = None
+            for step in workout.workout_steps:
+                if getattr(step, 'date', None):
+                    workout_date = step.date
+                    break
+            
+            for step, repetitions in TrainingLoadService._iter_executable_steps(workout.workout_steps):
+                value = step._parse_end_condition_value()
+                
+                columns['workout'].append(name)
+                columns['week'].append(week)
+                columns['session'].append(session)
+                columns['date'].append(workout_date)
+                columns['sport'].append(sport)
+                columns['step_type'].append(step.step_type)
+                columns['end_condition'].append(step.end_condition)
+                columns['value'].append(float(value) * repetitions if isinstance(value, (int, float)) else 0.0)
+                columns['speed'].append(TrainingLoadService._target_speed(step))
+                columns['zone'].append(TrainingLoadService._zone_label(step))
+        
+        df = pd.DataFrame(columns)
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
+        
+        # Velocità effettiva: target di passo o valore predefinito per lo sport
+        default_speed = df['sport'].map(DEFAULT_SPEEDS).fillna(DEFAULT_SPEEDS['running'])
+        target_speed = pd.to_numeric(df['speed'])
+        speed = target_speed.where(target_speed > 0, default_speed)
+        
+        is_time = df['end_condition'] == 'time'
+        is_distance = df['end_condition'] == 'distance'
+        
+        df['duration_s'] = np.where(is_time, df['value'],
+                                    np.where(is_distance, df['value'] / speed, 0.0))
+        df['distance_m'] = np.where(is_distance, df['value'],
+                                    np.where(is_time, df['value'] * speed, 0.0))
+        
+        # Settimana ricavata dalla data per gli allenamenti senza W##D##
+        missing_week = df['week'].isna() & df['date'].notna()
+        if missing_week.any():
+            first_date = df['date'].min()
+            df.loc[missing_week, 'week'] = (df.loc[missing_week, 'date'] - first_date).dt.days // 7 + 1
+        
+        df['week'] = pd.to_numeric(df['week']).astype('Int64')
+        df['session'] = pd.to_numeric(df['session']).astype('Int64')
+        
+        return df.drop(columns=['value', 'speed'])
+    
+    @staticmethod
+    def summarize(workouts: List[Tuple[str, Workout]]) -> Dict[str, 'pd.DataFrame']:
+        """
+        Riassume il carico del piano in un unico passaggio.
+        
+        Args:
+            workouts: Lista di tuple (nome, allenamento)
+        
+        Returns:
+            Dizionario con le tabelle:
+                - 'steps': tabella colonnare degli step
+                - 'weekly': volume settimanale (sessioni, durata, distanza, ramp rate)
+                - 'weekly_by_sport': durata settimanale per sport (secondi)
+                - 'intensity': distribuzione del tempo per zona (frazione della settimana)
+        """
+        steps = TrainingLoadService.build_step_table(workouts)
+        planned = steps[steps['week'].notna()]
+        
+        by_week = planned.groupby('week')
+        weekly = pd.DataFrame({
+            'sessions': by_week['workout'].nunique(),
+            'duration_s': by_week['duration_s'].sum(),
+            'distance_m': by_week['distance_m'].sum(),
+        })
+        
+        # Le settimane senza allenamenti contano come volume zero
+        if not weekly.empty:
+            full_range = pd.RangeIndex(int(weekly.index.min()), int(weekly.index.max()) + 1, name='week')
+            weekly = weekly.reindex(full_range, fill_value=0)
+        
+        # Variazione percentuale del volume rispetto alla settimana precedente
+        previous = weekly['duration_s'].shift(1)
+        weekly['ramp_rate'] = (weekly['duration_s'] - previous) / previous.where(previous > 0)
+        
+        weekly_by_sport = planned.pivot_table(index='week', columns='sport', values='duration_s',
+                                              aggfunc='sum', fill_value=0.0)
+        weekly_by_sport = weekly_by_sport.reindex(weekly.index, fill_value=0.0)
+        
+        zone_time = planned.pivot_table(index='week', columns='zone', values='duration_s',
+                                        aggfunc='sum', fill_value=0.0)
+        zone_time = zone_time.reindex(weekly.index, fill_value=0.0)
+        totals = zone_time.sum(axis=1)
+        intensity = zone_time.div(totals.where(totals > 0), axis=0).fillna(0.0)
+        
+        logging.info(f"Analisi del carico: {len(steps)} step, {len(weekly)} settimane")
+        
+        return {
+            'steps': steps,
+            'weekly': weekly,
+            'weekly_by_sport': weekly_by_sport,
+            'intensity': intensity,
+        }
+    
+    @staticmethod
+    def parse_week_session(name: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Estrae settimana e sessione da un nome nel formato W##D##.
+        
+        Args:
+            name: Nome dell'allenamento
+        
+        Returns:
+            Tupla (settimana, sessione), con None se il nome non segue il formato
+        """
+        match = WEEK_SESSION_PATTERN.match(name or '')
+        if not match:
+            return None, None
+        return int(match.group(1)), int(match.group(2))
+    
+    @staticmethod
+    def _iter_executable_steps(steps: List[WorkoutStep], repetitions: int = 1):
+        """
+        Itera sugli step eseguibili espandendo le ripetute.
+        
+        Args:
+            steps: Lista di step
+            repetitions: Moltiplicatore dovuto alle ripetute esterne
+        
+        Yields:
+            Tuple (step, ripetizioni totali)
+        """
+        for step in steps:
+            # Salta gli step speciali con la data
+            if getattr(step, 'date', None):
+                continue
+            
+            if step.step_type == 'repeat':
+                try:
+                    iterations = int(step.end_condition_value or 1)
+                except (ValueError, TypeError):
+                    iterations = 1
+                yield from TrainingLoadService._iter_executable_steps(step.workout_steps,
+                                                                      repetitions * iterations)
+            else:
+                yield step, repetitions
+    
+    @staticmethod
+    def _target_speed(step: WorkoutStep) -> Optional[float]:
+        """
+        Calcola la velocità media (m/s) del target di passo di uno step.
+        
+        Args:
+            step: Step da analizzare
+        
+        Returns:
+            Velocità media o None se lo step non ha un target di passo
+        """
+        target = step.target
+        if not target or target.target != 'pace.zone':
+            return None
+        
+        values = [v for v in (target.from_value, target.to_value) if isinstance(v, (int, float)) and v > 0]
+        if not values:
+            return None
+        return sum(values) / len(values)
+    
+    @staticmethod
+    def _zone_label(step: WorkoutStep) -> str:
+        """
+        Restituisce l'etichetta della zona di uno step.
+        
+        Args:
+            step: Step da analizzare
+        
+        Returns:
+            Nome della zona, 'custom' per target numerici o 'none' senza target
+        """
+        target = step.target
+        if not target or target.target == 'no.target':
+            return 'none'
+        return getattr(target, 'target_zone_name', None) or 'custom'
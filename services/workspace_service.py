@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Servizio per le operazioni in blocco sugli atleti di uno spazio di lavoro.
+"""
+
+import logging
+from typing import Dict, Any, List, Tuple, Optional, Callable
+
+from config import use_config
+from services.garmin_service import GarminService
+from workspace import Workspace, Athlete, AthleteResult
+
+
+class WorkspaceService:
+    """Servizio per caricare piani e aggiornare i dati di più atleti contemporaneamente."""
+    
+    @staticmethod
+    def push_plan(workspace: Workspace, plan_path: str, athlete_ids: Optional[List[str]] = None,
+                  schedule: bool = False, max_workers: Optional[int] = None,
+                  progress_callback: Optional[Callable[[int, int, AthleteResult], None]] = None) -> List[AthleteResult]:
+        """
+        Carica lo stesso piano su Garmin Connect per più atleti.
+        
+        Il piano viene importato per ogni atleta con una copia temporanea
+        della sua configurazione: i passi e le frequenze sono calcolati sulle
+        zone dell'atleta (salvo che il piano definisca le proprie) e la
+        configurazione salvata dell'atleta non viene modificata.
+        
+        Args:
+            workspace: Spazio di lavoro
+            plan_path: File del piano (.yaml, .xlsx, .jsonl)
+            athlete_ids: Atleti destinatari (predefiniti: tutti)
+            schedule: Se True pianifica nel calendario gli allenamenti con una data
+            max_workers: Atleti elaborati contemporaneamente
+            progress_callback: Funzione chiamata con (completati, totale, risultato)
+        
+        Returns:
+            Risultati per atleta, con valore {'workouts', 'pushed', 'scheduled', 'errors'}
+        """
+        def push(athlete: Athlete) -> Dict[str, Any]:
+            from services.batch_import import importer_for
+            
+            client = athlete.connect()
+            service = GarminService(client)
+            
+            with use_config(athlete.scratch_config()):
+                workouts = list(importer_for(plan_path)(plan_path))
+                
+                pushed = scheduled = 0
+                errors = []
+                for name, workout in workouts:
+                    response = service.add_workout(workout)
+                    workout_id = response.get('workoutId') if response else None
+                    
+                    if not workout_id:
+                        errors.append(f"{name}: risposta non valida da Garmin Connect")
+                        continue
+                    pushed += 1
+                    
+                    date = WorkspaceService._workout_date(workout) if schedule else None
+                    if date:
+                        if service.schedule_workout(workout_id, date):
+                            scheduled += 1
+                        else:
+                            errors.append(f"{name}: impossibile pianificare per il {date}")
+            
+            logging.info(f"Atleta {athlete.id}: caricati {pushed} allenamenti, pianificati {scheduled}")
+            return {'workouts': len(workouts), 'pushed': pushed, 'scheduled': scheduled, 'errors': errors}
+        
+        return workspace.run_all(push, athlete_ids, max_workers, progress_callback)
+    
+    @staticmethod
+    def refresh_calendars(workspace: Workspace, start: Tuple[int, int], months: int = 1,
+                          athlete_ids: Optional[List[str]] = None, max_workers: Optional[int] = None,
+                          progress_callback: Optional[Callable[[int, int, AthleteResult], None]] = None) -> List[AthleteResult]:
+        """
+        Aggiorna i mesi del calendario nell'archivio locale di ogni atleta.
+        
+        Args:
+            workspace: Spazio di lavoro
+            start: Primo mese come tupla (anno, mese)
+            months: Numero di mesi
+            athlete_ids: Atleti da aggiornare (predefiniti: tutti)
+            max_workers: Atleti elaborati contemporaneamente
+            progress_callback: Funzione chiamata con (completati, totale, risultato)
+        
+        Returns:
+            Risultati per atleta, con valore {'months', 'items', 'errors'}
+        """
+        def refresh(athlete: Athlete) -> Dict[str, Any]:
+            service = GarminService(athlete.connect())
+            store = athlete.store
+            
+            year, month = start
+            saved = items = 0
+            errors = []
+            for _ in range(months):
+                calendar_month = service.get_calendar_month(year, month)
+                
+                if calendar_month is None:
+                    errors.append(f"{year}-{month:02d}: impossibile leggere il calendario")
+                else:
+                    store.save_calendar_month(calendar_month)
+                    saved += 1
+                    items += sum(len(day.items) for day in calendar_month.days.values())
+                
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            
+            return {'months': saved, 'items': items, 'errors': errors}
+        
+        return workspace.run_all(refresh, athlete_ids, max_workers, progress_callback)
+    
+    @staticmethod
+    def pull_activities(workspace: Workspace, start_date: str, end_date: str,
+                        athlete_ids: Optional[List[str]] = None, max_workers: Optional[int] = None,
+                        progress_callback: Optional[Callable[[int, int, AthleteResult], None]] = None) -> List[AthleteResult]:
+        """
+        Scarica le attività svolte dagli atleti in un intervallo di date.
+        
+        Args:
+            workspace: Spazio di lavoro
+            start_date: Data di inizio (formato YYYY-MM-DD)
+            end_date: Data di fine (formato YYYY-MM-DD)
+            athlete_ids: Atleti da interrogare (predefiniti: tutti)
+            max_workers: Atleti elaborati contemporaneamente
+            progress_callback: Funzione chiamata con (completati, totale, risultato)
+        
+        Returns:
+            Risultati per atleta, con valore la lista delle attività
+        """
+        def pull(athlete: Athlete) -> List[Dict[str, Any]]:
+            return GarminService(athlete.connect()).get_activities(start_date, end_date)
+        
+        return workspace.run_all(pull, athlete_ids, max_workers, progress_callback)
+    
+    @staticmethod
+    def _workout_date(workout) -> Optional[str]:
+        """
+        Restituisce la data di un allenamento, memorizzata nello step speciale.
+        
+        Args:
+            workout: Allenamento
+        
+        Returns:
+            Data nel formato YYYY-MM-DD o None
+        """
+        return next((step.date for step in workout.workout_steps if getattr(step, 'date', None)), None)
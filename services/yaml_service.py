@@ -7,12 +7,27 @@ Servizio per la gestione dei file YAML.
 
 import logging
 import re
-import yaml
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterator
 
+import yaml_io
 from config import get_config  # Assicuriamoci che questa importazione sia a livello di file
 from models.workout import Workout, WorkoutStep, Target, create_workout_from_yaml
 
+
+# Sezioni di zone: chiave nel file -> (chiave nella configurazione, descrizione per il log)
+ZONE_SECTIONS = {
+    'heart_rates': ('heart_rates', 'heart rate'),
+    'paces': ('sports.running.paces', 'running pace'),
+    'power_values': ('sports.cycling.power_values', 'cycling power'),
+    'swim_paces': ('sports.swimming.paces', 'swimming pace'),
+}
+
+# Sezioni del file applicate alla configurazione
+CONFIG_SECTIONS = ('config',) + tuple(ZONE_SECTIONS)
+
+# Nomi speciali da ignorare
+IGNORED_KEYS = ['config', 'paces', 'swim_paces', 'power_values', 'margins', 'athlete_name', 'heart_rates']
+
 class YamlService:
     """Servizio per la gestione dei file YAML."""
     
@@ -33,7 +48,7 @@ class YamlService:
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+                return yaml_io.load(f)
         except Exception as e:
             logging.error(f"Errore nel caricamento del file YAML: {str(e)}")
             raise
@@ -53,27 +68,132 @@ class YamlService:
         """
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+                yaml_io.dump(data, f)
         except Exception as e:
             logging.error(f"Errore nel salvataggio del file YAML: {str(e)}")
             raise
     
     @staticmethod
     def import_workouts(file_path: str) -> List[Tuple[str, Workout]]:
-        try:
-            # Carica il file
-            yaml_data = YamlService.load_yaml(file_path)
+        """
+        Importa tutti gli allenamenti di un file YAML.
+        
+        Args:
+            file_path: Percorso del file
             
-            # Verifica che sia un dizionario
-            if not isinstance(yaml_data, dict):
-                raise ValueError("Il file YAML non contiene un dizionario")
+        Returns:
+            Lista di tuple (nome, allenamento)
+        """
+        return list(YamlService.iter_workouts(file_path))
+    
+    @staticmethod
+    def iter_workouts(file_path: str,
+                      on_config: Optional[Callable[[str, Any], None]] = None) -> Iterator[Tuple[str, Workout]]:
+        """
+        Importa gli allenamenti di un file YAML uno alla volta.
+        
+        Il file viene letto una voce alla volta. Tutte le sezioni di
+        configurazione vengono applicate prima di costruire qualsiasi
+        allenamento, ovunque si trovino nel file: gli allenamenti che le
+        precedono vengono trattenuti finché non è stata letta l'ultima, poi
+        ogni allenamento viene restituito non appena è stato costruito.
+        
+        Args:
+            file_path: Percorso del file
+            on_config: Funzione chiamata con (sezione, dati) per ogni sezione
+                       di configurazione applicata (opzionale)
             
-            # Estrai la configurazione se presente
-            config_data = yaml_data.pop('config', {})
-            name_prefix = config_data.get('name_prefix', '')
+        Yields:
+            Tuple (nome, allenamento) nell'ordine del file
             
+        Raises:
+            IOError: Se il file non può essere letto
+            ValueError: Se il file non contiene un dizionario
+        """
+        try:
             # Ottieni istanza di configurazione
             app_config = get_config()
+            name_prefix = ''
+            
+            # Prima passata sulle sole chiavi: quante sezioni di configurazione
+            # devono essere applicate prima di costruire gli allenamenti
+            with open(file_path, 'r', encoding='utf-8') as f:
+                sections_left = sum(1 for name in yaml_io.iter_mapping_keys(f) if name in CONFIG_SECTIONS)
+            
+            # Allenamenti letti prima dell'ultima sezione di configurazione
+            held_back = []
+            
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for name, value in yaml_io.iter_mapping(f):
+                    # Sezioni di configurazione
+                    if name in CONFIG_SECTIONS:
+                        YamlService.apply_config_section(name, value or {}, app_config)
+                        if name == 'config':
+                            name_prefix = (value or {}).get('name_prefix', '')
+                        
+                        if on_config:
+                            on_config(name, value)
+                        
+                        sections_left -= 1
+                        if sections_left > 0:
+                            continue
+                        
+                        # Configurazione completa: salvala e costruisci gli allenamenti trattenuti
+                        app_config.save()
+                        for held_name, held_value in held_back:
+                            yield YamlService._display_name(held_name, name_prefix), \
+                                YamlService.build_workout(held_name, held_value)
+                        held_back = []
+                        continue
+                    
+                    # Nomi speciali da ignorare
+                    if name in IGNORED_KEYS:
+                        continue
+                    
+                    if sections_left > 0:
+                        held_back.append((name, value))
+                        continue
+                    
+                    yield YamlService._display_name(name, name_prefix), YamlService.build_workout(name, value)
+            
+        except Exception as e:
+            logging.error(f"Errore nell'importazione degli allenamenti: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _display_name(name: str, name_prefix: str) -> str:
+        """
+        Restituisce il nome di un allenamento senza il prefisso del piano.
+        
+        Args:
+            name: Nome dell'allenamento nel file
+            name_prefix: Prefisso dei nomi ('config.name_prefix')
+            
+        Returns:
+            Nome senza il prefisso, se presente
+        """
+        # Se il nome comincia con il prefisso, usa solo la parte finale
+        if name_prefix and name.startswith(name_prefix):
+            return name[len(name_prefix):].strip()
+        return name
+    
+    @staticmethod
+    def apply_config_section(section: str, data: Dict[str, Any], app_config=None) -> None:
+        """
+        Applica alla configurazione una sezione letta da un file YAML.
+        
+        La configurazione non viene salvata.
+        
+        Args:
+            section: Nome della sezione (una di CONFIG_SECTIONS)
+            data: Contenuto della sezione
+            app_config: Configurazione da aggiornare (predefinita: quella globale)
+        """
+        if app_config is None:
+            app_config = get_config()
+        
+        if section == 'config':
+            config_data = data
             
             # Importa i parametri di configurazione
             if 'athlete_name' in config_data:
@@ -111,128 +231,54 @@ class YamlService:
                     app_config.set('hr_margins.hr_up', margins['hr_up'])
                 if 'hr_down' in margins:
                     app_config.set('hr_margins.hr_down', margins['hr_down'])
+            return
+        
+        # Sezioni di zone: sostituisci completamente la sezione corrispondente
+        config_key, label = ZONE_SECTIONS[section]
+        app_config.replace_section(config_key, data)
+        
+        # Log dei valori importati
+        for key, value in data.items():
+            logging.info(f"Importato {label}: {key} = {value}")
+    
+    @staticmethod
+    def build_workout(name: str, steps: List[Dict[str, Any]]) -> Workout:
+        """
+        Crea un allenamento dagli step letti da un file YAML.
+        
+        Args:
+            name: Nome dell'allenamento nel file
+            steps: Lista degli step
             
-            # Importa i parametri di heart_rates
-            if 'heart_rates' in yaml_data:
-                # Usa il nuovo metodo replace_section per sostituire completamente la sezione
-                heart_rates = yaml_data.pop('heart_rates')
-                app_config.replace_section('heart_rates', heart_rates)
-                
-                # Log dei valori importati
-                for key, value in heart_rates.items():
-                    logging.info(f"Importato heart rate: {key} = {value}")
-            
-            # Importa i parametri di pace per la corsa
-            if 'paces' in yaml_data:
-                # Sostituisci completamente la sezione
-                paces = yaml_data.pop('paces')
-                app_config.replace_section('sports.running.paces', paces)
-                
-                # Log dei valori importati
-                for key, value in paces.items():
-                    logging.info(f"Importato running pace: {key} = {value}")
-            
-            # Importa i parametri di power per il ciclismo
-            if 'power_values' in yaml_data:
-                # Sostituisci completamente la sezione
-                power_values = yaml_data.pop('power_values')
-                app_config.replace_section('sports.cycling.power_values', power_values)
-                
-                # Log dei valori importati
-                for key, value in power_values.items():
-                    logging.info(f"Importato cycling power: {key} = {value}")
-            
-            # Importa i parametri di pace per il nuoto
-            if 'swim_paces' in yaml_data:
-                # Sostituisci completamente la sezione
-                swim_paces = yaml_data.pop('swim_paces')
-                app_config.replace_section('sports.swimming.paces', swim_paces)
-                
-                # Log dei valori importati
-                for key, value in swim_paces.items():
-                    logging.info(f"Importato swimming pace: {key} = {value}")
-            
-            # Salva le modifiche alla configurazione
-            app_config.save()
-            
-            # Nomi speciali da ignorare 
-            ignore_keys = ['config', 'paces', 'swim_paces', 'power_values', 'margins', 'athlete_name', 'heart_rates']
-            
-            # Lista degli allenamenti importati
-            imported_workouts = []
-            
-            # Per ogni sezione, crea un allenamento
-            for name, steps in yaml_data.items():
-                if name in ignore_keys:
-                    continue
-                
-                # Se il nome comincia con il prefisso, usa solo la parte finale
-                if name_prefix and name.startswith(name_prefix):
-                    display_name = name[len(name_prefix):].strip()
-                else:
-                    display_name = name
-                
-                # Crea l'allenamento
-                workout = create_workout_from_yaml(yaml_data, name)
-                
-                # Assicurati che tutti gli step dell'allenamento abbiano correttamente il target_zone_name
-                for step in workout.workout_steps:
-                    if step.target and step.target.target != "no.target":
-                        # Se lo step ha un target, verifica se possiamo ricavare il nome della zona dal YAML
-                        if hasattr(step, 'yaml_target_zone') and step.yaml_target_zone:
-                            step.target.target_zone_name = step.yaml_target_zone
-                    
-                    # Gestisci anche gli step ripetuti
-                    if step.step_type == 'repeat' and step.workout_steps:
-                        for child_step in step.workout_steps:
-                            if child_step.target and child_step.target.target != "no.target":
-                                if hasattr(child_step, 'yaml_target_zone') and child_step.yaml_target_zone:
-                                    child_step.target.target_zone_name = child_step.yaml_target_zone
-                
-                # Aggiungi alla lista
-                imported_workouts.append((display_name, workout))
+        Returns:
+            Allenamento creato
             
-            return imported_workouts
+        Raises:
+            ValueError: Se i dati non sono validi
+        """
+        workout = create_workout_from_yaml({name: steps}, name)
+        
+        # Assicurati che tutti gli step dell'allenamento abbiano correttamente il target_zone_name
+        for step in workout.workout_steps:
+            if step.target and step.target.target != "no.target":
+                # Se lo step ha un target, verifica se possiamo ricavare il nome della zona dal YAML
+                if hasattr(step, 'yaml_target_zone') and step.yaml_target_zone:
+                    step.target.target_zone_name = step.yaml_target_zone
             
-        except Exception as e:
-            logging.error(f"Errore nell'importazione degli allenamenti: {str(e)}")
-            raise
-
+            # Gestisci anche gli step ripetuti
+            if step.step_type == 'repeat' and step.workout_steps:
+                for child_step in step.workout_steps:
+                    if child_step.target and child_step.target.target != "no.target":
+                        if hasattr(child_step, 'yaml_target_zone') and child_step.yaml_target_zone:
+                            child_step.target.target_zone_name = child_step.yaml_target_zone
+        
+        return workout
+    
     @staticmethod
     def export_workouts(workouts: List[Tuple[str, Workout]], file_path: str, config: Optional[Dict[str, Any]] = None) -> None:
         try:
-            # Ottieni le impostazioni complete di configurazione
-            app_config = get_config()
-            
-            # Crea il dizionario per il YAML
-            yaml_data = {'config': config or {}}
-            
-            # Aggiungi informazioni complete nella configurazione
-            yaml_data['config'].update({
-                'margins': {
-                    'faster': app_config.get('sports.running.margins.faster', '0:05'),
-                    'slower': app_config.get('sports.running.margins.slower', '0:05'),
-                    'power_up': app_config.get('sports.cycling.margins.power_up', 10),
-                    'power_down': app_config.get('sports.cycling.margins.power_down', 10),
-                    'hr_up': app_config.get('hr_margins.hr_up', 5),
-                    'hr_down': app_config.get('hr_margins.hr_down', 5),
-                },
-                'athlete_name': app_config.get('athlete_name', ''),
-                'race_day': app_config.get('planning.race_day', ''),
-                'preferred_days': str(app_config.get('planning.preferred_days', [1, 3, 5])),
-                'date_format': 'YYYY-MM-DD',  # Nota sul formato delle date utilizzato
-            })
-            
-            # Aggiungi heart_rates al livello principale
-            yaml_data['heart_rates'] = {}
-            heart_rates = app_config.get('heart_rates', {})
-            for name, value in heart_rates.items():
-                yaml_data['heart_rates'][name] = value
-            
-            # Aggiungi i paces, swim_paces e power_values
-            yaml_data['paces'] = app_config.get('sports.running.paces', {})
-            yaml_data['swim_paces'] = app_config.get('sports.swimming.paces', {})
-            yaml_data['power_values'] = app_config.get('sports.cycling.power_values', {})
+            # Crea il dizionario per il YAML, con le sezioni di configurazione in testa
+            yaml_data = YamlService.build_config_sections(config)
             
             # Per ogni allenamento
             for name, workout in workouts:
@@ -249,6 +295,52 @@ class YamlService:
             logging.error(f"Errore nell'esportazione degli allenamenti: {str(e)}")
             raise
     
+    @staticmethod
+    def build_config_sections(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Crea le sezioni di configurazione scritte in testa ai file esportati.
+        
+        Args:
+            config: Valori aggiuntivi della sezione 'config' (es. name_prefix)
+            
+        Returns:
+            Dizionario con le sezioni 'config', 'heart_rates', 'paces',
+            'swim_paces' e 'power_values'
+        """
+        # Ottieni le impostazioni complete di configurazione
+        app_config = get_config()
+        
+        sections = {'config': config or {}}
+        
+        # Aggiungi informazioni complete nella configurazione
+        sections['config'].update({
+            'margins': {
+                'faster': app_config.get('sports.running.margins.faster', '0:05'),
+                'slower': app_config.get('sports.running.margins.slower', '0:05'),
+                'power_up': app_config.get('sports.cycling.margins.power_up', 10),
+                'power_down': app_config.get('sports.cycling.margins.power_down', 10),
+                'hr_up': app_config.get('hr_margins.hr_up', 5),
+                'hr_down': app_config.get('hr_margins.hr_down', 5),
+            },
+            'athlete_name': app_config.get('athlete_name', ''),
+            'race_day': app_config.get('planning.race_day', ''),
+            'preferred_days': str(app_config.get('planning.preferred_days', [1, 3, 5])),
+            'date_format': 'YYYY-MM-DD',  # Nota sul formato delle date utilizzato
+        })
+        
+        # Aggiungi heart_rates al livello principale
+        sections['heart_rates'] = {}
+        heart_rates = app_config.get('heart_rates', {})
+        for name, value in heart_rates.items():
+            sections['heart_rates'][name] = value
+        
+        # Aggiungi i paces, swim_paces e power_values
+        sections['paces'] = app_config.get('sports.running.paces', {})
+        sections['swim_paces'] = app_config.get('sports.swimming.paces', {})
+        sections['power_values'] = app_config.get('sports.cycling.power_values', {})
+        
+        return sections
+    
     @staticmethod
     def workout_to_yaml_steps(workout: Workout) -> List[Dict[str, Any]]:
         """
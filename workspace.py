@@ -0,0 +1,450 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Spazio di lavoro con più atleti, ciascuno con configurazione, sessione di
+Garmin Connect e archivio locale separati.
+
+Struttura della cartella:
+    workspace.yaml                   elenco degli atleti
+    athletes/<id>/config.yaml        configurazione (zone, pianificazione, ...)
+    athletes/<id>/garth/             token OAuth di Garmin Connect
+    athletes/<id>/garmin_planner.db  archivio locale
+"""
+
+import os
+import re
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Callable
+
+import yaml_io
+from auth import GarminClient, RateLimiter
+from config import Config, get_config, use_config
+from lazy_import import lazy_import
+
+# garth viene importato solo al primo accesso a Garmin Connect
+garth = lazy_import('garth')
+
+
+# File con l'elenco degli atleti e cartella dei dati degli atleti
+WORKSPACE_FILE = 'workspace.yaml'
+ATHLETES_DIR = 'athletes'
+
+# Limite predefinito delle richieste a Garmin Connect per ogni atleta
+DEFAULT_RATE = 2.0   # Richieste al secondo
+DEFAULT_BURST = 5    # Richieste consecutive senza attesa
+
+# Atleti elaborati contemporaneamente dalle operazioni in blocco
+DEFAULT_MAX_WORKERS = 8
+
+# File dei token scritto da garth
+TOKEN_FILE = 'oauth2_token.json'
+
+
+class Athlete:
+    """Atleta dello spazio di lavoro, con configurazione, sessione e archivio propri."""
+    
+    def __init__(self, athlete_id: str, name: str, directory: str,
+                 rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """
+        Inizializza l'atleta.
+        
+        Args:
+            athlete_id: Identificativo (nome della cartella)
+            name: Nome visualizzato
+            directory: Cartella dei dati dell'atleta
+            rate: Richieste al secondo consentite verso Garmin Connect
+            burst: Richieste consecutive consentite senza attesa
+        """
+        self.id = athlete_id
+        self.name = name
+        self.directory = directory
+        self.rate_limiter = RateLimiter(rate, burst)
+        
+        self._lock = threading.Lock()
+        self._config = None
+        self._store = None
+        self._client = None
+    
+    @property
+    def config_path(self) -> str:
+        """Percorso del file di configurazione."""
+        return os.path.join(self.directory, 'config.yaml')
+    
+    @property
+    def oauth_folder(self) -> str:
+        """Cartella dei token OAuth."""
+        return os.path.join(self.directory, 'garth')
+    
+    @property
+    def store_path(self) -> str:
+        """Percorso dell'archivio locale."""
+        return os.path.join(self.directory, 'garmin_planner.db')
+    
+    @property
+    def config(self) -> Config:
+        """Configurazione dell'atleta (caricata al primo accesso)."""
+        with self._lock:
+            if self._config is None:
+                self._config = Config(self.config_path)
+            return self._config
+    
+    @property
+    def store(self) -> 'LocalStore':
+        """Archivio locale dell'atleta (aperto al primo accesso)."""
+        from services.local_store import LocalStore
+        
+        with self._lock:
+            if self._store is None:
+                self._store = LocalStore(self.store_path)
+            return self._store
+    
+    @property
+    def has_session(self) -> bool:
+        """True se sono stati salvati i token di Garmin Connect."""
+        return os.path.exists(os.path.join(self.oauth_folder, TOKEN_FILE))
+    
+    def scratch_config(self) -> Config:
+        """
+        Crea una copia della configurazione che non viene mai salvata.
+        
+        Serve per importare piani condivisi senza che le loro sezioni di
+        configurazione modifichino quella dell'atleta.
+        
+        Returns:
+            Copia della configurazione
+        """
+        scratch = Config(self.config_path)
+        scratch.persistence_enabled = False
+        scratch.from_json(self.config.to_json())
+        return scratch
+    
+    def login(self, username: str, password: str,
+              prompt_mfa: Optional[Callable[[], str]] = None) -> GarminClient:
+        """
+        Effettua il login a Garmin Connect e salva i token nella cartella dell'atleta.
+        
+        Args:
+            username: Nome utente (email)
+            password: Password
+            prompt_mfa: Funzione che restituisce il codice MFA, se richiesto
+        
+        Returns:
+            Client autenticato
+        """
+        session = garth.Client()
+        if prompt_mfa:
+            session.login(username, password, prompt_mfa=prompt_mfa)
+        else:
+            session.login(username, password)
+        
+        os.makedirs(self.oauth_folder, exist_ok=True)
+        session.dump(self.oauth_folder)
+        
+        logging.info(f"Atleta {self.id}: login effettuato come {username}")
+        
+        with self._lock:
+            self._client = GarminClient(session, self.rate_limiter)
+            return self._client
+    
+    def connect(self) -> GarminClient:
+        """
+        Riprende la sessione salvata dell'atleta.
+        
+        Returns:
+            Client autenticato
+        
+        Raises:
+            RuntimeError: Se non c'è una sessione valida
+        """
+        with self._lock:
+            if self._client is not None:
+                return self._client
+            
+            if not self.has_session:
+                raise RuntimeError(f"Nessuna sessione di Garmin Connect per l'atleta {self.id}")
+            
+            session = garth.Client()
+            try:
+                session.load(self.oauth_folder)
+                client = GarminClient(session, self.rate_limiter)
+                
+                # Verifica che la sessione sia valida
+                if not client._connectapi('/userprofile-service/socialProfile'):
+                    raise RuntimeError("sessione non valida")
+            except Exception as e:
+                raise RuntimeError(f"Sessione di Garmin Connect non valida per l'atleta {self.id}: {str(e)}")
+            
+            # Salva i token eventualmente rinnovati
+            try:
+                session.dump(self.oauth_folder)
+            except Exception as e:
+                logging.warning(f"Atleta {self.id}: impossibile salvare i token: {str(e)}")
+            
+            self._client = client
+            return client
+    
+    def logout(self) -> None:
+        """Elimina la sessione salvata dell'atleta."""
+        with self._lock:
+            self._client = None
+        shutil.rmtree(self.oauth_folder, ignore_errors=True)
+    
+    def close(self) -> None:
+        """Salva la configurazione e chiude l'archivio locale."""
+        with self._lock:
+            if self._config is not None:
+                self._config.flush()
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converte l'atleta in un dizionario per workspace.yaml.
+        
+        Returns:
+            Dizionario con i dati dell'atleta
+        """
+        return {'id': self.id, 'name': self.name,
+                'rate': self.rate_limiter.rate, 'burst': self.rate_limiter.burst}
+
+
+class AthleteResult:
+    """Risultato di un'operazione su un atleta."""
+    
+    def __init__(self, athlete_id: str, value: Any = None, error: Optional[str] = None,
+                 elapsed: float = 0.0):
+        """
+        Inizializza il risultato.
+        
+        Args:
+            athlete_id: Identificativo dell'atleta
+            value: Valore restituito dall'operazione
+            error: Messaggio di errore, None se l'operazione è riuscita
+            elapsed: Durata dell'operazione in secondi
+        """
+        self.athlete_id = athlete_id
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+    
+    @property
+    def ok(self) -> bool:
+        """True se l'operazione è riuscita."""
+        return self.error is None
+
+
+class Workspace:
+    """Spazio di lavoro di un allenatore con più atleti."""
+    
+    def __init__(self, root: str):
+        """
+        Inizializza lo spazio di lavoro, caricando l'elenco degli atleti.
+        
+        Args:
+            root: Cartella dello spazio di lavoro
+        """
+        self.root = os.path.expanduser(root)
+        self._lock = threading.Lock()
+        self._athletes = {}
+        self.load()
+    
+    @property
+    def athletes(self) -> List[Athlete]:
+        """Atleti nell'ordine di inserimento."""
+        return list(self._athletes.values())
+    
+    def load(self) -> None:
+        """Carica l'elenco degli atleti da workspace.yaml."""
+        path = os.path.join(self.root, WORKSPACE_FILE)
+        self._athletes = {}
+        
+        if not os.path.exists(path):
+            return
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml_io.load(f) or {}
+        
+        for entry in data.get('athletes', []):
+            athlete_id = entry['id']
+            self._athletes[athlete_id] = Athlete(
+                athlete_id, entry.get('name', athlete_id),
+                os.path.join(self.root, ATHLETES_DIR, athlete_id),
+                entry.get('rate', DEFAULT_RATE), entry.get('burst', DEFAULT_BURST))
+    
+    def save(self) -> None:
+        """Salva l'elenco degli atleti in workspace.yaml (scrittura atomica)."""
+        os.makedirs(self.root, exist_ok=True)
+        data = {'athletes': [athlete.to_dict() for athlete in self._athletes.values()]}
+        
+        fd, tmp_path = tempfile.mkstemp(prefix='.workspace-', suffix='.tmp', dir=self.root)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                yaml_io.dump(data, f)
+            os.replace(tmp_path, os.path.join(self.root, WORKSPACE_FILE))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def get_athlete(self, athlete_id: str) -> Athlete:
+        """
+        Restituisce un atleta.
+        
+        Args:
+            athlete_id: Identificativo dell'atleta
+        
+        Returns:
+            Atleta
+        
+        Raises:
+            KeyError: Se l'atleta non esiste
+        """
+        try:
+            return self._athletes[athlete_id]
+        except KeyError:
+            raise KeyError(f"Atleta non trovato: {athlete_id}")
+    
+    def add_athlete(self, name: str, athlete_id: Optional[str] = None,
+                    template: Optional[Config] = None) -> Athlete:
+        """
+        Aggiunge un atleta e ne crea la cartella.
+        
+        Args:
+            name: Nome dell'atleta
+            athlete_id: Identificativo (predefinito: ricavato dal nome)
+            template: Configurazione da copiare (predefinita: configurazione iniziale)
+        
+        Returns:
+            Atleta creato
+        
+        Raises:
+            ValueError: Se l'identificativo è già usato
+        """
+        with self._lock:
+            if athlete_id is None:
+                base = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'atleta'
+                athlete_id, counter = base, 2
+                while athlete_id in self._athletes:
+                    athlete_id, counter = f"{base}-{counter}", counter + 1
+            elif athlete_id in self._athletes:
+                raise ValueError(f"Atleta già presente: {athlete_id}")
+            
+            athlete = Athlete(athlete_id, name, os.path.join(self.root, ATHLETES_DIR, athlete_id))
+            os.makedirs(athlete.directory, exist_ok=True)
+            
+            # Ogni atleta parte da una configurazione propria con il suo nome
+            config = athlete.config
+            if template is not None:
+                config.from_json(template.to_json())
+            config.set('athlete_name', name)
+            config.flush()
+            
+            self._athletes[athlete_id] = athlete
+            self.save()
+        
+        logging.info(f"Atleta aggiunto allo spazio di lavoro: {athlete_id}")
+        return athlete
+    
+    def remove_athlete(self, athlete_id: str, delete_files: bool = False) -> None:
+        """
+        Rimuove un atleta dallo spazio di lavoro.
+        
+        Args:
+            athlete_id: Identificativo dell'atleta
+            delete_files: Se True elimina anche la cartella dei dati
+        """
+        with self._lock:
+            athlete = self.get_athlete(athlete_id)
+            athlete.close()
+            del self._athletes[athlete_id]
+            self.save()
+        
+        if delete_files:
+            shutil.rmtree(athlete.directory, ignore_errors=True)
+    
+    def run_all(self, operation: Callable[[Athlete], Any], athlete_ids: Optional[List[str]] = None,
+                max_workers: Optional[int] = None,
+                progress_callback: Optional[Callable[[int, int, AthleteResult], None]] = None) -> List[AthleteResult]:
+        """
+        Esegue un'operazione su più atleti contemporaneamente.
+        
+        Ogni operazione viene eseguita in un thread con la configurazione
+        dell'atleta attiva (get_config() restituisce quella dell'atleta);
+        le richieste a Garmin Connect sono limitate per ogni atleta dal suo
+        limitatore.
+        
+        Args:
+            operation: Funzione che riceve l'atleta e restituisce un valore
+            athlete_ids: Atleti su cui eseguire l'operazione (predefiniti: tutti)
+            max_workers: Atleti elaborati contemporaneamente
+            progress_callback: Funzione chiamata con (completati, totale, risultato)
+        
+        Returns:
+            Risultati nell'ordine degli atleti
+        """
+        athletes = ([self.get_athlete(athlete_id) for athlete_id in athlete_ids]
+                    if athlete_ids else self.athletes)
+        results = {}
+        
+        def run(athlete: Athlete) -> AthleteResult:
+            started = time.perf_counter()
+            try:
+                with use_config(athlete.config):
+                    value = operation(athlete)
+                return AthleteResult(athlete.id, value, elapsed=time.perf_counter() - started)
+            except Exception as e:
+                logging.error(f"Errore per l'atleta {athlete.id}: {str(e)}")
+                return AthleteResult(athlete.id, error=str(e), elapsed=time.perf_counter() - started)
+        
+        if athletes:
+            workers = max(1, min(len(athletes), max_workers or DEFAULT_MAX_WORKERS))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(run, athlete): athlete.id for athlete in athletes}
+                
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[result.athlete_id] = result
+                    if progress_callback:
+                        progress_callback(len(results), len(athletes), result)
+        
+        return [results[athlete.id] for athlete in athletes]
+    
+    def close(self) -> None:
+        """Salva le configurazioni e chiude gli archivi di tutti gli atleti."""
+        for athlete in self.athletes:
+            athlete.close()
+
+
+# Istanza singleton
+_workspace_instance = None
+
+def get_workspace(root: Optional[str] = None) -> Workspace:
+    """
+    Ottiene l'istanza singleton dello spazio di lavoro.
+    
+    Args:
+        root: Cartella dello spazio di lavoro (predefinita: 'paths.workspace' della configurazione)
+    
+    Returns:
+        Istanza dello spazio di lavoro
+    """
+    global _workspace_instance
+    if _workspace_instance is None:
+        if root is None:
+            root = get_config().get('paths.workspace') or 'workspace'
+        _workspace_instance = Workspace(root)
+    return _workspace_instance
+
+def reset_workspace() -> None:
+    """Chiude e reimposta l'istanza dello spazio di lavoro."""
+    global _workspace_instance
+    if _workspace_instance is not None:
+        _workspace_instance.close()
+    _workspace_instance = None
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Lettura e scrittura dei file YAML, con libyaml quando disponibile.
+"""
+
+from typing import Any, IO, Iterator, Optional, Tuple, Union
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.events import MappingStartEvent, MappingEndEvent, CollectionStartEvent, CollectionEndEvent
+from yaml.representer import SafeRepresenter
+from yaml.resolver import Resolver
+
+# PyYAML compilato con libyaml espone i loader/dumper in C
+LIBYAML_AVAILABLE = bool(getattr(yaml, '__with_libyaml__', False)) and hasattr(yaml, 'CSafeLoader')
+
+if LIBYAML_AVAILABLE:
+    _BaseLoader = yaml.CSafeLoader
+    _BaseDumper = yaml.CSafeDumper
+else:
+    _BaseLoader = yaml.SafeLoader
+    _BaseDumper = yaml.SafeDumper
+
+
+class SafeLoader(_BaseLoader):
+    """Loader sicuro (tipi YAML standard), in C se disponibile."""
+
+
+class SafeDumper(_BaseDumper):
+    """Dumper sicuro (tipi YAML standard), in C se disponibile."""
+
+
+# Le tuple vengono scritte come liste, come le rilegge il loader sicuro
+SafeDumper.add_representer(tuple, SafeRepresenter.represent_list)
+
+
+if LIBYAML_AVAILABLE:
+    from yaml.cyaml import CParser
+    
+    class _StreamingLoader(CParser, Composer, SafeConstructor, Resolver):
+        """Loader che usa il parser in C e compone i nodi uno alla volta."""
+        
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+else:
+    class _StreamingLoader(yaml.SafeLoader):
+        """Loader in puro Python che compone i nodi uno alla volta."""
+
+
+def backend() -> str:
+    """
+    Restituisce l'implementazione YAML in uso.
+    
+    Returns:
+        'libyaml' se vengono usati loader e dumper in C, 'python' altrimenti
+    """
+    return 'libyaml' if LIBYAML_AVAILABLE else 'python'
+
+
+def load(stream: Union[str, bytes, IO]) -> Any:
+    """
+    Legge un documento YAML con il loader sicuro.
+    
+    Args:
+        stream: Testo YAML o file aperto
+    
+    Returns:
+        Dati letti
+    
+    Raises:
+        yaml.YAMLError: Se il documento non è un YAML valido
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump(data: Any, stream: Optional[IO] = None, **kwargs) -> Optional[str]:
+    """
+    Scrive dei dati in formato YAML a blocchi, mantenendo l'ordine delle chiavi.
+    
+    Args:
+        data: Dati da scrivere
+        stream: File aperto (None per restituire il testo)
+        **kwargs: Opzioni aggiuntive per yaml.dump
+    
+    Returns:
+        Testo YAML se stream è None, altrimenti None
+    
+    Raises:
+        yaml.YAMLError: Se i dati non possono essere convertiti in YAML
+    """
+    kwargs.setdefault('default_flow_style', False)
+    kwargs.setdefault('sort_keys', False)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def iter_mapping(stream: Union[str, bytes, IO]) -> Iterator[Tuple[Any, Any]]:
+    """
+    Legge un documento la cui radice è un dizionario, una voce alla volta.
+    
+    Ogni coppia (chiave, valore) viene costruita e restituita prima di leggere
+    la successiva, senza creare l'intero documento in memoria.
+    
+    Args:
+        stream: Testo YAML o file aperto
+        
+    Yields:
+        Coppie (chiave, valore) nell'ordine del documento
+        
+    Raises:
+        ValueError: Se la radice del documento non è un dizionario
+        yaml.YAMLError: Se il documento non è un YAML valido
+    """
+    loader = _StreamingLoader(stream)
+    try:
+        _start_mapping(loader)
+        
+        while not loader.check_event(MappingEndEvent):
+            key_node = loader.compose_node(None, None)
+            value_node = loader.compose_node(key_node, None)
+            yield loader.construct_document(key_node), loader.construct_document(value_node)
+    finally:
+        loader.dispose()
+
+
+def iter_mapping_keys(stream: Union[str, bytes, IO]) -> Iterator[Any]:
+    """
+    Legge le chiavi di un documento la cui radice è un dizionario.
+    
+    I valori vengono saltati a livello di eventi del parser, senza
+    costruirli: la lettura costa molto meno di iter_mapping().
+    
+    Args:
+        stream: Testo YAML o file aperto
+        
+    Yields:
+        Chiavi nell'ordine del documento
+        
+    Raises:
+        ValueError: Se la radice del documento non è un dizionario
+        yaml.YAMLError: Se il documento non è un YAML valido
+    """
+    loader = _StreamingLoader(stream)
+    try:
+        _start_mapping(loader)
+        
+        while not loader.check_event(MappingEndEvent):
+            key_node = loader.compose_node(None, None)
+            yield loader.construct_document(key_node)
+            
+            # Salta il valore: uno scalare, un alias o una collezione completa
+            depth = 0
+            while True:
+                event = loader.get_event()
+                if isinstance(event, CollectionStartEvent):
+                    depth += 1
+                elif isinstance(event, CollectionEndEvent):
+                    depth -= 1
+                if depth == 0:
+                    break
+    finally:
+        loader.dispose()
+
+
+def _start_mapping(loader) -> None:
+    """
+    Consuma gli eventi fino all'inizio del dizionario radice.
+    
+    Args:
+        loader: Loader posizionato all'inizio dello stream
+        
+    Raises:
+        ValueError: Se la radice del documento non è un dizionario
+    """
+    # Salta l'inizio dello stream e del documento
+    loader.get_event()
+    if loader.check_event(yaml.events.DocumentStartEvent):
+        loader.get_event()
+    
+    if not loader.check_event(MappingStartEvent):
+        raise ValueError("Il file YAML non contiene un dizionario")
+    loader.get_event()